@@ -0,0 +1,49 @@
+"""collection_lookup_indexes
+
+Revision ID: 9b3d5e7f1a24
+Revises: f2c6a8d4b710
+Create Date: 2024-10-18 09:41:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3d5e7f1a24'
+down_revision: Union[str, None] = 'f2c6a8d4b710'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Collection tables written by PgVector2, which creates them on first use; new ones get these indexes then
+SCHEMA = 'ai'
+
+
+def _collection_tables(inspector):
+    for table in inspector.get_table_names(schema=SCHEMA):
+        columns = {column['name'] for column in inspector.get_columns(table, schema=SCHEMA)}
+        if {'embedding', 'meta_data', 'content'} <= columns:
+            yield table, columns
+
+
+def upgrade():
+    tables = list(_collection_tables(sa.inspect(op.get_bind())))
+    # Build the indexes of the exact-key lookups without blocking writes
+    with op.get_context().autocommit_block():
+        for table, columns in tables:
+            if 'name' in columns:
+                op.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_name_idx" ON {SCHEMA}."{table}" (name)')
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_meta_data_idx" '
+                f'ON {SCHEMA}."{table}" USING gin (meta_data jsonb_path_ops)'
+            )
+
+
+def downgrade():
+    tables = list(_collection_tables(sa.inspect(op.get_bind())))
+    with op.get_context().autocommit_block():
+        for table, _ in tables:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {SCHEMA}."{table}_name_idx"')
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {SCHEMA}."{table}_meta_data_idx"')
@@ -0,0 +1,89 @@
+"""incremental_devops_sync
+
+Revision ID: a7c3e91d5b20
+Revises: fc16332f1d23
+Create Date: 2024-10-02 09:14:51.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d5b20'
+down_revision: Union[str, None] = 'fc16332f1d23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Earlier syncs inserted fresh rows on every run; keep the oldest row per Azure id
+    # (DORA metrics reference it) and repoint dependants before adding the unique keys.
+    for table in ('devops_teams', 'work_item_types', 'dora_metrics', 'dora_metric_snapshots'):
+        op.execute(f"""
+            WITH dupes AS (
+                SELECT id, MIN(id) OVER (PARTITION BY organization_id, project_id) AS keep_id
+                FROM devops_projects
+            )
+            UPDATE {table} t SET project_id = d.keep_id
+            FROM dupes d WHERE t.project_id = d.id AND d.id <> d.keep_id
+        """)
+    op.execute("""
+        DELETE FROM devops_projects p USING devops_projects keep
+        WHERE p.organization_id = keep.organization_id
+          AND p.project_id = keep.project_id
+          AND p.id > keep.id
+    """)
+
+    for table in ('dora_metrics', 'dora_metric_snapshots'):
+        op.execute(f"""
+            WITH dupes AS (
+                SELECT id, MIN(id) OVER (PARTITION BY project_id, team_id) AS keep_id
+                FROM devops_teams
+            )
+            UPDATE {table} t SET team_id = d.keep_id
+            FROM dupes d WHERE t.team_id = d.id AND d.id <> d.keep_id
+        """)
+    op.execute("""
+        DELETE FROM devops_teams t USING devops_teams keep
+        WHERE t.project_id = keep.project_id
+          AND t.team_id = keep.team_id
+          AND t.id > keep.id
+    """)
+    op.execute("""
+        DELETE FROM work_item_types w USING work_item_types keep
+        WHERE w.project_id = keep.project_id
+          AND w.name = keep.name
+          AND w.id > keep.id
+    """)
+
+    op.add_column('devops_projects', sa.Column('content_hash', sa.String(), nullable=True))
+    op.add_column('devops_teams', sa.Column('content_hash', sa.String(), nullable=True))
+    op.add_column('work_item_types', sa.Column('content_hash', sa.String(), nullable=True))
+
+    op.create_unique_constraint('uq_devops_projects_org_project', 'devops_projects', ['organization_id', 'project_id'])
+    op.create_unique_constraint('uq_devops_teams_project_team', 'devops_teams', ['project_id', 'team_id'])
+    op.create_unique_constraint('uq_work_item_types_project_name', 'work_item_types', ['project_id', 'name'])
+
+    op.create_table('devops_sync_checkpoints',
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_attempt_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('projects_synced', sa.Integer(), nullable=True),
+        sa.Column('rows_upserted', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('organization_id')
+    )
+
+def downgrade():
+    op.drop_table('devops_sync_checkpoints')
+    op.drop_constraint('uq_work_item_types_project_name', 'work_item_types', type_='unique')
+    op.drop_constraint('uq_devops_teams_project_team', 'devops_teams', type_='unique')
+    op.drop_constraint('uq_devops_projects_org_project', 'devops_projects', type_='unique')
+    op.drop_column('work_item_types', 'content_hash')
+    op.drop_column('devops_teams', 'content_hash')
+    op.drop_column('devops_projects', 'content_hash')
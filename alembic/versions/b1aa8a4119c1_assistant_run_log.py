@@ -0,0 +1,88 @@
+"""assistant_run_log
+
+Revision ID: b1aa8a4119c1
+Revises: a7c3e91d5b20
+Create Date: 2024-10-09 16:42:07.530118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1aa8a4119c1'
+down_revision: Union[str, None] = 'a7c3e91d5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Run tables written by PgAssistantStorage, which creates them on first use
+RUN_TABLES = ('llm_os_runs',)
+SCHEMA = 'ai'
+LOG_KINDS = ('chat_history', 'llm_messages', 'references')
+
+
+def _list(kind):
+    return f"CASE WHEN jsonb_typeof(r.memory -> '{kind}') = 'array' THEN r.memory -> '{kind}' ELSE '[]'::jsonb END"
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in RUN_TABLES:
+        if not inspector.has_table(table, schema=SCHEMA):
+            continue
+        if not inspector.has_table(f'{table}_log', schema=SCHEMA):
+            op.create_table(f'{table}_log',
+                sa.Column('run_id', sa.String(), nullable=False),
+                sa.Column('kind', sa.String(), nullable=False),
+                sa.Column('seq', sa.Integer(), nullable=False),
+                sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+                sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+                sa.PrimaryKeyConstraint('run_id', 'kind', 'seq'),
+                schema=SCHEMA
+            )
+        # Move every message of the existing rows to the log, in order, then keep only the bounds in the row
+        values = ", ".join(f"('{kind}')" for kind in LOG_KINDS)
+        op.execute(f"""
+            INSERT INTO {SCHEMA}.{table}_log (run_id, kind, seq, data)
+            SELECT r.run_id, k.kind, e.ordinality - 1, e.value
+            FROM {SCHEMA}.{table} r
+            CROSS JOIN (VALUES {values}) AS k(kind)
+            CROSS JOIN LATERAL jsonb_array_elements(
+                CASE WHEN jsonb_typeof(r.memory -> k.kind) = 'array' THEN r.memory -> k.kind ELSE '[]'::jsonb END
+            ) WITH ORDINALITY AS e(value, ordinality)
+            WHERE r.memory IS NOT NULL AND NOT r.memory ? 'log'
+            ON CONFLICT DO NOTHING
+        """)
+        bounds = ", ".join(
+            f"'{kind}', jsonb_build_object('start', 0, 'next', jsonb_array_length({_list(kind)}))" for kind in LOG_KINDS
+        )
+        stripped = " - ".join(["r.memory"] + [f"'{kind}'" for kind in LOG_KINDS])
+        op.execute(f"""
+            UPDATE {SCHEMA}.{table} r
+            SET memory = ({stripped}) || jsonb_build_object('log', jsonb_build_object({bounds}))
+            WHERE r.memory IS NOT NULL AND NOT r.memory ? 'log'
+        """)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in RUN_TABLES:
+        if not inspector.has_table(f'{table}_log', schema=SCHEMA):
+            continue
+        lists = ", ".join(
+            f"""'{kind}', COALESCE((
+                SELECT jsonb_agg(l.data ORDER BY l.seq) FROM {SCHEMA}.{table}_log l
+                WHERE l.run_id = r.run_id AND l.kind = '{kind}'
+                  AND l.seq >= COALESCE((r.memory -> 'log' -> '{kind}' ->> 'start')::int, 0)
+            ), '[]'::jsonb)"""
+            for kind in LOG_KINDS
+        )
+        op.execute(f"""
+            UPDATE {SCHEMA}.{table} r
+            SET memory = (r.memory - 'log') || jsonb_build_object({lists})
+            WHERE r.memory ? 'log'
+        """)
+        op.drop_table(f'{table}_log', schema=SCHEMA)
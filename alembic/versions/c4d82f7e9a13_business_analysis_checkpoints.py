@@ -0,0 +1,41 @@
+"""business_analysis_checkpoints
+
+Revision ID: c4d82f7e9a13
+Revises: b1aa8a4119c1
+Create Date: 2024-10-11 11:05:33.914260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d82f7e9a13'
+down_revision: Union[str, None] = 'b1aa8a4119c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table('business_analysis_checkpoints',
+        sa.Column('analysis_id', sa.String(), nullable=False),
+        sa.Column('node', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('input_hash', sa.String(), nullable=True),
+        sa.Column('delta', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('analysis_id', 'node')
+    )
+    op.create_index(op.f('ix_business_analysis_checkpoints_user_id'), 'business_analysis_checkpoints', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_business_analysis_checkpoints_user_id'), table_name='business_analysis_checkpoints')
+    op.drop_table('business_analysis_checkpoints')
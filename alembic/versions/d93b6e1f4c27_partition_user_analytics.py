@@ -0,0 +1,108 @@
+"""partition_user_analytics
+
+Revision ID: d93b6e1f4c27
+Revises: c4d82f7e9a13
+Create Date: 2024-10-14 09:27:48.301552
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93b6e1f4c27'
+down_revision: Union[str, None] = 'c4d82f7e9a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = 'user_analytics'
+COLUMNS = 'id, user_id, event_type, event_data, timestamp, duration, created_at, updated_at'
+# Daily partitions created ahead; UserEventBuffer keeps creating them from there
+DAYS_AHEAD = 7
+
+
+def _is_partitioned(bind):
+    return bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = CAST(:table AS regclass))"
+    ), {'table': TABLE}).scalar()
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Created by init_db on first start; a fresh database gets the partitioned table from the model
+    if not sa.inspect(bind).has_table(TABLE) or _is_partitioned(bind):
+        return
+
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_legacy")
+    op.execute(f"ALTER TABLE {TABLE}_legacy RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_legacy_pkey")
+    op.execute(f"ALTER INDEX IF EXISTS ix_{TABLE}_id RENAME TO ix_{TABLE}_legacy_id")
+    # Keep the ids: the sequence outlives the legacy table and grows to bigint
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY NONE")
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq AS bigint")
+
+    op.create_table(TABLE,
+        sa.Column('id', sa.BigInteger(), server_default=sa.text(f"nextval('{TABLE}_id_seq'::regclass)"), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('event_type', sa.String(length=50), nullable=True),
+        sa.Column('event_data', sa.JSON(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id', 'timestamp'),
+        postgresql_partition_by='RANGE (timestamp)'
+    )
+    op.create_index('ix_user_analytics_timestamp', TABLE, ['timestamp'], unique=False)
+    op.create_index('ix_user_analytics_event_type_timestamp', TABLE, ['event_type', 'timestamp'], unique=False)
+    op.create_index('ix_user_analytics_user_id_timestamp', TABLE, ['user_id', 'timestamp'], unique=False)
+
+    # Everything before today goes to one history partition, dropped as a whole once it expires
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    op.execute(f"CREATE TABLE {TABLE}_history PARTITION OF {TABLE} FOR VALUES FROM (MINVALUE) TO ('{today.isoformat()}')")
+    for offset in range(DAYS_AHEAD + 1):
+        lower = today + timedelta(days=offset)
+        op.execute(
+            f"CREATE TABLE {TABLE}_p{lower:%Y%m%d} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{(lower + timedelta(days=1)).isoformat()}')"
+        )
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+    op.execute(f"""
+        INSERT INTO {TABLE} ({COLUMNS})
+        SELECT id, user_id, event_type, event_data, COALESCE(timestamp, created_at, now()), duration, created_at, updated_at
+        FROM {TABLE}_legacy
+    """)
+    op.drop_table(f'{TABLE}_legacy')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE) or not _is_partitioned(bind):
+        return
+
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {TABLE}_partitioned")
+    op.execute(f"ALTER TABLE {TABLE}_partitioned RENAME CONSTRAINT {TABLE}_pkey TO {TABLE}_partitioned_pkey")
+    for index in ('timestamp', 'event_type_timestamp', 'user_id_timestamp'):
+        op.drop_index(f'ix_user_analytics_{index}', table_name=f'{TABLE}_partitioned')
+    op.create_table(TABLE,
+        sa.Column('id', sa.Integer(), server_default=sa.text(f"nextval('{TABLE}_id_seq'::regclass)"), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('event_type', sa.String(length=50), nullable=True),
+        sa.Column('event_data', sa.JSON(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(f'ix_{TABLE}_id', TABLE, ['id'], unique=False)
+    op.execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {TABLE}_partitioned")
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq AS integer")
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    # Dropping the parent drops every partition
+    op.drop_table(f'{TABLE}_partitioned')
@@ -0,0 +1,31 @@
+"""knowledge_base_versions
+
+Revision ID: e5b07c2d9a61
+Revises: d93b6e1f4c27
+Create Date: 2024-10-15 14:12:09.552817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b07c2d9a61'
+down_revision: Union[str, None] = 'd93b6e1f4c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table('knowledge_base_versions',
+        sa.Column('collection', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('collection')
+    )
+
+
+def downgrade():
+    op.drop_table('knowledge_base_versions')
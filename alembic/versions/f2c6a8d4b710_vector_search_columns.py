@@ -0,0 +1,79 @@
+"""vector_search_columns
+
+Revision ID: f2c6a8d4b710
+Revises: e5b07c2d9a61
+Create Date: 2024-10-17 10:05:31.224906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8d4b710'
+down_revision: Union[str, None] = 'e5b07c2d9a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Collection tables written by PgVector2, which creates them on first use; new ones get these columns then
+SCHEMA = 'ai'
+# Must match PROMOTED_METADATA_KEYS and the default text_search_config of PgVector2
+PROMOTED_METADATA_KEYS = ('project', 'type', 'space_key')
+TEXT_SEARCH_CONFIG = 'english'
+
+
+def _collection_tables(inspector):
+    for table in inspector.get_table_names(schema=SCHEMA):
+        columns = {column['name'] for column in inspector.get_columns(table, schema=SCHEMA)}
+        if {'embedding', 'meta_data', 'content'} <= columns:
+            yield table, columns
+
+
+def upgrade():
+    tables = list(_collection_tables(sa.inspect(op.get_bind())))
+    # Each added stored column rewrites the table, so add them all in one ALTER TABLE
+    for table, columns in tables:
+        additions = [
+            f"ADD COLUMN meta_{key} text GENERATED ALWAYS AS (meta_data->>'{key}') STORED"
+            for key in PROMOTED_METADATA_KEYS if f'meta_{key}' not in columns
+        ]
+        if 'content_tsv' not in columns:
+            source = "coalesce(content, '')"
+            if 'name' in columns:
+                source = f"coalesce(name, '') || ' ' || {source}"
+            additions.append(
+                f"ADD COLUMN content_tsv tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, {source})) STORED"
+            )
+        if additions:
+            op.execute(f'ALTER TABLE {SCHEMA}."{table}" {", ".join(additions)}')
+
+    # Build the indexes without blocking writes
+    with op.get_context().autocommit_block():
+        for table, columns in tables:
+            for key in PROMOTED_METADATA_KEYS:
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_meta_{key}_idx" '
+                    f'ON {SCHEMA}."{table}" (meta_{key} text_pattern_ops)'
+                )
+            for column in ('user_id', 'org_id'):
+                if column in columns:
+                    op.execute(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_{column}_idx" ON {SCHEMA}."{table}" ({column})'
+                    )
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_content_tsv_idx" '
+                f'ON {SCHEMA}."{table}" USING gin (content_tsv)'
+            )
+
+
+def downgrade():
+    tables = list(_collection_tables(sa.inspect(op.get_bind())))
+    for table, _ in tables:
+        drops = [f'DROP COLUMN IF EXISTS meta_{key}' for key in PROMOTED_METADATA_KEYS]
+        drops.append('DROP COLUMN IF EXISTS content_tsv')
+        op.execute(f'ALTER TABLE {SCHEMA}."{table}" {", ".join(drops)}')
+        for column in ('user_id', 'org_id'):
+            op.execute(f'DROP INDEX IF EXISTS {SCHEMA}."{table}_{column}_idx"')
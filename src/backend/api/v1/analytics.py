@@ -2,9 +2,8 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from src.backend.db.session import get_db
-from src.backend.schemas.user import UserEvent
+from src.backend.schemas.user import UserEvent, UserEventBatch
 from src.backend.services.analytics_service import AnalyticsService
-from fastapi_cache import FastAPICache
 from fastapi_cache.decorator import cache
 
 router = APIRouter()
@@ -99,8 +98,7 @@ async def save_user_event(event: UserEvent, db: Session = Depends(get_db)):
             event.duration
         )
         if result:
-            # Clear the cache when new data is added
-            await FastAPICache.clear(namespace="analytics")
+            # Written in the next batch; the analytics endpoints are cached for 5 minutes anyway
             return {"message": "Event saved successfully"}
         else:
             raise HTTPException(status_code=500, detail="Failed to save event")
@@ -108,6 +106,15 @@ async def save_user_event(event: UserEvent, db: Session = Depends(get_db)):
         logger.error(f"Error in save_user_event: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to save event: {str(e)}")
 
+@router.post("/user-events/batch")
+async def save_user_events(batch: UserEventBatch, db: Session = Depends(get_db)):
+    try:
+        accepted = analytics_service.save_user_events(db, [event.dict() for event in batch.events])
+        return {"accepted": accepted, "dropped": len(batch.events) - accepted}
+    except Exception as e:
+        logger.error(f"Error in save_user_events: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to save events: {str(e)}")
+
 @router.get("/user-events")
 @cache(expire=300)
 async def get_user_events(user_id: int = None, db: Session = Depends(get_db)):
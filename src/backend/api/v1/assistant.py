@@ -8,6 +8,8 @@ from src.backend.schemas.code_tool_schemas import ProjectLoadRequest
 from src.backend.kr8.tools.code_tools import CodeTools
 from src.backend.kr8.assistant.assistant_manager import get_assistant_manager, AssistantManager
 from src.backend.db.session import get_db
+from src.backend.helpers.auth import get_current_user
+from src.backend.kr8.llm.router import get_provider_metrics
 
 router = APIRouter()
 
@@ -23,6 +25,11 @@ async def get_assistant(
     assistant = assistant_manager.get_assistant(db, user_id, org_id, user_role, user_nickname)
     return {"assistant_id": id(assistant)}
 
+@router.get("/llm-metrics")
+async def get_llm_metrics(user_id: int = Depends(get_current_user)):
+    # Rolling latency, errors, hedges and failovers of each LLM provider in this process
+    return get_provider_metrics()
+
 @router.get("/assistant-info/{assistant_id}")
 async def get_assistant_info(
     assistant_id: int,
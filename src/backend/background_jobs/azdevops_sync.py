@@ -1,40 +1,214 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
 from src.backend.services.azure_devops_service import AzureDevOpsService
-from src.backend.models.models import AzureDevOpsConfig, DevOpsProject, DevOpsTeam, WorkItemType
+from src.backend.models.models import AzureDevOpsConfig, DevOpsProject, DevOpsSyncCheckpoint, DevOpsTeam, WorkItemType
 from src.backend.db.session import SessionLocal
 
-def sync_azure_devops_metadata():
+logger = logging.getLogger(__name__)
+
+MAX_ORG_WORKERS = 4
+MAX_PROJECT_WORKERS = 8
+# Shared across all organizations; Azure DevOps throttles per PAT/user at a few hundred requests per minute
+REQUESTS_PER_SECOND = 10.0
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting calls to `rate` per second with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _content_hash(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _serialize_fields(fields: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"reference_name": field.reference_name, "name": field.name, "always_required": getattr(field, "always_required", None)}
+        for field in fields or []
+    ]
+
+
+def _fetch_project(service: AzureDevOpsService, limiter: RateLimiter, project: Any) -> Dict[str, Any]:
+    limiter.acquire()
+    teams = service.get_teams(project.id)
+    limiter.acquire()
+    work_item_types = service.get_work_item_types(project.id)
+
+    team_rows = []
+    for team in teams:
+        row = {"team_id": team.id, "name": team.name}
+        team_rows.append({**row, "content_hash": _content_hash(row)})
+
+    wit_rows = []
+    for wit in work_item_types:
+        row = {"name": wit.name, "fields": _serialize_fields(wit.fields)}
+        wit_rows.append({**row, "content_hash": _content_hash(row)})
+
+    project_row = {"project_id": project.id, "name": project.name, "description": project.description}
+    return {
+        "project": {**project_row, "content_hash": _content_hash(project_row)},
+        "teams": team_rows,
+        "work_item_types": wit_rows,
+    }
+
+
+def _upsert_projects(db, organization_id: int, project_rows: List[Dict[str, Any]]) -> int:
+    existing = dict(
+        db.execute(
+            select(DevOpsProject.project_id, DevOpsProject.content_hash).where(DevOpsProject.organization_id == organization_id)
+        ).all()
+    )
+    changed = [row for row in project_rows if existing.get(row["project_id"]) != row["content_hash"]]
+    if changed:
+        stmt = insert(DevOpsProject).values([{**row, "organization_id": organization_id} for row in changed])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["organization_id", "project_id"],
+            set_={"name": stmt.excluded.name, "description": stmt.excluded.description, "content_hash": stmt.excluded.content_hash},
+        )
+        db.execute(stmt)
+    return len(changed)
+
+
+def _upsert_children(db, model, key: str, rows_by_project: Dict[int, List[Dict[str, Any]]]) -> int:
+    """Bulk upsert teams or work item types, skipping rows whose content hash is unchanged."""
+    if not rows_by_project:
+        return 0
+    key_column = getattr(model, key)
+    existing = {
+        (project_id, key_value): content_hash
+        for project_id, key_value, content_hash in db.execute(
+            select(model.project_id, key_column, model.content_hash).where(model.project_id.in_(list(rows_by_project)))
+        ).all()
+    }
+    changed = [
+        {**row, "project_id": project_id}
+        for project_id, rows in rows_by_project.items()
+        for row in rows
+        if existing.get((project_id, row[key])) != row["content_hash"]
+    ]
+    if changed:
+        stmt = insert(model).values(changed)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["project_id", key],
+            set_={column: stmt.excluded[column] for column in changed[0] if column not in ("project_id", key)},
+        )
+        db.execute(stmt)
+    return len(changed)
+
+
+def _save_checkpoint(db, organization_id: int, **values) -> None:
+    stmt = insert(DevOpsSyncCheckpoint).values(organization_id=organization_id, **values)
+    stmt = stmt.on_conflict_do_update(index_elements=["organization_id"], set_=values)
+    db.execute(stmt)
+
+
+def _sync_organization(config: AzureDevOpsConfig, limiter: RateLimiter, max_project_workers: int) -> Dict[str, Any]:
+    organization_id = config.organization_id
+    started_at = datetime.now(timezone.utc)
     db = SessionLocal()
-    configs = db.query(AzureDevOpsConfig).all()
-    for config in configs:
-        service = AzureDevOpsService(config.organization_url, config.personal_access_token)
+    try:
+        service = AzureDevOpsService(organization_id, config.organization_url, config.personal_access_token)
+        limiter.acquire()
         projects = service.get_projects()
-        for project in projects:
-            db_project = DevOpsProject(
-                organization_id=config.organization_id,
-                project_id=project.id,
-                name=project.name,
-                description=project.description
-            )
-            db.add(db_project)
-            db.flush()
-
-            teams = service.get_teams(project.id)
-            for team in teams:
-                db_team = DevOpsTeam(
-                    project_id=db_project.id,
-                    team_id=team.id,
-                    name=team.name
-                )
-                db.add(db_team)
-
-            work_item_types = service.get_work_item_types(project.id)
-            for wit in work_item_types:
-                db_wit = WorkItemType(
-                    project_id=db_project.id,
-                    name=wit.name,
-                    fields=wit.fields
-                )
-                db.add(db_wit)
-
-    db.commit()
-    db.close()
\ No newline at end of file
+
+        with ThreadPoolExecutor(max_workers=max_project_workers) as executor:
+            fetched = list(executor.map(lambda project: _fetch_project(service, limiter, project), projects))
+
+        rows_upserted = _upsert_projects(db, organization_id, [item["project"] for item in fetched])
+        project_ids = dict(
+            db.execute(
+                select(DevOpsProject.project_id, DevOpsProject.id).where(DevOpsProject.organization_id == organization_id)
+            ).all()
+        )
+        rows_upserted += _upsert_children(
+            db, DevOpsTeam, "team_id", {project_ids[item["project"]["project_id"]]: item["teams"] for item in fetched}
+        )
+        rows_upserted += _upsert_children(
+            db, WorkItemType, "name", {project_ids[item["project"]["project_id"]]: item["work_item_types"] for item in fetched}
+        )
+        _save_checkpoint(
+            db,
+            organization_id,
+            status="success",
+            last_synced_at=started_at,
+            last_attempt_at=started_at,
+            projects_synced=len(fetched),
+            rows_upserted=rows_upserted,
+            error=None,
+        )
+        db.commit()
+        logger.info(f"Synced Azure DevOps metadata for organization {organization_id}: {len(fetched)} projects, {rows_upserted} rows changed")
+        return {"organization_id": organization_id, "status": "success", "projects": len(fetched), "rows_upserted": rows_upserted}
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error syncing Azure DevOps metadata for organization {organization_id}: {str(e)}")
+        # Record the failure without touching last_synced_at so the next run retries this organization
+        _save_checkpoint(db, organization_id, status="failed", last_attempt_at=started_at, error=str(e))
+        db.commit()
+        return {"organization_id": organization_id, "status": "failed", "error": str(e)}
+    finally:
+        db.close()
+
+
+def sync_azure_devops_metadata(
+    min_interval: Optional[timedelta] = None,
+    max_org_workers: int = MAX_ORG_WORKERS,
+    max_project_workers: int = MAX_PROJECT_WORKERS,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+) -> List[Dict[str, Any]]:
+    """Incrementally sync projects, teams and work item types for every configured organization.
+
+    Organizations whose last successful checkpoint is newer than `min_interval` are skipped.
+    Each organization commits independently, so one failing tenant does not roll back the others.
+    """
+    db = SessionLocal()
+    try:
+        configs = db.query(AzureDevOpsConfig).all()
+        checkpoints = {checkpoint.organization_id: checkpoint for checkpoint in db.query(DevOpsSyncCheckpoint).all()}
+        db.expunge_all()
+    finally:
+        db.close()
+
+    if min_interval is not None:
+        cutoff = datetime.now(timezone.utc) - min_interval
+        due = []
+        for config in configs:
+            checkpoint = checkpoints.get(config.organization_id)
+            if checkpoint and checkpoint.status == "success" and checkpoint.last_synced_at and checkpoint.last_synced_at > cutoff:
+                logger.info(f"Skipping organization {config.organization_id}: synced at {checkpoint.last_synced_at}")
+                continue
+            due.append(config)
+        configs = due
+
+    limiter = RateLimiter(requests_per_second)
+    with ThreadPoolExecutor(max_workers=max_org_workers) as executor:
+        results = list(executor.map(lambda config: _sync_organization(config, limiter, max_project_workers), configs))
+    return results
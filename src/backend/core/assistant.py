@@ -20,11 +20,14 @@ from src.backend.kr8.llm.offline_llm import OfflineLLM
 from src.backend.kr8.llm.ollama import Ollama
 from src.backend.kr8.llm.openai import OpenAIChat
 from src.backend.kr8.llm.anthropic import Claude
+from src.backend.kr8.llm.router import LLMRouter
 from src.backend.kr8.storage.assistant.postgres import PgAssistantStorage
+from src.backend.kr8.storage.dataframe.postgres import PgDataFrameStore
 from src.backend.kr8.tools.exa import ExaTools
 from src.backend.kr8.tools.pandas import PandasTools
 from src.backend.kr8.utils.log import logger
-from src.backend.kr8.vectordb.pgvector import PgVector2
+from src.backend.kr8.vectordb.pgvector import PgVector2, Prefix
+from src.backend.kr8.reranker.cross_encoder import CrossEncoderReranker
 
 from src.backend.kr8.tools.yfinance import YFinanceTools
 from src.backend.db.session import get_db 
@@ -42,9 +45,11 @@ from src.backend.kr8.assistant.team.business_analyst import EnhancedBusinessAnal
 from src.backend.kr8.assistant.team.call_center_assistant import CallCenterAssistant
 from src.backend.kr8.assistant.team.project_management_assistant import ProjectManagementAssistant
 from src.backend.models.models import Organization
+from src.backend.services.answer_cache import get_answer_cache
 
 
 from src.backend.core.client_config import get_client_name
+from src.backend.core.config import settings
 
 load_dotenv()
 client_name = get_client_name()         
@@ -80,16 +85,34 @@ def is_ollama_available() -> bool:
         logger.error(f"Request error: {e}")
         return False
 
-def create_pandas_tools(user_id: Optional[int]) -> PandasTools:
-    return PandasTools(user_id=user_id)
+def create_pandas_tools(user_id: Optional[int], knowledge_base: Optional[AssistantKnowledge] = None) -> PandasTools:
+    return PandasTools(
+        user_id=user_id,
+        knowledge_base=knowledge_base,
+        dataframe_store=PgDataFrameStore(table_name="dataframes", db_url=db_url),
+    )
 
 def get_llm(llm_id: str, fallback_model: str):
+    """The LLM for llm_id, routed with failover and hedging to the fallbacks configured in LLM_FALLBACKS"""
+    fallbacks = [fallback_id for fallback_id in settings.LLM_FALLBACKS.get(llm_id, []) if fallback_id != llm_id]
+    if not fallbacks:
+        return get_provider_llm(llm_id, fallback_model)
+    llm_ids = [llm_id] + fallbacks
+    return LLMRouter(
+        model=",".join(llm_ids),
+        providers=[get_provider_llm(provider_id, fallback_model) for provider_id in llm_ids],
+        hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        hedge_with_tools=settings.LLM_HEDGE_WITH_TOOLS,
+    )
+
+def get_provider_llm(llm_id: str, fallback_model: str):
     if llm_id in ["llama3.1"]:
         ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
         try:
             return Ollama(
                 model=llm_id,
                 base_url=ollama_base_url,
+                keep_alive=settings.OLLAMA_KEEP_ALIVE,
                 options={
                     "num_ctx": 4096, 
                     "temperature": 0.7,
@@ -103,6 +126,7 @@ def get_llm(llm_id: str, fallback_model: str):
                 return Ollama(
                     model=fallback_model,
                     base_url=ollama_base_url,
+                    keep_alive=settings.OLLAMA_KEEP_ALIVE,
                     options={"num_ctx": 1024, "temperature": 0.7, "top_p": 0.9}
                 )
             except Exception as fallback_error:
@@ -127,11 +151,6 @@ def add_context_reminder(messages, current_project, current_project_type):
         messages.append({"role": "system", "content": reminder})
     return messages
 
-def filter_results(results, current_project, current_project_type):
-    if current_project and current_project_type:
-        return [r for r in results if r.meta_data.get('project') == current_project and r.meta_data.get('type').startswith(current_project_type)]
-    return results
-
 def get_llm_os(
     llm_id: str = "gpt-4o",
     fallback_model: str = "tinyllama",    
@@ -161,18 +180,23 @@ def get_llm_os(
     available_assistants = org_config['assistants'].get(user_role, [])
     feature_flags = org_config['feature_flags']
 
+    embedder = SentenceTransformerEmbedder(model="all-MiniLM-L6-v2")
     knowledge_base = AssistantKnowledge(
         vector_db=PgVector2(
             db_url=db_url,
             collection=f"org_{org_id}_user_{user_id}_documents" if user_id is not None else "llm_os_documents",
-            embedder=SentenceTransformerEmbedder(model="all-MiniLM-L6-v2"),
+            embedder=embedder,
+            # MiniLM misses exact identifiers (ticket ids, policy codes, class names); fuse with full-text search
+            search_type="hybrid",
         ),
         num_documents=100,
+        # Score the 100 retrieved chunks with a local cross encoder and pass only the best few to the LLM
+        reranker=CrossEncoderReranker(top_k=8, max_tokens=3000),
         user_id=user_id,
     )
 
     try:
-        pandas_tools = create_pandas_tools(user_id)
+        pandas_tools = create_pandas_tools(user_id, knowledge_base)
         code_tools = CodeTools(knowledge_base=knowledge_base)
         exa_tools = ExaTools(num_results=5, text_length_limit=2000)
         
@@ -252,14 +276,17 @@ def get_llm_os(
                 preprocessed_query = query
 
             # Clear previous conversation history only for Claude
-            if isinstance(self.llm, Claude):
+            if isinstance(self.llm, Claude) or (isinstance(self.llm, LLMRouter) and isinstance(self.llm.providers[0], Claude)):
                 self.memory.clear()
                 
             results = super().run(preprocessed_query, stream=stream, **kwargs)
             
             if self.knowledge_base and self.current_project and self.current_project_type:
-                filtered_results = filter_results(self.knowledge_base.search(preprocessed_query), self.current_project, self.current_project_type)
-                self.last_search_results = filtered_results
+                # Filtered in the vector db, before the limit, so the project's documents are not crowded out
+                self.last_search_results = self.knowledge_base.search(
+                    preprocessed_query,
+                    filters={"project": self.current_project, "type": Prefix(self.current_project_type)},
+                )
 
             return results
 
@@ -288,6 +315,8 @@ def get_llm_os(
         markdown=True,
         add_datetime_to_instructions=True,
         introduction=assistant_instructions['introduction'],
+        # Repeated questions skip retrieval and generation; the query embedding comes from the same local model
+        answer_cache=get_answer_cache(org_id, embedder) if feature_flags.get("enable_answer_cache", False) else None,
         debug_mode=debug_mode,
     )
     return llm_os
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 import os
 from pathlib import Path
 
@@ -52,6 +52,18 @@ class Settings(BaseSettings):
     AZURE_DEVOPS_ORGANIZATION: Optional[str] = None
     AZURE_DEVOPS_PERSONAL_ACCESS_TOKEN: Optional[str] = None
     AZURE_DEVOPS_SYNC_INTERVAL: int = 3600
+    USER_EVENT_RETENTION_DAYS: int = 90
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.92
+    ANSWER_CACHE_TTL: int = 86400
+    ANSWER_CACHE_MAX_ENTRIES: int = 1000
+    # llm id -> fallback llm ids, e.g. LLM_FALLBACKS='{"gpt-4o": ["claude-3.5", "llama3.1"]}'
+    LLM_FALLBACKS: Dict[str, List[str]] = {}
+    LLM_HEDGE_PERCENTILE: Optional[float] = 0.95
+    LLM_HEDGE_WITH_TOOLS: bool = False
+    # Ollama models loaded at startup and kept loaded, e.g. OLLAMA_WARM_MODELS='["llama3.1"]'
+    OLLAMA_WARM_MODELS: List[str] = []
+    # How long Ollama keeps a model loaded after its last request ("30m", "1h", seconds; negative is forever)
+    OLLAMA_KEEP_ALIVE: str = "30m"
     AZURE_DEVOPS_SCHEMA_URL: Optional[str] = None
     AZURE_DEVOPS_ORGANIZATION_URL:  Optional[str] = None
     AZURE_DEVOPS_PERSONAL_ACCESS_TOKEN:  Optional[str] = None
@@ -76,3 +76,23 @@ def create_assistant_event(event: AssistantEventCreate) -> bool:
         except Exception as e:
             logger.debug(f"Could not create assistant event: {e}")
     return False
+
+
+def queue_assistant_run(run: AssistantRunCreate) -> bool:
+    """Queues the run for the background event shipper instead of sending it on the calling thread."""
+    if not phi_cli_settings.api_enabled:
+        return True
+
+    from src.backend.kr8.api.events import get_assistant_run_shipper
+
+    return get_assistant_run_shipper().enqueue(run.model_dump(exclude_none=True))
+
+
+def queue_assistant_event(event: AssistantEventCreate) -> bool:
+    """Queues the event for the background event shipper instead of sending it on the calling thread."""
+    if not phi_cli_settings.api_enabled:
+        return True
+
+    from src.backend.kr8.api.events import get_assistant_event_shipper
+
+    return get_assistant_event_shipper().enqueue(event.model_dump(exclude_none=True))
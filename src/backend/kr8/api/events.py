@@ -0,0 +1,213 @@
+import atexit
+import random
+import threading
+import time
+from collections import deque
+from os import getenv
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from httpx import Client as HttpxClient, Response
+
+from src.backend.kr8.api.api import api, invalid_response
+from src.backend.kr8.api.routes import ApiRoutes
+from src.backend.kr8.constants import PHI_API_KEY_ENV_VAR, PHI_WS_KEY_ENV_VAR
+from src.backend.kr8.utils.log import logger
+
+# Keys of assistant_data that repeat what the run row already holds and can grow with the conversation
+_COMPACT_EXCLUDED_KEYS = ("memory",)
+
+
+def compact_payload(value: Any, max_chars: int = 4000, max_items: int = 50) -> Any:
+    """Returns a copy of value with long strings truncated and long lists cut to their last items"""
+    if isinstance(value, str):
+        if len(value) > max_chars:
+            return f"{value[:max_chars]}... [{len(value) - max_chars} chars truncated]"
+        return value
+    if isinstance(value, dict):
+        return {
+            key: compact_payload(item, max_chars, max_items)
+            for key, item in value.items()
+            if item is not None and key not in _COMPACT_EXCLUDED_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        # The most recent messages are the ones worth keeping
+        return [compact_payload(item, max_chars, max_items) for item in list(value)[-max_items:]]
+    return value
+
+
+class EventShipper:
+    """Ships api events from a bounded in-process queue on a background thread.
+
+    Callers only append to the queue, so a request never waits on the api. The flusher sends queued events
+    in batches over one long-lived client, every flush_interval seconds or as soon as batch_size events are
+    waiting. Once the queue is more than high_watermark full, only sample_rate of new events are kept, and
+    when it is full new events are dropped. Remaining events are flushed when the process exits.
+    """
+
+    def __init__(
+        self,
+        route: str,
+        payload_key: str = "event",
+        batch_route: Optional[str] = None,
+        client_factory: Optional[Callable[[], HttpxClient]] = None,
+        max_queue_size: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        high_watermark: float = 0.8,
+        sample_rate: float = 0.1,
+        max_chars: int = 4000,
+    ):
+        """
+        :param route: Route each event is posted to as {payload_key: event}.
+        :param batch_route: If set, each batch is posted once as {payload_key + "s": [events]} instead.
+        :param client_factory: Creates the http client, defaults to the authenticated phi api client.
+        """
+        self.route = route
+        self.payload_key = payload_key
+        self.batch_route = batch_route
+        self.client_factory: Callable[[], HttpxClient] = client_factory or api.AuthenticatedClient
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.high_watermark = high_watermark
+        self.sample_rate = sample_rate
+        self.max_chars = max_chars
+
+        self.queue: Deque[Dict[str, Any]] = deque()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.flusher: Optional[threading.Thread] = None
+        self.client: Optional[HttpxClient] = None
+        self.closed = False
+        # Counters
+        self.num_queued: int = 0
+        self.num_sent: int = 0
+        self.num_failed: int = 0
+        self.num_dropped: int = 0
+        self.num_sampled_out: int = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "queued": self.num_queued,
+                "sent": self.num_sent,
+                "failed": self.num_failed,
+                "dropped": self.num_dropped,
+                "sampled_out": self.num_sampled_out,
+                "pending": len(self.queue),
+            }
+
+    def enqueue(self, payload: Dict[str, Any]) -> bool:
+        """Queues payload for shipping. Returns False if it was dropped or sampled out."""
+        if self.closed:
+            return False
+        with self.lock:
+            size = len(self.queue)
+            if size >= self.max_queue_size:
+                self.num_dropped += 1
+                return False
+            if size >= self.max_queue_size * self.high_watermark and random.random() >= self.sample_rate:
+                self.num_sampled_out += 1
+                return False
+            self.queue.append(compact_payload(payload, max_chars=self.max_chars))
+            self.num_queued += 1
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self._run, name="api-event-shipper", daemon=True)
+                self.flusher.start()
+            if len(self.queue) >= self.batch_size:
+                self.wakeup.set()
+        return True
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self.queue.popleft() for _ in range(min(self.batch_size, len(self.queue)))]
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {getenv(PHI_API_KEY_ENV_VAR)}",
+            "PHI-WORKSPACE": f"{getenv(PHI_WS_KEY_ENV_VAR)}",
+        }
+
+    def _post(self, route: str, body: Dict[str, Any]) -> bool:
+        if self.client is None:
+            self.client = self.client_factory()
+        try:
+            r: Response = self.client.post(route, headers=self._headers(), json=body)
+            return not invalid_response(r)
+        except Exception as e:
+            logger.debug(f"Could not ship events to {route}: {e}")
+            return False
+
+    def _send(self, batch: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Returns (sent, failed)"""
+        if self.batch_route is not None:
+            if self._post(self.batch_route, {f"{self.payload_key}s": batch}):
+                return len(batch), 0
+            return 0, len(batch)
+        sent = sum(1 for event in batch if self._post(self.route, {self.payload_key: event}))
+        return sent, len(batch) - sent
+
+    def flush(self) -> None:
+        """Sends every queued event, on the calling thread"""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            sent, failed = self._send(batch)
+            with self.lock:
+                self.num_sent += sent
+                self.num_failed += failed
+
+    def _run(self) -> None:
+        while not self.closed:
+            self.wakeup.wait(timeout=self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.debug(f"Event flush failed: {e}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stops the flusher and sends what is left, giving up after timeout seconds"""
+        if self.closed:
+            return
+        self.closed = True
+        self.wakeup.set()
+        if self.flusher is not None:
+            self.flusher.join(timeout=timeout)
+        deadline = time.monotonic() + timeout
+        while self.queue and time.monotonic() < deadline:
+            batch = self._take_batch()
+            sent, failed = self._send(batch)
+            with self.lock:
+                self.num_sent += sent
+                self.num_failed += failed
+        with self.lock:
+            self.num_dropped += len(self.queue)
+            self.queue.clear()
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        logger.debug(f"Event shipper closed: {self.stats()}")
+
+
+_shippers: Dict[str, EventShipper] = {}
+_shippers_lock = threading.Lock()
+
+
+def get_event_shipper(route: str, payload_key: str = "event") -> EventShipper:
+    """Process-wide shipper for route, flushed at exit"""
+    with _shippers_lock:
+        if route not in _shippers:
+            shipper = EventShipper(route=route, payload_key=payload_key)
+            atexit.register(shipper.close)
+            _shippers[route] = shipper
+        return _shippers[route]
+
+
+def get_assistant_event_shipper() -> EventShipper:
+    return get_event_shipper(ApiRoutes.ASSISTANT_EVENT_CREATE, payload_key="event")
+
+
+def get_assistant_run_shipper() -> EventShipper:
+    return get_event_shipper(ApiRoutes.ASSISTANT_RUN_CREATE, payload_key="run")
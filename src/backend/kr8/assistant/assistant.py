@@ -16,6 +16,7 @@ from sqlalchemy import create_engine
 from src.backend.kr8.document.base import Document
 from src.backend.kr8.llm.base import LLM
 from src.backend.kr8.llm.references import References
+from src.backend.kr8.llm.router import health_cache
 from src.backend.kr8.utils.log import set_log_level_to_debug
 from src.backend.kr8.utils.merge_dict import merge_dictionaries
 from src.backend.kr8.utils.message import get_text_from_message
@@ -61,6 +62,8 @@ class Assistant(BaseModel):
     # Assistant Knowledge Base
     knowledge_base: Optional[AssistantKnowledge] = None
     add_references_to_prompt: bool = False
+    # Answers repeated questions without retrieval or generation, e.g. a SemanticAnswerCache (opt-in)
+    answer_cache: Optional[Any] = None
 
     # Assistant Storage
     storage: Optional[AssistantStorage] = None
@@ -441,7 +444,12 @@ class Assistant(BaseModel):
         return self.run_id
 
     def check_connection(self) -> None:
-        """Check connections to necessary local services."""
+        """Check connections to necessary local services, at most once per health cache ttl instead of every run."""
+        key = f"assistant:{getattr(self.llm, 'base_url', None)}:{getattr(self.storage, 'db_url', None)}"
+        if not health_cache.check(key, self._check_connection):
+            raise ConnectionError(health_cache.last_error(key))
+
+    def _check_connection(self) -> None:
         import socket
         connection_errors = []
 
@@ -534,6 +542,20 @@ class Assistant(BaseModel):
             yield search_results
             yield f"\n\nIs there anything specific you'd like to know about these documents, {self.user_nickname}? Simples!"
             return
+
+        cache_lookup = None
+        if self.answer_cache is not None and isinstance(message, str) and not messages:
+            try:
+                cache_lookup = self.answer_cache.lookup(message, self)
+            except Exception as e:
+                logger.warning(f"Answer cache lookup failed: {e}")
+            if cache_lookup is not None and cache_lookup.answer is not None:
+                self.memory.add_chat_message(message=Message(role="user", content=message))
+                self.memory.add_chat_message(message=Message(role="assistant", content=cache_lookup.answer))
+                self.output = cache_lookup.answer
+                self.write_to_storage()
+                yield cache_lookup.answer
+                return
         
         self.update_llm()
 
@@ -665,6 +687,9 @@ class Assistant(BaseModel):
 
         self.write_to_storage()
 
+        if cache_lookup is not None:
+            self.answer_cache.store(cache_lookup, llm_response)
+
         if self.save_output_to_file is not None:
             try:
                 fn = self.save_output_to_file.format(name=self.name, run_id=self.run_id, user_id=self.user_id)
@@ -1278,11 +1303,11 @@ class Assistant(BaseModel):
         if not self.monitoring:
             return
 
-        from src.backend.kr8.api.assistant import create_assistant_run, AssistantRunCreate
+        from src.backend.kr8.api.assistant import queue_assistant_run, AssistantRunCreate
 
         try:
             database_row: AssistantRun = self.db_row or self.to_database_row()
-            create_assistant_run(
+            queue_assistant_run(
                 run=AssistantRunCreate(
                     run_id=database_row.run_id,
                     assistant_data=database_row.assistant_dict(),
@@ -1295,11 +1320,11 @@ class Assistant(BaseModel):
         if not self.monitoring:
             return
 
-        from src.backend.kr8.api.assistant import create_assistant_event, AssistantEventCreate
+        from src.backend.kr8.api.assistant import queue_assistant_event, AssistantEventCreate
 
         try:
             database_row: AssistantRun = self.db_row or self.to_database_row()
-            create_assistant_event(
+            queue_assistant_event(
                 event=AssistantEventCreate(
                     run_id=database_row.run_id,
                     assistant_data=database_row.assistant_dict(),
@@ -61,10 +61,7 @@ class CodeAssistant(Assistant):
 
 
     def get_dependency_graph(self, project_name: str, project_type: str) -> Dict:
-        doc = self.code_tools.knowledge_base.search(query=f"project:{project_name} type:{project_type}_dependency_graph", num_documents=1)
-        if doc:
-            return json.loads(doc[0].content)
-        return {}
+        return self.code_tools.get_dependency_graph(project_name, project_type) or {}
 
     def find_component(self, project_name: str, component_name: str, project_type: str) -> str:
         result = self.code_tools.find_component(project_name, component_name, project_type)
@@ -1,4 +1,5 @@
-from typing import Optional, Any
+import threading
+from typing import Dict, Optional, Any
 
 from src.backend.kr8.utils.log import logger
 
@@ -12,9 +13,16 @@ class AwsApiClient:
         super().__init__()
         self.aws_region: Optional[str] = aws_region
         self.aws_profile: Optional[str] = aws_profile
+        # StateSnapshot used to answer is_active/read, set by AwsResources
+        self.snapshot: Optional[Any] = None
+        # AwsWaitCoordinator used to batch waiters, set by AwsResources
+        self.wait_coordinator: Optional[Any] = None
 
         # aws boto3 session
         self._boto3_session: Optional[Any] = None
+        # boto3 clients by service name; clients are thread-safe once created, the session that creates them is not
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.RLock()
         logger.debug("**-+-** AwsApiClient created")
 
     def create_boto3_session(self) -> Optional[Any]:
@@ -38,6 +46,23 @@ class AwsApiClient:
 
     @property
     def boto3_session(self) -> Optional[Any]:
-        if self._boto3_session is None:
-            self._boto3_session = self.create_boto3_session()
-        return self._boto3_session
+        with self._lock:
+            if self._boto3_session is None:
+                self._boto3_session = self.create_boto3_session()
+            return self._boto3_session
+
+    def client(self, service_name: str) -> Any:
+        """The boto3 client for service_name, shared by every resource using this AwsApiClient.
+
+        Resources are applied from worker threads, so clients are created under a lock: a boto3.Session is
+        not thread-safe and creating clients from it concurrently fails in botocore.
+        """
+        with self._lock:
+            if service_name not in self._clients:
+                self._clients[service_name] = self.boto3_session.client(service_name=service_name)
+            return self._clients[service_name]
+
+    def resource(self, service_name: str) -> Any:
+        """A new boto3 resource for service_name, created under the same lock as the clients"""
+        with self._lock:
+            return self.boto3_session.resource(service_name=service_name)
@@ -57,19 +57,13 @@ class AwsResource(ResourceBase):
         return self.aws_profile
 
     def get_service_client(self, aws_client: AwsApiClient):
-        from boto3 import session
-
         if self.service_client is None:
-            boto3_session: session = aws_client.boto3_session
-            self.service_client = boto3_session.client(service_name=self.service_name)
+            self.service_client = aws_client.client(self.service_name)
         return self.service_client
 
     def get_service_resource(self, aws_client: AwsApiClient):
-        from boto3 import session
-
         if self.service_resource is None:
-            boto3_session: session = aws_client.boto3_session
-            self.service_resource = boto3_session.resource(service_name=self.service_name)
+            self.service_resource = aws_client.resource(self.service_name)
         return self.service_resource
 
     def get_aws_client(self) -> AwsApiClient:
@@ -97,8 +91,27 @@ class AwsResource(ResourceBase):
         client: AwsApiClient = aws_client or self.get_aws_client()
         return self._read(client)
 
+    def wait_with_coordinator(
+        self, aws_client: AwsApiClient, kind: str, identifier: str, ready: Any, scope: Optional[str] = None
+    ) -> Optional[bool]:
+        """Waits through the AwsWaitCoordinator on the client.
+        Returns None if the client has no coordinator, in which case the resource uses its own boto3 waiter.
+        """
+        coordinator = getattr(aws_client, "wait_coordinator", None)
+        if coordinator is None:
+            return None
+        return coordinator.wait(self, kind=kind, identifier=identifier, ready=ready, scope=scope)
+
+    def get_snapshot_scope(self) -> Optional[str]:
+        return self.get_aws_region()
+
     def is_active(self, aws_client: AwsApiClient) -> bool:
         """Returns True if the resource is active on Aws"""
+        found, active_resource = self.read_from_snapshot(aws_client)
+        if found:
+            if active_resource is not None:
+                self.active_resource = active_resource
+            return active_resource is not None
         _resource = self.read(aws_client=aws_client)
         return True if _resource is not None else False
 
@@ -122,6 +135,7 @@ class AwsResource(ResourceBase):
         # Step 3: Create the resource
         else:
             self.resource_created = self._create(client)
+            self.invalidate_snapshot(client)
             if self.resource_created:
                 print_info(f"{self.get_resource_type()}: {self.get_resource_name()} created")
 
@@ -153,6 +167,7 @@ class AwsResource(ResourceBase):
         client: AwsApiClient = aws_client or self.get_aws_client()
         if self.is_active(client):
             self.resource_updated = self._update(client)
+            self.invalidate_snapshot(client)
         else:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} does not exist")
             return True
@@ -186,6 +201,7 @@ class AwsResource(ResourceBase):
         client: AwsApiClient = aws_client or self.get_aws_client()
         if self.is_active(client):
             self.resource_deleted = self._delete(client)
+            self.invalidate_snapshot(client)
         else:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} does not exist")
             return True
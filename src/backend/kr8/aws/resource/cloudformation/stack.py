@@ -57,15 +57,22 @@ class CloudFormationStack(AwsResource):
         # Wait for Stack to be created
         if self.wait_for_create:
             try:
+                from src.backend.kr8.aws.waiter import stack_create_complete
+
                 print_info(f"Waiting for {self.get_resource_type()} to be created.")
-                waiter = self.get_service_client(aws_client).get_waiter("stack_create_complete")
-                waiter.wait(
-                    StackName=self.name,
-                    WaiterConfig={
-                        "Delay": self.waiter_delay,
-                        "MaxAttempts": self.waiter_max_attempts,
-                    },
-                )
+                ready = self.wait_with_coordinator(aws_client, "cloudformation_stack", self.name, stack_create_complete)
+                if ready is None:
+                    waiter = self.get_service_client(aws_client).get_waiter("stack_create_complete")
+                    waiter.wait(
+                        StackName=self.name,
+                        WaiterConfig={
+                            "Delay": self.waiter_delay,
+                            "MaxAttempts": self.waiter_max_attempts,
+                        },
+                    )
+                elif not ready:
+                    logger.error("Waiter failed.")
+                    return False
             except Exception as e:
                 logger.error("Waiter failed.")
                 logger.error(e)
@@ -128,15 +135,23 @@ class CloudFormationStack(AwsResource):
         # Wait for Stack to be deleted
         if self.wait_for_delete:
             try:
+                from src.backend.kr8.aws.waiter import stack_delete_complete
+
                 print_info(f"Waiting for {self.get_resource_type()} to be deleted.")
-                waiter = self.get_service_client(aws_client).get_waiter("stack_delete_complete")
-                waiter.wait(
-                    StackName=self.name,
-                    WaiterConfig={
-                        "Delay": self.waiter_delay,
-                        "MaxAttempts": self.waiter_max_attempts,
-                    },
+                deleted = self.wait_with_coordinator(
+                    aws_client, "cloudformation_stack", self.name, stack_delete_complete
                 )
+                if deleted is None:
+                    waiter = self.get_service_client(aws_client).get_waiter("stack_delete_complete")
+                    waiter.wait(
+                        StackName=self.name,
+                        WaiterConfig={
+                            "Delay": self.waiter_delay,
+                            "MaxAttempts": self.waiter_max_attempts,
+                        },
+                    )
+                elif not deleted:
+                    logger.error("Waiter failed.")
                 return True
             except Exception as e:
                 logger.error("Waiter failed.")
@@ -195,20 +195,27 @@ class SecurityGroup(AwsResource):
         # Wait for SecurityGroup to be created
         if self.wait_for_create:
             try:
+                from src.backend.kr8.aws.waiter import security_group_exists
+
                 print_info(f"Waiting for {self.get_resource_type()} to be created.")
-                waiter = self.get_service_client(aws_client).get_waiter("security_group_exists")
-                waiter.wait(
-                    Filters=[
-                        {
-                            "Name": "group-name",
-                            "Values": [self.name],
+                ready = self.wait_with_coordinator(aws_client, "security_group", self.name, security_group_exists)
+                if ready is None:
+                    waiter = self.get_service_client(aws_client).get_waiter("security_group_exists")
+                    waiter.wait(
+                        Filters=[
+                            {
+                                "Name": "group-name",
+                                "Values": [self.name],
+                            },
+                        ],
+                        WaiterConfig={
+                            "Delay": self.waiter_delay,
+                            "MaxAttempts": self.waiter_max_attempts,
                         },
-                    ],
-                    WaiterConfig={
-                        "Delay": self.waiter_delay,
-                        "MaxAttempts": self.waiter_max_attempts,
-                    },
-                )
+                    )
+                elif not ready:
+                    logger.error("Waiter failed.")
+                    return False
             except Exception as e:
                 logger.error("Waiter failed.")
                 logger.error(e)
@@ -164,15 +164,21 @@ class EbsVolume(AwsResource):
         if self.wait_for_create:
             try:
                 if self.volume_id is not None:
+                    from src.backend.kr8.aws.waiter import volume_available
+
                     print_info(f"Waiting for {self.get_resource_type()} to be created.")
-                    waiter = self.get_service_client(aws_client).get_waiter("volume_available")
-                    waiter.wait(
-                        VolumeIds=[self.volume_id],
-                        WaiterConfig={
-                            "Delay": self.waiter_delay,
-                            "MaxAttempts": self.waiter_max_attempts,
-                        },
-                    )
+                    ready = self.wait_with_coordinator(aws_client, "ebs_volume", self.volume_id, volume_available)
+                    if ready is None:
+                        waiter = self.get_service_client(aws_client).get_waiter("volume_available")
+                        waiter.wait(
+                            VolumeIds=[self.volume_id],
+                            WaiterConfig={
+                                "Delay": self.waiter_delay,
+                                "MaxAttempts": self.waiter_max_attempts,
+                            },
+                        )
+                    elif not ready:
+                        logger.error("Waiter failed.")
                 else:
                     logger.warning("Skipping waiter, no volume_id found")
             except Exception as e:
@@ -228,16 +228,24 @@ class EcsService(AwsResource):
             try:
                 cluster_name = self.get_ecs_cluster_name()
                 if cluster_name is not None:
+                    from src.backend.kr8.aws.waiter import ecs_service_stable
+
                     print_info(f"Waiting for {self.get_resource_type()} to be available.")
-                    waiter = self.get_service_client(aws_client).get_waiter("services_stable")
-                    waiter.wait(
-                        cluster=cluster_name,
-                        services=[self.get_ecs_service_name()],
-                        WaiterConfig={
-                            "Delay": self.waiter_delay,
-                            "MaxAttempts": self.waiter_max_attempts,
-                        },
+                    ready = self.wait_with_coordinator(
+                        aws_client, "ecs_service", self.get_ecs_service_name(), ecs_service_stable, scope=cluster_name
                     )
+                    if ready is None:
+                        waiter = self.get_service_client(aws_client).get_waiter("services_stable")
+                        waiter.wait(
+                            cluster=cluster_name,
+                            services=[self.get_ecs_service_name()],
+                            WaiterConfig={
+                                "Delay": self.waiter_delay,
+                                "MaxAttempts": self.waiter_max_attempts,
+                            },
+                        )
+                    elif not ready:
+                        logger.error("Waiter failed.")
                 else:
                     logger.warning("Skipping waiter, no Service found")
             except Exception as e:
@@ -314,16 +322,24 @@ class EcsService(AwsResource):
             try:
                 cluster_name = self.get_ecs_cluster_name()
                 if cluster_name is not None:
+                    from src.backend.kr8.aws.waiter import ecs_service_inactive
+
                     print_info(f"Waiting for {self.get_resource_type()} to be deleted.")
-                    waiter = self.get_service_client(aws_client).get_waiter("services_inactive")
-                    waiter.wait(
-                        cluster=cluster_name,
-                        services=[self.get_ecs_service_name()],
-                        WaiterConfig={
-                            "Delay": self.waiter_delay,
-                            "MaxAttempts": self.waiter_max_attempts,
-                        },
+                    deleted = self.wait_with_coordinator(
+                        aws_client, "ecs_service", self.get_ecs_service_name(), ecs_service_inactive, scope=cluster_name
                     )
+                    if deleted is None:
+                        waiter = self.get_service_client(aws_client).get_waiter("services_inactive")
+                        waiter.wait(
+                            cluster=cluster_name,
+                            services=[self.get_ecs_service_name()],
+                            WaiterConfig={
+                                "Delay": self.waiter_delay,
+                                "MaxAttempts": self.waiter_max_attempts,
+                            },
+                        )
+                    elif not deleted:
+                        logger.error("Waiter failed.")
                 else:
                     logger.warning("Skipping waiter, no Service found")
             except Exception as e:
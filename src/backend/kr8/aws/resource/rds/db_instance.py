@@ -445,6 +445,18 @@ class DbInstance(AwsResource):
                 logger.error(e)
         return True
 
+    def get_snapshot_key(self) -> str:
+        return self.get_db_instance_identifier()
+
+    def list_for_snapshot(self, aws_client: AwsApiClient) -> Optional[Dict[str, Any]]:
+        """Lists all DbInstances in the region"""
+        service_client = self.get_service_client(aws_client)
+        db_instances: Dict[str, Any] = {}
+        for page in service_client.get_paginator("describe_db_instances").paginate():
+            for _resource in page.get("DBInstances", []):
+                db_instances[_resource["DBInstanceIdentifier"]] = _resource
+        return db_instances
+
     def _read(self, aws_client: AwsApiClient) -> Optional[Any]:
         """Returns the DbInstance
 
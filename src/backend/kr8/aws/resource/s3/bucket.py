@@ -123,6 +123,18 @@ class S3Bucket(AwsResource):
                 logger.error(e)
         return True
 
+    def get_snapshot_scope(self) -> Optional[str]:
+        # Bucket names are global to the account
+        return None
+
+    def list_for_snapshot(self, aws_client: AwsApiClient) -> Optional[Dict[str, Any]]:
+        """Lists all buckets in the account with a single ListBuckets call"""
+        service_client = self.get_service_client(aws_client)
+        buckets = service_client.list_buckets().get("Buckets", [])
+        return {
+            bucket["Name"]: {"name": bucket["Name"], "creation_date": bucket.get("CreationDate")} for bucket in buckets
+        }
+
     def _read(self, aws_client: AwsApiClient) -> Optional[Any]:
         """Returns the s3.Bucket
 
@@ -6,7 +6,10 @@ from src.backend.kr8.aws.app.base import AwsApp
 from src.backend.kr8.aws.app.context import AwsBuildContext
 from src.backend.kr8.aws.api_client import AwsApiClient
 from src.backend.kr8.aws.resource.base import AwsResource
+from src.backend.kr8.aws.waiter import AwsWaitCoordinator
+from src.backend.kr8.infra.apply import ApplyGraph
 from src.backend.kr8.infra.resources import InfraResources
+from src.backend.kr8.infra.snapshot import plan_resources, print_plan
 from src.backend.kr8.utils.log import logger
 
 
@@ -162,37 +165,16 @@ class AwsResources(InfraResources):
                         ):
                             resources_to_create.append(app_resource)
 
-        # Sort the AwsResources in install order
-        resources_to_create.sort(key=lambda x: AwsResourceInstallOrder.get(x.__class__.__name__, 5000))
-
-        # Deduplicate AwsResources
-        deduped_resources_to_create: List[AwsResource] = []
-        for r in resources_to_create:
-            if r not in deduped_resources_to_create:
-                deduped_resources_to_create.append(r)
-
-        # Implement dependency sorting
-        final_aws_resources: List[AwsResource] = []
+        # Build the dependency graph; dependencies are created before the resources that use them
         logger.debug("-*- Building AwsResources dependency graph")
-        for aws_resource in deduped_resources_to_create:
-            # Logic to follow if resource has dependencies
-            if aws_resource.depends_on is not None and len(aws_resource.depends_on) > 0:
-                # Add the dependencies before the resource itself
-                for dep in aws_resource.depends_on:
-                    if isinstance(dep, AwsResource):
-                        if dep not in final_aws_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {aws_resource.name}")
-                            final_aws_resources.append(dep)
-
-                # Add the resource to be created after its dependencies
-                if aws_resource not in final_aws_resources:
-                    logger.debug(f"-*- Adding {aws_resource.name}")
-                    final_aws_resources.append(aws_resource)
-            else:
-                # Add the resource to be created if it has no dependencies
-                if aws_resource not in final_aws_resources:
-                    logger.debug(f"-*- Adding {aws_resource.name}")
-                    final_aws_resources.append(aws_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: AwsResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=AwsResource,
+        )
+        for aws_resource in resources_to_create:
+            apply_graph.add(aws_resource)
+
+        final_aws_resources: List[AwsResource] = apply_graph.order()
 
         # Track the total number of AwsResources to create for validation
         num_resources_to_create: int = len(final_aws_resources)
@@ -200,10 +182,11 @@ class AwsResources(InfraResources):
         if num_resources_to_create == 0:
             return 0, 0
 
+        self.attach_snapshot(self.aws_client, final_aws_resources)
+
         if dry_run:
             print_heading("--**- AWS resources to create:")
-            for resource in final_aws_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_aws_resources, self.aws_client, "create"))
             print_info("")
             if self.get_aws_region():
                 print_info(f"Region: {self.get_aws_region()}")
@@ -230,22 +213,20 @@ class AwsResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_aws_resources:
+        # Resources waiting on the apply pool share batched describe calls
+        self.aws_client.wait_coordinator = AwsWaitCoordinator(self.aws_client)
+
+        def _create(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
-            # logger.debug(resource)
-            try:
-                _resource_created = resource.create(aws_client=self.aws_client)
-                if _resource_created:
-                    num_resources_created += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_create_failure:
-                        return num_resources_created, num_resources_to_create
-            except Exception as e:
-                logger.error(f"Failed to create {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.error(e)
-                logger.error("Please fix and try again...")
+            return resource.create(aws_client=self.aws_client)
+
+        num_resources_created = apply_graph.apply(
+            _create,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_create_failure,
+        )
 
         print_heading(f"\n--**-- Resources created: {num_resources_created}/{num_resources_to_create}")
         if num_resources_to_create != num_resources_created:
@@ -334,46 +315,17 @@ class AwsResources(InfraResources):
                         ):
                             resources_to_delete.append(app_resource)
 
-        # Sort the AwsResources in install order
-        resources_to_delete.sort(key=lambda x: AwsResourceInstallOrder.get(x.__class__.__name__, 5000), reverse=True)
-
-        # Deduplicate AwsResources
-        deduped_resources_to_delete: List[AwsResource] = []
-        for r in resources_to_delete:
-            if r not in deduped_resources_to_delete:
-                deduped_resources_to_delete.append(r)
-
-        # Implement dependency sorting
-        final_aws_resources: List[AwsResource] = []
+        # Build the dependency graph; resources are deleted before their dependencies
         logger.debug("-*- Building AwsResources dependency graph")
-        for aws_resource in deduped_resources_to_delete:
-            # Logic to follow if resource has dependencies
-            if aws_resource.depends_on is not None and len(aws_resource.depends_on) > 0:
-                # 1. Reverse the order of dependencies
-                aws_resource.depends_on.reverse()
-
-                # 2. Remove the dependencies if they are already added to the final_aws_resources
-                for dep in aws_resource.depends_on:
-                    if dep in final_aws_resources:
-                        logger.debug(f"-*- Removing {dep.name}, dependency of {aws_resource.name}")
-                        final_aws_resources.remove(dep)
-
-                # 3. Add the resource to be deleted before its dependencies
-                if aws_resource not in final_aws_resources:
-                    logger.debug(f"-*- Adding {aws_resource.name}")
-                    final_aws_resources.append(aws_resource)
-
-                # 4. Add the dependencies back in reverse order
-                for dep in aws_resource.depends_on:
-                    if isinstance(dep, AwsResource):
-                        if dep not in final_aws_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {aws_resource.name}")
-                            final_aws_resources.append(dep)
-            else:
-                # Add the resource to be deleted if it has no dependencies
-                if aws_resource not in final_aws_resources:
-                    logger.debug(f"-*- Adding {aws_resource.name}")
-                    final_aws_resources.append(aws_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: AwsResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=AwsResource,
+            reverse=True,
+        )
+        for aws_resource in resources_to_delete:
+            apply_graph.add(aws_resource)
+
+        final_aws_resources: List[AwsResource] = apply_graph.order()
 
         # Track the total number of AwsResources to delete for validation
         num_resources_to_delete: int = len(final_aws_resources)
@@ -381,10 +333,11 @@ class AwsResources(InfraResources):
         if num_resources_to_delete == 0:
             return 0, 0
 
+        self.attach_snapshot(self.aws_client, final_aws_resources)
+
         if dry_run:
             print_heading("--**- AWS resources to delete:")
-            for resource in final_aws_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_aws_resources, self.aws_client, "delete"))
             print_info("")
             if self.get_aws_region():
                 print_info(f"Region: {self.get_aws_region()}")
@@ -411,22 +364,20 @@ class AwsResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_aws_resources:
+        # Resources waiting on the apply pool share batched describe calls
+        self.aws_client.wait_coordinator = AwsWaitCoordinator(self.aws_client)
+
+        def _delete(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
-            # logger.debug(resource)
-            try:
-                _resource_deleted = resource.delete(aws_client=self.aws_client)
-                if _resource_deleted:
-                    num_resources_deleted += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_delete_failure:
-                        return num_resources_deleted, num_resources_to_delete
-            except Exception as e:
-                logger.error(f"Failed to delete {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.error(e)
-                logger.error("Please fix and try again...")
+            return resource.delete(aws_client=self.aws_client)
+
+        num_resources_deleted = apply_graph.apply(
+            _delete,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_delete_failure,
+        )
 
         print_heading(f"\n--**-- Resources deleted: {num_resources_deleted}/{num_resources_to_delete}")
         if num_resources_to_delete != num_resources_deleted:
@@ -516,37 +467,16 @@ class AwsResources(InfraResources):
                         ):
                             resources_to_update.append(app_resource)
 
-        # Sort the AwsResources in install order
-        resources_to_update.sort(key=lambda x: AwsResourceInstallOrder.get(x.__class__.__name__, 5000))
-
-        # Deduplicate AwsResources
-        deduped_resources_to_update: List[AwsResource] = []
-        for r in resources_to_update:
-            if r not in deduped_resources_to_update:
-                deduped_resources_to_update.append(r)
-
-        # Implement dependency sorting
-        final_aws_resources: List[AwsResource] = []
+        # Build the dependency graph; dependencies are updated before the resources that use them
         logger.debug("-*- Building AwsResources dependency graph")
-        for aws_resource in deduped_resources_to_update:
-            # Logic to follow if resource has dependencies
-            if aws_resource.depends_on is not None and len(aws_resource.depends_on) > 0:
-                # Add the dependencies before the resource itself
-                for dep in aws_resource.depends_on:
-                    if isinstance(dep, AwsResource):
-                        if dep not in final_aws_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {aws_resource.name}")
-                            final_aws_resources.append(dep)
-
-                # Add the resource to be created after its dependencies
-                if aws_resource not in final_aws_resources:
-                    logger.debug(f"-*- Adding {aws_resource.name}")
-                    final_aws_resources.append(aws_resource)
-            else:
-                # Add the resource to be created if it has no dependencies
-                if aws_resource not in final_aws_resources:
-                    logger.debug(f"-*- Adding {aws_resource.name}")
-                    final_aws_resources.append(aws_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: AwsResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=AwsResource,
+        )
+        for aws_resource in resources_to_update:
+            apply_graph.add(aws_resource)
+
+        final_aws_resources: List[AwsResource] = apply_graph.order()
 
         # Track the total number of AwsResources to update for validation
         num_resources_to_update: int = len(final_aws_resources)
@@ -554,10 +484,11 @@ class AwsResources(InfraResources):
         if num_resources_to_update == 0:
             return 0, 0
 
+        self.attach_snapshot(self.aws_client, final_aws_resources)
+
         if dry_run:
             print_heading("--**- AWS resources to update:")
-            for resource in final_aws_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_aws_resources, self.aws_client, "update"))
             print_info("")
             if self.get_aws_region():
                 print_info(f"Region: {self.get_aws_region()}")
@@ -584,22 +515,20 @@ class AwsResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_aws_resources:
+        # Resources waiting on the apply pool share batched describe calls
+        self.aws_client.wait_coordinator = AwsWaitCoordinator(self.aws_client)
+
+        def _update(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
-            # logger.debug(resource)
-            try:
-                _resource_updated = resource.update(aws_client=self.aws_client)
-                if _resource_updated:
-                    num_resources_updated += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_patch_failure:
-                        return num_resources_updated, num_resources_to_update
-            except Exception as e:
-                logger.error(f"Failed to update {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.error(e)
-                logger.error("Please fix and try again...")
+            return resource.update(aws_client=self.aws_client)
+
+        num_resources_updated = apply_graph.apply(
+            _update,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_patch_failure,
+        )
 
         print_heading(f"\n--**-- Resources updated: {num_resources_updated}/{num_resources_to_update}")
         if num_resources_to_update != num_resources_updated:
@@ -0,0 +1,282 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.backend.kr8.cli.console import print_info
+from src.backend.kr8.utils.log import logger
+
+# Returns True when the resource is ready, False when it failed and None while it is still pending.
+# The argument is the description returned by the batched describe call, or None if it was not found.
+ReadyCondition = Callable[[Optional[Dict[str, Any]]], Optional[bool]]
+# Describes many resources of one kind in as few calls as possible: (client, scope, identifiers) -> descriptions
+Describer = Callable[[Any, Optional[str], List[str]], Dict[str, Dict[str, Any]]]
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def describe_ecs_services(client: Any, cluster: Optional[str], names: List[str]) -> Dict[str, Dict[str, Any]]:
+    descriptions: Dict[str, Dict[str, Any]] = {}
+    # describe_services accepts at most 10 services per call
+    for chunk in _chunks(names, 10):
+        args: Dict[str, Any] = {"services": chunk}
+        if cluster is not None:
+            args["cluster"] = cluster
+        for service in client.describe_services(**args).get("services", []):
+            descriptions[service.get("serviceName")] = service
+    return descriptions
+
+
+def describe_cloudformation_stacks(client: Any, scope: Optional[str], names: List[str]) -> Dict[str, Dict[str, Any]]:
+    from botocore.exceptions import ClientError
+
+    descriptions: Dict[str, Dict[str, Any]] = {}
+    if len(names) == 1:
+        try:
+            for stack in client.describe_stacks(StackName=names[0]).get("Stacks", []):
+                descriptions[stack.get("StackName")] = stack
+        except ClientError as e:
+            # Raised once the stack does not exist
+            logger.debug(e)
+        return descriptions
+
+    # One paginated listing covers every stack in the region
+    wanted = set(names)
+    for page in client.get_paginator("describe_stacks").paginate():
+        for stack in page.get("Stacks", []):
+            if stack.get("StackName") in wanted:
+                descriptions[stack.get("StackName")] = stack
+    return descriptions
+
+
+def describe_ebs_volumes(client: Any, scope: Optional[str], volume_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    descriptions: Dict[str, Dict[str, Any]] = {}
+    # Filtering on volume-id, unlike VolumeIds, does not fail when one of the volumes is missing
+    for chunk in _chunks(volume_ids, 200):
+        response = client.describe_volumes(Filters=[{"Name": "volume-id", "Values": chunk}])
+        for volume in response.get("Volumes", []):
+            descriptions[volume.get("VolumeId")] = volume
+    return descriptions
+
+
+def describe_security_groups(client: Any, scope: Optional[str], names: List[str]) -> Dict[str, Dict[str, Any]]:
+    descriptions: Dict[str, Dict[str, Any]] = {}
+    for chunk in _chunks(names, 200):
+        response = client.describe_security_groups(Filters=[{"Name": "group-name", "Values": chunk}])
+        for group in response.get("SecurityGroups", []):
+            descriptions[group.get("GroupName")] = group
+    return descriptions
+
+
+# kind -> (boto3 service name, describer)
+DESCRIBERS: Dict[str, Tuple[str, Describer]] = {
+    "ecs_service": ("ecs", describe_ecs_services),
+    "cloudformation_stack": ("cloudformation", describe_cloudformation_stacks),
+    "ebs_volume": ("ec2", describe_ebs_volumes),
+    "security_group": ("ec2", describe_security_groups),
+}
+
+
+def ecs_service_stable(service: Optional[Dict[str, Any]]) -> Optional[bool]:
+    """Same check as the services_stable waiter"""
+    if service is None:
+        return None
+    if service.get("status") in ("DRAINING", "INACTIVE"):
+        return False
+    if len(service.get("deployments", [])) == 1 and service.get("runningCount") == service.get("desiredCount"):
+        return True
+    return None
+
+
+def ecs_service_inactive(service: Optional[Dict[str, Any]]) -> Optional[bool]:
+    if service is None or service.get("status") == "INACTIVE":
+        return True
+    return None
+
+
+def stack_create_complete(stack: Optional[Dict[str, Any]]) -> Optional[bool]:
+    status = (stack or {}).get("StackStatus", "")
+    if status == "CREATE_COMPLETE":
+        return True
+    if status.endswith("FAILED") or status.startswith(("ROLLBACK", "DELETE")):
+        return False
+    return None
+
+
+def stack_delete_complete(stack: Optional[Dict[str, Any]]) -> Optional[bool]:
+    status = (stack or {}).get("StackStatus", "DELETE_COMPLETE")
+    if status == "DELETE_COMPLETE":
+        return True
+    if status == "DELETE_FAILED":
+        return False
+    return None
+
+
+def volume_available(volume: Optional[Dict[str, Any]]) -> Optional[bool]:
+    state = (volume or {}).get("State")
+    if state == "available":
+        return True
+    if state == "error":
+        return False
+    return None
+
+
+def security_group_exists(group: Optional[Dict[str, Any]]) -> Optional[bool]:
+    return True if group is not None else None
+
+
+class WaitRequest:
+    def __init__(
+        self,
+        resource: Any,
+        kind: str,
+        identifier: str,
+        scope: Optional[str],
+        ready: ReadyCondition,
+        timeout: float,
+    ):
+        self.resource = resource
+        self.kind = kind
+        self.identifier = identifier
+        self.scope = scope
+        self.ready = ready
+        self.started_at: float = time.monotonic()
+        self.deadline: float = self.started_at + timeout
+        self.done = threading.Event()
+        self.result: bool = False
+
+    def finish(self, result: bool) -> None:
+        self.result = result
+        self.done.set()
+
+
+class AwsWaitCoordinator:
+    """Waits for many AWS resources at once on a single polling schedule.
+
+    Resources register what they are waiting for and block until it is resolved. One background thread
+    groups the pending requests by kind and scope, describes each group with batched calls, and backs off
+    between rounds, so concurrent waits cost one describe call per group instead of one per resource and
+    finish as soon as the slowest resource is ready.
+    """
+
+    def __init__(
+        self,
+        aws_client: Any,
+        min_delay: float = 2,
+        max_delay: float = 30,
+        backoff: float = 1.5,
+    ):
+        self.aws_client = aws_client
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.pending: List[WaitRequest] = []
+        self.num_registered: int = 0
+        self.clients: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.poller: Optional[threading.Thread] = None
+
+    def wait(
+        self,
+        resource: Any,
+        kind: str,
+        identifier: str,
+        ready: ReadyCondition,
+        scope: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Blocks until ready(description) is True. Returns False if it failed or timed out."""
+        if kind not in DESCRIBERS:
+            raise ValueError(f"No describer for {kind}")
+        if timeout is None:
+            timeout = resource.waiter_delay * resource.waiter_max_attempts
+        request = WaitRequest(resource, kind, identifier, scope, ready, timeout)
+        with self.lock:
+            self.pending.append(request)
+            self.num_registered += 1
+            if self.poller is None:
+                self.poller = threading.Thread(target=self._poll, name="aws-wait-coordinator", daemon=True)
+                self.poller.start()
+        self.wakeup.set()
+        request.done.wait()
+        return request.result
+
+    def _get_client(self, service_name: str) -> Any:
+        if service_name not in self.clients:
+            self.clients[service_name] = self.aws_client.client(service_name)
+        return self.clients[service_name]
+
+    def _poll_group(self, kind: str, scope: Optional[str], requests: List[WaitRequest]) -> None:
+        service_name, describer = DESCRIBERS[kind]
+        identifiers = list(dict.fromkeys(request.identifier for request in requests))
+        try:
+            descriptions = describer(self._get_client(service_name), scope, identifiers)
+        except Exception as e:
+            # Treat errors as "still pending", the next round retries
+            logger.debug(f"Could not describe {kind}: {e}")
+            return
+        for request in requests:
+            try:
+                state = request.ready(descriptions.get(request.identifier))
+            except Exception as e:
+                logger.debug(f"Could not check {kind} {request.identifier}: {e}")
+                state = None
+            if state is not None:
+                self._finish(request, state)
+
+    def _finish(self, request: WaitRequest, result: bool) -> None:
+        with self.lock:
+            if request in self.pending:
+                self.pending.remove(request)
+        elapsed = time.monotonic() - request.started_at
+        resource_label = f"{request.resource.get_resource_type()}: {request.resource.get_resource_name()}"
+        if result:
+            print_info(f"{resource_label} ready after {elapsed:.0f}s")
+        else:
+            logger.error(f"{resource_label} failed while waiting after {elapsed:.0f}s")
+        request.finish(result)
+
+    def _report(self) -> None:
+        with self.lock:
+            pending = list(self.pending)
+            num_registered = self.num_registered
+        if not pending:
+            return
+        counts: Dict[str, int] = {}
+        for request in pending:
+            resource_type = request.resource.get_resource_type()
+            counts[resource_type] = counts.get(resource_type, 0) + 1
+        waiting_on = ", ".join(f"{count} {resource_type}" for resource_type, count in counts.items())
+        print_info(f"Waiting for {len(pending)}/{num_registered} resources: {waiting_on}")
+
+    def _poll(self) -> None:
+        delay = self.min_delay
+        while True:
+            woken = self.wakeup.wait(timeout=delay)
+            self.wakeup.clear()
+            if woken:
+                # A new request restarts the schedule; wait briefly so requests registered together share a call
+                delay = self.min_delay
+                time.sleep(self.min_delay)
+            else:
+                delay = min(delay * self.backoff, self.max_delay)
+
+            with self.lock:
+                pending = list(self.pending)
+                if not pending:
+                    self.poller = None
+                    return
+
+            now = time.monotonic()
+            groups: Dict[Tuple[str, Optional[str]], List[WaitRequest]] = {}
+            for request in pending:
+                if now > request.deadline:
+                    logger.error(f"Timed out waiting for {request.kind}: {request.identifier}")
+                    self._finish(request, False)
+                    continue
+                groups.setdefault((request.kind, request.scope), []).append(request)
+            for (kind, scope), requests in groups.items():
+                self._poll_group(kind, scope, requests)
+            self._report()
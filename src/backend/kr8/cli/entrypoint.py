@@ -3,15 +3,52 @@
 This is the entrypoint for the `phi` cli application.
 """
 
-from typing import Optional
+from importlib import import_module
+from typing import Dict, List, Optional, Tuple
 
+import click
 import typer
+from typer.core import TyperGroup
 
-from src.backend.kr8.cli.ws.ws_cli import ws_cli
-from src.backend.kr8.cli.k.k_cli import k_cli
 from src.backend.kr8.utils.log import set_log_level_to_debug, logger
 
+
+class LazyTyperGroup(TyperGroup):
+    """Registers subcommand groups by import path so their modules load only when the subcommand runs.
+
+    `phi --help` lists them from the short help stored here; `phi ws ...` imports the ws cli on dispatch.
+    """
+
+    # name -> (import path of the Typer app, short help)
+    lazy_subcommands: Dict[str, Tuple[str, str]] = {
+        "ws": ("src.backend.kr8.cli.ws.ws_cli:ws_cli", "Manage workspaces"),
+        "k": ("src.backend.kr8.cli.k.k_cli:k_cli", "Manage kubernetes resources"),
+    }
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return super().list_commands(ctx) + [name for name in self.lazy_subcommands if name not in self.commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            # Placeholder used to render the command list, the real group is loaded in resolve_command
+            return click.Command(cmd_name, short_help=self.lazy_subcommands[cmd_name][1])
+        return super().get_command(ctx, cmd_name)
+
+    def resolve_command(self, ctx: click.Context, args: List[str]):
+        cmd_name = args[0] if args else None
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self.load_subcommand(cmd_name), cmd_name)
+        return super().resolve_command(ctx, args)
+
+    def load_subcommand(self, cmd_name: str) -> click.Command:
+        import_path, _ = self.lazy_subcommands[cmd_name]
+        module_name, app_name = import_path.split(":")
+        logger.debug(f"Loading {cmd_name} commands from {module_name}")
+        return typer.main.get_command(getattr(import_module(module_name), app_name))
+
+
 phi_cli = typer.Typer(
+    cls=LazyTyperGroup,
     help="""\b
 Phidata is an AI toolkit for engineers.
 \b
@@ -643,6 +680,3 @@ def restart(
         force=force,
     )
 
-
-phi_cli.add_typer(ws_cli)
-phi_cli.add_typer(k_cli)
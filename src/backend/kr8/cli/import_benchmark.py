@@ -0,0 +1,135 @@
+"""Phi Cli import benchmark
+
+Measures the cold start of `phi` subcommands with `python -X importtime` and checks it against a budget.
+
+Usage:
+    python -m src.backend.kr8.cli.import_benchmark
+    python -m src.backend.kr8.cli.import_benchmark --runs 5 --top 15 ws
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Runs the cli in a fresh interpreter; --help exits through SystemExit once the command is resolved
+_RUN_CLI = (
+    "import sys; sys.argv = ['phi'] + sys.argv[1:]\n"
+    "from src.backend.kr8.cli.entrypoint import phi_cli\n"
+    "try:\n"
+    "    phi_cli()\n"
+    "except SystemExit:\n"
+    "    pass\n"
+)
+_importtime_line = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# Modules that must never load just to dispatch or print help
+HEAVY_MODULES = (
+    "src.backend.kr8.k8s",
+    "src.backend.kr8.docker",
+    "src.backend.kr8.aws",
+    "src.backend.kr8.workspace.config",
+)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    args: List[str]
+    # Total self import time, in milliseconds
+    budget_ms: float
+    # Prefixes of modules this command may not import
+    forbidden: Tuple[str, ...] = HEAVY_MODULES
+
+
+@dataclass
+class BenchmarkResult:
+    benchmark: Benchmark
+    total_ms: float
+    # module -> cumulative import time in milliseconds, for top level imports of the run
+    cumulative_ms: Dict[str, float] = field(default_factory=dict)
+    forbidden_imports: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.total_ms <= self.benchmark.budget_ms and not self.forbidden_imports
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark(name="help", args=["--help"], budget_ms=400),
+    Benchmark(name="init", args=["init", "--help"], budget_ms=400),
+    Benchmark(name="ws", args=["ws", "--help"], budget_ms=450),
+    Benchmark(name="ws up", args=["ws", "up", "--help"], budget_ms=450),
+    Benchmark(name="k", args=["k", "--help"], budget_ms=450),
+]
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float], List[str]]:
+    """Returns (total self time ms, cumulative ms of top level imports, every imported module)"""
+    total_us = 0
+    cumulative: Dict[str, float] = {}
+    modules: List[str] = []
+    for line in stderr.splitlines():
+        match = _importtime_line.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        total_us += int(self_us)
+        modules.append(module)
+        # Nested imports are indented by two spaces per level under the top level import
+        if len(indent) <= 1:
+            cumulative[module] = int(cumulative_us) / 1000
+    return total_us / 1000, cumulative, modules
+
+
+def run_benchmark(benchmark: Benchmark, runs: int = 3, python: Optional[str] = None) -> BenchmarkResult:
+    """Runs the command `runs` times in a fresh interpreter and keeps the fastest run."""
+    best: Optional[BenchmarkResult] = None
+    for _ in range(max(1, runs)):
+        completed = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", _RUN_CLI, *benchmark.args],
+            capture_output=True,
+            text=True,
+        )
+        total_ms, cumulative_ms, modules = parse_importtime(completed.stderr)
+        if not modules:
+            raise RuntimeError(f"`phi {' '.join(benchmark.args)}` did not run:\n{completed.stderr}")
+        forbidden = sorted({module for module in modules if module.startswith(benchmark.forbidden)})
+        result = BenchmarkResult(benchmark, total_ms, cumulative_ms, forbidden)
+        if best is None or result.total_ms < best.total_ms:
+            best = result
+    return best  # type: ignore
+
+
+def print_result(result: BenchmarkResult, top: int = 10) -> None:
+    status = "ok" if result.passed else "OVER BUDGET"
+    command = f"phi {' '.join(result.benchmark.args)}"
+    print(f"{command:<24} {result.total_ms:8.1f} ms / {result.benchmark.budget_ms:.0f} ms  {status}")
+    for module, cumulative_ms in sorted(result.cumulative_ms.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {cumulative_ms:8.1f} ms  {module}")
+    for module in result.forbidden_imports:
+        print(f"    forbidden import: {module}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of phi subcommands against a budget.")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run, defaults to all")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per command, the fastest is kept")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top level imports to print")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, for slower machines")
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in BENCHMARKS if not args.names or b.name in args.names or b.args[0] in args.names]
+    passed = True
+    for benchmark in benchmarks:
+        benchmark.budget_ms *= args.scale
+        result = run_benchmark(benchmark, runs=args.runs)
+        print_result(result, top=args.top)
+        passed = passed and result.passed
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
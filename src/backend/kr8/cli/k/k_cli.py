@@ -49,6 +49,18 @@ def save(
         metavar="",
         help="Filter resource using type",
     ),
+    stdout: bool = typer.Option(
+        False,
+        "--stdout",
+        help="Print all manifests as one stream instead of saving files.",
+    ),
+    output_format: str = typer.Option(
+        "yaml",
+        "-o",
+        "--output",
+        metavar="",
+        help="Format of the --stdout stream: yaml or json.",
+    ),
     print_debug_log: bool = typer.Option(
         False,
         "-d",
@@ -62,6 +74,7 @@ def save(
     \b
     Examples:
     > `phi k save`      -> Save resources for the active workspace
+    > `phi k save --stdout | kubectl apply -f -`  -> Apply resources without writing files
     """
     if print_debug_log:
         set_log_level_to_debug()
@@ -140,6 +153,8 @@ def save(
         target_group=target_group,
         target_name=target_name,
         target_type=target_type,
+        stdout=stdout,
+        output_format=output_format,
     )
 
 
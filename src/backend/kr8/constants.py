@@ -13,6 +13,8 @@ WORKSPACE_ID_ENV_VAR: str = "PHI_WORKSPACE_ID"
 WORKSPACE_HASH_ENV_VAR: str = "PHI_WORKSPACE_HASH"
 WORKSPACE_KEY_ENV_VAR: str = "PHI_WORKSPACE_KEY"
 WORKSPACE_DIR_ENV_VAR: str = "PHI_WORKSPACE_DIR"
+WORKSPACE_CACHE_ENV_VAR: str = "PHI_WORKSPACE_CACHE"
+WORKSPACE_CACHE_DIR_ENV_VAR: str = "PHI_WORKSPACE_CACHE_DIR"
 REQUIREMENTS_FILE_PATH_ENV_VAR: str = "REQUIREMENTS_FILE_PATH"
 
 AWS_REGION_ENV_VAR: str = "AWS_REGION"
@@ -8,6 +8,8 @@ class DockerApiClient:
         super().__init__()
         self.base_url: Optional[str] = base_url
         self.timeout: int = timeout
+        # StateSnapshot used to answer is_active/read, set by DockerResources
+        self.snapshot: Optional[Any] = None
 
         # DockerClient
         self._api_client: Optional[Any] = None
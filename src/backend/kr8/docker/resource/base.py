@@ -52,7 +52,8 @@ class DockerResource(ResourceBase):
 
     def is_active(self, docker_client: DockerApiClient) -> bool:
         """Returns True if the active is active on the docker cluster"""
-        self.active_resource = self._read(docker_client=docker_client)
+        found, active_resource = self.read_from_snapshot(docker_client)
+        self.active_resource = active_resource if found else self._read(docker_client=docker_client)
         return True if self.active_resource is not None else False
 
     def _create(self, docker_client: DockerApiClient) -> bool:
@@ -75,6 +76,7 @@ class DockerResource(ResourceBase):
         # Step 3: Create the resource
         else:
             self.resource_created = self._create(client)
+            self.invalidate_snapshot(client)
             if self.resource_created:
                 print_info(f"{self.get_resource_type()}: {self.get_resource_name()} created")
 
@@ -106,6 +108,7 @@ class DockerResource(ResourceBase):
         client: DockerApiClient = docker_client or self.get_docker_client()
         if self.is_active(client):
             self.resource_updated = self._update(client)
+            self.invalidate_snapshot(client)
         else:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} not active, creating...")
             return self.create(client)
@@ -139,6 +142,7 @@ class DockerResource(ResourceBase):
         client: DockerApiClient = docker_client or self.get_docker_client()
         if self.is_active(client):
             self.resource_deleted = self._delete(client)
+            self.invalidate_snapshot(client)
         else:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} does not exist")
             return True
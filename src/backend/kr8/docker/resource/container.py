@@ -1,3 +1,4 @@
+from threading import Lock
 from time import sleep
 from typing import Optional, Any, Dict, Union, List
 
@@ -7,6 +8,31 @@ from src.backend.kr8.cli.console import print_info
 from src.backend.kr8.utils.log import logger
 
 
+class _ContainersByName(dict):
+    """Container ids keyed by name, from a sparse list. get() inspects just the container asked for."""
+
+    def __init__(self, api_client: Any, ids_by_name: Dict[str, str]):
+        super().__init__(ids_by_name)
+        self.api_client = api_client
+        self.containers: Dict[str, Any] = {}
+        self.lock = Lock()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        from docker.errors import NotFound
+
+        container_id = super().get(name)
+        if container_id is None:
+            return default
+        with self.lock:
+            if name not in self.containers:
+                try:
+                    self.containers[name] = self.api_client.containers.get(container_id)
+                except NotFound:
+                    # Removed since the list
+                    self.containers[name] = default
+            return self.containers[name]
+
+
 class DockerContainerMount(DockerResource):
     resource_type: str = "ContainerMount"
 
@@ -230,6 +256,24 @@ class DockerContainer(DockerResource):
         logger.debug("Container not found")
         return False
 
+    def list_for_snapshot(self, docker_client: DockerApiClient) -> Optional[Dict[str, Any]]:
+        """Lists all containers on the docker daemon, keyed by name.
+
+        The list is sparse, one request without an inspect per container; only the containers that are
+        looked up are inspected.
+        """
+        from docker import DockerClient
+
+        _api_client: DockerClient = docker_client.api_client
+        return _ContainersByName(
+            _api_client,
+            {
+                name.lstrip("/"): container.id
+                for container in _api_client.containers.list(all=True, sparse=True)
+                for name in container.attrs.get("Names") or []
+            },
+        )
+
     def _read(self, docker_client: DockerApiClient) -> Optional[Any]:
         """Returns a Container object if the container is active
 
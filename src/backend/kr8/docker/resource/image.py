@@ -1,10 +1,100 @@
-from typing import Optional, Any, Dict, List
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Optional, Any, Dict, Iterator, List
 
 from src.backend.kr8.docker.api_client import DockerApiClient
 from src.backend.kr8.docker.resource.base import DockerResource
 from src.backend.kr8.cli.console import print_info, console
 from src.backend.kr8.utils.log import logger
 
+# Image label holding the hash of everything that went into the build
+FINGERPRINT_LABEL = "kr8.build.fingerprint"
+
+# rich allows a single Live display at a time, concurrent builds fall back to plain logging
+_live_lock = threading.Lock()
+_build_slots: Dict[int, threading.BoundedSemaphore] = {}
+_build_slots_lock = threading.Lock()
+
+
+class _PlainLog:
+    def update(self, renderable: Any) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+@contextmanager
+def _live_log() -> Iterator[Any]:
+    from rich.live import Live
+
+    if _live_lock.acquire(blocking=False):
+        try:
+            with Live(transient=True, console=console) as live_log:
+                yield live_log
+        finally:
+            _live_lock.release()
+    else:
+        yield _PlainLog()
+
+
+def _build_slot(limit: int) -> threading.BoundedSemaphore:
+    with _build_slots_lock:
+        if limit not in _build_slots:
+            _build_slots[limit] = threading.BoundedSemaphore(max(1, limit))
+        return _build_slots[limit]
+
+
+def _read_dockerignore(context_dir: str) -> List[str]:
+    patterns: List[str] = []
+    ignore_file = os.path.join(context_dir, ".dockerignore")
+    if os.path.isfile(ignore_file):
+        with open(ignore_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    patterns.append(line)
+    return patterns
+
+
+def _pattern_regex(pattern: str) -> "re.Pattern[str]":
+    """Translates a .dockerignore pattern: `*` and `?` stay within a path segment, `**` spans segments"""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    # A pattern matches the path itself or anything below it
+    return re.compile(f"{regex}(?:/.*)?")
+
+
+def _is_ignored(rel_path: str, patterns: List[str]) -> bool:
+    """Applies .dockerignore patterns in order, the last matching pattern wins"""
+    ignored = False
+    for pattern in patterns:
+        negate = pattern.startswith("!")
+        regex = _pattern_regex(os.path.normpath(pattern.lstrip("!").lstrip("/")))
+        if regex.fullmatch(rel_path):
+            ignored = not negate
+    return ignored
+
 
 class DockerImage(DockerResource):
     resource_type: str = "Image"
@@ -75,8 +165,74 @@ class DockerImage(DockerResource):
     skip_delete: bool = True
     image_build_id: Optional[str] = None
 
-    # Set use_cache to False so image is always built
+    # Set use_cache to False so create always goes through the build fingerprint check
     use_cache: bool = False
+    # Skip the build when a local image carries the same build fingerprint
+    skip_unchanged: bool = True
+    # Cached build fingerprint
+    build_fingerprint: Optional[str] = None
+
+    def get_build_fingerprint(self) -> str:
+        """Hashes the build context (respecting .dockerignore), Dockerfile, target, platforms and buildargs"""
+        if self.build_fingerprint is not None:
+            return self.build_fingerprint
+
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps(
+                {
+                    "dockerfile": self.dockerfile,
+                    "target": self.target,
+                    "platform": self.platform,
+                    "platforms": self.platforms,
+                    "buildargs": self.buildargs,
+                },
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        )
+        if self.path is not None and os.path.isdir(self.path):
+            patterns = _read_dockerignore(self.path)
+            dockerfile = os.path.normpath(self.dockerfile or "Dockerfile")
+            # Without exceptions (!pattern) an ignored directory can be skipped entirely
+            can_prune = not any(pattern.startswith("!") for pattern in patterns)
+            for root, dirs, files in os.walk(self.path):
+                rel_root = os.path.relpath(root, self.path)
+                if can_prune:
+                    dirs[:] = [
+                        d for d in dirs if not _is_ignored(os.path.normpath(os.path.join(rel_root, d)), patterns)
+                    ]
+                dirs.sort()
+                for file_name in sorted(files):
+                    rel_path = os.path.normpath(os.path.join(rel_root, file_name))
+                    # Docker always sends the Dockerfile and .dockerignore, even if ignored
+                    if rel_path not in (dockerfile, ".dockerignore") and _is_ignored(rel_path, patterns):
+                        continue
+                    digest.update(rel_path.encode("utf-8"))
+                    with open(os.path.join(root, file_name), "rb") as f:
+                        for block in iter(lambda: f.read(1 << 20), b""):
+                            digest.update(block)
+        if self.dockerfile is not None and os.path.isfile(self.dockerfile):
+            with open(self.dockerfile, "rb") as f:
+                digest.update(f.read())
+
+        self.build_fingerprint = digest.hexdigest()
+        return self.build_fingerprint
+
+    def get_build_workers(self) -> int:
+        if self.workspace_settings is not None:
+            return self.workspace_settings.build_workers
+        return 2
+
+    def is_unchanged(self, docker_client: DockerApiClient) -> bool:
+        """Returns True if the local image was built from the same fingerprint"""
+        found, image_object = self.read_from_snapshot(docker_client)
+        if not found:
+            image_object = self._read(docker_client)
+        if image_object is None:
+            return False
+        labels = getattr(image_object, "labels", None) or {}
+        return labels.get(FINGERPRINT_LABEL) == self.get_build_fingerprint()
 
     def get_image_str(self) -> str:
         if self.tag:
@@ -119,6 +275,10 @@ class DockerImage(DockerResource):
             if self.dockerfile is not None:
                 command.extend(["--file", self.dockerfile])
 
+            # Add labels
+            for key, value in self.get_build_labels().items():
+                command.extend(["--label", f"{key}={value}"])
+
             # Add build arguments
             if self.buildargs:
                 for key, value in self.buildargs.items():
@@ -163,6 +323,70 @@ class DockerImage(DockerResource):
             logger.error(e)
             return None
 
+    def get_build_labels(self) -> Dict[str, Any]:
+        labels: Dict[str, Any] = dict(self.labels or {})
+        if self.skip_unchanged:
+            labels[FINGERPRINT_LABEL] = self.get_build_fingerprint()
+        return labels
+
+    def push(self, docker_client: DockerApiClient) -> bool:
+        """Pushes the image to the registry"""
+        from docker import DockerClient
+        from rich import box
+        from rich.table import Table
+
+        _api_client: DockerClient = docker_client.api_client
+        print_info(f"Pushing {self.get_image_str()}")
+        with _live_log() as live_log:
+            push_status = {}
+            last_push_progress = None
+            for push_output in _api_client.images.push(
+                repository=self.name,
+                tag=self.tag,
+                stream=True,
+                decode=True,
+            ):
+                _id = push_output.get("id", None)
+                _status = push_output.get("status", None)
+                _progress = push_output.get("progress", None)
+                if _id is not None and _status is not None:
+                    push_status[_id] = {
+                        "status": _status,
+                        "progress": _progress,
+                    }
+
+                if push_output.get("error", None) is not None:
+                    logger.error(push_output["error"])
+                    logger.error(f"Push failed for {self.get_image_str()}")
+                    logger.error("If you are using a private registry, make sure you are logged in")
+                    return False
+
+                if self.print_push_output and push_output.get("status", None) in (
+                    "Pushing",
+                    "Pushed",
+                ):
+                    current_progress = push_output.get("progress", None)
+                    if current_progress != last_push_progress:
+                        print_info(current_progress)
+                        last_push_progress = current_progress
+                if push_output.get("aux", {}).get("Size", 0) > 0:
+                    print_info(f"Push complete: {push_output.get('aux', {})}")
+
+                # Render table
+                table = Table(box=box.ASCII2)
+                table.add_column("Layer", justify="center")
+                table.add_column("Status", justify="center")
+                table.add_column("Progress", justify="center")
+                for layer, layer_status in push_status.items():
+                    table.add_row(
+                        layer,
+                        layer_status["status"],
+                        layer_status["progress"],
+                        style="dim",
+                    )
+                live_log.update(table)
+        return True
+
     def build_image(self, docker_client: DockerApiClient) -> Optional[Any]:
         if self.platforms is not None:
             logger.debug("Using buildx for multi-platform build")
@@ -170,8 +394,6 @@ class DockerImage(DockerResource):
 
         from docker import DockerClient
         from docker.errors import BuildError, APIError
-        from rich import box
-        from rich.live import Live
         from rich.table import Table
 
         print_info(f"Building image: {self.get_image_str()}")
@@ -204,7 +426,7 @@ class DockerImage(DockerResource):
                 buildargs=self.buildargs,
                 container_limits=self.container_limits,
                 shmsize=self.shmsize,
-                labels=self.labels,
+                labels=self.get_build_labels(),
                 cache_from=self.cache_from,
                 target=self.target,
                 network_mode=self.network_mode,
@@ -216,7 +438,7 @@ class DockerImage(DockerResource):
                 decode=True,
             )
 
-            with Live(transient=True, console=console) as live_log:
+            with _live_log() as live_log:
                 for build_log in build_stream:
                     if build_log != last_build_log:
                         last_build_log = build_log
@@ -282,56 +504,8 @@ class DockerImage(DockerResource):
                         table.add_row(line, style="dim")
                     live_log.update(table)
 
-            if self.push_image:
-                print_info(f"Pushing {self.get_image_str()}")
-                with Live(transient=True, console=console) as live_log:
-                    push_status = {}
-                    last_push_progress = None
-                    for push_output in _api_client.images.push(
-                        repository=self.name,
-                        tag=self.tag,
-                        stream=True,
-                        decode=True,
-                    ):
-                        _id = push_output.get("id", None)
-                        _status = push_output.get("status", None)
-                        _progress = push_output.get("progress", None)
-                        if _id is not None and _status is not None:
-                            push_status[_id] = {
-                                "status": _status,
-                                "progress": _progress,
-                            }
-
-                        if push_output.get("error", None) is not None:
-                            logger.error(push_output["error"])
-                            logger.error(f"Push failed for {self.get_image_str()}")
-                            logger.error("If you are using a private registry, make sure you are logged in")
-                            return None
-
-                        if self.print_push_output and push_output.get("status", None) in (
-                            "Pushing",
-                            "Pushed",
-                        ):
-                            current_progress = push_output.get("progress", None)
-                            if current_progress != last_push_progress:
-                                print_info(current_progress)
-                                last_push_progress = current_progress
-                        if push_output.get("aux", {}).get("Size", 0) > 0:
-                            print_info(f"Push complete: {push_output.get('aux', {})}")
-
-                        # Render table
-                        table = Table(box=box.ASCII2)
-                        table.add_column("Layer", justify="center")
-                        table.add_column("Status", justify="center")
-                        table.add_column("Progress", justify="center")
-                        for layer, layer_status in push_status.items():
-                            table.add_row(
-                                layer,
-                                layer_status["status"],
-                                layer_status["progress"],
-                                style="dim",
-                            )
-                        live_log.update(table)
+            if self.push_image and not self.push(docker_client):
+                return None
 
             return self._read(docker_client)
         except TypeError as type_error:
@@ -352,7 +526,16 @@ class DockerImage(DockerResource):
         """
         logger.debug("Creating: {}".format(self.get_resource_name()))
         try:
-            image_object = self.build_image(docker_client)
+            # buildx --push leaves no local image to compare against
+            pushes_remotely = self.platforms is not None and self.push_image
+            if self.skip_unchanged and not (self.force or self.skip_docker_cache) and not pushes_remotely:
+                if self.is_unchanged(docker_client):
+                    print_info(f"Image {self.get_image_str()} is up to date, skipping build")
+                    return self.push(docker_client) if self.push_image else True
+
+            # Limit concurrent builds, the apply graph may run many images at once
+            with _build_slot(self.get_build_workers()):
+                image_object = self.build_image(docker_client)
             if image_object is not None:
                 return True
             return False
@@ -365,6 +548,13 @@ class DockerImage(DockerResource):
             logger.error("Error while creating image: {}".format(e))
             raise
 
+    def list_for_snapshot(self, docker_client: DockerApiClient) -> Optional[Dict[str, Any]]:
+        """Lists all local images, keyed by each of their tags"""
+        from docker import DockerClient
+
+        _api_client: DockerClient = docker_client.api_client
+        return {tag: image for image in _api_client.images.list() for tag in image.tags}
+
     def _read(self, docker_client: DockerApiClient) -> Any:
         """Returns an Image object if available
 
@@ -434,6 +624,7 @@ class DockerImage(DockerResource):
                 return True
 
         resource_created = self._create(docker_client=docker_client)
+        self.invalidate_snapshot(docker_client)
         if resource_created:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} created")
             return True
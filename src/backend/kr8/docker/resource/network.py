@@ -67,6 +67,13 @@ class DockerNetwork(DockerResource):
         logger.debug("Network not found")
         return False
 
+    def list_for_snapshot(self, docker_client: DockerApiClient) -> Optional[Dict[str, Any]]:
+        """Lists all networks on the docker daemon, keyed by name"""
+        from docker import DockerClient
+
+        _api_client: DockerClient = docker_client.api_client
+        return {network.name: network for network in _api_client.networks.list()}
+
     def _read(self, docker_client: DockerApiClient) -> Any:
         """Returns a Network object if the network is active
 
@@ -70,6 +70,13 @@ class DockerVolume(DockerResource):
             return True
         return False
 
+    def list_for_snapshot(self, docker_client: DockerApiClient) -> Optional[Dict[str, Any]]:
+        """Lists all volumes on the docker daemon, keyed by name"""
+        from docker import DockerClient
+
+        _api_client: DockerClient = docker_client.api_client
+        return {volume.name: volume for volume in _api_client.volumes.list()}
+
     def _read(self, docker_client: DockerApiClient) -> Any:
         """Returns a Volume object if the volume is active on the docker_client"""
         from docker import DockerClient
@@ -6,7 +6,9 @@ from src.backend.kr8.docker.app.base import DockerApp
 from src.backend.kr8.docker.app.context import DockerBuildContext
 from src.backend.kr8.docker.api_client import DockerApiClient
 from src.backend.kr8.docker.resource.base import DockerResource
+from src.backend.kr8.infra.apply import ApplyGraph
 from src.backend.kr8.infra.resources import InfraResources
+from src.backend.kr8.infra.snapshot import plan_resources, print_plan
 from src.backend.kr8.workspace.settings import WorkspaceSettings
 from src.backend.kr8.utils.log import logger
 
@@ -121,37 +123,16 @@ class DockerResources(InfraResources):
                         ):
                             resources_to_create.append(app_resource)
 
-        # Sort the DockerResources in install order
-        resources_to_create.sort(key=lambda x: DockerResourceInstallOrder.get(x.__class__.__name__, 5000))
-
-        # Deduplicate DockerResources
-        deduped_resources_to_create: List[DockerResource] = []
-        for r in resources_to_create:
-            if r not in deduped_resources_to_create:
-                deduped_resources_to_create.append(r)
-
-        # Implement dependency sorting
-        final_docker_resources: List[DockerResource] = []
+        # Build the dependency graph; dependencies are created before the resources that use them
         logger.debug("-*- Building DockerResources dependency graph")
-        for docker_resource in deduped_resources_to_create:
-            # Logic to follow if resource has dependencies
-            if docker_resource.depends_on is not None:
-                # Add the dependencies before the resource itself
-                for dep in docker_resource.depends_on:
-                    if isinstance(dep, DockerResource):
-                        if dep not in final_docker_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {docker_resource.name}")
-                            final_docker_resources.append(dep)
-
-                # Add the resource to be created after its dependencies
-                if docker_resource not in final_docker_resources:
-                    logger.debug(f"-*- Adding {docker_resource.name}")
-                    final_docker_resources.append(docker_resource)
-            else:
-                # Add the resource to be created if it has no dependencies
-                if docker_resource not in final_docker_resources:
-                    logger.debug(f"-*- Adding {docker_resource.name}")
-                    final_docker_resources.append(docker_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: DockerResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=DockerResource,
+        )
+        for docker_resource in resources_to_create:
+            apply_graph.add(docker_resource)
+
+        final_docker_resources: List[DockerResource] = apply_graph.order()
 
         # Track the total number of DockerResources to create for validation
         num_resources_to_create: int = len(final_docker_resources)
@@ -159,10 +140,11 @@ class DockerResources(InfraResources):
         if num_resources_to_create == 0:
             return 0, 0
 
+        self.attach_snapshot(self.docker_client, final_docker_resources)
+
         if dry_run:
             print_heading("--**- Docker resources to create:")
-            for resource in final_docker_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_docker_resources, self.docker_client, "create"))
             print_info(f"\nNetwork: {self.network}")
             print_info(f"Total {num_resources_to_create} resources")
             return 0, 0
@@ -181,7 +163,8 @@ class DockerResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_docker_resources:
+
+        def _create(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
@@ -190,18 +173,13 @@ class DockerResources(InfraResources):
             if isinstance(resource, DockerContainer):
                 if resource.network is None and self.network is not None:
                     resource.network = self.network
-            # logger.debug(resource)
-            try:
-                _resource_created = resource.create(docker_client=self.docker_client)
-                if _resource_created:
-                    num_resources_created += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_create_failure:
-                        return num_resources_created, num_resources_to_create
-            except Exception as e:
-                logger.error(f"Failed to create {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.error(e)
-                logger.error("Please fix and try again...")
+            return resource.create(docker_client=self.docker_client)
+
+        num_resources_created = apply_graph.apply(
+            _create,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_create_failure,
+        )
 
         print_heading(f"\n--**-- Resources created: {num_resources_created}/{num_resources_to_create}")
         if num_resources_to_create != num_resources_created:
@@ -301,46 +279,17 @@ class DockerResources(InfraResources):
                     #                     if isinstance(dep_resource, DockerResource):
                     #                         resources_to_delete.append(dep_resource)
 
-        # Sort the DockerResources in install order
-        resources_to_delete.sort(key=lambda x: DockerResourceInstallOrder.get(x.__class__.__name__, 5000), reverse=True)
-
-        # Deduplicate DockerResources
-        deduped_resources_to_delete: List[DockerResource] = []
-        for r in resources_to_delete:
-            if r not in deduped_resources_to_delete:
-                deduped_resources_to_delete.append(r)
-
-        # Implement dependency sorting
-        final_docker_resources: List[DockerResource] = []
+        # Build the dependency graph; resources are deleted before their dependencies
         logger.debug("-*- Building DockerResources dependency graph")
-        for docker_resource in deduped_resources_to_delete:
-            # Logic to follow if resource has dependencies
-            if docker_resource.depends_on is not None:
-                # 1. Reverse the order of dependencies
-                docker_resource.depends_on.reverse()
-
-                # 2. Remove the dependencies if they are already added to the final_docker_resources
-                for dep in docker_resource.depends_on:
-                    if dep in final_docker_resources:
-                        logger.debug(f"-*- Removing {dep.name}, dependency of {docker_resource.name}")
-                        final_docker_resources.remove(dep)
-
-                # 3. Add the resource to be deleted before its dependencies
-                if docker_resource not in final_docker_resources:
-                    logger.debug(f"-*- Adding {docker_resource.name}")
-                    final_docker_resources.append(docker_resource)
-
-                # 4. Add the dependencies back in reverse order
-                for dep in docker_resource.depends_on:
-                    if isinstance(dep, DockerResource):
-                        if dep not in final_docker_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {docker_resource.name}")
-                            final_docker_resources.append(dep)
-            else:
-                # Add the resource to be deleted if it has no dependencies
-                if docker_resource not in final_docker_resources:
-                    logger.debug(f"-*- Adding {docker_resource.name}")
-                    final_docker_resources.append(docker_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: DockerResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=DockerResource,
+            reverse=True,
+        )
+        for docker_resource in resources_to_delete:
+            apply_graph.add(docker_resource)
+
+        final_docker_resources: List[DockerResource] = apply_graph.order()
 
         # Track the total number of DockerResources to delete for validation
         num_resources_to_delete: int = len(final_docker_resources)
@@ -348,10 +297,11 @@ class DockerResources(InfraResources):
         if num_resources_to_delete == 0:
             return 0, 0
 
+        self.attach_snapshot(self.docker_client, final_docker_resources)
+
         if dry_run:
             print_heading("--**- Docker resources to delete:")
-            for resource in final_docker_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_docker_resources, self.docker_client, "delete"))
             print_info("")
             print_info(f"\nNetwork: {self.network}")
             print_info(f"Total {num_resources_to_delete} resources")
@@ -372,25 +322,21 @@ class DockerResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_docker_resources:
+
+        def _delete(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
             if isinstance(resource, DockerContainer):
                 if resource.network is None and self.network is not None:
                     resource.network = self.network
-            # logger.debug(resource)
-            try:
-                _resource_deleted = resource.delete(docker_client=self.docker_client)
-                if _resource_deleted:
-                    num_resources_deleted += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_delete_failure:
-                        return num_resources_deleted, num_resources_to_delete
-            except Exception as e:
-                logger.error(f"Failed to delete {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.error(e)
-                logger.error("Please fix and try again...")
+            return resource.delete(docker_client=self.docker_client)
+
+        num_resources_deleted = apply_graph.apply(
+            _delete,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_delete_failure,
+        )
 
         print_heading(f"\n--**-- Resources deleted: {num_resources_deleted}/{num_resources_to_delete}")
         if num_resources_to_delete != num_resources_deleted:
@@ -492,37 +438,16 @@ class DockerResources(InfraResources):
                         ):
                             resources_to_update.append(app_resource)
 
-        # Sort the DockerResources in install order
-        resources_to_update.sort(key=lambda x: DockerResourceInstallOrder.get(x.__class__.__name__, 5000), reverse=True)
-
-        # Deduplicate DockerResources
-        deduped_resources_to_update: List[DockerResource] = []
-        for r in resources_to_update:
-            if r not in deduped_resources_to_update:
-                deduped_resources_to_update.append(r)
-
-        # Implement dependency sorting
-        final_docker_resources: List[DockerResource] = []
+        # Build the dependency graph; dependencies are updated before the resources that use them
         logger.debug("-*- Building DockerResources dependency graph")
-        for docker_resource in deduped_resources_to_update:
-            # Logic to follow if resource has dependencies
-            if docker_resource.depends_on is not None:
-                # Add the dependencies before the resource itself
-                for dep in docker_resource.depends_on:
-                    if isinstance(dep, DockerResource):
-                        if dep not in final_docker_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {docker_resource.name}")
-                            final_docker_resources.append(dep)
-
-                # Add the resource to be created after its dependencies
-                if docker_resource not in final_docker_resources:
-                    logger.debug(f"-*- Adding {docker_resource.name}")
-                    final_docker_resources.append(docker_resource)
-            else:
-                # Add the resource to be created if it has no dependencies
-                if docker_resource not in final_docker_resources:
-                    logger.debug(f"-*- Adding {docker_resource.name}")
-                    final_docker_resources.append(docker_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: -DockerResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=DockerResource,
+        )
+        for docker_resource in resources_to_update:
+            apply_graph.add(docker_resource)
+
+        final_docker_resources: List[DockerResource] = apply_graph.order()
 
         # Track the total number of DockerResources to update for validation
         num_resources_to_update: int = len(final_docker_resources)
@@ -530,10 +455,11 @@ class DockerResources(InfraResources):
         if num_resources_to_update == 0:
             return 0, 0
 
+        self.attach_snapshot(self.docker_client, final_docker_resources)
+
         if dry_run:
             print_heading("--**- Docker resources to update:")
-            for resource in final_docker_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_docker_resources, self.docker_client, "update", create_missing=True))
             print_info("")
             print_info(f"\nNetwork: {self.network}")
             print_info(f"Total {num_resources_to_update} resources")
@@ -554,7 +480,8 @@ class DockerResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_docker_resources:
+
+        def _update(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
@@ -563,18 +490,13 @@ class DockerResources(InfraResources):
             if isinstance(resource, DockerContainer):
                 if resource.network is None and self.network is not None:
                     resource.network = self.network
-            # logger.debug(resource)
-            try:
-                _resource_updated = resource.update(docker_client=self.docker_client)
-                if _resource_updated:
-                    num_resources_updated += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_patch_failure:
-                        return num_resources_updated, num_resources_to_update
-            except Exception as e:
-                logger.error(f"Failed to update {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.error(e)
-                logger.error("Please fix and try again...")
+            return resource.update(docker_client=self.docker_client)
+
+        num_resources_updated = apply_graph.apply(
+            _update,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_patch_failure,
+        )
 
         print_heading(f"\n--**-- Resources updated: {num_resources_updated}/{num_resources_to_update}")
         if num_resources_to_update != num_resources_updated:
@@ -15,3 +15,7 @@ class Embedder(BaseModel):
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         raise NotImplementedError
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts. Embedders with a native batch API should override this."""
+        return [self.get_embedding(text) for text in texts]
@@ -49,9 +49,10 @@ class SentenceTransformerEmbedder(Embedder, BaseModel):
         usage = {"total_tokens": token_count}
         return embedding, usage
 
-    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def get_embeddings(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
         try:
-            return [self.get_embedding(text) for text in texts]
+            embeddings = self._sentence_transformer.encode(texts, batch_size=batch_size, convert_to_tensor=False)
+            return [embedding.tolist() for embedding in embeddings]
         except Exception as e:
             logger.error(f"Error getting embeddings: {str(e)}")
             return [[0.0] * self.dimensions for _ in texts]
\ No newline at end of file
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Set, Tuple, Type
+
+from src.backend.kr8.utils.log import logger
+
+
+class ApplyGraph:
+    """Dependency DAG of infra resources, applied one ready frontier at a time on a thread pool.
+
+    Edges come from each resource's `depends_on` plus the install order: every resource in a tier
+    waits for the tier before it. A resource is lifted to the tier of its slowest dependency so
+    the two kinds of constraint never form a cycle. With `reverse=True` (deletes) every edge is
+    flipped, so dependents are removed before what they depend on.
+    """
+
+    def __init__(
+        self,
+        tier: Callable[[Any], int],
+        resource_class: Type = object,
+        reverse: bool = False,
+    ):
+        self.tier = tier
+        self.resource_class = resource_class
+        self.reverse = reverse
+        # Resources hash on "type:name", so re-adding the same resource is a dict lookup
+        self.resources: Dict[Any, Any] = {}
+
+    def __contains__(self, resource: Any) -> bool:
+        return resource in self.resources
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def add(self, resource: Any) -> None:
+        if resource in self.resources:
+            return
+        self.resources[resource] = resource
+        for dep in resource.depends_on or []:
+            if isinstance(dep, self.resource_class):
+                logger.debug(f"-*- Adding {dep.name}, dependency of {resource.name}")
+                self.add(dep)
+
+    def _dependencies(self, resource: Any) -> List[Any]:
+        return [
+            self.resources[dep]
+            for dep in resource.depends_on or []
+            if isinstance(dep, self.resource_class) and dep in self.resources
+        ]
+
+    def _edges(self) -> Tuple[Dict[Any, Set[Any]], Dict[Any, int]]:
+        effective_tier: Dict[Any, int] = {}
+
+        def resolve(resource: Any, path: Set[Any]) -> int:
+            if resource in effective_tier:
+                return effective_tier[resource]
+            if resource in path:
+                raise ValueError(f"Dependency cycle detected at {resource.get_resource_type()}: {resource.name}")
+            path.add(resource)
+            value = max([self.tier(resource)] + [resolve(dep, path) for dep in self._dependencies(resource)])
+            path.discard(resource)
+            effective_tier[resource] = value
+            return value
+
+        for resource in self.resources:
+            resolve(resource, set())
+
+        successors: Dict[Any, Set[Any]] = {resource: set() for resource in self.resources}
+        for resource in self.resources:
+            for dep in self._dependencies(resource):
+                successors[dep].add(resource)
+
+        tiers: Dict[int, List[Any]] = {}
+        for resource, value in effective_tier.items():
+            tiers.setdefault(value, []).append(resource)
+        ordered_tiers = sorted(tiers)
+        for previous, current in zip(ordered_tiers, ordered_tiers[1:]):
+            for before in tiers[previous]:
+                successors[before].update(tiers[current])
+
+        if self.reverse:
+            reversed_successors: Dict[Any, Set[Any]] = {resource: set() for resource in self.resources}
+            for resource, after in successors.items():
+                for successor in after:
+                    reversed_successors[successor].add(resource)
+            successors = reversed_successors
+
+        in_degree: Dict[Any, int] = {resource: 0 for resource in self.resources}
+        for after in successors.values():
+            for successor in after:
+                in_degree[successor] += 1
+        return successors, in_degree
+
+    def frontiers(self) -> List[List[Any]]:
+        """Group resources into the frontiers they would be applied in."""
+        successors, in_degree = self._edges()
+        frontier = [resource for resource in self.resources if in_degree[resource] == 0]
+        frontiers: List[List[Any]] = []
+        while frontier:
+            frontiers.append(frontier)
+            next_frontier = []
+            for resource in frontier:
+                for successor in successors[resource]:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        next_frontier.append(successor)
+            # Keep the declaration order inside a frontier
+            next_set = set(next_frontier)
+            frontier = [resource for resource in self.resources if resource in next_set]
+        return frontiers
+
+    def order(self) -> List[Any]:
+        return [resource for frontier in self.frontiers() for resource in frontier]
+
+    def apply(
+        self,
+        action: Callable[[Any], bool],
+        max_workers: int = 1,
+        continue_on_failure: bool = False,
+    ) -> int:
+        """Run `action` on every resource once all of its predecessors finished.
+
+        Returns the number of resources for which `action` returned True. When an action fails
+        and `continue_on_failure` is False, no new resources are started and the in-flight ones
+        are allowed to finish.
+        """
+        successors, in_degree = self._edges()
+        num_succeeded = 0
+        stop = False
+
+        def run(resource: Any) -> bool:
+            try:
+                return bool(action(resource))
+            except Exception as e:
+                logger.error(f"Failed to apply {resource.get_resource_type()}: {resource.get_resource_name()}")
+                logger.error(e)
+                logger.error("Please fix and try again...")
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            running: Dict[Any, Any] = {}
+            ready = [resource for resource in self.resources if in_degree[resource] == 0]
+            while ready or running:
+                if not stop:
+                    for resource in ready:
+                        running[executor.submit(run, resource)] = resource
+                ready = []
+                if not running:
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    resource = running.pop(future)
+                    if future.result():
+                        num_succeeded += 1
+                    elif not continue_on_failure:
+                        stop = True
+                    for successor in successors[resource]:
+                        in_degree[successor] -= 1
+                        if in_degree[successor] == 0:
+                            ready.append(successor)
+        return num_succeeded
@@ -1,6 +1,7 @@
 from typing import Optional, List, Any, Tuple
 
 from src.backend.kr8.base import PhiBase
+from src.backend.kr8.infra.snapshot import StateSnapshot
 
 # from phi.workspace.settings import WorkspaceSettings
 
@@ -8,6 +9,20 @@ from src.backend.kr8.base import PhiBase
 class InfraResources(PhiBase):
     apps: Optional[List[Any]] = None
     resources: Optional[List[Any]] = None
+    # Number of independent resources applied concurrently, defaults to workspace_settings.apply_workers
+    apply_workers: Optional[int] = None
+
+    def get_apply_workers(self) -> int:
+        if self.apply_workers is not None:
+            return self.apply_workers
+        if self.workspace_settings is not None:
+            return self.workspace_settings.apply_workers
+        return 8
+
+    def attach_snapshot(self, client: Any, resources: List[Any]) -> None:
+        """Lists the live state of resources once per kind and attaches it to client, so the plan and the
+        existence checks of the apply do not call the API per resource"""
+        client.snapshot = StateSnapshot.from_resources(resources, client, max_workers=self.get_apply_workers())
 
     def create_resources(
         self,
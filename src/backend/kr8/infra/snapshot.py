@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from src.backend.kr8.utils.log import logger
+
+SnapshotKey = Tuple[str, Optional[str]]
+
+
+class StateSnapshot:
+    """Point-in-time index of live resources, shared by every resource read through one api client.
+
+    Each resource kind is listed once per scope (namespace, region or Docker daemon) and indexed by
+    name, so existence checks before create/update/delete become dictionary lookups. Resources
+    mutated after the snapshot was taken are marked stale and fall back to a direct read.
+    """
+
+    def __init__(self):
+        self.indexes: Dict[SnapshotKey, Optional[Dict[str, Any]]] = {}
+        self.stale: Set[Tuple[str, Optional[str], str]] = set()
+        self.lock = threading.Lock()
+        self.key_locks: Dict[SnapshotKey, threading.Lock] = {}
+
+    def _index(self, key: SnapshotKey, list_fn: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            if key in self.indexes:
+                return self.indexes[key]
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        # Only one thread lists a given kind; the others wait for its result
+        with key_lock:
+            if key not in self.indexes:
+                try:
+                    index = list_fn()
+                except Exception as e:
+                    logger.debug(f"Could not list {key[0]} for snapshot: {e}")
+                    index = None
+                with self.lock:
+                    self.indexes[key] = index
+            return self.indexes[key]
+
+    def lookup(
+        self, kind: str, scope: Optional[str], name: str, list_fn: Callable[[], Optional[Dict[str, Any]]]
+    ) -> Tuple[bool, Any]:
+        """Returns (covered, active_resource). covered is False when the caller must read directly."""
+        if (kind, scope, name) in self.stale:
+            return False, None
+        index = self._index((kind, scope), list_fn)
+        if index is None:
+            return False, None
+        return True, index.get(name)
+
+    def invalidate(self, kind: str, scope: Optional[str], name: str) -> None:
+        with self.lock:
+            self.stale.add((kind, scope, name))
+
+    @classmethod
+    def from_resources(cls, resources: List[Any], client: Any, max_workers: int = 8) -> "StateSnapshot":
+        """List every (kind, scope) used by `resources` concurrently and return the snapshot."""
+        snapshot = cls()
+        first_of_kind: Dict[SnapshotKey, Any] = {}
+        for resource in resources:
+            first_of_kind.setdefault((resource.__class__.__name__, resource.get_snapshot_scope()), resource)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(
+                executor.map(
+                    lambda item: snapshot._index(item[0], lambda: item[1].list_for_snapshot(client)),
+                    first_of_kind.items(),
+                )
+            )
+        logger.debug(f"Snapshot listed {len(first_of_kind)} resource kinds")
+        return snapshot
+
+
+def plan_resources(resources: List[Any], client: Any, operation: str, create_missing: bool = False) -> List[Tuple[str, Any]]:
+    """Classify each resource as create, update, delete or no-op for `operation` without mutating anything.
+
+    `create_missing` marks resources that `update` would create when they are not active (Docker).
+    """
+    plan: List[Tuple[str, Any]] = []
+    for resource in resources:
+        skip = {"create": resource.skip_create, "update": resource.skip_update, "delete": resource.skip_delete}[operation]
+        if skip:
+            plan.append(("no-op", resource))
+            continue
+        active = resource.is_active(client)
+        if operation == "create":
+            action = "no-op" if active and resource.use_cache else "create"
+        elif operation == "update":
+            action = "update" if active else ("create" if create_missing else "no-op")
+        else:
+            action = "delete" if active else "no-op"
+        plan.append((action, resource))
+    return plan
+
+
+def print_plan(plan: List[Tuple[str, Any]]) -> None:
+    from src.backend.kr8.cli.console import print_info
+
+    counts: Dict[str, int] = {"create": 0, "update": 0, "delete": 0, "no-op": 0}
+    for action, resource in plan:
+        counts[action] += 1
+        print_info(f"  -+-> {action:<7} {resource.get_resource_type()}: {resource.get_resource_name()}")
+    print_info(
+        f"\nPlan: {counts['create']} to create, {counts['update']} to update, "
+        f"{counts['delete']} to delete, {counts['no-op']} unchanged"
+    )
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Optional
 
 try:
     import kubernetes
@@ -17,6 +17,8 @@ class K8sApiClient:
 
         self.context: Optional[str] = context
         self.kubeconfig_path: Optional[str] = kubeconfig_path
+        # StateSnapshot used to answer is_active/read, set by K8sResources
+        self.snapshot: Optional[Any] = None
         self.configuration: Optional[kubernetes.client.Configuration] = None
 
         # kubernetes API clients
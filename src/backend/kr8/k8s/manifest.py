@@ -0,0 +1,121 @@
+import json
+import os
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.backend.kr8.utils.log import logger
+
+
+def write_if_changed(file_path: Path, content: str) -> bool:
+    """Writes content to file_path unless the file already has it. Returns True if the file was written."""
+    if file_path.exists() and file_path.is_file():
+        try:
+            if file_path.read_text() == content:
+                return False
+        except OSError:
+            pass
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, file_path)
+    return True
+
+
+class ManifestRenderer:
+    """Renders K8s manifests, reusing the output of resources whose model has not changed.
+
+    Rendered documents are cached by the resource's manifest hash (see K8sResource.get_k8s_manifest_hash),
+    which is computed from pydantic's JSON serializer and is far cheaper than building the manifest dict and
+    dumping it to YAML. The cache is kept in cache_file between runs, so a no-op `phi k save` only hashes
+    each resource and compares files. Rendered manifests include Secret data, so cache_file is private to the
+    user like the workspace cache it sits in.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        self.cache_file: Optional[Path] = cache_file
+        self.cache: Dict[str, str] = {}
+        # Keys used in this run, only these are written back so the cache does not grow forever
+        self.used: Dict[str, str] = {}
+        self.num_rendered: int = 0
+        self.num_reused: int = 0
+        if cache_file is not None and cache_file.exists():
+            from src.backend.kr8.workspace.cache import is_private
+
+            try:
+                if is_private(cache_file):
+                    self.cache = json.loads(cache_file.read_text())
+                else:
+                    # Manifests someone else could have written must not be applied
+                    logger.debug(f"Ignoring manifest cache {cache_file} that is not private to this user")
+            except Exception as e:
+                logger.debug(f"Ignoring manifest cache {cache_file}: {e}")
+
+    def _render_uncached(self, resource: Any, output_format: str, **kwargs) -> Optional[str]:
+        if output_format == "json":
+            return resource.get_k8s_manifest_json(**kwargs)
+        return resource.get_k8s_manifest_yaml(**kwargs)
+
+    def render(self, resource: Any, output_format: str = "yaml", **kwargs) -> Optional[str]:
+        """Returns the manifest for resource as a yaml or json document"""
+        model_hash: Optional[str] = resource.get_k8s_manifest_hash()
+        if model_hash is None:
+            self.num_rendered += 1
+            return self._render_uncached(resource, output_format, **kwargs)
+
+        key = f"{output_format}:{model_hash}:{json.dumps(kwargs, sort_keys=True, default=str)}"
+        rendered = self.cache.get(key)
+        if rendered is None:
+            rendered = self._render_uncached(resource, output_format, **kwargs)
+            if rendered is None:
+                return None
+            self.num_rendered += 1
+        else:
+            self.num_reused += 1
+        self.used[key] = rendered
+        return rendered
+
+    def render_stream(self, resources: List[Any], output_format: str = "yaml") -> str:
+        """Returns every manifest as a single stream that can be piped to `kubectl apply -f -`.
+
+        yaml: documents separated by `---`
+        json: a v1 List holding every manifest as an item
+        Returns an empty string if there are no manifests.
+        """
+        if output_format == "json":
+            items: List[str] = []
+            for resource in resources:
+                rendered = self.render(resource, output_format="json")
+                if rendered is not None:
+                    items.append(rendered)
+            if not items:
+                return ""
+            return '{"apiVersion": "v1", "kind": "List", "items": [' + ", ".join(items) + "]}\n"
+
+        documents: List[str] = []
+        for resource in resources:
+            rendered = self.render(resource, output_format="yaml", default_flow_style=False)
+            if rendered is not None:
+                documents.append(rendered if rendered.endswith("\n") else f"{rendered}\n")
+        return "---\n".join(documents)
+
+    def save(self) -> None:
+        logger.debug(f"Manifests rendered: {self.num_rendered}, reused: {self.num_reused}")
+        if self.cache_file is None or self.used == self.cache:
+            return
+        from src.backend.kr8.workspace.cache import write_private_file
+
+        try:
+            write_private_file(self.cache_file, json.dumps(self.used).encode())
+        except Exception as e:
+            logger.debug(f"Could not save manifest cache {self.cache_file}: {e}")
+
+
+def get_manifest_cache_file(workspace_dir: Optional[Path], name: str) -> Optional[Path]:
+    """Cache file for the manifests of one K8sResources group in the workspace"""
+    if workspace_dir is None:
+        return None
+    from src.backend.kr8.workspace.cache import get_workspace_cache_dir
+
+    workspace_key = sha256(str(workspace_dir.resolve()).encode()).hexdigest()[:16]
+    return get_workspace_cache_dir().joinpath(workspace_key, f"manifests-{name}.json")
@@ -15,8 +15,12 @@ def save_resources(
     target_group: Optional[str] = None,
     target_name: Optional[str] = None,
     target_type: Optional[str] = None,
+    stdout: bool = False,
+    output_format: str = "yaml",
 ) -> None:
-    """Saves the K8s resources"""
+    """Saves the K8s resources.
+    With stdout=True, prints every manifest as one multi-document stream instead of saving files.
+    """
     if ws_config is None:
         logger.error("WorkspaceConfig invalid")
         return
@@ -42,6 +46,24 @@ def save_resources(
         print_info("No resources to save")
         return
 
+    if stdout:
+        import sys
+
+        streams: List[str] = []
+        for rg in resource_groups_to_save:
+            streams.append(
+                rg.render_manifests(  # type: ignore
+                    group_filter=target_group,
+                    name_filter=target_name,
+                    type_filter=target_type,
+                    output_format=output_format,
+                )
+            )
+        # Each group renders its own stream: yaml documents are joined with `---`, json Lists are concatenated
+        separator = "" if output_format == "json" else "---\n"
+        sys.stdout.write(separator.join(stream for stream in streams if stream))
+        return
+
     logger.debug(f"Processing {num_rgs_to_save} resource groups")
     for rg in resource_groups_to_save:
         _num_resources_saved, _num_resources_to_save = rg.save_resources(
@@ -137,6 +137,10 @@ class CustomObject(K8sResource):
         logger.error("CustomObject could not be created")
         return False
 
+    def list_for_snapshot(self, k8s_client: K8sApiClient) -> None:
+        # CustomObjects of different CRDs share this class, so they are always read directly
+        return None
+
     def _read(self, k8s_client: K8sApiClient) -> Optional[Dict[str, Any]]:
         """Returns the "Active" CustomObject from the cluster"""
 
@@ -115,9 +115,23 @@ class K8sResource(ResourceBase, K8sObject):
         client: K8sApiClient = k8s_client or self.get_k8s_client()
         return self._read(client)
 
+    def get_snapshot_scope(self) -> Optional[str]:
+        return self.get_namespace()
+
+    def list_for_snapshot(self, k8s_client: K8sApiClient) -> Optional[Dict[str, Any]]:
+        """Lists this kind once per namespace using get_from_cluster"""
+        active_resources: Optional[List[Any]] = self.get_from_cluster(
+            k8s_client=k8s_client,
+            namespace=self.get_namespace(),
+        )
+        if active_resources is None:
+            return None
+        return {_resource.metadata.name: _resource for _resource in active_resources}
+
     def is_active(self, k8s_client: K8sApiClient) -> bool:
         """Returns True if the resource is active on the k8s cluster"""
-        self.active_resource = self._read(k8s_client=k8s_client)
+        found, active_resource = self.read_from_snapshot(k8s_client)
+        self.active_resource = active_resource if found else self._read(k8s_client=k8s_client)
         return True if self.active_resource is not None else False
 
     def _create(self, k8s_client: K8sApiClient) -> bool:
@@ -141,6 +155,7 @@ class K8sResource(ResourceBase, K8sObject):
         # Step 3: Create the resource
         else:
             self.resource_created = self._create(client)
+            self.invalidate_snapshot(client)
             if self.resource_created:
                 print_info(f"{self.get_resource_type()}: {self.get_resource_name()} created")
 
@@ -172,6 +187,7 @@ class K8sResource(ResourceBase, K8sObject):
         client: K8sApiClient = k8s_client or self.get_k8s_client()
         if self.is_active(client):
             self.resource_updated = self._update(client)
+            self.invalidate_snapshot(client)
         else:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} does not exist")
             return True
@@ -205,6 +221,7 @@ class K8sResource(ResourceBase, K8sObject):
         client: K8sApiClient = k8s_client or self.get_k8s_client()
         if self.is_active(client):
             self.resource_deleted = self._delete(client)
+            self.invalidate_snapshot(client)
         else:
             print_info(f"{self.get_resource_type()}: {self.get_resource_name()} does not exist")
             return True
@@ -240,6 +257,31 @@ class K8sResource(ResourceBase, K8sObject):
         # logger.debug(f"k8s_manifest:\n{k8s_manifest}")
         return k8s_manifest
 
+    def get_k8s_manifest_hash(self) -> Optional[str]:
+        """Returns a hash of the fields that make up the K8s Manifest, used to reuse rendered manifests.
+        Returns None if the manifest cannot be cached, eg: when get_k8s_manifest_dict is overridden.
+        """
+        from hashlib import sha256
+        from itertools import chain
+
+        if type(self).get_k8s_manifest_dict is not K8sResource.get_k8s_manifest_dict:
+            return None
+        # get_k8s_manifest_dict matches the keys of a by_alias dump, so select the fields dumped under them
+        manifest_keys = set(chain(self.fields_for_k8s_manifest_base, self.fields_for_k8s_manifest))
+        include = {
+            field_name
+            for field_name, field in type(self).model_fields.items()
+            if (field.serialization_alias or field.alias or field_name) in manifest_keys
+        }
+        try:
+            manifest_json = self.model_dump_json(
+                include=include, exclude_defaults=True, by_alias=True, exclude_none=True
+            )
+        except Exception as e:
+            logger.debug(f"Could not hash {self.get_resource_type()}: {self.get_resource_name()}: {e}")
+            return None
+        return sha256(f"{self.__class__.__name__}:{manifest_json}".encode()).hexdigest()
+
     def get_k8s_manifest_yaml(self, **kwargs) -> Optional[str]:
         """Returns the K8s Manifest for this Object as a yaml"""
 
@@ -262,24 +304,30 @@ class K8sResource(ResourceBase, K8sObject):
             return json.dumps(k8s_manifest_dict, **kwargs)
         return None
 
-    def save_manifests(self, **kwargs) -> Optional[Path]:
-        """Saves the K8s Manifests for this Object to the input file
+    def save_manifests(self, renderer: Optional[Any] = None, **kwargs) -> Optional[Path]:
+        """Saves the K8s Manifests for this Object to the input file.
+        The file is only written if its contents changed.
+
+        Args:
+            renderer: ManifestRenderer used to reuse the manifest rendered in a previous run
 
         Returns:
             Path: The path to the input file
         """
+        from src.backend.kr8.k8s.manifest import write_if_changed
+
         input_file_path: Optional[Path] = self.get_input_file_path()
         if input_file_path is None:
             return None
 
-        input_file_path_parent: Optional[Path] = input_file_path.parent
-        # Create parent directory if needed
-        if input_file_path_parent is not None and not input_file_path_parent.exists():
-            input_file_path_parent.mkdir(parents=True, exist_ok=True)
-
-        manifest_yaml = self.get_k8s_manifest_yaml(**kwargs)
+        if renderer is not None:
+            manifest_yaml = renderer.render(self, output_format="yaml", **kwargs)
+        else:
+            manifest_yaml = self.get_k8s_manifest_yaml(**kwargs)
         if manifest_yaml is not None:
-            logger.debug(f"Writing {str(input_file_path)}")
-            input_file_path.write_text(manifest_yaml)
+            if write_if_changed(input_file_path, manifest_yaml):
+                logger.debug(f"Writing {str(input_file_path)}")
+            else:
+                logger.debug(f"Unchanged {str(input_file_path)}")
             return input_file_path
         return None
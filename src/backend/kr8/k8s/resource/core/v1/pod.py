@@ -41,6 +41,10 @@ class Pod(K8sResource):
         # logger.debug(f"pods type: {type(pods)}")
         return pods
 
+    def list_for_snapshot(self, k8s_client: K8sApiClient) -> None:
+        # Pods are matched by name prefix in _read, not by exact name
+        return None
+
     def _read(self, k8s_client: K8sApiClient) -> Optional[V1Pod]:
         """Returns the "Active" Deployment from the cluster"""
 
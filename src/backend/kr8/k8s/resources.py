@@ -10,7 +10,10 @@ from src.backend.kr8.k8s.api_client import K8sApiClient
 from src.backend.kr8.k8s.create.base import CreateK8sResource
 from src.backend.kr8.k8s.resource.base import K8sResource
 from src.backend.kr8.k8s.helm.chart import HelmChart
+from src.backend.kr8.k8s.manifest import ManifestRenderer, get_manifest_cache_file
+from src.backend.kr8.infra.apply import ApplyGraph
 from src.backend.kr8.infra.resources import InfraResources
+from src.backend.kr8.infra.snapshot import plan_resources, print_plan
 from src.backend.kr8.utils.log import logger
 
 
@@ -185,37 +188,14 @@ class K8sResources(InfraResources):
                             ):
                                 resources_to_create.append(_k8s_resource)
 
-        # Sort the K8sResources in install order
-        resources_to_create.sort(key=lambda x: K8sResourceInstallOrder.get(x.__class__.__name__, 5000))
-
-        # Deduplicate K8sResources
-        deduped_resources_to_create: List[K8sResource] = []
-        for r in resources_to_create:
-            if r not in deduped_resources_to_create:
-                deduped_resources_to_create.append(r)
-
-        # Implement dependency sorting
-        final_k8s_resources: List[Union[K8sResource, HelmChart]] = []
+        # Build the dependency graph; dependencies are created before the resources that use them
         logger.debug("-*- Building K8sResources dependency graph")
-        for k8s_resource in deduped_resources_to_create:
-            # Logic to follow if resource has dependencies
-            if k8s_resource.depends_on is not None:
-                # Add the dependencies before the resource itself
-                for dep in k8s_resource.depends_on:
-                    if isinstance(dep, K8sResource):
-                        if dep not in final_k8s_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {k8s_resource.name}")
-                            final_k8s_resources.append(dep)
-
-                # Add the resource to be created after its dependencies
-                if k8s_resource not in final_k8s_resources:
-                    logger.debug(f"-*- Adding {k8s_resource.name}")
-                    final_k8s_resources.append(k8s_resource)
-            else:
-                # Add the resource to be created if it has no dependencies
-                if k8s_resource not in final_k8s_resources:
-                    logger.debug(f"-*- Adding {k8s_resource.name}")
-                    final_k8s_resources.append(k8s_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: K8sResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=K8sResource,
+        )
+        for k8s_resource in resources_to_create:
+            apply_graph.add(k8s_resource)
 
         # Build a list of HelmCharts to create
         if self.charts is not None:
@@ -223,11 +203,13 @@ class K8sResources(InfraResources):
                 if chart.group is None and self.name is not None:
                     chart.group = self.name
                 if chart.should_create(group_filter=group_filter):
-                    if chart not in final_k8s_resources:
+                    if chart not in apply_graph:
                         chart.set_workspace_settings(workspace_settings=self.workspace_settings)
                         if chart.namespace is None:
                             chart.namespace = self.namespace
-                        final_k8s_resources.append(chart)
+                        apply_graph.add(chart)
+
+        final_k8s_resources: List[Union[K8sResource, HelmChart]] = apply_graph.order()
 
         # Track the total number of K8sResources to create for validation
         num_resources_to_create: int = len(final_k8s_resources)
@@ -235,10 +217,11 @@ class K8sResources(InfraResources):
         if num_resources_to_create == 0:
             return 0, 0
 
+        self.attach_snapshot(self.k8s_client, final_k8s_resources)
+
         if dry_run:
             print_heading("--**- K8s resources to create:")
-            for resource in final_k8s_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_k8s_resources, self.k8s_client, "create"))
             print_info("")
             print_info(f"Total {num_resources_to_create} resources")
             return 0, 0
@@ -257,22 +240,18 @@ class K8sResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_k8s_resources:
+
+        def _create(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
-            # logger.debug(resource)
-            try:
-                _resource_created = resource.create(k8s_client=self.k8s_client)
-                if _resource_created:
-                    num_resources_created += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_create_failure:
-                        return num_resources_created, num_resources_to_create
-            except Exception as e:
-                logger.error(f"Failed to create {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.exception(e)
-                logger.error("Please fix and try again...")
+            return resource.create(k8s_client=self.k8s_client)
+
+        num_resources_created = apply_graph.apply(
+            _create,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_create_failure,
+        )
 
         print_heading(f"\n--**-- Resources created: {num_resources_created}/{num_resources_to_create}")
         if num_resources_to_create != num_resources_created:
@@ -394,46 +373,15 @@ class K8sResources(InfraResources):
                             ):
                                 resources_to_delete.append(_k8s_resource)
 
-        # Sort the K8sResources in install order
-        resources_to_delete.sort(key=lambda x: K8sResourceInstallOrder.get(x.__class__.__name__, 5000), reverse=True)
-
-        # Deduplicate K8sResources
-        deduped_resources_to_delete: List[K8sResource] = []
-        for r in resources_to_delete:
-            if r not in deduped_resources_to_delete:
-                deduped_resources_to_delete.append(r)
-
-        # Implement dependency sorting
-        final_k8s_resources: List[Union[K8sResource, HelmChart]] = []
+        # Build the dependency graph; resources are deleted before their dependencies
         logger.debug("-*- Building K8sResources dependency graph")
-        for k8s_resource in deduped_resources_to_delete:
-            # Logic to follow if resource has dependencies
-            if k8s_resource.depends_on is not None:
-                # 1. Reverse the order of dependencies
-                k8s_resource.depends_on.reverse()
-
-                # 2. Remove the dependencies if they are already added to the final_k8s_resources
-                for dep in k8s_resource.depends_on:
-                    if dep in final_k8s_resources:
-                        logger.debug(f"-*- Removing {dep.name}, dependency of {k8s_resource.name}")
-                        final_k8s_resources.remove(dep)
-
-                # 3. Add the resource to be deleted before its dependencies
-                if k8s_resource not in final_k8s_resources:
-                    logger.debug(f"-*- Adding {k8s_resource.name}")
-                    final_k8s_resources.append(k8s_resource)
-
-                # 4. Add the dependencies back in reverse order
-                for dep in k8s_resource.depends_on:
-                    if isinstance(dep, K8sResource):
-                        if dep not in final_k8s_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {k8s_resource.name}")
-                            final_k8s_resources.append(dep)
-            else:
-                # Add the resource to be deleted if it has no dependencies
-                if k8s_resource not in final_k8s_resources:
-                    logger.debug(f"-*- Adding {k8s_resource.name}")
-                    final_k8s_resources.append(k8s_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: K8sResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=K8sResource,
+            reverse=True,
+        )
+        for k8s_resource in resources_to_delete:
+            apply_graph.add(k8s_resource)
 
         # Build a list of HelmCharts to create
         if self.charts is not None:
@@ -441,11 +389,13 @@ class K8sResources(InfraResources):
                 if chart.group is None and self.name is not None:
                     chart.group = self.name
                 if chart.should_create(group_filter=group_filter):
-                    if chart not in final_k8s_resources:
+                    if chart not in apply_graph:
                         chart.set_workspace_settings(workspace_settings=self.workspace_settings)
                         if chart.namespace is None:
                             chart.namespace = self.namespace
-                        final_k8s_resources.append(chart)
+                        apply_graph.add(chart)
+
+        final_k8s_resources: List[Union[K8sResource, HelmChart]] = apply_graph.order()
 
         # Track the total number of K8sResources to delete for validation
         num_resources_to_delete: int = len(final_k8s_resources)
@@ -453,10 +403,11 @@ class K8sResources(InfraResources):
         if num_resources_to_delete == 0:
             return 0, 0
 
+        self.attach_snapshot(self.k8s_client, final_k8s_resources)
+
         if dry_run:
             print_heading("--**- K8s resources to delete:")
-            for resource in final_k8s_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_k8s_resources, self.k8s_client, "delete"))
             print_info("")
             print_info(f"Total {num_resources_to_delete} resources")
             return 0, 0
@@ -475,22 +426,18 @@ class K8sResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_k8s_resources:
+
+        def _delete(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
-            # logger.debug(resource)
-            try:
-                _resource_deleted = resource.delete(k8s_client=self.k8s_client)
-                if _resource_deleted:
-                    num_resources_deleted += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_delete_failure:
-                        return num_resources_deleted, num_resources_to_delete
-            except Exception as e:
-                logger.error(f"Failed to delete {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.exception(e)
-                logger.error("Please fix and try again...")
+            return resource.delete(k8s_client=self.k8s_client)
+
+        num_resources_deleted = apply_graph.apply(
+            _delete,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_delete_failure,
+        )
 
         print_heading(f"\n--**-- Resources deleted: {num_resources_deleted}/{num_resources_to_delete}")
         if num_resources_to_delete != num_resources_deleted:
@@ -614,37 +561,14 @@ class K8sResources(InfraResources):
                             ):
                                 resources_to_update.append(_k8s_resource)
 
-        # Sort the K8sResources in install order
-        resources_to_update.sort(key=lambda x: K8sResourceInstallOrder.get(x.__class__.__name__, 5000), reverse=True)
-
-        # Deduplicate K8sResources
-        deduped_resources_to_update: List[K8sResource] = []
-        for r in resources_to_update:
-            if r not in deduped_resources_to_update:
-                deduped_resources_to_update.append(r)
-
-        # Implement dependency sorting
-        final_k8s_resources: List[Union[K8sResource, HelmChart]] = []
+        # Build the dependency graph; dependencies are updated before the resources that use them
         logger.debug("-*- Building K8sResources dependency graph")
-        for k8s_resource in deduped_resources_to_update:
-            # Logic to follow if resource has dependencies
-            if k8s_resource.depends_on is not None:
-                # Add the dependencies before the resource itself
-                for dep in k8s_resource.depends_on:
-                    if isinstance(dep, K8sResource):
-                        if dep not in final_k8s_resources:
-                            logger.debug(f"-*- Adding {dep.name}, dependency of {k8s_resource.name}")
-                            final_k8s_resources.append(dep)
-
-                # Add the resource to be created after its dependencies
-                if k8s_resource not in final_k8s_resources:
-                    logger.debug(f"-*- Adding {k8s_resource.name}")
-                    final_k8s_resources.append(k8s_resource)
-            else:
-                # Add the resource to be created if it has no dependencies
-                if k8s_resource not in final_k8s_resources:
-                    logger.debug(f"-*- Adding {k8s_resource.name}")
-                    final_k8s_resources.append(k8s_resource)
+        apply_graph = ApplyGraph(
+            tier=lambda x: -K8sResourceInstallOrder.get(x.__class__.__name__, 5000),
+            resource_class=K8sResource,
+        )
+        for k8s_resource in resources_to_update:
+            apply_graph.add(k8s_resource)
 
         # Build a list of HelmCharts to create
         if self.charts is not None:
@@ -652,11 +576,13 @@ class K8sResources(InfraResources):
                 if chart.group is None and self.name is not None:
                     chart.group = self.name
                 if chart.should_create(group_filter=group_filter):
-                    if chart not in final_k8s_resources:
+                    if chart not in apply_graph:
                         chart.set_workspace_settings(workspace_settings=self.workspace_settings)
                         if chart.namespace is None:
                             chart.namespace = self.namespace
-                        final_k8s_resources.append(chart)
+                        apply_graph.add(chart)
+
+        final_k8s_resources: List[Union[K8sResource, HelmChart]] = apply_graph.order()
 
         # Track the total number of K8sResources to update for validation
         num_resources_to_update: int = len(final_k8s_resources)
@@ -664,10 +590,11 @@ class K8sResources(InfraResources):
         if num_resources_to_update == 0:
             return 0, 0
 
+        self.attach_snapshot(self.k8s_client, final_k8s_resources)
+
         if dry_run:
             print_heading("--**- K8s resources to update:")
-            for resource in final_k8s_resources:
-                print_info(f"  -+-> {resource.get_resource_type()}: {resource.get_resource_name()}")
+            print_plan(plan_resources(final_k8s_resources, self.k8s_client, "update"))
             print_info("")
             print_info(f"Total {num_resources_to_update} resources")
             return 0, 0
@@ -686,22 +613,18 @@ class K8sResources(InfraResources):
                 print_info("-*-")
                 return 0, 0
 
-        for resource in final_k8s_resources:
+
+        def _update(resource) -> bool:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             if force is True:
                 resource.force = True
-            # logger.debug(resource)
-            try:
-                _resource_updated = resource.update(k8s_client=self.k8s_client)
-                if _resource_updated:
-                    num_resources_updated += 1
-                else:
-                    if self.workspace_settings is not None and not self.workspace_settings.continue_on_patch_failure:
-                        return num_resources_updated, num_resources_to_update
-            except Exception as e:
-                logger.error(f"Failed to update {resource.get_resource_type()}: {resource.get_resource_name()}")
-                logger.exception(e)
-                logger.error("Please fix and try again...")
+            return resource.update(k8s_client=self.k8s_client)
+
+        num_resources_updated = apply_graph.apply(
+            _update,
+            max_workers=self.get_apply_workers(),
+            continue_on_failure=self.workspace_settings is None or self.workspace_settings.continue_on_patch_failure,
+        )
 
         print_heading(f"\n--**-- Resources updated: {num_resources_updated}/{num_resources_to_update}")
         if num_resources_to_update != num_resources_updated:
@@ -710,17 +633,15 @@ class K8sResources(InfraResources):
             )  # noqa: E501
         return num_resources_updated, num_resources_to_update
 
-    def save_resources(
+    def get_resources_to_save(
         self,
         group_filter: Optional[str] = None,
         name_filter: Optional[str] = None,
         type_filter: Optional[str] = None,
-    ) -> Tuple[int, int]:
-        from src.backend.kr8.cli.console import print_info, print_heading
+    ) -> List[K8sResource]:
+        """Returns the K8sResources to save, in install order"""
         from src.backend.kr8.k8s.resource.types import K8sResourceInstallOrder
 
-        logger.debug("-*- Saving K8sResources")
-
         # Build a list of K8sResources to save
         resources_to_save: List[K8sResource] = []
         if self.resources is not None:
@@ -857,16 +778,58 @@ class K8sResources(InfraResources):
                     logger.debug(f"-*- Adding {k8s_resource.name}")
                     final_k8s_resources.append(k8s_resource)
 
+        return final_k8s_resources
+
+    def get_manifest_renderer(self) -> ManifestRenderer:
+        from src.backend.kr8.workspace.helpers import get_workspace_dir_from_env
+
+        workspace_dir = self.workspace_dir or get_workspace_dir_from_env()
+        return ManifestRenderer(cache_file=get_manifest_cache_file(workspace_dir, f"{self.env}-{self.name}"))
+
+    def render_manifests(
+        self,
+        group_filter: Optional[str] = None,
+        name_filter: Optional[str] = None,
+        type_filter: Optional[str] = None,
+        output_format: str = "yaml",
+    ) -> str:
+        """Returns the manifests for every K8sResource to save as one multi-document stream,
+        eg: for `kubectl apply -f -` or server-side apply
+        """
+        renderer = self.get_manifest_renderer()
+        stream = renderer.render_stream(
+            self.get_resources_to_save(group_filter=group_filter, name_filter=name_filter, type_filter=type_filter),
+            output_format=output_format,
+        )
+        renderer.save()
+        return stream
+
+    def save_resources(
+        self,
+        group_filter: Optional[str] = None,
+        name_filter: Optional[str] = None,
+        type_filter: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        from src.backend.kr8.cli.console import print_info, print_heading
+
+        logger.debug("-*- Saving K8sResources")
+
+        final_k8s_resources = self.get_resources_to_save(
+            group_filter=group_filter, name_filter=name_filter, type_filter=type_filter
+        )
+
         # Track the total number of K8sResources to save for validation
         num_resources_to_save: int = len(final_k8s_resources)
         num_resources_saved: int = 0
         if num_resources_to_save == 0:
             return 0, 0
 
+        # Reuse manifests rendered in a previous run for resources that did not change
+        renderer = self.get_manifest_renderer()
         for resource in final_k8s_resources:
             print_info(f"\n-==+==- {resource.get_resource_type()}: {resource.get_resource_name()}")
             try:
-                _resource_path = resource.save_manifests(default_flow_style=False)
+                _resource_path = resource.save_manifests(renderer=renderer, default_flow_style=False)
                 if _resource_path is not None:
                     print_info(f"Saved to: {_resource_path}")
                     num_resources_saved += 1
@@ -874,6 +837,7 @@ class K8sResources(InfraResources):
                 logger.error(f"Failed to save {resource.get_resource_type()}: {resource.get_resource_name()}")
                 logger.exception(e)
                 logger.error("Please fix and try again...")
+        renderer.save()
 
         print_heading(f"\n--**-- Resources saved: {num_resources_saved}/{num_resources_to_save}")
         if num_resources_to_save != num_resources_saved:
@@ -15,6 +15,9 @@ class AssistantKnowledge(BaseModel):
     optimize_on: Optional[int] = 1000
     cache: Dict[str, Any] = {}  # Simple cache implementation
     user_id: Optional[int] = None 
+    # Optional second stage: search over-fetches rerank_candidates documents and the reranker keeps the best
+    reranker: Optional[Any] = None
+    rerank_candidates: Optional[int] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -30,6 +33,14 @@ class AssistantKnowledge(BaseModel):
             logger.warning("No vector db provided")
             return None
 
+        try:
+            return self.vector_db.get_document_by_id(document_id)
+        except (AttributeError, NotImplementedError):
+            logger.debug("Vector db has no exact id lookup, falling back to search")
+        except Exception as e:
+            logger.error(f"Error retrieving document by ID: {e}")
+            return None
+
         try:
             results = self.vector_db.search(query=f"id:{document_id}", limit=1, collection=self.get_collection_name())
             if results:
@@ -37,8 +48,25 @@ class AssistantKnowledge(BaseModel):
         except Exception as e:
             logger.error(f"Error retrieving document by ID: {e}")
         return None
+
+    def get_documents_by_metadata(
+        self, filters: Dict[str, Any], name: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Document]:
+        """Exact lookup of documents whose metadata contains every key/value in `filters`."""
+        if self.vector_db is None:
+            logger.warning("No vector db provided")
+            return []
+
+        try:
+            return self.vector_db.get_documents_by_metadata(filters, name=name, limit=limit)
+        except Exception as e:
+            logger.error(f"Error retrieving documents by metadata {filters}: {e}")
+            return []
     
-    def search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
+    def search(
+        self, query: str, num_documents: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Returns the documents most relevant to query. filters are applied by the vector db before the limit."""
         logger.info(f"Searching for query: {query}")
         try:
             if self.vector_db is None:
@@ -46,14 +74,40 @@ class AssistantKnowledge(BaseModel):
                 return []
 
             _num_documents = num_documents or self.num_documents
+            # Only vector dbs with filter support accept the argument
+            search_kwargs: Dict[str, Any] = {"filters": filters} if filters else {}
+            _num_candidates = self.rerank_candidates or self.num_documents
+            # Listings that ask for at least the whole candidate pool are returned in retrieval order
+            if self.reranker is not None and (num_documents is None or num_documents < _num_candidates):
+                # Retrieval is cheap, fetch a wide candidate pool and let the reranker pick the top-k
+                logger.debug(f"Getting {_num_candidates} candidate documents for query: {query}")
+                candidates = self.vector_db.search(
+                    query=query, limit=_num_candidates, collection=self.get_collection_name(), **search_kwargs
+                )
+                results = self.rerank(query, candidates, top_k=num_documents)
+                logger.info(f"Kept {len(results)} of {len(candidates)} documents after reranking")
+                return results
+
             logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
-            results = self.vector_db.search(query=query, limit=_num_documents, collection=self.get_collection_name())
+            results = self.vector_db.search(
+                query=query, limit=_num_documents, collection=self.get_collection_name(), **search_kwargs
+            )
             logger.info(f"Found {len(results)} documents")
             return results
         except Exception as e:
             logger.error(f"Error searching for documents: {e}")
             return []
 
+    def rerank(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> List[Document]:
+        """Reorders documents with the reranker, falling back to the retrieval order if it fails."""
+        if self.reranker is None or not documents:
+            return documents[:top_k] if top_k else documents
+        try:
+            return self.reranker.rerank(query, documents, top_k=top_k)
+        except Exception as e:
+            logger.error(f"Error reranking documents, using retrieval order: {e}")
+            return documents[: top_k or self.reranker.top_k]
+
     def load(self, recreate: bool = False, upsert: bool = False, skip_existing: bool = True) -> None:
         if self.vector_db is None:
             logger.warning("No vector db provided")
@@ -106,6 +160,14 @@ class AssistantKnowledge(BaseModel):
             logger.warning("No vector db provided")
             return None
 
+        try:
+            return self.vector_db.get_document_by_name(name)
+        except (AttributeError, NotImplementedError):
+            logger.debug("Vector db has no exact name lookup, falling back to search")
+        except Exception as e:
+            logger.error(f"Error retrieving document by name: {e}")
+            return None
+
         try:
             results = self.vector_db.search(query=f"name:{name}", limit=1, collection=self.get_collection_name())
             if results:
@@ -144,7 +206,8 @@ class AssistantKnowledge(BaseModel):
         documents = self.search(df_name, num_documents=1)
         if documents:
             doc = documents[0]
-            if doc.meta_data.get("type") == "dataframe":
+            # Newer dataframes only index a summary here; their data lives in the dataframe store
+            if doc.meta_data.get("type") == "dataframe" and doc.meta_data.get("storage") is None:
                 # Convert CSV string representation back to DataFrame
                 return pd.read_csv(io.StringIO(doc.content))
         return None
@@ -9,6 +9,7 @@ from src.backend.kr8.utils.log import logger
 from src.backend.kr8.utils.timer import Timer
 from src.backend.kr8.utils.tools import get_function_call_for_tool_call
 from src.backend.kr8.llm.offline_llm import OfflineLLM
+from src.backend.kr8.llm.ollama.warm_pool import get_ollama_client
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 try:
@@ -35,6 +36,9 @@ class Ollama(LLM):
 
     @property
     def client(self) -> OllamaClient:
+        if self.ollama_client is None and not self.client_kwargs:
+            # Shared with the warm pool and every other Ollama llm of this server, so connections are reused
+            self.ollama_client = get_ollama_client(self.base_url, self.timeout)
         if self.ollama_client is None:
             _ollama_params: Dict[str, Any] = {"host": self.base_url}
             if self.timeout:
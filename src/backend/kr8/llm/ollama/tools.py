@@ -4,6 +4,7 @@ from typing import Optional, List, Iterator, Dict, Any, Mapping, Union
 
 from src.backend.kr8.llm.base import LLM
 from src.backend.kr8.llm.message import Message
+from src.backend.kr8.llm.ollama.warm_pool import get_ollama_client
 from src.backend.kr8.llm.exceptions import InvalidToolCallException
 from src.backend.kr8.tools.function import FunctionCall
 from src.backend.kr8.utils.log import logger
@@ -40,6 +41,9 @@ class OllamaTools(LLM):
     def client(self) -> OllamaClient:
         if self.ollama_client:
             return self.ollama_client
+        if not self.client_kwargs:
+            # Shared per server, so calls reuse its connections instead of opening new ones each time
+            return get_ollama_client(self.host, self.timeout)
 
         _ollama_params: Dict[str, Any] = {}
         if self.host:
@@ -0,0 +1,184 @@
+import atexit
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.backend.kr8.utils.log import logger
+
+try:
+    from ollama import Client as OllamaClient
+except ImportError:
+    logger.error("`ollama` not installed")
+    raise
+
+_clients: Dict[Tuple[Optional[str], Any], OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ollama_client(base_url: Optional[str], timeout: Optional[Any] = None) -> OllamaClient:
+    """One client, and with it one pool of keep-alive connections, per Ollama server (None: OLLAMA_HOST)"""
+    key = (base_url, timeout)
+    with _clients_lock:
+        if key not in _clients:
+            params: Dict[str, Any] = {"host": base_url}
+            if timeout:
+                params["timeout"] = timeout
+            _clients[key] = OllamaClient(**params)
+        return _clients[key]
+
+
+def keep_alive_seconds(keep_alive: Union[float, int, str, None]) -> Optional[float]:
+    """Seconds a keep_alive value keeps a model loaded ("30m", "1h", "90s", 300, ...); None if forever"""
+    if keep_alive is None:
+        return 300.0  # Ollama's default
+    if isinstance(keep_alive, (int, float)):
+        return None if keep_alive < 0 else float(keep_alive)
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*", str(keep_alive))
+    if match is None:
+        raise ValueError(f"Invalid keep_alive: {keep_alive}")
+    value = float(match.group(1))
+    if value < 0:
+        return None
+    return value * {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+
+
+class OllamaWarmPool:
+    """Keeps the configured Ollama models loaded, so no chat request pays for loading one.
+
+    start() loads every model in the background with an empty prompt, which makes Ollama load it without
+    generating anything, and with keep_alive, so it stays loaded that long after its last request. A background
+    thread then asks the server which models are resident every refresh_interval seconds and loads again any
+    model that was evicted or would expire before the next check. Requests should pass the same keep_alive
+    (the Ollama llm does when created with it), so each one extends the model's residency too.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        models: List[str],
+        keep_alive: Union[float, str] = "30m",
+        refresh_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.base_url = base_url
+        self.models = list(dict.fromkeys(models))
+        self.keep_alive = keep_alive
+        ttl = keep_alive_seconds(keep_alive)
+        # Check well before a model expires; models kept forever only need to be checked for eviction
+        self.refresh_interval = refresh_interval or (min(ttl / 2, 300.0) if ttl else 300.0)
+        self.client = get_ollama_client(base_url, timeout)
+
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.closed = False
+        # model -> {"resident", "expires_at" (epoch seconds, None if forever), "warmups", "last_warmup_seconds", "error"}
+        self.residency: Dict[str, Dict[str, Any]] = {
+            model: {"resident": False, "expires_at": None, "warmups": 0, "last_warmup_seconds": None, "error": None}
+            for model in self.models
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return {model: dict(state) for model, state in self.residency.items()}
+
+    def warm(self, model: str) -> bool:
+        """Loads model and resets its keep_alive; returns whether it succeeded"""
+        started = time.perf_counter()
+        try:
+            self.client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+        except Exception as e:
+            logger.warning(f"Could not load Ollama model {model}: {e}")
+            with self.lock:
+                self.residency[model].update(resident=False, error=str(e))
+            return False
+        seconds = time.perf_counter() - started
+        ttl = keep_alive_seconds(self.keep_alive)
+        with self.lock:
+            self.residency[model].update(
+                resident=True,
+                expires_at=time.time() + ttl if ttl is not None else None,
+                warmups=self.residency[model]["warmups"] + 1,
+                last_warmup_seconds=round(seconds, 3),
+                error=None,
+            )
+        logger.info(f"Ollama model {model} warmed in {seconds:.2f}s, keep_alive {self.keep_alive}")
+        return True
+
+    def refresh_residency(self) -> Dict[str, Optional[float]]:
+        """Asks the server which models are loaded; returns model -> expires_at (epoch seconds, None if forever)"""
+        response = self.client.ps()
+        loaded: Dict[str, Optional[float]] = {}
+        for entry in response.get("models") or []:
+            name = entry.get("name") or entry.get("model")
+            expires_at = entry.get("expires_at")
+            if isinstance(expires_at, str):
+                try:
+                    expires_at = datetime.fromisoformat(re.sub(r"(\.\d{6})\d+", r"\1", expires_at.replace("Z", "+00:00")))
+                except ValueError:
+                    expires_at = None
+            expires = expires_at.timestamp() if isinstance(expires_at, datetime) else None
+            # Ollama reports models kept forever with an expiry centuries away
+            loaded[name] = None if expires is not None and expires - time.time() > 10 * 365 * 86400 else expires
+        with self.lock:
+            for model, state in self.residency.items():
+                name = model if model in loaded else f"{model}:latest" if f"{model}:latest" in loaded else None
+                state["resident"] = name is not None
+                if name is not None:
+                    state["expires_at"] = loaded[name]
+        return loaded
+
+    def maintain(self) -> None:
+        """Loads every model that is not resident or would expire before the next check"""
+        try:
+            self.refresh_residency()
+        except Exception as e:
+            # Servers without /api/ps: rely on the expiry we computed when loading
+            logger.debug(f"Could not list loaded Ollama models: {e}")
+        horizon = time.time() + self.refresh_interval * 1.5
+        for model, state in self.stats().items():
+            if self.closed:
+                return
+            if not state["resident"] or (state["expires_at"] is not None and state["expires_at"] < horizon):
+                self.warm(model)
+
+    def _run(self) -> None:
+        while not self.closed:
+            self.maintain()
+            self.wakeup.wait(timeout=self.refresh_interval)
+            self.wakeup.clear()
+
+    def start(self) -> None:
+        """Loads the models and keeps them loaded, in a background thread so startup does not wait for it"""
+        if not self.models or self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="ollama-warm-pool", daemon=True)
+        self.thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.closed = True
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+
+
+_warm_pool: Optional[OllamaWarmPool] = None
+_warm_pool_lock = threading.Lock()
+
+
+def get_ollama_warm_pool() -> OllamaWarmPool:
+    """Process-wide warm pool of the models in OLLAMA_WARM_MODELS, stopped at exit"""
+    global _warm_pool
+    with _warm_pool_lock:
+        if _warm_pool is None:
+            from src.backend.core.config import settings
+
+            _warm_pool = OllamaWarmPool(
+                base_url=settings.OLLAMA_BASE_URL or "http://ollama:11434",
+                models=settings.OLLAMA_WARM_MODELS,
+                keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            )
+            atexit.register(_warm_pool.close)
+        return _warm_pool
@@ -0,0 +1,197 @@
+"""OllamaWarmPool benchmark
+
+Starts a fake Ollama server that, like the real one, takes --load seconds to load a model that is not resident and
+unloads it keep_alive seconds after its last request (--server-keep-alive when a request has none). Then streams
+chats with the Ollama llm separated by idle periods longer than that default, once as deployed before (no warm
+pool, no keep_alive) and once with an OllamaWarmPool and keep_alive. Reports time to first token of both runs,
+how many chats paid for a load, and the pool's residency stats.
+
+Usage:
+    python -m src.backend.kr8.llm.ollama.warm_pool_benchmark
+    python -m src.backend.kr8.llm.ollama.warm_pool_benchmark --chats 10 --idle 4 --load 2 --keep-alive 10s
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.backend.kr8.llm.message import Message
+from src.backend.kr8.llm.ollama.chat import Ollama
+from src.backend.kr8.llm.ollama.warm_pool import OllamaWarmPool, keep_alive_seconds
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """Serves /api/chat, /api/generate, /api/ps and /api/tags with Ollama's load and unload behavior"""
+
+    daemon_threads = True
+
+    def __init__(self, load_seconds: float, default_keep_alive: float, token_seconds: float = 0.01):
+        super().__init__(("127.0.0.1", 0), FakeOllamaHandler)
+        self.load_seconds = load_seconds
+        self.default_keep_alive = default_keep_alive
+        self.token_seconds = token_seconds
+        self.lock = threading.Lock()
+        # model -> epoch seconds it unloads at (None if never)
+        self.resident: Dict[str, Optional[float]] = {}
+        self.loads: int = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def _is_resident(self, model: str) -> bool:
+        expires_at = self.resident.get(model, 0.0)
+        return model in self.resident and (expires_at is None or expires_at > time.time())
+
+    def use(self, model: str, keep_alive: Any) -> None:
+        """Loads model if it is not resident, then keeps it keep_alive seconds from now"""
+        with self.lock:
+            resident = self._is_resident(model)
+            if not resident:
+                self.loads += 1
+        if not resident:
+            time.sleep(self.load_seconds)
+        ttl = keep_alive_seconds(keep_alive) if keep_alive is not None else self.default_keep_alive
+        with self.lock:
+            self.resident[model] = time.time() + ttl if ttl is not None else None
+
+    def ps(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            models = [(model, self.resident[model]) for model in list(self.resident) if self._is_resident(model)]
+        return [
+            {
+                "name": model,
+                "model": model,
+                "expires_at": datetime.fromtimestamp(expires_at or time.time() + 100 * 365 * 86400, timezone.utc)
+                .isoformat(),
+            }
+            for model, expires_at in models
+        ]
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    server: FakeOllama
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path == "/api/ps":
+            self._send_json({"models": self.server.ps()})
+        elif self.path == "/api/tags":
+            self._send_json({"models": self.server.ps()})
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        model = body.get("model", "")
+        self.server.use(model, body.get("keep_alive"))
+        created_at = datetime.now(timezone.utc).isoformat()
+        if self.path == "/api/generate":
+            self._send_json({"model": model, "created_at": created_at, "response": "", "done": True})
+            return
+        if self.path != "/api/chat":
+            self.send_error(404)
+            return
+
+        words = ["Sure", ",", " here", " is", " the", " answer", "."]
+        if not body.get("stream", True):
+            message = {"role": "assistant", "content": "".join(words)}
+            self._send_json({"model": model, "created_at": created_at, "message": message, "done": True})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for word in words:
+            chunk = {"model": model, "created_at": created_at,
+                     "message": {"role": "assistant", "content": word}, "done": False}
+            self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            self.wfile.flush()
+            time.sleep(self.server.token_seconds)
+        done = {"model": model, "created_at": created_at, "message": {"role": "assistant", "content": ""},
+                "done": True}
+        self.wfile.write(json.dumps(done).encode() + b"\n")
+        self.wfile.flush()
+
+
+def _time_to_first_token(llm: Ollama) -> float:
+    started = time.perf_counter()
+    stream = llm.response_stream(messages=[Message(role="user", content="What are your opening hours?")])
+    next(iter(stream))
+    seconds = time.perf_counter() - started
+    for _ in stream:
+        pass
+    return seconds
+
+
+def _run(llm: Ollama, chats: int, idle: float) -> List[float]:
+    timings = []
+    for i in range(chats):
+        if i:
+            time.sleep(idle)
+        timings.append(_time_to_first_token(llm))
+    return timings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure time to first token after idle periods, with and "
+                                                 "without OllamaWarmPool, against a fake Ollama server.")
+    parser.add_argument("--model", default="llama3.1", help="Model name")
+    parser.add_argument("--chats", type=int, default=6, help="Chats per run")
+    parser.add_argument("--idle", type=float, default=3.0, help="Idle seconds between chats")
+    parser.add_argument("--load", type=float, default=1.5, help="Seconds the fake server takes to load the model")
+    parser.add_argument("--server-keep-alive", type=float, default=2.0,
+                        help="Seconds the fake server keeps a model after a request without keep_alive")
+    parser.add_argument("--keep-alive", default="6s", help="keep_alive of the warm pool and its llm")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for label in ("cold", "warm pool"):
+        server = FakeOllama(load_seconds=args.load, default_keep_alive=args.server_keep_alive)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        pool = None
+        try:
+            if label == "cold":
+                llm = Ollama(model=args.model, base_url=server.url)
+            else:
+                pool = OllamaWarmPool(base_url=server.url, models=[args.model], keep_alive=args.keep_alive)
+                pool.warm(args.model)  # what startup does, before any chat arrives
+                pool.start()
+                llm = Ollama(model=args.model, base_url=server.url, keep_alive=args.keep_alive)
+            loads_before = server.loads
+            timings = _run(llm, args.chats, args.idle)
+            results[label] = (timings, server.loads - loads_before)
+            if pool is not None:
+                print(json.dumps(pool.stats(), indent=2))
+        finally:
+            if pool is not None:
+                pool.close()
+            server.shutdown()
+            server.server_close()
+
+    print(f"{args.chats} chats, {args.idle}s idle between them, {args.load}s model load")
+    for label, (timings, loads) in results.items():
+        ordered = sorted(timings)
+        print(
+            f"{label:<10} ttft p50 {ordered[len(ordered) // 2]:6.3f} s  max {ordered[-1]:6.3f} s  "
+            f"chats that loaded the model {loads:>3}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+import asyncio
+import copy
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from src.backend.kr8.llm.base import LLM
+from src.backend.kr8.llm.message import Message
+from src.backend.kr8.utils.log import logger
+
+# Settings the assistant puts on its llm, copied to the provider that serves each call
+_SHARED_FIELDS = (
+    "tools", "functions", "tool_choice", "show_tool_calls", "response_format", "run_id", "system_prompt", "instructions"
+)
+# Settings with a default, copied only once set on the router so each provider keeps its own default otherwise
+_SHARED_SET_FIELDS = ("run_tools", "function_call_limit")
+
+
+def provider_key(llm: LLM) -> str:
+    base_url = getattr(llm, "base_url", None)
+    return f"{type(llm).__name__}:{llm.model}" + (f"@{base_url}" if base_url else "")
+
+
+class ProviderStats:
+    """Rolling latency and error statistics of one provider, and its circuit breaker"""
+
+    def __init__(self, window: int = 200):
+        self.lock = threading.Lock()
+        # "response" is the time to a whole response, "first_chunk" the time to the first streamed chunk
+        self.latencies: Dict[str, Deque[float]] = {"response": deque(maxlen=window), "first_chunk": deque(maxlen=window)}
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures: int = 0
+        self.open_until: float = 0.0
+        self.last_error: Optional[str] = None
+        # Counters
+        self.num_requests: int = 0
+        self.num_errors: int = 0
+        self.num_hedges: int = 0
+        self.num_hedge_wins: int = 0
+        self.num_failovers: int = 0
+
+    def add_latency(self, kind: str, seconds: float) -> None:
+        with self.lock:
+            self.latencies[kind].append(seconds)
+
+    def add_outcome(self, error: Optional[BaseException] = None, failure_threshold: int = 3, cooldown: float = 30.0):
+        with self.lock:
+            self.num_requests += 1
+            self.outcomes.append(error is None)
+            if error is None:
+                self.consecutive_failures = 0
+                return
+            self.num_errors += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            if self.consecutive_failures >= failure_threshold:
+                # Skipped until the cooldown ends, then tried again with the next call
+                self.open_until = time.monotonic() + cooldown
+
+    def count(self, counter: str) -> None:
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    def percentile(self, kind: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        with self.lock:
+            values = sorted(self.latencies[kind])
+        if len(values) < max(1, min_samples):
+            return None
+        return values[min(len(values) - 1, int(len(values) * percentile))]
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {}
+        for kind in self.latencies:
+            for percentile in (0.5, 0.95, 0.99):
+                value = self.percentile(kind, percentile)
+                metrics[f"{kind}_p{int(percentile * 100)}"] = round(value, 3) if value is not None else None
+        with self.lock:
+            metrics.update({
+                "requests": self.num_requests,
+                "errors": self.num_errors,
+                "error_rate": round(self.outcomes.count(False) / len(self.outcomes), 3) if self.outcomes else 0.0,
+                "hedges": self.num_hedges,
+                "hedge_wins": self.num_hedge_wins,
+                "failovers": self.num_failovers,
+                "circuit_open": time.monotonic() < self.open_until,
+                "last_error": self.last_error,
+            })
+        return metrics
+
+
+class HealthCache:
+    """Caches the result of health probes for ttl seconds, so they stay off the request path"""
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        # key -> (healthy, expires_at, error)
+        self.results: Dict[str, Tuple[bool, float, Optional[str]]] = {}
+
+    def check(self, key: str, probe: Callable[[], Any], ttl: Optional[float] = None) -> bool:
+        """Returns the cached result for key, or runs probe, which raises when unhealthy, and caches it"""
+        with self.lock:
+            cached = self.results.get(key)
+        if cached is not None and time.monotonic() < cached[1]:
+            return cached[0]
+        try:
+            probe()
+            result = (True, None)
+        except Exception as e:
+            logger.warning(f"Health check {key} failed: {e}")
+            result = (False, str(e))
+        with self.lock:
+            self.results[key] = (result[0], time.monotonic() + (self.ttl if ttl is None else ttl), result[1])
+        return result[0]
+
+    def last_error(self, key: str) -> Optional[str]:
+        with self.lock:
+            cached = self.results.get(key)
+        return cached[2] if cached else None
+
+    def peek(self, key: str) -> Optional[bool]:
+        with self.lock:
+            cached = self.results.get(key)
+        return cached[0] if cached else None
+
+
+health_cache = HealthCache()
+
+_provider_stats: Dict[str, ProviderStats] = {}
+_provider_stats_lock = threading.Lock()
+# Hedged calls that lose keep running here until they finish; streams stop at their next chunk
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-router")
+
+
+def get_provider_stats(llm: LLM) -> ProviderStats:
+    """Process-wide statistics of a provider, shared by every router that uses it"""
+    key = provider_key(llm)
+    with _provider_stats_lock:
+        if key not in _provider_stats:
+            _provider_stats[key] = ProviderStats()
+        return _provider_stats[key]
+
+
+def get_provider_metrics() -> Dict[str, Dict[str, Any]]:
+    with _provider_stats_lock:
+        stats = dict(_provider_stats)
+    return {key: {**provider.metrics(), "healthy": health_cache.peek(key)} for key, provider in stats.items()}
+
+
+def _probe(llm: LLM) -> None:
+    base_url = getattr(llm, "base_url", None)
+    if base_url:
+        # Local Ollama; hosted APIs have no cheap probe and rely on the error statistics instead
+        httpx.get(f"{base_url}/api/tags", timeout=2.0).raise_for_status()
+
+
+class LLMRouter(LLM):
+    """Routes each call to the first available of providers, in order, with failover and hedging.
+
+    A provider is skipped while its circuit is open (failure_threshold consecutive errors, for cooldown
+    seconds) or its cached health check fails. If the call fails before anything was returned, the next
+    provider is tried. If the call takes longer than the hedge_percentile latency of the provider, a second
+    call goes to the next provider and the first answer wins. Streams hedge and fail over on the time to the
+    first chunk, and never once a chunk was yielded. Calls that may run tools are not hedged unless
+    hedge_with_tools, since the tools would run twice.
+    """
+
+    name: str = "LLMRouter"
+    model: str = "router"
+    providers: List[LLM]
+    hedge_percentile: Optional[float] = 0.95
+    hedge_min_samples: int = 20
+    hedge_with_tools: bool = False
+    failure_threshold: int = 3
+    cooldown: float = 30.0
+    health_ttl: float = 30.0
+
+    def candidates(self) -> List[LLM]:
+        """Providers in the order to try them; unavailable ones last, as a last resort"""
+        available, unavailable = [], []
+        for provider in self.providers:
+            healthy = get_provider_stats(provider).available() and health_cache.check(
+                provider_key(provider), lambda: _probe(provider), ttl=self.health_ttl
+            )
+            (available if healthy else unavailable).append(provider)
+        return available + unavailable
+
+    def _hedge_after(self, provider: LLM, kind: str) -> Optional[float]:
+        if self.hedge_percentile is None or (self.functions and not self.hedge_with_tools):
+            return None
+        return get_provider_stats(provider).percentile(kind, self.hedge_percentile, self.hedge_min_samples)
+
+    def _prepare(self, provider: LLM) -> LLM:
+        """A copy of provider with the router's settings and state for one call.
+
+        Providers are shared by every copy of the router and by concurrent calls, so each call runs on its own
+        copy; every shared field is copied, None included, so a router without tools never runs the provider's.
+        """
+        update: Dict[str, Any] = {field: getattr(self, field) for field in _SHARED_FIELDS}
+        for field in _SHARED_SET_FIELDS:
+            if field not in self.model_fields_set:
+                continue
+            value = getattr(self, field)
+            if field == "function_call_limit":
+                # Like Assistant.tool_call_limit, only ever lowers the provider's own limit
+                value = min(value, provider.function_call_limit)
+            update[field] = value
+        update["metrics"] = copy.deepcopy(self.metrics)
+        update["function_call_stack"] = list(self.function_call_stack) if self.function_call_stack is not None else None
+        return provider.model_copy(update=update)
+
+    def _adopt(self, call: LLM, messages: List[Message], provider_messages: List[Message]) -> None:
+        # Providers append the assistant and tool messages to the list they were given
+        messages[:] = provider_messages
+        self.metrics = call.metrics
+        self.function_call_stack = call.function_call_stack
+
+    def _call(self, provider: LLM, call: LLM, messages: List[Message]) -> str:
+        stats = get_provider_stats(provider)
+        started = time.perf_counter()
+        try:
+            result = call.response(messages=messages)
+        except Exception as e:
+            stats.add_outcome(e, self.failure_threshold, self.cooldown)
+            raise
+        stats.add_latency("response", time.perf_counter() - started)
+        stats.add_outcome(None)
+        return result
+
+    def response(self, messages: List[Message]) -> str:
+        candidates = self.candidates()
+        hedge_after = self._hedge_after(candidates[0], "response")
+        pending: Dict[Any, Tuple[LLM, LLM, List[Message]]] = {}
+        next_index = 0
+        hedged = False
+        last_error: Optional[Exception] = None
+
+        def start() -> None:
+            nonlocal next_index
+            provider, provider_messages = candidates[next_index], list(messages)
+            call = self._prepare(provider)
+            next_index += 1
+            future = _executor.submit(self._call, provider, call, provider_messages)
+            pending[future] = (provider, call, provider_messages)
+
+        start()
+        while pending:
+            can_hedge = hedge_after is not None and not hedged and next_index < len(candidates)
+            done, _ = wait(list(pending), timeout=hedge_after if can_hedge else None, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                get_provider_stats(candidates[0]).count("num_hedges")
+                logger.info(f"{provider_key(candidates[0])} slower than {hedge_after:.2f}s, hedging")
+                start()
+                continue
+            for future in done:
+                provider, call, provider_messages = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"LLM provider {provider_key(provider)} failed: {e}")
+                    last_error = e
+                    continue
+                if hedged and provider is not candidates[0]:
+                    get_provider_stats(provider).count("num_hedge_wins")
+                self._adopt(call, messages, provider_messages)
+                return result
+            if not pending and next_index < len(candidates):
+                get_provider_stats(candidates[next_index]).count("num_failovers")
+                start()
+        raise last_error or RuntimeError("No LLM provider available")
+
+    async def aresponse(self, messages: List[Message]) -> str:
+        return await asyncio.to_thread(self.response, messages)
+
+    def _stream_into(
+        self,
+        index: int,
+        provider: LLM,
+        call: LLM,
+        messages: List[Message],
+        items: queue.Queue,
+        cancel: threading.Event,
+    ) -> None:
+        stats = get_provider_stats(provider)
+        started = time.perf_counter()
+        first = True
+        stream = None
+        try:
+            stream = call.response_stream(messages=messages)
+            for chunk in stream:
+                if first:
+                    stats.add_latency("first_chunk", time.perf_counter() - started)
+                    first = False
+                if cancel.is_set():
+                    return
+                items.put((index, "chunk", chunk))
+            stats.add_outcome(None)
+            items.put((index, "done", None))
+        except Exception as e:
+            stats.add_outcome(e, self.failure_threshold, self.cooldown)
+            items.put((index, "error", e))
+        finally:
+            if cancel.is_set() and hasattr(stream, "close"):
+                stream.close()
+
+    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+        candidates = self.candidates()
+        hedge_after = self._hedge_after(candidates[0], "first_chunk")
+        items: queue.Queue = queue.Queue()
+        cancels: Dict[int, threading.Event] = {}
+        copies: Dict[int, List[Message]] = {}
+        calls: Dict[int, LLM] = {}
+        active = set()
+        hedged = False
+
+        def start() -> None:
+            index = len(cancels)
+            cancels[index], copies[index] = threading.Event(), list(messages)
+            calls[index] = self._prepare(candidates[index])
+            active.add(index)
+            _executor.submit(
+                self._stream_into, index, candidates[index], calls[index], copies[index], items, cancels[index]
+            )
+
+        start()
+        try:
+            # Wait for the first provider to produce something
+            while True:
+                can_hedge = hedge_after is not None and not hedged and len(cancels) < len(candidates)
+                try:
+                    index, kind, value = items.get(timeout=hedge_after if can_hedge else None)
+                except queue.Empty:
+                    hedged = True
+                    get_provider_stats(candidates[0]).count("num_hedges")
+                    logger.info(f"{provider_key(candidates[0])} first chunk slower than {hedge_after:.2f}s, hedging")
+                    start()
+                    continue
+                if kind != "error":
+                    break
+                logger.warning(f"LLM provider {provider_key(candidates[index])} failed: {value}")
+                active.discard(index)
+                if not active:
+                    if len(cancels) >= len(candidates):
+                        raise value
+                    get_provider_stats(candidates[len(cancels)]).count("num_failovers")
+                    start()
+
+            winner = index
+            for other in active - {winner}:
+                cancels[other].set()
+            if hedged and winner != 0:
+                get_provider_stats(candidates[winner]).count("num_hedge_wins")
+
+            # Then stream the winner only
+            while kind == "chunk":
+                yield value
+                index, kind, value = items.get()
+                while index != winner:
+                    index, kind, value = items.get()
+            if kind == "error":
+                raise value
+            self._adopt(calls[winner], messages, copies[winner])
+        finally:
+            for cancel in cancels.values():
+                cancel.set()
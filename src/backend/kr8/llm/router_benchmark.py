@@ -0,0 +1,110 @@
+"""LLMRouter benchmark
+
+Sends the same calls straight to a fake primary provider and through an LLMRouter with a fake fallback. The
+fakes take a base delay, are slow on a fraction of calls and fail on another. Reports p50, p99 and errors of
+both, and the router's per-provider metrics (hedges, hedge wins, failovers, circuit state).
+
+Usage:
+    python -m src.backend.kr8.llm.router_benchmark
+    python -m src.backend.kr8.llm.router_benchmark --calls 300 --slow-fraction 0.05 --error-rate 0.02 --stream
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Any, Iterator, List, Optional, Sequence
+
+from src.backend.kr8.llm.base import LLM
+from src.backend.kr8.llm.message import Message
+from src.backend.kr8.llm.router import LLMRouter, get_provider_metrics
+
+
+class FakeProvider(LLM):
+    """Answers after delay seconds, or slow_delay seconds on slow_fraction of calls, and fails on error_rate"""
+
+    name: str = "FakeProvider"
+    delay: float = 0.05
+    slow_delay: float = 1.0
+    slow_fraction: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    rng: Optional[Any] = None
+    lock: Optional[Any] = None
+
+    def _wait(self) -> None:
+        if self.rng is None:
+            self.rng, self.lock = random.Random(self.seed), threading.Lock()
+        with self.lock:
+            slow = self.rng.random() < self.slow_fraction
+            fail = self.rng.random() < self.error_rate
+        time.sleep(self.slow_delay if slow else self.delay)
+        if fail:
+            raise RuntimeError(f"{self.model} failed")
+
+    def response(self, messages: List[Message]) -> str:
+        self._wait()
+        return f"answer from {self.model}"
+
+    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+        self._wait()
+        for word in ("answer", "from", self.model):
+            yield f"{word} "
+
+
+def _measure(llm: LLM, calls: int, stream: bool) -> dict:
+    latencies, errors = [], 0
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            if stream:
+                next(iter(llm.response_stream(messages=[])))
+            else:
+                llm.response(messages=[])
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50": latencies[len(latencies) // 2] if latencies else None,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else None,
+        "errors": errors,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure LLMRouter hedging and failover against fake providers.")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per run")
+    parser.add_argument("--delay", type=float, default=0.05, help="Usual seconds per call")
+    parser.add_argument("--slow-delay", type=float, default=1.0, help="Seconds per slow call")
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="Fraction of slow primary calls")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of failing primary calls")
+    parser.add_argument("--hedge-percentile", type=float, default=0.9, help="Hedge after this latency percentile")
+    parser.add_argument("--stream", action="store_true", help="Time the first streamed chunk instead")
+    args = parser.parse_args(argv)
+
+    def primary(seed: int) -> FakeProvider:
+        return FakeProvider(model="primary", delay=args.delay, slow_delay=args.slow_delay,
+                            slow_fraction=args.slow_fraction, error_rate=args.error_rate, seed=seed)
+
+    direct = _measure(primary(seed=1), args.calls, args.stream)
+    router = LLMRouter(
+        providers=[primary(seed=1), FakeProvider(model="fallback", delay=args.delay * 1.5, seed=2)],
+        hedge_percentile=args.hedge_percentile,
+        hedge_min_samples=10,
+    )
+    routed = _measure(router, args.calls, args.stream)
+
+    for label, result in (("direct", direct), ("router", routed)):
+        p50 = f"{result['p50']:.3f}" if result["p50"] is not None else "-"
+        p99 = f"{result['p99']:.3f}" if result["p99"] is not None else "-"
+        print(f"{label:<8} p50 {p50:>7} s  p99 {p99:>7} s  errors {result['errors']:>4}")
+    print(json.dumps(get_provider_metrics(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
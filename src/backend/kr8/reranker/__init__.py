@@ -0,0 +1 @@
+from src.backend.kr8.reranker.base import Reranker
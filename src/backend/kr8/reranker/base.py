@@ -0,0 +1,47 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from src.backend.kr8.document import Document
+
+
+class Reranker(BaseModel):
+    """Base class for rerankers, which reorder the candidates returned by a vector search"""
+
+    # Documents kept after reranking
+    top_k: int = 8
+    # Rough budget for the content of the kept documents, None for no limit
+    max_tokens: Optional[int] = 3000
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def score(self, query: str, documents: List[Document]) -> List[float]:
+        raise NotImplementedError
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # Rough estimate, about 4 characters per token for English text
+        return max(1, len(text) // 4)
+
+    def rerank(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> List[Document]:
+        """Returns the best top_k documents for query, most relevant first, that fit in max_tokens."""
+        if not documents:
+            return []
+        _top_k = top_k or self.top_k
+        scores = self.score(query, documents)
+        ranked = sorted(zip(scores, range(len(documents))), key=lambda item: -item[0])
+
+        selected: List[Document] = []
+        used_tokens = 0
+        for score, index in ranked:
+            if len(selected) >= _top_k:
+                break
+            document = documents[index]
+            tokens = self.estimate_tokens(document.content)
+            # Always keep the best document, even when it alone is over the budget
+            if self.max_tokens is not None and selected and used_tokens + tokens > self.max_tokens:
+                continue
+            document.meta_data["rerank_score"] = round(float(score), 4)
+            selected.append(document)
+            used_tokens += tokens
+        return selected
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+from hashlib import md5
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import Field
+
+from src.backend.kr8.document import Document
+from src.backend.kr8.reranker.base import Reranker
+from src.backend.kr8.utils.log import logger
+
+try:
+    from sentence_transformers import CrossEncoder
+except ImportError:
+    logger.error("`sentence_transformers` not installed")
+    raise
+
+# Cross encoders are loaded once per process and shared by every reranker using the same model
+_models: Dict[Tuple[str, str], CrossEncoder] = {}
+_models_lock = threading.Lock()
+
+
+def get_cross_encoder(model: str, device: Optional[str] = None) -> CrossEncoder:
+    key = (model, device or "")
+    with _models_lock:
+        if key not in _models:
+            # Prefer a copy of the model next to the sentence transformer models, so the server can run offline
+            local_model_path = Path("models/cross_encoders").joinpath(model.split("/")[-1])
+            model_path = str(local_model_path) if local_model_path.exists() else model
+            logger.info(f"Loading cross encoder from {model_path}")
+            _models[key] = CrossEncoder(model_path, device=device)
+        return _models[key]
+
+
+class CrossEncoderReranker(Reranker):
+    """Reranks candidates with a small local cross encoder.
+
+    A cross encoder reads the query and the chunk together, so it ranks far better than the bi-encoder
+    distance used for retrieval, but costs one forward pass per pair. Pairs are scored in batches and the
+    scores are cached by (query, content hash), so repeated questions and follow-ups only score new chunks.
+    """
+
+    model: str = Field(default="cross-encoder/ms-marco-MiniLM-L-6-v2")
+    device: Optional[str] = None
+    batch_size: int = 32
+    # Characters of each chunk passed to the model, MiniLM cross encoders truncate at 512 tokens anyway
+    max_chars: int = 2000
+    cache_size: int = 10000
+    # (query, content hash) -> score, least recently used first
+    _scores: Any = None
+    _lock: Any = None
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _content_hash(document: Document) -> str:
+        return md5(document.content.encode()).hexdigest()
+
+    def score(self, query: str, documents: List[Document]) -> List[float]:
+        keys = [(query, self._content_hash(document)) for document in documents]
+        scores: List[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                scores.append(score)
+
+        # The same chunk can be returned twice, score it once
+        missing: Dict[Tuple[str, str], str] = {}
+        for key, document, score in zip(keys, documents, scores):
+            if score is None and key not in missing:
+                missing[key] = document.content[: self.max_chars]
+        if missing:
+            logger.debug(f"Reranking {len(missing)} new of {len(documents)} candidates")
+            cross_encoder = get_cross_encoder(self.model, self.device)
+            new_scores = cross_encoder.predict(
+                [(query, content) for content in missing.values()],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            computed = {key: float(score) for key, score in zip(missing.keys(), new_scores)}
+            with self._lock:
+                for key, score in computed.items():
+                    self._scores[key] = score
+                while len(self._scores) > self.cache_size:
+                    self._scores.popitem(last=False)
+            scores = [computed[key] if score is None else score for key, score in zip(keys, scores)]
+        return [float(score) for score in scores]  # type: ignore
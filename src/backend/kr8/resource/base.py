@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 
 from src.backend.kr8.base import PhiBase
 from src.backend.kr8.utils.log import logger
@@ -187,6 +187,36 @@ class ResourceBase(PhiBase):
                 return self.get_resource_name() == other.get_resource_name()
         return False
 
+    def get_snapshot_scope(self) -> Optional[str]:
+        """Scope the snapshot lists this resource kind in, eg: the namespace or region"""
+        return None
+
+    def get_snapshot_key(self) -> str:
+        return self.get_resource_name()
+
+    def list_for_snapshot(self, client: Any) -> Optional[Dict[str, Any]]:
+        """Lists all active resources of this kind in this resource's scope, keyed by snapshot key.
+        Returns None if the resource kind cannot be read from a snapshot.
+        """
+        return None
+
+    def read_from_snapshot(self, client: Any) -> Tuple[bool, Any]:
+        """Returns (found_in_snapshot, active_resource) using the StateSnapshot attached to the client"""
+        snapshot = getattr(client, "snapshot", None)
+        if snapshot is None:
+            return False, None
+        return snapshot.lookup(
+            self.__class__.__name__,
+            self.get_snapshot_scope(),
+            self.get_snapshot_key(),
+            lambda: self.list_for_snapshot(client),
+        )
+
+    def invalidate_snapshot(self, client: Any) -> None:
+        snapshot = getattr(client, "snapshot", None)
+        if snapshot is not None:
+            snapshot.invalidate(self.__class__.__name__, self.get_snapshot_scope(), self.get_snapshot_key())
+
     def read(self, client: Any) -> bool:
         raise NotImplementedError
 
@@ -0,0 +1,104 @@
+"""PgAssistantStorage turn benchmark
+
+Replays a conversation against a postgres database the way Assistant does each turn (read the run, add the
+new messages, upsert) and reports the cost of a turn at increasing conversation lengths. With the append-only
+log the cost stays flat; with use_log=False (the full-row rewrite) it grows with the conversation.
+
+Usage:
+    python -m src.backend.kr8.storage.assistant.benchmark --db-url postgresql+psycopg://ai:ai@localhost:5532/ai
+    python -m src.backend.kr8.storage.assistant.benchmark --checkpoints 10 100 1000 --legacy
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.backend.kr8.assistant.run import AssistantRun
+from src.backend.kr8.storage.assistant.postgres import PgAssistantStorage
+
+# Roughly one paragraph, the size of a typical chat message
+_MESSAGE = "The quarterly report shows revenue up on last year, driven by the enterprise plan. " * 6
+
+
+@dataclass
+class TurnTimings:
+    # turn number -> mean milliseconds over the window of turns ending at that turn
+    write_ms: Dict[int, float] = field(default_factory=dict)
+    read_ms: Dict[int, float] = field(default_factory=dict)
+
+
+def _turn_messages(turn: int) -> Dict[str, List[Dict[str, Any]]]:
+    user = {"role": "user", "content": f"Question {turn}: {_MESSAGE}"}
+    assistant = {"role": "assistant", "content": f"Answer {turn}: {_MESSAGE}"}
+    return {
+        "chat_history": [user, assistant],
+        "llm_messages": [{"role": "system", "content": _MESSAGE}, user, assistant],
+        "references": [{"query": user["content"], "references": [{"name": "report.pdf", "content": _MESSAGE}]}],
+    }
+
+
+def run_benchmark(
+    db_url: str, checkpoints: Sequence[int], use_log: bool = True, window: int = 10
+) -> TurnTimings:
+    """Plays max(checkpoints) turns of one run and times the `window` turns ending at each checkpoint."""
+    table_name = f"benchmark_runs_{uuid.uuid4().hex[:8]}"
+    storage = PgAssistantStorage(table_name=table_name, db_url=db_url, use_log=use_log)
+    run_id = str(uuid.uuid4())
+    timings = TurnTimings()
+    write_times: List[float] = []
+    read_times: List[float] = []
+    try:
+        storage.create()
+        memory: Dict[str, List[Any]] = {"chat_history": [], "llm_messages": [], "references": []}
+        for turn in range(1, max(checkpoints) + 1):
+            started = time.perf_counter()
+            run = storage.read(run_id=run_id)
+            read_times.append(time.perf_counter() - started)
+            if run is not None and run.memory is not None:
+                # Like Assistant.from_database_row, memory holds what the storage returned
+                memory = {kind: list(run.memory.get(kind, [])) for kind in memory}
+
+            for kind, messages in _turn_messages(turn).items():
+                memory[kind].extend(messages)
+            started = time.perf_counter()
+            storage.upsert(AssistantRun(run_id=run_id, name="benchmark", memory=memory))
+            write_times.append(time.perf_counter() - started)
+
+            if turn in checkpoints:
+                timings.write_ms[turn] = sum(write_times[-window:]) / len(write_times[-window:]) * 1000
+                timings.read_ms[turn] = sum(read_times[-window:]) / len(read_times[-window:]) * 1000
+    finally:
+        storage.delete()
+    return timings
+
+
+def print_timings(label: str, timings: TurnTimings) -> None:
+    print(label)
+    for turn, write_ms in timings.write_ms.items():
+        print(f"    turn {turn:>5}  write {write_ms:8.2f} ms  read {timings.read_ms[turn]:8.2f} ms")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the per-turn cost of PgAssistantStorage.")
+    parser.add_argument("--db-url", default=os.getenv("DB_URL"), help="Database URL, defaults to $DB_URL")
+    parser.add_argument("--checkpoints", type=int, nargs="+", default=[10, 100, 1000], help="Turns to report")
+    parser.add_argument("--window", type=int, default=10, help="Turns averaged at each checkpoint")
+    parser.add_argument("--legacy", action="store_true", help="Also measure full-row rewrites (use_log=False)")
+    args = parser.parse_args(argv)
+    if not args.db_url:
+        parser.error("--db-url or $DB_URL is required")
+
+    print_timings("append-only log", run_benchmark(args.db_url, args.checkpoints, use_log=True, window=args.window))
+    if args.legacy:
+        print_timings(
+            "full-row rewrite", run_benchmark(args.db_url, args.checkpoints, use_log=False, window=args.window)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from typing import Optional, Any, List
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Tuple
 
 try:
     from sqlalchemy.dialects import postgresql
@@ -7,8 +8,8 @@ try:
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, select
-    from sqlalchemy.types import DateTime, String
+    from sqlalchemy.sql.expression import text, select, and_, or_, func
+    from sqlalchemy.types import DateTime, Integer, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
 
@@ -16,6 +17,9 @@ from src.backend.kr8.assistant.run import AssistantRun
 from src.backend.kr8.storage.assistant.base import AssistantStorage
 from src.backend.kr8.utils.log import logger
 
+# Memory lists kept in the append-only log table instead of the run row
+LOG_KINDS = ("chat_history", "llm_messages", "references")
+
 
 class PgAssistantStorage(AssistantStorage):
     def __init__(
@@ -24,10 +28,22 @@ class PgAssistantStorage(AssistantStorage):
         schema: Optional[str] = "ai",
         db_url: Optional[str] = None,
         db_engine: Optional[Engine] = None,
+        use_log: bool = True,
+        log_table_name: Optional[str] = None,
+        log_window: Optional[int] = 100,
+        log_state_size: int = 1000,
     ):
         """
         This class provides assistant storage using a postgres table.
 
+        With use_log, the chat_history, llm_messages and references of a run are kept in an append-only log
+        table keyed by (run_id, kind, seq). Each upsert appends only the messages added since the last read
+        or write, and each read loads the last log_window entries of every kind, so the cost of a turn does
+        not grow with the length of the conversation. The run row keeps the rest of the memory and, under
+        memory["log"], the first and next sequence number of every kind. Appends to a run are serialized with
+        a transaction-level advisory lock and take their sequence numbers from the log itself, so writers in
+        other processes never overwrite each other's entries.
+
         The following order is used to determine the database connection:
             1. Use the db_engine if provided
             2. Use the db_url
@@ -36,6 +52,10 @@ class PgAssistantStorage(AssistantStorage):
         :param schema: The schema to store the table in.
         :param db_url: The database URL to connect to.
         :param db_engine: The database engine to use.
+        :param use_log: Store memory messages in the append-only log table.
+        :param log_table_name: The name of the log table, defaults to "<table_name>_log".
+        :param log_window: The number of most recent entries of each kind loaded on read, None loads all.
+        :param log_state_size: The number of runs whose append bounds are remembered, least recently used dropped.
         """
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -57,6 +77,17 @@ class PgAssistantStorage(AssistantStorage):
         # Database table for storage
         self.table: Table = self.get_table()
 
+        # Append-only log of memory messages
+        self.use_log: bool = use_log
+        self.log_table_name: str = log_table_name or f"{table_name}_log"
+        self.log_window: Optional[int] = log_window
+        self.log_table: Table = self.get_log_table()
+        # run_id -> kind -> (first seq of the history, seq of the first entry held in memory, next seq to write),
+        # least recently used first
+        self.log_state: "OrderedDict[str, Dict[str, Tuple[int, int, int]]]" = OrderedDict()
+        self.log_state_size: int = log_state_size
+        self.log_table_checked: bool = False
+
     def get_table(self) -> Table:
         return Table(
             self.table_name,
@@ -88,6 +119,23 @@ class PgAssistantStorage(AssistantStorage):
             extend_existing=True,
         )
 
+    def get_log_table(self) -> Table:
+        return Table(
+            self.log_table_name,
+            self.metadata,
+            # Run this entry belongs to
+            Column("run_id", String, primary_key=True),
+            # Memory list: chat_history, llm_messages or references
+            Column("kind", String, primary_key=True),
+            # Position of the entry in the list, starting at 0 for each run and kind
+            Column("seq", Integer, primary_key=True),
+            # The message or references
+            Column("data", postgresql.JSONB),
+            # The timestamp of when this entry was written.
+            Column("created_at", DateTime(timezone=True), server_default=text("now()")),
+            extend_existing=True,
+        )
+
     def table_exists(self) -> bool:
         logger.debug(f"Checking if table exists: {self.table.name}")
         try:
@@ -104,6 +152,9 @@ class PgAssistantStorage(AssistantStorage):
                     sess.execute(text(f"create schema if not exists {self.schema};"))
             logger.debug(f"Creating table: {self.table_name}")
             self.table.create(self.db_engine)
+        if self.use_log:
+            logger.debug(f"Creating table: {self.log_table_name}")
+            self.log_table.create(self.db_engine, checkfirst=True)
 
     def _read(self, session: Session, run_id: str) -> Optional[Row[Any]]:
         stmt = select(self.table).where(self.table.c.run_id == run_id)
@@ -115,9 +166,142 @@ class PgAssistantStorage(AssistantStorage):
         return None
 
     def read(self, run_id: str) -> Optional[AssistantRun]:
+        return self._read_run(run_id=run_id, track=True)
+
+    def _ensure_log_table(self) -> None:
+        if self.use_log and not self.log_table_checked:
+            self.create()
+            self.log_table_checked = True
+
+    def _read_run(self, run_id: str, track: bool) -> Optional[AssistantRun]:
+        """Reads the run and the tail of its log. With track, the loaded tail becomes the base for appends."""
+        self._ensure_log_table()
         with self.Session() as sess, sess.begin():
             existing_row: Optional[Row[Any]] = self._read(session=sess, run_id=run_id)
-            return AssistantRun.model_validate(existing_row) if existing_row is not None else None
+            if existing_row is None:
+                return None
+            run = AssistantRun.model_validate(existing_row)
+            if not self.use_log:
+                return run
+
+            memory: Dict[str, Any] = dict(run.memory or {})
+            if "log" not in memory and any(memory.get(kind) for kind in LOG_KINDS):
+                # Row written before the log existed, move its messages to the log
+                memory = self._migrate_memory(sess, run_id, memory)
+            log: Dict[str, Any] = memory.pop("log", {})
+
+            bounds: Dict[str, Tuple[int, int, int]] = {}
+            for kind in LOG_KINDS:
+                start, next_seq = log.get(kind, {}).get("start", 0), log.get(kind, {}).get("next", 0)
+                offset = start if self.log_window is None else max(start, next_seq - self.log_window)
+                bounds[kind] = (start, offset, next_seq)
+                memory[kind] = []
+            entries = sess.execute(
+                select(self.log_table.c.kind, self.log_table.c.data)
+                .where(
+                    self.log_table.c.run_id == run_id,
+                    or_(
+                        *[
+                            and_(self.log_table.c.kind == kind, self.log_table.c.seq >= offset)
+                            for kind, (_, offset, _) in bounds.items()
+                        ]
+                    ),
+                )
+                .order_by(self.log_table.c.kind, self.log_table.c.seq)
+            ).fetchall()
+            for entry in entries:
+                memory[entry.kind].append(entry.data)
+            if track:
+                self._track(run_id, bounds)
+            return run.model_copy(update={"memory": memory})
+
+    def _migrate_memory(self, sess: Session, run_id: str, memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Appends the memory lists of a legacy run row to the log and strips them from the row."""
+        log: Dict[str, Dict[str, int]] = {}
+        for kind in LOG_KINDS:
+            entries = memory.pop(kind, None) or []
+            # Concurrent readers may both migrate the same row, the entries they write are identical
+            self._append(sess, run_id, kind, 0, entries, retry=True)
+            log[kind] = {"start": 0, "next": len(entries)}
+        memory["log"] = log
+        sess.execute(self.table.update().where(self.table.c.run_id == run_id).values(memory=memory))
+        logger.debug(f"Moved memory of run {run_id} to {self.log_table_name}")
+        return dict(memory)
+
+    def _track(self, run_id: str, bounds: Dict[str, Tuple[int, int, int]]) -> None:
+        self.log_state[run_id] = bounds
+        self.log_state.move_to_end(run_id)
+        while len(self.log_state) > self.log_state_size:
+            self.log_state.popitem(last=False)
+
+    def _append(
+        self, sess: Session, run_id: str, kind: str, first_seq: int, entries: List[Any], retry: bool = False
+    ) -> None:
+        if not entries:
+            return
+        stmt = postgresql.insert(self.log_table).values(
+            [
+                {"run_id": run_id, "kind": kind, "seq": first_seq + i, "data": entry}
+                for i, entry in enumerate(entries)
+            ]
+        )
+        if retry:
+            # Rewriting entries that are already there, which are immutable
+            stmt = stmt.on_conflict_do_nothing(index_elements=["run_id", "kind", "seq"])
+        sess.execute(stmt)
+
+    def _lock_log(self, sess: Session, run_id: str) -> Dict[str, int]:
+        """Locks the log of a run until the transaction ends. Returns the next seq of every kind in the log."""
+        sess.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"{self.log_table_name}:{run_id}"))))
+        rows = sess.execute(
+            select(self.log_table.c.kind, func.max(self.log_table.c.seq))
+            .where(self.log_table.c.run_id == run_id)
+            .group_by(self.log_table.c.kind)
+        ).fetchall()
+        return {kind: max_seq + 1 for kind, max_seq in rows}
+
+    def _get_log_bounds(self, sess: Session, run_id: str) -> Dict[str, Tuple[int, int, int]]:
+        """Bounds of a run that was not read through this storage, whose memory holds its whole history."""
+        memory = sess.execute(select(self.table.c.memory).where(self.table.c.run_id == run_id)).scalar()
+        log: Dict[str, Any] = (memory or {}).get("log", {})
+        bounds: Dict[str, Tuple[int, int, int]] = {}
+        for kind in LOG_KINDS:
+            start, next_seq = log.get(kind, {}).get("start", 0), log.get(kind, {}).get("next", 0)
+            bounds[kind] = (start, start, next_seq)
+        return bounds
+
+    def _write_log(
+        self, sess: Session, row: AssistantRun
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Tuple[int, int, int]]]]:
+        """Appends the new memory entries of row to the log. Returns the memory for the run row and new bounds."""
+        if row.memory is None:
+            return None, None
+        memory: Dict[str, Any] = dict(row.memory)
+        log_next = self._lock_log(sess, row.run_id)
+        bounds = self.log_state.get(row.run_id)
+        if bounds is None:
+            bounds = self._get_log_bounds(sess, row.run_id)
+
+        log: Dict[str, Dict[str, int]] = {}
+        new_bounds: Dict[str, Tuple[int, int, int]] = {}
+        for kind in LOG_KINDS:
+            entries: List[Any] = memory.pop(kind, None) or []
+            start, offset, next_seq = bounds.get(kind, (0, 0, 0))
+            # Entries before this index are already in the log
+            num_written = next_seq - offset
+            # Other writers may have appended since, new entries go after theirs
+            next_seq = max(next_seq, log_next.get(kind, 0))
+            if len(entries) < num_written:
+                # The list was cleared, what comes next starts a new history
+                start = next_seq
+                num_written = 0
+            self._append(sess, row.run_id, kind, next_seq, entries[num_written:])
+            next_seq += len(entries) - num_written
+            # The entries held by the caller end at next_seq, whatever other writers added in between
+            new_bounds[kind] = (start, next_seq - len(entries), next_seq)
+            log[kind] = {"start": start, "next": next_seq}
+        memory["log"] = log
+        return memory, new_bounds
 
     def get_all_run_ids(self, user_id: Optional[str] = None) -> List[str]:
         run_ids: List[str] = []
@@ -162,7 +346,14 @@ class PgAssistantStorage(AssistantStorage):
         Create a new assistant run if it does not exist, otherwise update the existing assistant.
         """
 
+        memory = row.memory
+        log_bounds: Optional[Dict[str, Tuple[int, int, int]]] = None
+        self._ensure_log_table()
         with self.Session() as sess, sess.begin():
+            if self.use_log:
+                # Only the entries added since the last read or write are inserted
+                memory, log_bounds = self._write_log(sess, row)
+
             # Create an insert statement
             stmt = postgresql.insert(self.table).values(
                 run_id=row.run_id,
@@ -170,7 +361,7 @@ class PgAssistantStorage(AssistantStorage):
                 run_name=row.run_name,
                 user_id=row.user_id,
                 llm=row.llm,
-                memory=row.memory,
+                memory=memory,
                 assistant_data=row.assistant_data,
                 run_data=row.run_data,
                 user_data=row.user_data,
@@ -186,7 +377,7 @@ class PgAssistantStorage(AssistantStorage):
                     run_name=row.run_name,
                     user_id=row.user_id,
                     llm=row.llm,
-                    memory=row.memory,
+                    memory=memory,
                     assistant_data=row.assistant_data,
                     run_data=row.run_data,
                     user_data=row.user_data,
@@ -200,9 +391,17 @@ class PgAssistantStorage(AssistantStorage):
                 # Create table and try again
                 self.create()
                 sess.execute(stmt)
-        return self.read(run_id=row.run_id)
+        if log_bounds is not None:
+            self._track(row.run_id, log_bounds)
+        # The memory held by the caller is unchanged, so reading back must not move the base for appends
+        return self._read_run(run_id=row.run_id, track=False)
 
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.table_name}")
             self.table.drop(self.db_engine)
+        if self.use_log:
+            logger.debug(f"Deleting table: {self.log_table_name}")
+            self.log_table.drop(self.db_engine, checkfirst=True)
+        self.log_state = OrderedDict()
+        self.log_table_checked = False
@@ -0,0 +1 @@
+from src.backend.kr8.storage.dataframe.base import DataFrameStore
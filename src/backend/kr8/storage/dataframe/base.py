@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+try:
+    import pandas as pd
+except ImportError:
+    raise ImportError("`pandas` not installed. Please install using `pip install pandas`.")
+
+
+class DataFrameStore(ABC):
+    @abstractmethod
+    def create(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, name: str, df: pd.DataFrame, user_id: Optional[int] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self, name: str) -> Optional[pd.DataFrame]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_metadata(self, name: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, name: str) -> bool:
+        raise NotImplementedError
@@ -0,0 +1,224 @@
+import os
+import re
+from typing import Optional, Any, Dict, List
+
+try:
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine.row import Row
+    from sqlalchemy.inspection import inspect
+    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.schema import MetaData, Table, Column
+    from sqlalchemy.sql.expression import text, select, delete
+    from sqlalchemy.types import BigInteger, DateTime, Integer, String
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+try:
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    raise ImportError("`pandas` and `pyarrow` not installed. Please install using `pip install pandas pyarrow`.")
+
+from src.backend.kr8.storage.dataframe.base import DataFrameStore
+from src.backend.kr8.utils.log import logger
+
+DATAFRAME_STORE_DIR = os.getenv("DATAFRAME_STORE_DIR", "data/dataframes")
+
+
+def summarize_dataframe(df: pd.DataFrame, top_values: int = 3) -> List[Dict[str, Any]]:
+    """Per-column dtype, null count and either numeric range or the most common values."""
+    columns: List[Dict[str, Any]] = []
+    for name in df.columns:
+        series = df[name]
+        column: Dict[str, Any] = {
+            "name": str(name),
+            "dtype": str(series.dtype),
+            "nulls": int(series.isna().sum()),
+        }
+        non_null = series.dropna()
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            if not non_null.empty:
+                column.update(min=float(non_null.min()), max=float(non_null.max()), mean=float(non_null.mean()))
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            if not non_null.empty:
+                column.update(min=str(non_null.min()), max=str(non_null.max()))
+        else:
+            counts = non_null.astype(str).value_counts()
+            column.update(distinct=int(counts.size), top=[str(value) for value in counts.index[:top_values]])
+        columns.append(column)
+    return columns
+
+
+class PgDataFrameStore(DataFrameStore):
+    def __init__(
+        self,
+        table_name: str = "dataframes",
+        schema: Optional[str] = "ai",
+        db_url: Optional[str] = None,
+        db_engine: Optional[Engine] = None,
+        base_dir: Optional[str] = None,
+    ):
+        """
+        This class stores dataframes as Parquet files on disk, with their schema and stats in a postgres table.
+
+        The following order is used to determine the database connection:
+            1. Use the db_engine if provided
+            2. Use the db_url
+
+        :param table_name: The name of the table to store dataframe metadata.
+        :param schema: The schema to store the table in.
+        :param db_url: The database URL to connect to.
+        :param db_engine: The database engine to use.
+        :param base_dir: The directory to write Parquet files to. Defaults to DATAFRAME_STORE_DIR.
+        """
+        _engine: Optional[Engine] = db_engine
+        if _engine is None and db_url is not None:
+            _engine = create_engine(db_url)
+
+        if _engine is None:
+            raise ValueError("Must provide either db_url or db_engine")
+
+        # Database attributes
+        self.table_name: str = table_name
+        self.schema: Optional[str] = schema
+        self.db_url: Optional[str] = db_url
+        self.db_engine: Engine = _engine
+        self.metadata: MetaData = MetaData(schema=self.schema)
+        self.base_dir: str = base_dir or DATAFRAME_STORE_DIR
+
+        # Database session
+        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+
+        # Database table for storage
+        self.table: Table = self.get_table()
+
+    def get_table(self) -> Table:
+        return Table(
+            self.table_name,
+            self.metadata,
+            # Dataframe name, already prefixed with the user id by PandasTools
+            Column("name", String, primary_key=True),
+            # ID of the user who uploaded this dataframe
+            Column("user_id", String, index=True),
+            # Location of the Parquet file
+            Column("path", String),
+            Column("num_rows", BigInteger),
+            Column("num_columns", Integer),
+            Column("size_bytes", BigInteger),
+            # Per-column dtype, null count and summary stats
+            Column("columns", postgresql.JSONB),
+            # The timestamp of when this dataframe was created.
+            Column("created_at", DateTime(timezone=True), server_default=text("now()")),
+            # The timestamp of when this dataframe was last updated.
+            Column("updated_at", DateTime(timezone=True), onupdate=text("now()")),
+            extend_existing=True,
+        )
+
+    def table_exists(self) -> bool:
+        logger.debug(f"Checking if table exists: {self.table.name}")
+        try:
+            return inspect(self.db_engine).has_table(self.table.name, schema=self.schema)
+        except Exception as e:
+            logger.error(e)
+            return False
+
+    def create(self) -> None:
+        if not self.table_exists():
+            if self.schema is not None:
+                with self.Session() as sess, sess.begin():
+                    logger.debug(f"Creating schema: {self.schema}")
+                    sess.execute(text(f"create schema if not exists {self.schema};"))
+            logger.debug(f"Creating table: {self.table_name}")
+            self.table.create(self.db_engine)
+
+    def _file_path(self, name: str, user_id: Optional[int]) -> str:
+        owner = f"user_{user_id}" if user_id is not None else "shared"
+        safe_name = re.sub(r"[^\w.-]", "_", name)
+        return os.path.join(self.base_dir, owner, f"{safe_name}.parquet")
+
+    def _to_arrow(self, df: pd.DataFrame) -> pa.Table:
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Spreadsheet columns often mix numbers and text; store those as strings
+            mixed = {column: "string" for column in df.columns if df[column].dtype == object}
+            return pa.Table.from_pandas(df.astype(mixed), preserve_index=False)
+
+    def save(self, name: str, df: pd.DataFrame, user_id: Optional[int] = None) -> Dict[str, Any]:
+        path = self._file_path(name, user_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pq.write_table(self._to_arrow(df), tmp_path)
+        os.replace(tmp_path, path)
+
+        values = {
+            "user_id": str(user_id) if user_id is not None else None,
+            "path": path,
+            "num_rows": int(df.shape[0]),
+            "num_columns": int(df.shape[1]),
+            "size_bytes": os.path.getsize(path),
+            "columns": summarize_dataframe(df),
+        }
+        stmt = postgresql.insert(self.table).values(name=name, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=["name"], set_=values)
+        with self.Session() as sess, sess.begin():
+            try:
+                sess.execute(stmt)
+            except Exception:
+                # Create table and try again
+                sess.rollback()
+                self.create()
+                sess.execute(stmt)
+        logger.debug(f"Saved dataframe {name} to {path}")
+        return {"name": name, **values}
+
+    def _read(self, session: Session, name: str) -> Optional[Row[Any]]:
+        stmt = select(self.table).where(self.table.c.name == name)
+        try:
+            return session.execute(stmt).first()
+        except Exception:
+            # Create table if it does not exist
+            session.rollback()
+            self.create()
+        return None
+
+    def read_metadata(self, name: str) -> Optional[Dict[str, Any]]:
+        with self.Session() as sess, sess.begin():
+            row = self._read(session=sess, name=name)
+            return dict(row._mapping) if row is not None else None
+
+    def load(self, name: str) -> Optional[pd.DataFrame]:
+        metadata = self.read_metadata(name)
+        if metadata is None:
+            return None
+        path = metadata["path"]
+        if not os.path.exists(path):
+            logger.warning(f"Parquet file for dataframe {name} is missing: {path}")
+            return None
+        # Memory-map the file so only the pages pandas touches are read from disk
+        table = pq.read_table(path, memory_map=True)
+        return table.to_pandas()
+
+    def list(self, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        stmt = select(self.table)
+        if user_id is not None:
+            stmt = stmt.where(self.table.c.user_id == str(user_id))
+        stmt = stmt.order_by(self.table.c.created_at.desc())
+        try:
+            with self.Session() as sess, sess.begin():
+                return [dict(row._mapping) for row in sess.execute(stmt).fetchall()]
+        except Exception:
+            logger.debug(f"Table does not exist: {self.table.name}")
+        return []
+
+    def delete(self, name: str) -> bool:
+        metadata = self.read_metadata(name)
+        if metadata is None:
+            return False
+        with self.Session() as sess, sess.begin():
+            sess.execute(delete(self.table).where(self.table.c.name == name))
+        if os.path.exists(metadata["path"]):
+            os.remove(metadata["path"])
+        return True
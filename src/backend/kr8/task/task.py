@@ -21,6 +21,14 @@ class Task(BaseModel):
     # Reviewer for this task. Set reviewer=True for a default reviewer
     reviewer: Optional[Union[Assistant, bool]] = None
 
+    # -*- Task inputs
+    # Names (or task_ids) of the tasks whose outputs this task needs.
+    # When any task in a Workflow sets depends_on, the Workflow runs its tasks as a DAG
+    # and each task only receives the outputs of the tasks it depends on.
+    depends_on: Optional[List[str]] = None
+    # Named values added to the input of this task
+    inputs: Optional[Dict[str, Any]] = None
+
     # -*- Task Output
     # Final output of this Task
     output: Optional[Any] = None
@@ -0,0 +1,233 @@
+# code_ingestion.py
+
+import os
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.backend.kr8.document import Document
+from src.backend.kr8.utils.log import logger
+from src.backend.utils.java_utils import chunk_java_file
+
+SKIP_DIRECTORIES = {".git", "node_modules", "target", "build", "dist", ".idea", ".gradle", "__pycache__", "coverage"}
+MAX_FILE_BYTES = 1_000_000
+
+# Top-level (unindented) declarations in JS/TS sources are natural chunk boundaries
+_SCRIPT_BOUNDARY = re.compile(
+    r"^(export\s+(default\s+)?)?(async\s+)?(function\*?|class|interface|type|enum|const|let|var)\s+(?P<name>[A-Za-z_$][\w$]*)"
+)
+_SCRIPT_EXTENSIONS = {".js", ".jsx", ".ts", ".tsx"}
+
+
+def stitch_chunks(chunks: List[Document]) -> str:
+    """Rebuilds a file from the chunks CodeIngestionPipeline stored for it, placing each at its start_line"""
+    lines: List[str] = []
+    for chunk in sorted(chunks, key=lambda chunk: chunk.meta_data.get("chunk", 0)):
+        chunk_lines = chunk.content.split('\n')
+        start_line = chunk.meta_data.get("start_line")
+        if start_line is not None and lines and start_line == len(lines):
+            # The chunk continues a line too long for a single chunk
+            lines[-1] += chunk_lines.pop(0)
+        elif start_line is not None and start_line > len(lines) + 1:
+            # Empty lines in between were not stored
+            lines.extend([""] * (start_line - len(lines) - 1))
+        lines.extend(chunk_lines)
+    line_count = chunks[0].meta_data.get("line_count") if chunks else None
+    if line_count is not None and line_count > len(lines):
+        lines.extend([""] * (line_count - len(lines)))
+    return '\n'.join(lines)
+
+
+class CodeIngestionPipeline:
+    """Reads, chunks, embeds and upserts a code project in batches.
+
+    Files are read and chunked on a thread pool, chunks are split at class/method (Java) or top-level
+    declaration (JS/TS) boundaries, and each batch is embedded with a single embedder call and written
+    with a single multi-row upsert into the project namespace. Every chunk is tagged with the id of the load
+    that wrote it, so once a load completes the chunks of deleted files, and the trailing chunks of files
+    that shrank, are deleted.
+    """
+
+    def __init__(
+        self,
+        vector_db: Any,
+        max_workers: int = 8,
+        batch_size: int = 128,
+        max_chunk_chars: int = 3000,
+    ):
+        self.vector_db = vector_db
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_chunk_chars = max_chunk_chars
+
+    def read_files(self, directory_content: Dict[str, str], is_supported) -> Dict[str, str]:
+        """Expand directories in `directory_content` and read supported files in parallel."""
+        all_files: Dict[str, str] = {}
+        to_read: List[str] = []
+        for path, content in directory_content.items():
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    dirs[:] = [d for d in dirs if d not in SKIP_DIRECTORIES]
+                    for file in files:
+                        file_path = os.path.join(root, file)
+                        if is_supported(file_path):
+                            to_read.append(file_path)
+            elif is_supported(path):
+                all_files[path] = content
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for file_path, content in zip(to_read, executor.map(self._read_file, to_read)):
+                if content is not None:
+                    all_files[file_path] = content
+        return all_files
+
+    def _read_file(self, file_path: str) -> Optional[str]:
+        try:
+            if os.path.getsize(file_path) > MAX_FILE_BYTES:
+                logger.debug(f"Skipping large file {file_path}")
+                return None
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return f.read()
+        except OSError as e:
+            logger.warning(f"Could not read {file_path}: {e}")
+            return None
+
+    def chunk_file(self, file_path: str, content: str) -> List[Dict[str, Any]]:
+        _, ext = os.path.splitext(file_path)
+        chunks = None
+        if ext == ".java":
+            chunks = chunk_java_file(content, self.max_chunk_chars)
+        elif ext in _SCRIPT_EXTENSIONS:
+            chunks = self._chunk_script(content)
+        if not chunks:
+            chunks = [{"content": content, "start_line": 1, "end_line": content.count('\n') + 1, "symbol": None}]
+
+        # Declarations larger than the budget are split on line boundaries
+        sized = []
+        for chunk in chunks:
+            if len(chunk["content"]) <= self.max_chunk_chars:
+                sized.append(chunk)
+            else:
+                sized.extend(self._split_lines(chunk))
+        # Whitespace-only chunks are kept so the file can be stitched back together exactly; empty ones are
+        # restored from the line numbers of their neighbours and the line count of the file
+        return [chunk for chunk in sized if chunk["content"]]
+
+    def _chunk_script(self, content: str) -> List[Dict[str, Any]]:
+        lines = content.split('\n')
+        chunks: List[Dict[str, Any]] = []
+        current = {"start_line": 1, "symbol": None, "lines": []}
+        for number, line in enumerate(lines, start=1):
+            match = _SCRIPT_BOUNDARY.match(line)
+            size = sum(len(l) + 1 for l in current["lines"])
+            if match and current["lines"] and size + len(line) > self.max_chunk_chars // 2:
+                chunks.append(current)
+                current = {"start_line": number, "symbol": match.group("name"), "lines": []}
+            elif match and current["symbol"] is None:
+                current["symbol"] = match.group("name")
+            current["lines"].append(line)
+        chunks.append(current)
+        return [
+            {
+                "content": '\n'.join(chunk["lines"]),
+                "start_line": chunk["start_line"],
+                "end_line": chunk["start_line"] + len(chunk["lines"]) - 1,
+                "symbol": chunk["symbol"],
+            }
+            for chunk in chunks
+        ]
+
+    def _split_lines(self, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        pieces = []
+        start_line = chunk["start_line"]
+        buffer: List[str] = []
+        size = 0
+        for number, line in enumerate(chunk["content"].split('\n'), start=chunk["start_line"]):
+            # A line longer than the budget is cut into parts; every part after the first starts a chunk that
+            # continues the same line, so that chunk's start_line is the end_line of the previous one
+            parts = [line[i:i + self.max_chunk_chars] for i in range(0, len(line), self.max_chunk_chars)] or [""]
+            for part in parts:
+                if buffer and size + len(part) + 1 > self.max_chunk_chars:
+                    pieces.append({"content": '\n'.join(buffer), "start_line": start_line, "end_line": start_line + len(buffer) - 1, "symbol": chunk["symbol"]})
+                    start_line = number
+                    buffer, size = [], 0
+                buffer.append(part)
+                size += len(part) + 1
+        if buffer:
+            pieces.append({"content": '\n'.join(buffer), "start_line": start_line, "end_line": start_line + len(buffer) - 1, "symbol": chunk["symbol"]})
+        return pieces
+
+    def build_documents(
+        self, project_name: str, project_type: str, namespace: str, file_path: str, content: str,
+        load_id: Optional[str] = None,
+    ) -> List[Document]:
+        _, ext = os.path.splitext(file_path)
+        chunks = self.chunk_file(file_path, content)
+        return [
+            Document(
+                id=f"{namespace}:{file_path}:{index}",
+                name=file_path,
+                content=chunk["content"],
+                meta_data={
+                    "project": project_name,
+                    "type": f"{project_type}_file",
+                    "file_type": ext,
+                    "namespace": namespace,
+                    "load_id": load_id,
+                    "chunk": index,
+                    "chunk_count": len(chunks),
+                    "line_count": content.count('\n') + 1,
+                    "start_line": chunk["start_line"],
+                    "end_line": chunk["end_line"],
+                    "symbol": chunk["symbol"],
+                },
+            )
+            for index, chunk in enumerate(chunks)
+        ]
+
+    def ingest(
+        self, project_name: str, project_type: str, namespace: str, files: Dict[str, str]
+    ) -> Iterator[Tuple[int, int, str]]:
+        """Chunk `files` in parallel, then embed and upsert them batch by batch.
+
+        Yields `(files_done, total_files, last_file)` after each batch is stored. Once every file is stored,
+        the namespace's file chunks written by earlier loads are deleted.
+        """
+        total_files = len(files)
+        paths = list(files)
+        load_id = uuid.uuid4().hex
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            documents_per_file = executor.map(
+                lambda path: self.build_documents(project_name, project_type, namespace, path, files[path], load_id),
+                paths,
+            )
+            batch: List[Document] = []
+            files_done = 0
+            for path, documents in zip(paths, documents_per_file):
+                batch.extend(documents)
+                files_done += 1
+                if len(batch) >= self.batch_size:
+                    self._store(batch)
+                    batch = []
+                    yield files_done, total_files, path
+            if batch:
+                self._store(batch)
+                yield files_done, total_files, paths[-1]
+        # An empty file list is more likely a bad upload than a project whose files were all deleted
+        if paths:
+            self._delete_stale(project_type, namespace, load_id)
+
+    def _delete_stale(self, project_type: str, namespace: str, load_id: str) -> None:
+        if not hasattr(self.vector_db, "delete_documents_by_metadata"):
+            return
+        deleted = self.vector_db.delete_documents_by_metadata(
+            {"namespace": namespace, "type": f"{project_type}_file"}, exclude={"load_id": load_id}
+        )
+        logger.info(f"Deleted {deleted} stale chunks from {namespace}")
+
+    def _store(self, documents: List[Document]) -> None:
+        if hasattr(self.vector_db, "bulk_upsert"):
+            self.vector_db.bulk_upsert(documents, batch_size=len(documents))
+        else:
+            self.vector_db.upsert(documents)
@@ -4,7 +4,7 @@ import asyncio
 import json
 import os
 from sqlite3 import IntegrityError
-from typing import Callable, Dict, Optional, AsyncGenerator
+from typing import Callable, Dict, Iterator, Optional, AsyncGenerator
 from src.backend.kr8.tools import Toolkit
 from src.backend.kr8.document import Document
 from src.backend.kr8.utils.log import logger
@@ -15,6 +15,19 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import graphviz
 from src.backend.kr8.knowledge.base import AssistantKnowledge
+from src.backend.kr8.tools.code_ingestion import CodeIngestionPipeline, stitch_chunks
+
+# project_type -> (supported extensions, supported file names)
+PROJECT_FILE_TYPES = {
+    "react": (
+        ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss', '.json', '.html', '.md', '.yml', '.yaml', '.env'],
+        ['package.json', '.gitignore', '.eslintrc', '.prettierrc', 'tsconfig.json'],
+    ),
+    "java": (
+        ['.java', '.xml', '.properties', '.gradle', '.md', '.yml', '.yaml'],
+        ['pom.xml', 'build.gradle', '.gitignore'],
+    ),
+}
 
 class CodeTools(Toolkit):
     def __init__(self, knowledge_base: AssistantKnowledge):
@@ -43,291 +56,83 @@ class CodeTools(Toolkit):
                 logger.warning(f"Document {doc.name} already exists in the database. Skipping insertion.")
     
     async def load_project_async(self, project_name: str, project_type: str, directory_content: Dict[str, str]) -> AsyncGenerator[Dict[str, any], None]:
-        namespace = self._get_namespace(project_name, project_type)
-        if project_type == "react":
-            async for update in self._load_react_project_async(project_name, directory_content):
-                yield update
-        elif project_type == "java":
-            async for update in self._load_java_project_async(project_name, directory_content):
-                yield update
-        else:
+        if project_type not in PROJECT_FILE_TYPES:
             yield {"status": "error", "message": f"Unsupported project type: {project_type}"}
+            return
 
-    async def _load_react_project_async(self, project_name: str, directory_content: Dict[str, str]) -> AsyncGenerator[Dict[str, any], None]:
-        project_namespace = f"react_project_{project_name}"
-        supported_extensions = ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss', '.json', '.html', '.md', '.yml', '.yaml', '.env']
-        
-        total_files = len(directory_content)
-        processed_files = 0
-        package_json = None
-
-        for file_path, file_content in directory_content.items():
-            _, ext = os.path.splitext(file_path)
-            
-            if file_path.endswith('package.json'):
-                package_json = json.loads(file_content)
-                continue
-
-            if ext in supported_extensions or os.path.basename(file_path) in ['package.json', '.gitignore', '.eslintrc', '.prettierrc', 'tsconfig.json']:
-                doc = Document(
-                    name=file_path,
-                    content=file_content,
-                    meta_data={
-                        "project": project_name,
-                        "type": "react_file",
-                        "file_type": ext
-                    }
-                )
-                await self._upsert_document_async(doc)
-
-            processed_files += 1
-            progress = processed_files / total_files
-            yield {"status": "processing", "progress": progress, "message": f"Processing file {processed_files} of {total_files}: {file_path}"}
-            await asyncio.sleep(0)  # Allow other tasks to run
-
-        if package_json:
-            dependency_graph = generate_react_dependency_graph(package_json)
-            await self._store_dependency_graph_async(project_name, dependency_graph, "react")
-            yield {"status": "processing", "progress": 0.9, "message": "Generated dependency graph"}
-
-        yield {"status": "complete", "progress": 1.0, "message": f"React project '{project_name}' loaded successfully. Processed {processed_files} files and generated dependency graph."}
-
-    async def _load_java_project_async(self, project_name: str, directory_content: Dict[str, str]) -> AsyncGenerator[Dict[str, any], None]:
-        project_namespace = f"java_project_{project_name}"
-        supported_extensions = ['.java', '.xml', '.properties', '.gradle', '.md', '.yml', '.yaml']
-        
-        total_files = len(directory_content)
-        processed_files = 0
-        pom_xml = None
-        build_gradle = None
+        # Run each pipeline step off the event loop; file reading, embedding and upserts all block
+        updates = self._iter_load_project(project_name, project_type, directory_content)
+        while True:
+            update = await asyncio.to_thread(next, updates, None)
+            if update is None:
+                break
+            yield update
 
-        all_files = self._get_all_files(directory_content)
-        total_files = len(all_files)
+    def load_project(self, project_name: str, project_type: str, directory_content: Dict[str, str], progress_callback: Callable[[float, str], None] = None) -> str:
+        if project_type not in PROJECT_FILE_TYPES:
+            return f"Unsupported project type: {project_type}"
 
-        for file_path, file_content in all_files.items():
-            try:
-                _, ext = os.path.splitext(file_path)
-
-                if file_path.endswith('pom.xml'):
-                    pom_xml = file_content
-                elif file_path.endswith('build.gradle'):
-                    build_gradle = file_content
-
-                if ext in supported_extensions or os.path.basename(file_path) in ['pom.xml', 'build.gradle', '.gitignore']:
-                    doc = Document(
-                        name=file_path,
-                        content=file_content,
-                        meta_data={
-                            "project": project_name,
-                            "type": "java_file",
-                            "file_type": ext
-                        }
-                    )
-                    await self._upsert_document_async(doc)
-
-                processed_files += 1
-                progress = processed_files / total_files
-                yield {"status": "processing", "progress": progress, "message": f"Processing file {processed_files} of {total_files}: {file_path}"}
-                await asyncio.sleep(0)  # Allow other tasks to run
+        result = f"No files loaded for {project_type} project '{project_name}'"
+        for update in self._iter_load_project(project_name, project_type, directory_content):
+            if update["status"] == "error":
+                logger.error(update["message"])
+            elif progress_callback:
+                progress_callback(update["progress"], update["message"])
+            if update["status"] == "complete":
+                result = update["message"]
+        return result
+
+    def _is_supported_file(self, project_type: str, file_path: str) -> bool:
+        extensions, file_names = PROJECT_FILE_TYPES[project_type]
+        _, ext = os.path.splitext(file_path)
+        return ext in extensions or os.path.basename(file_path) in file_names
+
+    def _iter_load_project(self, project_name: str, project_type: str, directory_content: Dict[str, str]) -> Iterator[Dict[str, any]]:
+        """Load a project through the ingestion pipeline, yielding progress updates."""
+        namespace = self._get_namespace(project_name, project_type)
+        pipeline = CodeIngestionPipeline(self.knowledge_base.vector_db)
 
-            except Exception as e:
-                yield {"status": "error", "message": f"Error processing file {file_path}: {str(e)}"}
+        all_files = pipeline.read_files(directory_content, lambda path: self._is_supported_file(project_type, path))
+        yield {"status": "processing", "progress": 0.05, "message": f"Read {len(all_files)} files"}
 
-        try:
-            if pom_xml or build_gradle:
-                dependency_graph = generate_java_dependency_graph(pom_xml, build_gradle)
-                await self._store_dependency_graph_async(project_name, dependency_graph, "java")
-                yield {"status": "processing", "progress": 0.9, "message": "Generated dependency graph"}
-        except Exception as e:
-            yield {"status": "error", "message": f"Error generating dependency graph: {str(e)}"}
+        # Build manifests feed the dependency graph rather than the vector store
+        manifest_names = {"react": ("package.json",), "java": ("pom.xml", "build.gradle")}[project_type]
+        manifests = {name: next((content for path, content in all_files.items() if path.endswith(name)), None) for name in manifest_names}
+        source_files = {path: content for path, content in all_files.items() if not path.endswith("package.json")}
 
+        processed_files = 0
         try:
-            project_analysis = self._analyze_java_project_structure(all_files)
-            await self._store_project_analysis_async(project_name, project_analysis, "java")
-            yield {"status": "processing", "progress": 0.95, "message": "Completed project analysis"}
+            for processed_files, total_files, last_file in pipeline.ingest(project_name, project_type, namespace, source_files):
+                progress = 0.05 + 0.8 * processed_files / total_files
+                yield {"status": "processing", "progress": progress, "message": f"Processed file {processed_files} of {total_files}: {last_file}"}
         except Exception as e:
-            yield {"status": "error", "message": f"Error analyzing project structure: {str(e)}"}
+            logger.exception(f"Error ingesting files for project {project_name}")
+            yield {"status": "error", "message": f"Error ingesting files: {str(e)}"}
 
-        yield {"status": "complete", "progress": 1.0, "message": f"Java project '{project_name}' loaded successfully. Processed {processed_files} files, generated dependency graph, and analyzed project structure."}
-
-    async def _upsert_document_async(self, doc):
         try:
-            await self.knowledge_base.vector_db.upsert_async([doc])
-            logger.info(f"Upserted file {doc.name} to vector database")
-        except AttributeError:
-            try:
-                await self.knowledge_base.vector_db.insert_async([doc])
-                logger.info(f"Inserted file {doc.name} to vector database")
-            except IntegrityError:
-                logger.warning(f"Document {doc.name} already exists in the database. Skipping insertion.")
-
-    async def _store_dependency_graph_async(self, project_name: str, dependency_graph: Dict, project_type: str):
-        doc = Document(
-            name=f"{project_name}_dependency_graph",
-            content=json.dumps(dependency_graph, indent=2),
-            meta_data={
-                "project": project_name,
-                "type": f"{project_type}_dependency_graph"
-            }
-        )
-        await self._upsert_document_async(doc)
-        logger.info(f"Upserted dependency graph for project {project_name}")
-
-    async def _store_project_analysis_async(self, project_name: str, project_analysis: Dict, project_type: str):
-        doc = Document(
-            name=f"{project_name}_project_analysis",
-            content=json.dumps(project_analysis, indent=2),
-            meta_data={
-                "project": project_name,
-                "type": f"{project_type}_project_analysis"
-            }
-        )
-        await self._upsert_document_async(doc)
-        logger.info(f"Upserted project analysis for project {project_name}")
-        
-    def load_project(self, project_name: str, project_type: str, directory_content: Dict[str, str], progress_callback: Callable[[float, str], None] = None) -> str:
-        namespace = self._get_namespace(project_name, project_type)
-        if project_type == "react":
-            return self._load_react_project(project_name, directory_content, progress_callback)
-        elif project_type == "java":
-            return self._load_java_project(project_name, directory_content, progress_callback)
-        else:
-            return f"Unsupported project type: {project_type}"
-
-    def _load_react_project(self, project_name: str, directory_content: Dict[str, str], progress_callback: Callable[[float, str], None] = None) -> str:
-        project_namespace = f"react_project_{project_name}"
-        supported_extensions = ['.js', '.jsx', '.ts', '.tsx', '.css', '.scss', '.json', '.html', '.md', '.yml', '.yaml', '.env']
-        
-        total_files = len(directory_content)
-        processed_files = 0
-        package_json = None
-
-        for file_path, file_content in directory_content.items():
-            _, ext = os.path.splitext(file_path)
-            
-            if file_path.endswith('package.json'):
-                package_json = json.loads(file_content)
-                continue
-
-            if ext in supported_extensions or os.path.basename(file_path) in ['package.json', '.gitignore', '.eslintrc', '.prettierrc', 'tsconfig.json']:
-                doc = Document(
-                    name=file_path,
-                    content=file_content,
-                    meta_data={
-                        "project": project_name,
-                        "type": "react_file",
-                        "file_type": ext
-                    }
-                )
-                self._upsert_document(doc)
-
-            processed_files += 1
-            if progress_callback:
-                progress = processed_files / total_files
-                progress_callback(progress, f"Processing file {processed_files} of {total_files}: {file_path}")
-
-        if package_json:
-            dependency_graph = generate_react_dependency_graph(package_json)
-            self._store_dependency_graph(project_name, dependency_graph, "react")
-
-        if progress_callback:
-            progress_callback(1.0, f"Processed all files for {project_name}")
-
-        return f"React project '{project_name}' loaded successfully. Processed {processed_files} files and generated dependency graph."
-
-    def _load_java_project(self, project_name: str, directory_content: Dict[str, str], progress_callback: Callable[[float, str], None] = None) -> str:
-        print(f"Starting to load Java project: {project_name}")
-        project_namespace = f"java_project_{project_name}"
-        supported_extensions = ['.java', '.xml', '.properties', '.gradle', '.md', '.yml', '.yaml']
-        
-        total_files = len(directory_content)
-        processed_files = 0
-        pom_xml = None
-        build_gradle = None
-
-        print(f"Total files to process: {total_files}")
-
-        all_files = self._get_all_files(directory_content)
-        total_files = len(all_files)
+            if project_type == "react" and manifests["package.json"]:
+                dependency_graph = generate_react_dependency_graph(json.loads(manifests["package.json"]))
+                self._store_dependency_graph(project_name, dependency_graph, project_type)
+                yield {"status": "processing", "progress": 0.9, "message": "Generated dependency graph"}
+            elif project_type == "java" and (manifests["pom.xml"] or manifests["build.gradle"]):
+                dependency_graph = generate_java_dependency_graph(manifests["pom.xml"], manifests["build.gradle"])
+                self._store_dependency_graph(project_name, dependency_graph, project_type)
+                yield {"status": "processing", "progress": 0.9, "message": "Generated dependency graph"}
+        except Exception as e:
+            logger.exception(f"Error generating dependency graph for project {project_name}")
+            yield {"status": "error", "message": f"Error generating dependency graph: {str(e)}"}
 
-        for file_path, file_content in all_files.items():
+        if project_type == "java":
             try:
-                _, ext = os.path.splitext(file_path)
-                
-                print(f"Processing file: {file_path}")
-
-                if file_path.endswith('pom.xml'):
-                    pom_xml = file_content
-                    print("Found pom.xml")
-                elif file_path.endswith('build.gradle'):
-                    build_gradle = file_content
-                    print("Found build.gradle")
-
-                if ext in supported_extensions or os.path.basename(file_path) in ['pom.xml', 'build.gradle', '.gitignore']:
-                    doc = Document(
-                        name=file_path,
-                        content=file_content,
-                        meta_data={
-                            "project": project_name,
-                            "type": "java_file",
-                            "file_type": ext
-                        }
-                    )
-                    self._upsert_document(doc)
-                    print(f"Upserted document: {file_path}")
-
-                processed_files += 1
-                if progress_callback:
-                    progress = processed_files / total_files
-                    progress_callback(progress, f"Processing file {processed_files} of {total_files}: {file_path}")
-
+                project_analysis = self._analyze_java_project_structure(all_files)
+                self._store_project_analysis(project_name, project_analysis, project_type)
+                yield {"status": "processing", "progress": 0.95, "message": "Completed project analysis"}
             except Exception as e:
-                print(f"Error processing file {file_path}: {str(e)}")
-                import traceback
-                print(traceback.format_exc())
+                logger.exception(f"Error analyzing project structure for project {project_name}")
+                yield {"status": "error", "message": f"Error analyzing project structure: {str(e)}"}
 
-        print("Finished processing all files")
-
-        try:
-            if pom_xml or build_gradle:
-                print("Generating dependency graph")
-                dependency_graph = generate_java_dependency_graph(pom_xml, build_gradle)
-                self._store_dependency_graph(project_name, dependency_graph, "java")
-                print("Dependency graph generated and stored")
-        except Exception as e:
-            print(f"Error generating dependency graph: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-
-        try:
-            print("Analyzing Java project structure")
-            project_analysis = self._analyze_java_project_structure(all_files)
-            self._store_project_analysis(project_name, project_analysis, "java")
-            print("Project analysis completed and stored")
-        except Exception as e:
-            print(f"Error analyzing project structure: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-
-        if progress_callback:
-            progress_callback(1.0, f"Processed all files for {project_name}")
-
-        return f"Java project '{project_name}' loaded successfully. Processed {processed_files} files, generated dependency graph, and analyzed project structure."
-
-    def _get_all_files(self, directory_content: Dict[str, str]) -> Dict[str, str]:
-        all_files = {}
-        for path, content in directory_content.items():
-            if os.path.isdir(path):
-                # If it's a directory, recursively get all files
-                for root, _, files in os.walk(path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            all_files[file_path] = f.read()
-            else:
-                # If it's a file, add it directly
-                all_files[path] = content
-        return all_files
+        project_label = {"react": "React", "java": "Java"}[project_type]
+        yield {"status": "complete", "progress": 1.0, "message": f"{project_label} project '{project_name}' loaded successfully. Processed {processed_files} files."}
 
     def _analyze_java_project_structure(self, all_files: Dict[str, str]) -> Dict:
         java_files = [file for file in all_files.keys() if file.endswith('.java')]
@@ -366,6 +171,7 @@ class CodeTools(Toolkit):
 
     def _store_dependency_graph(self, project_name: str, dependency_graph: Dict, project_type: str):
         doc = Document(
+            id=f"{self._get_namespace(project_name, project_type)}:dependency_graph",
             name=f"{project_name}_dependency_graph",
             content=json.dumps(dependency_graph, indent=2),
             meta_data={
@@ -378,6 +184,7 @@ class CodeTools(Toolkit):
 
     def _store_project_analysis(self, project_name: str, project_analysis: Dict, project_type: str):
         doc = Document(
+            id=f"{self._get_namespace(project_name, project_type)}:project_analysis",
             name=f"{project_name}_project_analysis",
             content=json.dumps(project_analysis, indent=2),
             meta_data={
@@ -389,7 +196,9 @@ class CodeTools(Toolkit):
         logger.info(f"Upserted project analysis for project {project_name}")
 
     def analyze_project_structure(self, project_name: str, project_type: str) -> str:
-        analysis_doc = self.knowledge_base.search(query=f"project:{project_name} type:{project_type}_project_analysis", num_documents=1)
+        analysis_doc = self.knowledge_base.get_documents_by_metadata(
+            {"project": project_name, "type": f"{project_type}_project_analysis"}, limit=1
+        )
         if analysis_doc:
             try:
                 structure = json.loads(analysis_doc[0].content)
@@ -412,8 +221,12 @@ class CodeTools(Toolkit):
         return "\n\n".join(results) if results else f"Component {component_name} not found"
 
     def get_file_content(self, project_name: str, file_path: str, project_type: str) -> Optional[str]:
-        files = self.knowledge_base.search(query=f"project:{project_name} type:{project_type}_file name:{file_path}", num_documents=1)
-        return files[0].content if files else None
+        chunks = self.knowledge_base.get_documents_by_metadata(
+            {"project": project_name, "type": f"{project_type}_file"}, name=file_path
+        )
+        if not chunks:
+            return None
+        return stitch_chunks(chunks)
 
     def get_code_snippet(self, project_name: str, file_path: str, start_line: int, end_line: int, project_type: str) -> Optional[str]:
         content = self.get_file_content(project_name, file_path, project_type)
@@ -423,7 +236,9 @@ class CodeTools(Toolkit):
         return None
 
     def get_dependency_graph(self, project_name: str, project_type: str) -> Optional[Dict]:
-        graph_doc = self.knowledge_base.search(query=f"project:{project_name} type:{project_type}_dependency_graph", num_documents=1)
+        graph_doc = self.knowledge_base.get_documents_by_metadata(
+            {"project": project_name, "type": f"{project_type}_dependency_graph"}, limit=1
+        )
         if graph_doc and graph_doc[0].content:
             try:
                 return json.loads(graph_doc[0].content)
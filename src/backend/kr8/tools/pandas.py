@@ -1,11 +1,13 @@
 import base64
 import io
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 
 from src.backend.kr8.tools import Toolkit
 from src.backend.kr8.utils.log import logger
 from src.backend.kr8.document import Document
 from src.backend.kr8.knowledge.base import AssistantKnowledge
+from src.backend.kr8.storage.dataframe.base import DataFrameStore
 
 try:
     import pandas as pd
@@ -13,12 +15,39 @@ except ImportError:
     raise ImportError("`pandas` not installed. Please install using `pip install pandas`.")
 
 
+class DataFrameCache(OrderedDict):
+    """Dict of dataframes that keeps only the `max_frames` most recently used in memory."""
+
+    def __init__(self, max_frames: int = 8):
+        super().__init__()
+        self.max_frames = max_frames
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_frames:
+            evicted, _ = self.popitem(last=False)
+            logger.debug(f"Evicted dataframe {evicted} from memory")
+
+
 class PandasTools(Toolkit):
-    def __init__(self, user_id: Optional[int] = None, knowledge_base: Optional['AssistantKnowledge'] = None):
+    def __init__(
+        self,
+        user_id: Optional[int] = None,
+        knowledge_base: Optional['AssistantKnowledge'] = None,
+        dataframe_store: Optional[DataFrameStore] = None,
+        max_frames_in_memory: int = 8,
+    ):
         super().__init__(name="pandas_tools")
         self.user_id = user_id
-        self.dataframes: Dict[str, pd.DataFrame] = {}
+        self.dataframes: Dict[str, pd.DataFrame] = DataFrameCache(max_frames_in_memory)
         self.knowledge_base = knowledge_base
+        self.dataframe_store = dataframe_store
         self.register(self.create_pandas_dataframe)
         self.register(self.run_dataframe_operation)
         self.register(self.load_csv)
@@ -33,38 +62,60 @@ class PandasTools(Toolkit):
             df_name = f"user_{self.user_id}_{df_name}" if self.user_id else df_name
             self.dataframes[df_name] = df
             logger.info(f"Loaded CSV: {df_name}, shape: {df.shape}")
-            
-            # Save to pgvector
-            self.save_to_pgvector(df_name, df)
-            
+
+            self.save_dataframe(df_name, df)
+
             return df_name
         except Exception as e:
             logger.error(f"Error loading CSV {file_name}: {str(e)}")
             raise
 
-    def save_to_pgvector(self, df_name: str, df: pd.DataFrame):
+    def save_dataframe(self, df_name: str, df: pd.DataFrame):
+        """Persist the dataframe to the dataframe store and index a compact summary for discovery."""
+        stored = None
+        if self.dataframe_store is not None:
+            try:
+                stored = self.dataframe_store.save(df_name, df, user_id=self.user_id)
+                logger.info(f"Saved dataframe {df_name} to {stored['path']}")
+            except Exception as e:
+                logger.error(f"Error saving dataframe {df_name} to the dataframe store: {str(e)}")
+                logger.exception("Traceback:")
+
         if self.knowledge_base is None:
-            logger.error("Knowledge base not available. Cannot save to pgvector.")
+            logger.debug("Knowledge base not available. Skipping dataframe summary.")
             return
 
-        # Convert DataFrame to CSV string representation
-        csv_string = df.to_csv(index=False)
-
-        # Create a Document object
+        columns = stored["columns"] if stored else [{"name": str(c), "dtype": str(t)} for c, t in df.dtypes.items()]
         doc = Document(
-            content=csv_string,
+            id=df_name,
+            content=self._describe(df_name, df.shape, columns),
             name=df_name,
-            meta_data={"type": "dataframe", "shape": str(df.shape), "columns": df.columns.tolist()}
+            meta_data={
+                "type": "dataframe",
+                "shape": str(df.shape),
+                "columns": [column["name"] for column in columns],
+                "storage": "parquet" if stored else "memory",
+            },
         )
-
-        # Save to knowledge base
         try:
             self.knowledge_base.load_document(doc)
-            logger.info(f"Saved dataframe {df_name} to pgvector")
+            logger.info(f"Indexed summary of dataframe {df_name}")
         except Exception as e:
-            logger.error(f"Error saving dataframe {df_name} to pgvector: {str(e)}")
+            logger.error(f"Error indexing dataframe {df_name}: {str(e)}")
             logger.exception("Traceback:")
-            
+
+    @staticmethod
+    def _describe(df_name: str, shape, columns) -> str:
+        lines = [f"Dataframe {df_name}: {shape[0]} rows x {shape[1]} columns", "Columns:"]
+        for column in columns:
+            details = [column["dtype"]]
+            if "min" in column:
+                details.append(f"range {column['min']} to {column['max']}")
+            if column.get("top"):
+                details.append(f"e.g. {', '.join(column['top'])}")
+            lines.append(f"- {column['name']} ({'; '.join(details)})")
+        return "\n".join(lines)
+
     def load_excel(self, file_name: str, file_content: str) -> str:
         try:
             file_bytes = base64.b64decode(file_content)
@@ -73,8 +124,7 @@ class PandasTools(Toolkit):
             df_name = f"user_{self.user_id}_{df_name}" if self.user_id else df_name
             self.dataframes[df_name] = df
             logger.info(f"Loaded Excel: {df_name}, shape: {df.shape}")
-            # Save to pgvector
-            self.save_to_pgvector(df_name, df)
+            self.save_dataframe(df_name, df)
             return df_name
         except Exception as e:
             logger.error(f"Error loading Excel {file_name}: {str(e)}")
@@ -85,34 +135,41 @@ class PandasTools(Toolkit):
         if df_name in self.dataframes:
             logger.debug(f"Found dataframe {df_name} in local memory")
             return self.dataframes[df_name]
-        elif self.knowledge_base:
+        if self.dataframe_store is not None:
+            try:
+                df = self.dataframe_store.load(df_name)
+            except Exception as e:
+                logger.error(f"Error loading dataframe {df_name} from the dataframe store: {e}")
+                df = None
+            if df is not None:
+                self.dataframes[df_name] = df
+                logger.debug(f"Loaded dataframe {df_name} from the dataframe store")
+                return df
+        if self.knowledge_base:
+            # Dataframes uploaded before the dataframe store existed were saved as CSV documents
             logger.debug(f"Searching for dataframe {df_name} in knowledge base")
             doc = self.knowledge_base.get_document_by_name(df_name)
-            if doc and doc.content:
+            if doc and doc.content and doc.meta_data.get("storage") is None:
                 try:
-                    # Try different encodings
-                    encodings = ['utf-8', 'iso-8859-1', 'cp1252', 'latin1']
-                    for encoding in encodings:
-                        try:
-                            df = pd.read_csv(io.StringIO(doc.content), encoding=encoding)
-                            self.dataframes[df_name] = df
-                            logger.debug(f"Successfully loaded dataframe {df_name} from knowledge base")
-                            return df
-                        except UnicodeDecodeError:
-                            continue
-                    else:
-                        logger.error(f"Unable to decode the CSV content for {df_name} with any of the tried encodings")
+                    df = pd.read_csv(io.StringIO(doc.content))
+                    self.dataframes[df_name] = df
+                    logger.debug(f"Successfully loaded dataframe {df_name} from knowledge base")
+                    return df
                 except Exception as e:
                     logger.error(f"Error loading dataframe from document: {e}")
-        logger.warning(f"Dataframe '{df_name}' not found in local memory or knowledge base")
+        logger.warning(f"Dataframe '{df_name}' not found in local memory, dataframe store or knowledge base")
         return None
-                
+
     def list_dataframes(self) -> str:
+        shapes = {}
+        if self.dataframe_store is not None:
+            for row in self.dataframe_store.list(user_id=self.user_id):
+                shapes[row["name"]] = (row["num_rows"], row["num_columns"])
+        for name, df in self.dataframes.items():
+            shapes[name] = df.shape
         if self.user_id:
-            user_dfs = {name: df for name, df in self.dataframes.items() if name.startswith(f"user_{self.user_id}_")}
-        else:
-            user_dfs = self.dataframes
-        return "\n".join([f"{name}: {df.shape}" for name, df in user_dfs.items()])
+            shapes = {name: shape for name, shape in shapes.items() if name.startswith(f"user_{self.user_id}_")}
+        return "\n".join([f"{name}: {shape}" for name, shape in shapes.items()])
 
     def create_visualization(self, df_name: str, chart_type: str, x: str, y: str, title: str) -> Dict[str, Any]:
         df = self.get_dataframe(df_name)
@@ -1,12 +1,25 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from pathlib import Path
 
+# Module namespaces already executed in this process, keyed by (path, content hash)
+_module_cache: Dict[Tuple[str, str], Dict] = {}
 
-def get_python_objects_from_module(module_path: Path) -> Dict:
-    """Returns a dictionary of python objects from a module"""
+
+def get_python_objects_from_module(module_path: Path, use_cache: bool = False) -> Dict:
+    """Returns a dictionary of python objects from a module.
+    If use_cache is True, a module whose contents have not changed is only executed once per process.
+    """
     import importlib.util
     from importlib.machinery import ModuleSpec
 
+    cache_key: Optional[Tuple[str, str]] = None
+    if use_cache:
+        from hashlib import sha256
+
+        cache_key = (str(module_path.resolve()), sha256(module_path.read_bytes()).hexdigest())
+        if cache_key in _module_cache:
+            return _module_cache[cache_key]
+
     # https://docs.python.org/3/library/importlib.html#importing-a-source-file-directly
     # Create a ModuleSpec
     module_spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location("module", module_path)
@@ -14,6 +27,8 @@ def get_python_objects_from_module(module_path: Path) -> Dict:
     if module_spec:
         module = importlib.util.module_from_spec(module_spec)
         module_spec.loader.exec_module(module)  # type: ignore
+        if cache_key is not None:
+            _module_cache[cache_key] = module.__dict__
         return module.__dict__
     else:
         return {}
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from src.backend.kr8.document import Document
 
@@ -34,6 +34,18 @@ class VectorDb(ABC):
     def search(self, query: str, limit: int = 5) -> List[Document]:
         raise NotImplementedError
 
+    def get_document_by_id(self, id: str) -> Optional[Document]:
+        """Exact lookup by primary key; vector DBs without structured reads leave this unimplemented."""
+        raise NotImplementedError
+
+    def get_document_by_name(self, name: str) -> Optional[Document]:
+        raise NotImplementedError
+
+    def get_documents_by_metadata(
+        self, filters: Dict[str, Any], name: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Document]:
+        raise NotImplementedError
+
     @abstractmethod
     def delete(self) -> None:
         raise NotImplementedError
@@ -1,4 +1,4 @@
 from src.backend.kr8.vectordb.distance import Distance
 from src.backend.kr8.vectordb.pgvector.index import Ivfflat, HNSW
 from src.backend.kr8.vectordb.pgvector.pgvector import PgVector
-from src.backend.kr8.vectordb.pgvector.pgvector2 import PgVector2
+from src.backend.kr8.vectordb.pgvector.pgvector2 import PgVector2, Prefix
@@ -1,7 +1,7 @@
 from collections import defaultdict
 import json
 import re
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Set, Tuple, Union, Dict, Any
 from hashlib import md5
 from datetime import datetime
 import uuid
@@ -11,7 +11,7 @@ from sqlalchemy.engine import create_engine, Engine
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.schema import MetaData, Table
-from sqlalchemy.sql.expression import text, func, select
+from sqlalchemy.sql.expression import text, func, select, literal, literal_column, values, column
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from pgvector.sqlalchemy import Vector
@@ -25,6 +25,36 @@ from src.backend.kr8.vectordb.distance import Distance
 from src.backend.kr8.vectordb.pgvector.index import Ivfflat, HNSW
 from src.backend.kr8.utils.log import logger
 
+# Tables whose generated columns were already looked up by this process
+_checked_tables: Set[str] = set()
+# Tables with the generated tsvector column and GIN index used by hybrid search
+_text_search_tables: Set[str] = set()
+# Tables with the promoted metadata columns and filter indexes
+_filter_indexed_tables: Set[str] = set()
+# Metadata keys most searches filter on; each gets a generated meta_<key> column with a B-tree index
+PROMOTED_METADATA_KEYS = ("project", "type", "space_key")
+# The largest hnsw.ef_search pgvector accepts
+MAX_EF_SEARCH = 1000
+
+
+class Prefix(str):
+    """Filter value matching metadata values that start with it, e.g. filters={"type": Prefix("python")}"""
+
+
+def _like_prefix(value: str) -> str:
+    # Escape with backslash, the default LIKE escape, so Postgres can still use a text_pattern_ops index
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _is_json_text(value: str) -> bool:
+    """Whether value is also the text of a JSON number, boolean, null, array or object"""
+    try:
+        json.loads(value)
+    except ValueError:
+        return False
+    return True
+
+
 class PgVector2(VectorDb):
     def __init__(
         self,
@@ -39,8 +69,38 @@ class PgVector2(VectorDb):
         org_id: Optional[int] = None,
         project_namespace: Optional[str] = None,
         async_session: Optional[async_sessionmaker[AsyncSession]] = None,
-        custom_table: Optional[Table] = None
+        custom_table: Optional[Table] = None,
+        search_type: str = "vector",
+        text_search_config: str = "english",
+        vector_weight: float = 1.0,
+        keyword_weight: float = 1.0,
+        rrf_k: int = 60,
+        hybrid_candidates: int = 50,
+        exact_search_threshold: int = 2000,
+        max_ann_candidates: int = MAX_EF_SEARCH,
     ):
+        """
+        :param search_type: "vector" for embedding similarity only, or "hybrid" to fuse it with full-text search.
+        :param text_search_config: Postgres text search configuration used for the generated tsvector column.
+        :param vector_weight: Weight of the embedding ranking in reciprocal rank fusion.
+        :param keyword_weight: Weight of the full-text ranking in reciprocal rank fusion.
+        :param rrf_k: Reciprocal rank fusion constant; larger values flatten the difference between ranks.
+        :param hybrid_candidates: Minimum number of candidates each ranking contributes before fusion.
+        :param exact_search_threshold: Filtered searches matching at most this many rows scan them exactly
+            instead of using the ANN index.
+        :param max_ann_candidates: Largest candidate list a filtered ANN search over-fetches before it falls
+            back to an exact scan of the matching rows.
+        """
+        if search_type not in ("vector", "hybrid"):
+            raise ValueError(f"Invalid search_type: {search_type}")
+        self.search_type = search_type
+        self.text_search_config = text_search_config
+        self.vector_weight = vector_weight
+        self.keyword_weight = keyword_weight
+        self.rrf_k = rrf_k
+        self.hybrid_candidates = hybrid_candidates
+        self.exact_search_threshold = exact_search_threshold
+        self.max_ann_candidates = max_ann_candidates
         self.project_namespace = project_namespace
         self.user_id = user_id
         self.org_id = org_id
@@ -81,6 +141,10 @@ class PgVector2(VectorDb):
             parts.append(self.project_namespace)
         return "_".join(parts)
 
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.schema}.{self.table.name}" if self.schema else self.table.name
+
     def get_table(self) -> Table:
         if self.custom_table is not None:  # Change this line
             required_columns = {
@@ -122,6 +186,8 @@ class PgVector2(VectorDb):
     def ensure_table_exists(self):
         if not self.table_exists():
             self.create()
+        else:
+            self.check_generated_columns()
 
      
     def create(self) -> None:
@@ -133,10 +199,90 @@ class PgVector2(VectorDb):
                         if self.schema:
                             sess.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema};"))
                         self.table.create(self.db_engine)
+                        # Cheap while the table is empty
+                        for statement in self.lookup_index_statements() + self.generated_column_statements():
+                            sess.execute(text(statement))
                         self.logger.info(f"Successfully created table: {self.collection}")
                     except Exception as e:
                         self.logger.error(f"Error creating table: {e}")
                         raise
+        self.check_generated_columns()
+
+    def lookup_index_statements(self) -> List[str]:
+        """DDL for the B-tree index on `name` and GIN index on `meta_data` used by the exact-key lookups.
+
+        Only runs on new, empty tables; alembic revision 9b3d5e7f1a24 builds them concurrently on existing ones.
+        """
+        qualified_name = self.qualified_name
+        statements = []
+        if hasattr(self.table.c, 'name'):
+            statements.append(f'CREATE INDEX IF NOT EXISTS "{self.table.name}_name_idx" ON {qualified_name} (name)')
+        if hasattr(self.table.c, 'meta_data'):
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{self.table.name}_meta_data_idx" ON {qualified_name} USING gin (meta_data jsonb_path_ops)'
+            )
+        return statements
+
+    def generated_column_statements(self) -> List[str]:
+        """DDL adding the generated columns and indexes used by filtered and hybrid search.
+
+        The promoted meta_<key> columns turn filters on the hot metadata keys into B-tree lookups (text_pattern_ops
+        also serves Prefix filters), and `content_tsv` is the full-text side of hybrid search. Postgres generates
+        them on write, and they are deliberately not part of `self.table`, so documents never read or write them.
+        Adding a stored generated column rewrites the table, so these only run on new, empty tables; alembic
+        revision f2c6a8d4b710 adds them to existing ones.
+        """
+        qualified_name = self.qualified_name
+        statements = []
+        if hasattr(self.table.c, 'meta_data'):
+            for key in PROMOTED_METADATA_KEYS:
+                statements.append(
+                    f"ALTER TABLE {qualified_name} ADD COLUMN IF NOT EXISTS meta_{key} text "
+                    f"GENERATED ALWAYS AS (meta_data->>'{key}') STORED"
+                )
+                statements.append(
+                    f'CREATE INDEX IF NOT EXISTS "{self.table.name}_meta_{key}_idx" '
+                    f"ON {qualified_name} (meta_{key} text_pattern_ops)"
+                )
+        for column in ("user_id", "org_id"):
+            if hasattr(self.table.c, column):
+                statements.append(
+                    f'CREATE INDEX IF NOT EXISTS "{self.table.name}_{column}_idx" ON {qualified_name} ({column})'
+                )
+        if hasattr(self.table.c, 'content'):
+            source = "coalesce(content, '')"
+            if hasattr(self.table.c, 'name'):
+                source = f"coalesce(name, '') || ' ' || {source}"
+            statements.append(
+                f"ALTER TABLE {qualified_name} ADD COLUMN IF NOT EXISTS content_tsv tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('{self.text_search_config}'::regconfig, {source})) STORED"
+            )
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{self.table.name}_content_tsv_idx" '
+                f"ON {qualified_name} USING gin (content_tsv)"
+            )
+        return statements
+
+    def check_generated_columns(self) -> None:
+        """Record which of the generated columns the table has; filters and hybrid search only use those."""
+        qualified_name = self.qualified_name
+        if qualified_name in _checked_tables:
+            return
+        try:
+            columns = {column["name"] for column in inspect(self.db_engine).get_columns(self.table.name, schema=self.schema)}
+        except Exception as e:
+            self.logger.error(f"Error reading the columns of {qualified_name}: {e}")
+            return
+        _checked_tables.add(qualified_name)
+        if all(f"meta_{key}" in columns for key in PROMOTED_METADATA_KEYS):
+            _filter_indexed_tables.add(qualified_name)
+        elif hasattr(self.table.c, 'meta_data'):
+            self.logger.warning(f"{qualified_name} has no promoted metadata columns; run `alembic upgrade head`")
+        if "content_tsv" in columns:
+            _text_search_tables.add(qualified_name)
+        elif self.search_type == "hybrid":
+            self.logger.warning(f"{qualified_name} has no content_tsv column, searching by vector only; "
+                                f"run `alembic upgrade head`")
 
     def upsert(self, documents: List[Document], batch_size: int = 20) -> None:
         self.ensure_table_exists() 
@@ -196,59 +342,338 @@ class PgVector2(VectorDb):
                 sess.commit()
                 self.logger.info(f"Committed final {counter} documents")
 
+    def bulk_upsert(self, documents: List[Document], batch_size: int = 500) -> int:
+        """Upsert documents with one batched embedding call and one multi-row INSERT ... ON CONFLICT per batch.
+
+        Documents that already carry an embedding are not re-embedded.
+        """
+        self.ensure_table_exists()
+        upserted = 0
+        with self.Session() as sess:
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                to_embed = [document for document in batch if document.embedding is None]
+                if to_embed:
+                    embeddings = self.embedder.get_embeddings([document.content for document in to_embed])
+                    for document, embedding in zip(to_embed, embeddings):
+                        document.embedding = embedding
+
+                rows = {}
+                now = datetime.utcnow()
+                for document in batch:
+                    cleaned_content = document.content.replace("\x00", "\ufffd")
+                    content_hash = md5(cleaned_content.encode()).hexdigest()
+                    _id = document.id or content_hash
+                    # Last write wins for duplicate ids; ON CONFLICT cannot touch the same row twice in one statement
+                    rows[_id] = {
+                        "id": _id,
+                        "name": document.name,
+                        "meta_data": document.meta_data if isinstance(document.meta_data, dict) else {},
+                        "content": cleaned_content,
+                        "embedding": document.embedding,
+                        "usage": document.usage,
+                        "content_hash": content_hash,
+                        "user_id": self.user_id,
+                        "org_id": self.org_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+
+                stmt = postgresql.insert(self.table).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={
+                        col.name: stmt.excluded[col.name]
+                        for col in self.table.columns
+                        if col.name not in ['id', 'created_at']
+                    }
+                )
+                try:
+                    sess.execute(stmt)
+                    sess.commit()
+                    upserted += len(rows)
+                    self.logger.info(f"Bulk upserted {len(rows)} documents")
+                except SQLAlchemyError as e:
+                    self.logger.error(f"Error bulk upserting documents: {e}")
+                    sess.rollback()
+                    raise
+        return upserted
+
+    def _filter_conditions(self, filters: Optional[Dict[str, Any]]) -> List[Any]:
+        """Index-friendly predicates for `filters`.
+
+        Table columns and promoted metadata keys compare directly, other metadata keys with plain string values
+        are combined into one JSONB containment (`meta_data @> {...}`) and the rest compare as text. A Prefix
+        value matches values that start with it.
+        """
+        conditions = []
+        contained: Dict[str, Any] = {}
+        promoted = self.qualified_name in _filter_indexed_tables
+        for key, value in (filters or {}).items():
+            if hasattr(self.table.c, key):
+                column = getattr(self.table.c, key)
+            elif promoted and key in PROMOTED_METADATA_KEYS:
+                column = literal_column(f"meta_{key}", type_=String)
+                value = value if isinstance(value, Prefix) else str(value)
+            elif isinstance(value, Prefix):
+                column = self.table.c.meta_data[key].astext
+            elif isinstance(value, str) and not _is_json_text(value):
+                # Only a stored JSON string has this text, so containment matches the same rows as
+                # `meta_data->>key = value` and is served by the GIN index
+                contained[key] = value
+                continue
+            else:
+                # Compare as text, so 123 and "123" match whichever of the two is stored
+                column = self.table.c.meta_data[key].astext
+                value = str(value)
+            if isinstance(value, Prefix):
+                conditions.append(column.like(_like_prefix(value)))
+            else:
+                conditions.append(column == value)
+        if contained:
+            conditions.append(self.table.c.meta_data.contains(contained))
+        if self.user_id and hasattr(self.table.c, 'user_id'):
+            conditions.append(self.table.c.user_id == self.user_id)
+        return conditions
+
+    def _distance(self, query_embedding: List[float]) -> Any:
+        if self.distance == Distance.l2:
+            return self.table.c.embedding.l2_distance(query_embedding)
+        if self.distance == Distance.max_inner_product:
+            return self.table.c.embedding.max_inner_product(query_embedding)
+        return self.table.c.embedding.cosine_distance(query_embedding)
+
+    def _set_index_options(self, sess: Session, candidates: int = 0, expansion: int = 1) -> None:
+        """Set the ANN search options for this transaction.
+
+        :param candidates: Rows the index scan must be able to return; an HNSW scan stops after ef_search rows.
+        :param expansion: Multiplies the ivfflat probes, for searches that need to look further.
+        """
+        if self.index:
+            if isinstance(self.index, Ivfflat):
+                probes = min(self.index.lists, self.index.probes * expansion)
+                sess.execute(text(f"SET LOCAL ivfflat.probes = {probes}"))
+            elif isinstance(self.index, HNSW):
+                ef_search = min(max(self.index.ef_search, candidates), MAX_EF_SEARCH)
+                sess.execute(text(f"SET LOCAL hnsw.ef_search  = {ef_search}"))
+
+    def _to_documents(self, rows: List[Any]) -> List[Document]:
+        search_results = []
+        for row in rows:
+            doc_dict = {col.name: getattr(row, col.name) for col in self.table.columns if col.name != 'embedding'}
+            doc_dict['embedding'] = row.embedding
+            search_results.append(Document(**doc_dict))
+        return search_results
+
     def search(self, query: str, limit: int = 5, collection: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        if self.search_type == "hybrid":
+            return self.hybrid_search(query, limit=limit, filters=filters)
+
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             self.logger.error(f"Error getting embedding for Query: {query}")
             return []
+        return self.vector_search(query_embedding, limit=limit, filters=filters)
+
+    def vector_search(
+        self, query_embedding: List[float], limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        self.check_generated_columns()
+        conditions = self._filter_conditions(filters)
+        try:
+            with self.Session() as sess:
+                with sess.begin():
+                    if not filters:
+                        self._set_index_options(sess, candidates=limit)
+                        neighbors = self._ann_search(sess, query_embedding, conditions, limit)
+                    else:
+                        plan, num_matching = self.plan_filtered_search(sess, conditions, limit)
+                        self.logger.debug(f"Filtered search: {plan} ({num_matching} matching rows) for {filters}")
+                        if num_matching == 0:
+                            return []
+                        if plan == "exact":
+                            neighbors = self._exact_search(sess, query_embedding, conditions, limit)
+                        else:
+                            neighbors = self._filtered_ann_search(sess, query_embedding, conditions, limit)
+        except Exception as e:
+            self.logger.error(f"Error searching for documents: {e}")
+            return []
 
+        return self._to_documents(neighbors)
+
+    def _search_columns(self) -> List[Any]:
         columns = [col for col in self.table.columns if col.name != 'embedding']
         columns.append(self.table.c.embedding)
+        return columns
 
-        stmt = select(*columns)
+    def plan_filtered_search(self, sess: Session, conditions: List[Any], limit: int) -> Tuple[str, int]:
+        """Choose how to run a filtered search. Returns (plan, matching rows counted).
 
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.table.c, key):
-                    stmt = stmt.where(getattr(self.table.c, key) == value)
-                else:
-                    # For metadata fields, including Confluence-specific ones
-                    stmt = stmt.where(self.table.c.meta_data[key].astext == str(value))
+        Matching rows are counted through the filter indexes, stopping past the threshold. A small subset is
+        scanned exactly ("exact"); a large one uses the ANN index and over-fetches until k rows match ("ann").
+        """
+        threshold = max(self.exact_search_threshold, limit)
+        matching = select(literal(1)).select_from(self.table).where(*conditions).limit(threshold + 1).subquery()
+        num_matching = sess.execute(select(func.count()).select_from(matching)).scalar() or 0
+        return ("exact" if num_matching <= threshold else "ann"), num_matching
 
-        if self.user_id and hasattr(self.table.c, 'user_id'):
-            stmt = stmt.where(self.table.c.user_id == self.user_id)
+    def _ann_search(
+        self, sess: Session, query_embedding: List[float], conditions: List[Any], limit: int,
+        columns: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        stmt = select(*(columns or self._search_columns())).where(*conditions)
+        stmt = stmt.order_by(self._distance(query_embedding)).limit(limit)
+        return sess.execute(stmt).fetchall() or []
 
-        if self.distance == Distance.l2:
-            stmt = stmt.order_by(self.table.c.embedding.l2_distance(query_embedding))
-        elif self.distance == Distance.cosine:
-            stmt = stmt.order_by(self.table.c.embedding.cosine_distance(query_embedding))
-        elif self.distance == Distance.max_inner_product:
-            stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
+    def _exact_candidates(self, query_embedding: List[float], conditions: List[Any], columns: List[Any]) -> Any:
+        """The rows matching conditions with their distance, as a materialized CTE.
+
+        Materializing keeps Postgres from answering an ORDER BY distance with the ANN index, which would
+        stop after ef_search rows and then drop the ones that do not match.
+        """
+        return (
+            select(*columns, self._distance(query_embedding).label("distance"))
+            .where(*conditions)
+            .cte("candidates")
+            .prefix_with("MATERIALIZED")
+        )
+
+    def _exact_search(
+        self, sess: Session, query_embedding: List[float], conditions: List[Any], limit: int,
+        columns: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        """Exact nearest neighbours among the rows matching conditions."""
+        candidates = self._exact_candidates(query_embedding, conditions, columns or self._search_columns())
+        stmt = select(candidates).order_by(candidates.c.distance).limit(limit)
+        return sess.execute(stmt).fetchall() or []
+
+    def _filtered_ann_search(
+        self, sess: Session, query_embedding: List[float], conditions: List[Any], limit: int,
+        columns: Optional[List[Any]] = None,
+    ) -> List[Any]:
+        """ANN search that widens the index scan until `limit` rows pass the filters.
+
+        If the widest scan still comes up short, the matching rows are scanned exactly, so k rows are
+        returned whenever k rows match.
+        """
+        expansion = 1
+        candidates = limit * 4
+        while True:
+            self._set_index_options(sess, candidates=candidates, expansion=expansion)
+            rows = self._ann_search(sess, query_embedding, conditions, limit, columns)
+            if len(rows) >= limit or candidates >= self.max_ann_candidates:
+                break
+            expansion *= 4
+            candidates = min(candidates * 4, self.max_ann_candidates)
+        if len(rows) < limit:
+            self.logger.debug(f"ANN search found {len(rows)} of {limit} filtered rows, scanning exactly")
+            rows = self._exact_search(sess, query_embedding, conditions, limit, columns)
+        return rows
+
+    def hybrid_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Fuse the embedding ranking with a full-text ranking using reciprocal rank fusion.
+
+        Both candidate lists are computed in CTEs, so an unfiltered search is one round trip; a filtered one
+        first counts the matching rows to plan its embedding side (see `_semantic_candidates`). Full-text matching
+        catches exact identifiers (ticket ids, policy codes, class names, error strings) that the embedding
+        model misses, without raising `limit`.
+        """
+        query_embedding = self.embedder.get_embedding(query)
+        if query_embedding is None:
+            self.logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        self.check_generated_columns()
+        if self.qualified_name not in _text_search_tables:
+            return self.vector_search(query_embedding, limit=limit, filters=filters)
 
-        stmt = stmt.limit(limit=limit)
+        conditions = self._filter_conditions(filters)
+        num_candidates = max(limit * 4, self.hybrid_candidates)
+
+        # websearch_to_tsquery accepts free text and never raises on user input
+        ts_query = func.websearch_to_tsquery(literal(self.text_search_config).cast(postgresql.REGCONFIG), query)
+        content_tsv = literal_column("content_tsv", type_=postgresql.TSVECTOR)
+        # Normalization 1 divides by 1 + log(document length), a BM25-like length penalty
+        ts_rank = func.ts_rank_cd(content_tsv, ts_query, 1)
+        keyword = (
+            select(self.table.c.id, func.row_number().over(order_by=ts_rank.desc()).label("rank"))
+            .where(content_tsv.op("@@")(ts_query), *conditions)
+            .order_by(ts_rank.desc())
+            .limit(num_candidates)
+            .cte("keyword")
+        )
 
         try:
             with self.Session() as sess:
                 with sess.begin():
-                    if self.index:
-                        if isinstance(self.index, Ivfflat):
-                            sess.execute(text(f"SET LOCAL ivfflat.probes = {self.index.probes}"))
-                        elif isinstance(self.index, HNSW):
-                            sess.execute(text(f"SET LOCAL hnsw.ef_search  = {self.index.ef_search}"))
-                    neighbors = sess.execute(stmt).fetchall() or []
+                    semantic = self._semantic_candidates(sess, query_embedding, conditions, filters, num_candidates)
+                    if semantic is None:
+                        return []
+                    score = func.coalesce(
+                        literal(float(self.vector_weight)) / (self.rrf_k + semantic.c.rank), 0.0
+                    ) + func.coalesce(literal(float(self.keyword_weight)) / (self.rrf_k + keyword.c.rank), 0.0)
+                    fused = (
+                        select(func.coalesce(semantic.c.id, keyword.c.id).label("id"), score.label("score"))
+                        .select_from(semantic.join(keyword, semantic.c.id == keyword.c.id, full=True))
+                        .cte("fused")
+                    )
+                    stmt = (
+                        select(*self._search_columns())
+                        .join_from(self.table, fused, self.table.c.id == fused.c.id)
+                        .order_by(fused.c.score.desc())
+                        .limit(limit)
+                    )
+                    rows = sess.execute(stmt).fetchall() or []
         except Exception as e:
-            self.logger.error(f"Error searching for documents: {e}")
+            self.logger.error(f"Error in hybrid search for documents: {e}")
             return []
 
-        search_results = []
-        for neighbor in neighbors:
-            doc_dict = {col.name: getattr(neighbor, col.name) for col in self.table.columns if col.name != 'embedding'}
-            doc_dict['embedding'] = neighbor.embedding
-            doc = Document(**doc_dict)
-            search_results.append(doc)
+        return self._to_documents(rows)
+
+    def _semantic_candidates(
+        self,
+        sess: Session,
+        query_embedding: List[float],
+        conditions: List[Any],
+        filters: Optional[Dict[str, Any]],
+        num_candidates: int,
+    ) -> Optional[Any]:
+        """The embedding side of hybrid search: a CTE of (id, rank), or None if no row matches the filters.
+
+        Filtered searches are planned like `vector_search`, so the ranking holds num_candidates rows whenever
+        that many match instead of whatever the ANN scan happened to keep after filtering.
+        """
+        if not filters:
+            distance = self._distance(query_embedding)
+            self._set_index_options(sess, candidates=num_candidates)
+            return (
+                select(self.table.c.id, func.row_number().over(order_by=distance).label("rank"))
+                .where(*conditions)
+                .order_by(distance)
+                .limit(num_candidates)
+                .cte("semantic")
+            )
+
+        plan, num_matching = self.plan_filtered_search(sess, conditions, num_candidates)
+        self.logger.debug(f"Filtered hybrid search: {plan} ({num_matching} matching rows) for {filters}")
+        if num_matching == 0:
+            return None
+        if plan == "exact":
+            candidates = self._exact_candidates(query_embedding, conditions, [self.table.c.id])
+            return (
+                select(candidates.c.id, func.row_number().over(order_by=candidates.c.distance).label("rank"))
+                .order_by(candidates.c.distance)
+                .limit(num_candidates)
+                .cte("semantic")
+            )
+        # The widening ANN search needs a round trip per attempt, so its ranking is passed back as VALUES
+        rows = self._filtered_ann_search(sess, query_embedding, conditions, num_candidates, [self.table.c.id])
+        if not rows:
+            return None
+        ranks = values(column("id", String), column("rank", Integer), name="semantic_ranks").data(
+            [(row.id, rank) for rank, row in enumerate(rows, start=1)]
+        )
+        return select(ranks.c.id, ranks.c.rank).cte("semantic")
 
-        return search_results
-    
     def get_document_by_name(self, name: str) -> Optional[Document]:
         with self.Session() as sess:
             with sess.begin():
@@ -262,6 +687,38 @@ class PgVector2(VectorDb):
                     return Document(**doc_dict)
         return None
 
+    def get_documents_by_metadata(
+        self, filters: Dict[str, Any], name: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Document]:
+        """Exact lookup of documents whose meta_data contains `filters` (JSONB @>, served by the GIN index).
+
+        Embeddings are not loaded; callers of a point read only need the content and metadata.
+        """
+        columns = [col for col in self.table.columns if col.name != 'embedding']
+        stmt = select(*columns).where(self.table.c.meta_data.contains(filters))
+        if name is not None:
+            stmt = stmt.where(self.table.c.name == name)
+        if self.user_id and hasattr(self.table.c, 'user_id'):
+            stmt = stmt.where(self.table.c.user_id == self.user_id)
+        stmt = stmt.order_by(self.table.c.name, self.table.c.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with self.Session() as sess:
+            with sess.begin():
+                results = sess.execute(stmt).fetchall()
+                return [Document(**{col.name: getattr(result, col.name) for col in columns}) for result in results]
+
+    def delete_documents_by_metadata(self, filters: Dict[str, Any], exclude: Optional[Dict[str, Any]] = None) -> int:
+        """Delete the documents whose meta_data contains `filters` but not `exclude`. Returns how many."""
+        stmt = delete(self.table).where(self.table.c.meta_data.contains(filters))
+        if exclude:
+            stmt = stmt.where(~self.table.c.meta_data.contains(exclude))
+        if self.user_id and hasattr(self.table.c, 'user_id'):
+            stmt = stmt.where(self.table.c.user_id == self.user_id)
+        with self.Session() as sess:
+            with sess.begin():
+                return sess.execute(stmt).rowcount
+
     def get_all_documents(self) -> List[Document]:
         with self.Session() as sess:
             with sess.begin():
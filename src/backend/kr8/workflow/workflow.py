@@ -1,5 +1,10 @@
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from hashlib import sha256
+from pathlib import Path
 from uuid import uuid4
-from typing import List, Any, Optional, Dict, Iterator, Union
+from typing import List, Any, Optional, Dict, Iterator, Set, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, field_validator, Field
 
@@ -34,6 +39,15 @@ class Workflow(BaseModel):
     # Metadata associated with the assistant tasks
     task_data: Optional[Dict[str, Any]] = None
 
+    # -*- Execution settings
+    # Maximum number of independent tasks running at once, used when tasks set depends_on.
+    # Tasks running concurrently must not share an Assistant.
+    max_concurrency: int = 4
+    # Reuse the output of a task when its input has not changed since an earlier run
+    memoize: bool = False
+    # Directory to keep memoized outputs between processes. In memory only if None
+    memo_dir: Optional[str] = None
+
     # -*- Workflow Output
     # Final output of this Workflow
     output: Optional[Any] = None
@@ -45,6 +59,9 @@ class Workflow(BaseModel):
     # monitoring=True logs Workflow runs on phidata.app
     monitoring: bool = False
 
+    # Cached values: do not set these directly
+    _memo: Dict[str, str] = {}
+
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @field_validator("debug_mode", mode="before")
@@ -58,6 +75,135 @@ class Workflow(BaseModel):
     def set_run_id(cls, v: Optional[str]) -> str:
         return v if v is not None else str(uuid4())
 
+    def get_task_dependencies(self) -> Dict[str, List[Task]]:
+        """Returns task_id -> tasks it depends on, in the order of self.tasks. Raises ValueError on cycles."""
+        tasks_by_key: Dict[str, Task] = {}
+        for task in self.tasks:
+            tasks_by_key[task.task_id] = task  # type: ignore
+            if task.name is not None:
+                tasks_by_key[task.name] = task
+
+        dependencies: Dict[str, List[Task]] = {}
+        for task in self.tasks:
+            task_dependencies: List[Task] = []
+            for key in task.depends_on or []:
+                if key not in tasks_by_key:
+                    raise ValueError(f"Task {task.name or task.task_id} depends on unknown task: {key}")
+                task_dependencies.append(tasks_by_key[key])
+            dependencies[task.task_id] = sorted(task_dependencies, key=self.tasks.index)  # type: ignore
+
+        # Every task must be reachable in topological order
+        resolved: Set[str] = set()
+        while len(resolved) < len(self.tasks):
+            ready = [
+                task.task_id
+                for task in self.tasks
+                if task.task_id not in resolved and all(d.task_id in resolved for d in dependencies[task.task_id])
+            ]
+            if not ready:
+                cycle = [task.name or task.task_id for task in self.tasks if task.task_id not in resolved]
+                raise ValueError(f"Tasks have circular dependencies: {cycle}")
+            resolved.update(ready)  # type: ignore
+        return dependencies
+
+    def get_task_input(
+        self,
+        task: Task,
+        message: Optional[Union[List, Dict, str]] = None,
+        previous_tasks: Optional[List[Tuple[int, Task]]] = None,
+    ) -> str:
+        """Builds the input of task from the workflow message, its inputs and the outputs of previous_tasks"""
+        task_input: List[str] = []
+        if message is not None:
+            task_input.append(get_text_from_message(message))
+
+        if task.inputs:
+            task_input.append("\nInputs:")
+            for input_name, input_value in task.inputs.items():
+                task_input.append(f"{input_name}: {input_value}")
+
+        previous_task_outputs = []
+        for previous_task_idx, previous_task in previous_tasks or []:
+            previous_task_output = previous_task.get_task_output_as_str()
+            if previous_task_output is not None:
+                previous_task_outputs.append((previous_task_idx, previous_task.description, previous_task_output))
+
+        if len(previous_task_outputs) > 0:
+            task_input.append("\nHere are previous tasks and and their results:\n---")
+            for previous_task_idx, previous_task_description, previous_task_output in previous_task_outputs:
+                task_input.append(f"Task {previous_task_idx}: {previous_task_description}")
+                task_input.append(previous_task_output)
+            task_input.append("---")
+        return "\n".join(task_input)
+
+    def _get_memo_key(self, task: Task, task_input: str) -> str:
+        assistant = task.get_assistant()
+        llm = assistant.llm
+        return sha256(
+            json.dumps(
+                {
+                    "name": task.name,
+                    "description": task.description,
+                    "assistant": assistant.name,
+                    "instructions": assistant.instructions,
+                    "llm": f"{llm.__class__.__name__}:{getattr(llm, 'model', None)}" if llm is not None else None,
+                    "input": task_input,
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+
+    def _get_memo_file(self, memo_key: str) -> Optional[Path]:
+        return Path(self.memo_dir).joinpath(f"{memo_key}.json") if self.memo_dir is not None else None
+
+    def _read_memo(self, memo_key: str) -> Optional[str]:
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        memo_file = self._get_memo_file(memo_key)
+        if memo_file is not None and memo_file.exists():
+            try:
+                output = json.loads(memo_file.read_text())["output"]
+                self._memo[memo_key] = output
+                return output
+            except Exception as e:
+                logger.debug(f"Ignoring memoized output {memo_file}: {e}")
+        return None
+
+    def _write_memo(self, memo_key: str, output: str) -> None:
+        self._memo[memo_key] = output
+        memo_file = self._get_memo_file(memo_key)
+        if memo_file is not None:
+            try:
+                memo_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = memo_file.with_name(f".{memo_file.name}.{os.getpid()}.tmp")
+                tmp_file.write_text(json.dumps({"output": output}))
+                os.replace(tmp_file, memo_file)
+            except Exception as e:
+                logger.debug(f"Could not save memoized output {memo_file}: {e}")
+
+    def _run_task(self, task: Task, task_input: str, *, stream: bool, **kwargs: Any) -> Iterator[str]:
+        """Runs task, or replays its memoized output when it already ran with the same input"""
+        memo_key = self._get_memo_key(task, task_input) if self.memoize else None
+        if memo_key is not None:
+            memoized_output = self._read_memo(memo_key)
+            if memoized_output is not None:
+                logger.debug(f"Reusing memoized output of task: {task.name or task.task_id}")
+                task.output = memoized_output
+                yield memoized_output if task.show_output else ""
+                return
+
+        if stream and task.streamable:
+            for chunk in task.run(message=task_input, stream=True, **kwargs):
+                yield chunk if isinstance(chunk, str) else ""
+        else:
+            task_output = task.run(message=task_input, stream=False, **kwargs)
+            yield task_output if isinstance(task_output, str) else ""
+
+        task_output_str = task.get_task_output_as_str()
+        if memo_key is not None and task_output_str is not None:
+            self._write_memo(memo_key, task_output_str)
+
     def _run(
         self,
         message: Optional[Union[List, Dict, str]] = None,
@@ -67,8 +213,13 @@ class Workflow(BaseModel):
     ) -> Iterator[str]:
         logger.debug(f"*********** Workflow Run Start: {self.run_id} ***********")
 
+        if any(task.depends_on is not None for task in self.tasks):
+            yield from self._run_dag(message=message, **kwargs)
+            logger.debug(f"*********** Workflow Run End: {self.run_id} ***********")
+            return
+
         # List of tasks that have been run
-        executed_tasks: List[Task] = []
+        executed_tasks: List[Tuple[int, Task]] = []
         workflow_output: List[str] = []
 
         # -*- Generate response by running tasks
@@ -76,43 +227,64 @@ class Workflow(BaseModel):
             logger.debug(f"*********** Task {idx} Start ***********")
 
             # -*- Prepare input message for the current_task
-            task_input: List[str] = []
-            if message is not None:
-                task_input.append(get_text_from_message(message))
-
-            if len(executed_tasks) > 0:
-                previous_task_outputs = []
-                for previous_task_idx, previous_task in enumerate(executed_tasks, start=1):
-                    previous_task_output = previous_task.get_task_output_as_str()
-                    if previous_task_output is not None:
-                        previous_task_outputs.append(
-                            (previous_task_idx, previous_task.description, previous_task_output)
-                        )
-
-                if len(previous_task_outputs) > 0:
-                    task_input.append("\nHere are previous tasks and and their results:\n---")
-                    for previous_task_idx, previous_task_description, previous_task_output in previous_task_outputs:
-                        task_input.append(f"Task {previous_task_idx}: {previous_task_description}")
-                        task_input.append(previous_task_output)
-                    task_input.append("---")
+            input_for_current_task = self.get_task_input(task, message=message, previous_tasks=executed_tasks)
 
             # -*- Run Task
             task_output = ""
-            input_for_current_task = "\n".join(task_input)
-            if stream and task.streamable:
-                for chunk in task.run(message=input_for_current_task, stream=True, **kwargs):
-                    task_output += chunk if isinstance(chunk, str) else ""
-                    yield chunk if isinstance(chunk, str) else ""
-            else:
-                task_output = task.run(message=input_for_current_task, stream=False, **kwargs)  # type: ignore
-
-            executed_tasks.append(task)
+            for chunk in self._run_task(task, input_for_current_task, stream=stream, **kwargs):
+                task_output += chunk
+                yield chunk
+
+            executed_tasks.append((idx, task))
             workflow_output.append(task_output)
             logger.debug(f"*********** Task {idx} End ***********")
-            if not stream:
-                yield task_output
         logger.debug(f"*********** Workflow Run End: {self.run_id} ***********")
 
+    def _run_dag(self, message: Optional[Union[List, Dict, str]] = None, **kwargs: Any) -> Iterator[str]:
+        """Runs tasks as soon as the tasks they depend on finish, up to max_concurrency at once.
+
+        Each task receives the workflow message and the outputs of its dependencies only. Outputs are yielded
+        in the order of self.tasks, each as soon as it and every task before it have finished.
+        """
+        dependencies = self.get_task_dependencies()
+        task_index: Dict[str, int] = {task.task_id: idx for idx, task in enumerate(self.tasks, start=1)}  # type: ignore
+        outputs: Dict[str, str] = {}
+        started: Set[str] = set()
+        next_to_yield = 0
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+            running: Dict[Future, Task] = {}
+
+            def submit_ready_tasks() -> None:
+                for task in self.tasks:
+                    task_dependencies = dependencies[task.task_id]  # type: ignore
+                    if task.task_id in started or any(d.task_id not in outputs for d in task_dependencies):
+                        continue
+                    task_input = self.get_task_input(
+                        task,
+                        message=message,
+                        previous_tasks=[(task_index[d.task_id], d) for d in task_dependencies],  # type: ignore
+                    )
+                    logger.debug(f"*********** Task {task_index[task.task_id]} Start ***********")  # type: ignore
+                    started.add(task.task_id)  # type: ignore
+                    future = executor.submit(
+                        lambda t, i: "".join(self._run_task(t, i, stream=False, **kwargs)), task, task_input
+                    )
+                    running[future] = task
+
+            submit_ready_tasks()
+            while running:
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    # Raises the exception of a failed task; tasks already running are left to finish
+                    outputs[task.task_id] = future.result()  # type: ignore
+                    logger.debug(f"*********** Task {task_index[task.task_id]} End ***********")  # type: ignore
+                submit_ready_tasks()
+                while next_to_yield < len(self.tasks) and self.tasks[next_to_yield].task_id in outputs:
+                    yield outputs[self.tasks[next_to_yield].task_id]  # type: ignore
+                    next_to_yield += 1
+
     def run(
         self,
         message: Optional[Union[List, Dict, str]] = None,
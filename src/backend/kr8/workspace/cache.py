@@ -0,0 +1,197 @@
+import json
+import os
+import re
+import sys
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.backend.kr8.constants import WORKSPACE_CACHE_DIR_ENV_VAR, WORKSPACE_CACHE_ENV_VAR
+from src.backend.kr8.utils.log import logger
+
+# Bump when the layout of a cache entry changes
+WORKSPACE_CACHE_VERSION = 1
+# Env vars that change how resources are built even when no resource file reads them by name
+WORKSPACE_CACHE_ENV_PREFIXES = ("PHI_", "AWS_", "DOCKER_", "KUBECONFIG")
+# getenv("X"), environ.get("X") and environ["X"] in resource files
+_env_var_pattern = re.compile(r"""(?:getenv\(|environ\.get\(|environ\[)\s*["']([A-Za-z_][A-Za-z0-9_]*)["']""")
+_kr8_source_stamp: Optional[str] = None
+
+
+def workspace_cache_enabled() -> bool:
+    return os.getenv(WORKSPACE_CACHE_ENV_VAR, "true").lower() not in ("false", "0", "no")
+
+
+def get_workspace_cache_dir() -> Path:
+    cache_dir = os.getenv(WORKSPACE_CACHE_DIR_ENV_VAR)
+    if cache_dir is not None:
+        return Path(cache_dir)
+    return Path.home().resolve().joinpath(".phi", "cache", "workspaces")
+
+
+def _hash_file(file_path: Path) -> Optional[str]:
+    try:
+        return sha256(file_path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _get_kr8_source_stamp() -> str:
+    """Size and mtime of every kr8 module, so upgrading or editing kr8 invalidates pickled resources."""
+    global _kr8_source_stamp
+    if _kr8_source_stamp is None:
+        kr8_dir = Path(__file__).resolve().parent.parent
+        digest = sha256()
+        for source_file in sorted(kr8_dir.rglob("*.py")):
+            stat = source_file.stat()
+            digest.update(f"{source_file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        _kr8_source_stamp = digest.hexdigest()
+    return _kr8_source_stamp
+
+
+def _get_env_var_names(files: Iterable[Path]) -> List[str]:
+    names = {name for name in os.environ if name.startswith(WORKSPACE_CACHE_ENV_PREFIXES)}
+    for file_path in files:
+        try:
+            names.update(_env_var_pattern.findall(file_path.read_text(errors="ignore")))
+        except OSError:
+            continue
+    return sorted(names)
+
+
+def _hash_env(names: Iterable[str]) -> str:
+    # Only the digest is persisted, never the values themselves
+    return sha256(json.dumps({name: os.getenv(name) for name in names}, sort_keys=True).encode()).hexdigest()
+
+
+def is_private(path: Path) -> bool:
+    """Whether path and its directory are owned by this user and not writable by anyone else"""
+    if not hasattr(os, "getuid"):
+        return True
+    for checked in (path, path.parent):
+        stat = checked.stat()
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+            return False
+    return True
+
+
+def write_private_file(file_path: Path, data: bytes) -> None:
+    """Atomically writes data to file_path, readable only by this user, in a directory only this user can open"""
+    file_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    file_path.parent.chmod(0o700)
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as tmp_file:
+        tmp_file.write(data)
+    os.replace(tmp_path, file_path)
+
+
+class WorkspaceCache:
+    """Persists the resource groups built from a workspace between CLI invocations.
+
+    An entry is keyed by the content of the resource files and the .env file, the env vars those files read,
+    the python version and the installed kr8 sources. Local modules imported by the resource files are recorded
+    when the entry is written and re-hashed when it is read, so editing any of them rebuilds the resources.
+    """
+
+    def __init__(self, ws_root_path: Path, resource_files: List[Path], cache_dir: Optional[Path] = None):
+        self.ws_root_path: Path = ws_root_path.resolve()
+        self.resource_files: List[Path] = sorted(resource_files)
+        self.cache_dir: Path = (cache_dir or get_workspace_cache_dir()).joinpath(
+            sha256(str(self.ws_root_path).encode()).hexdigest()[:16]
+        )
+        self._key: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        if self._key is None:
+            digest = sha256()
+            digest.update(f"{WORKSPACE_CACHE_VERSION}:{sys.version}:{_get_kr8_source_stamp()}\n".encode())
+            for resource_file in self.resource_files + [self.ws_root_path.joinpath(".env")]:
+                digest.update(f"{resource_file}:{_hash_file(resource_file)}\n".encode())
+            digest.update(_hash_env(_get_env_var_names(self.resource_files)).encode())
+            self._key = digest.hexdigest()
+        return self._key
+
+    def _entry_path(self, name: str) -> Path:
+        safe_name = re.sub(r"[^\w.-]", "_", name)
+        return self.cache_dir.joinpath(f"{safe_name}.pkl")
+
+    def _local_modules(self) -> Dict[str, Optional[str]]:
+        """Source files under the workspace root that are currently imported, with their content hash."""
+        modules: Dict[str, Optional[str]] = {}
+        for module in list(sys.modules.values()):
+            module_file = getattr(module, "__file__", None)
+            if module_file is None or "site-packages" in module_file:
+                continue
+            module_path = Path(module_file).resolve()
+            if self.ws_root_path in module_path.parents and module_path not in self.resource_files:
+                modules[str(module_path)] = _hash_file(module_path)
+        return modules
+
+    def load(self, name: str) -> Optional[Any]:
+        """Returns the value stored under name, or None if it is missing or out of date."""
+        import pickle
+
+        entry_path = self._entry_path(name)
+        if not entry_path.exists():
+            return None
+        if not is_private(entry_path):
+            # Unpickling runs code, so never read an entry someone else could have written
+            logger.debug(f"Discarding workspace cache entry {entry_path} that is not private to this user")
+            entry_path.unlink(missing_ok=True)
+            return None
+        try:
+            with entry_path.open("rb") as entry_file:
+                entry = pickle.load(entry_file)
+        except Exception as e:
+            logger.debug(f"Discarding unreadable workspace cache entry {entry_path}: {e}")
+            entry_path.unlink(missing_ok=True)
+            return None
+
+        if entry.get("key") != self.key:
+            logger.debug(f"Workspace cache entry {name} is out of date")
+            return None
+        for module_file, module_hash in entry.get("modules", {}).items():
+            if _hash_file(Path(module_file)) != module_hash:
+                logger.debug(f"Workspace cache entry {name} is out of date: {module_file} changed")
+                return None
+        module_files = [Path(module_file) for module_file in entry.get("modules", {})]
+        if entry.get("modules_env") != _hash_env(_get_env_var_names(module_files)):
+            logger.debug(f"Workspace cache entry {name} is out of date: environment changed")
+            return None
+        # The value is unpickled only once the entry is known to be current
+        try:
+            value = pickle.loads(entry["value"])
+        except Exception as e:
+            logger.debug(f"Discarding unreadable workspace cache entry {entry_path}: {e}")
+            entry_path.unlink(missing_ok=True)
+            return None
+        logger.debug(f"Loaded {name} from workspace cache")
+        return value
+
+    def save(self, name: str, value: Any) -> bool:
+        """Stores value under name. Returns False if the value cannot be pickled."""
+        import pickle
+
+        try:
+            pickled_value = pickle.dumps(value)
+        except Exception as e:
+            # Objects defined inside resource files or holding live clients cannot be pickled
+            logger.debug(f"Not caching {name}: {e}")
+            return False
+
+        modules = self._local_modules()
+        data = pickle.dumps(
+            {
+                "key": self.key,
+                "modules": modules,
+                "modules_env": _hash_env(_get_env_var_names(Path(module_file) for module_file in modules)),
+                "value": pickled_value,
+            }
+        )
+
+        # Entries hold resolved resources, including secrets, env values and passwords: keep them private
+        write_private_file(self._entry_path(name), data)
+        logger.debug(f"Saved {name} to workspace cache")
+        return True
@@ -6,6 +6,7 @@ from pydantic import BaseModel, ConfigDict
 from src.backend.kr8.infra.type import InfraType
 from src.backend.kr8.infra.resources import InfraResources
 from src.backend.kr8.api.schemas.workspace import WorkspaceSchema
+from src.backend.kr8.workspace.cache import WorkspaceCache, workspace_cache_enabled
 from src.backend.kr8.workspace.settings import WorkspaceSettings
 from src.backend.kr8.utils.py_io import get_python_objects_from_module
 from src.backend.kr8.utils.log import logger
@@ -14,10 +15,27 @@ from src.backend.kr8.utils.log import logger
 ignored_dirs = ["ignore", "test", "tests", "config"]
 
 
+def get_workspace_resource_files(workspace_dir_path: Path) -> List[Path]:
+    """Returns the python files in the workspace directory that define resources"""
+    resource_files: List[Path] = []
+    workspace_dir_path_parts = workspace_dir_path.parts
+    for resource_file in workspace_dir_path.rglob("*.py"):
+        if resource_file.name == "__init__.py":
+            continue
+
+        resource_file_parts_after_ws = resource_file.parts[len(workspace_dir_path_parts) :]
+        # Check if file in ignored directory
+        if any([ignored_dir in resource_file_parts_after_ws for ignored_dir in ignored_dirs]):
+            logger.debug(f"Skipping file in ignored directory: {resource_file}")
+            continue
+        resource_files.append(resource_file)
+    return resource_files
+
+
 def get_workspace_objects_from_file(resource_file: Path) -> dict:
     """Returns workspace objects from the resource file"""
     try:
-        python_objects = get_python_objects_from_module(resource_file)
+        python_objects = get_python_objects_from_module(resource_file, use_cache=True)
         # logger.debug(f"python_objects: {python_objects}")
 
         workspace_objects = {}
@@ -215,7 +233,7 @@ class WorkspaceConfig(BaseModel):
 
         logger.debug(f"Loading workspace_settings from {ws_settings_file}")
         try:
-            python_objects = get_python_objects_from_module(ws_settings_file)
+            python_objects = get_python_objects_from_module(ws_settings_file, use_cache=True)
             for obj_name, obj in python_objects.items():
                 _type_name = obj.__class__.__name__
                 if _type_name == "WorkspaceSettings":
@@ -303,25 +321,33 @@ class WorkspaceConfig(BaseModel):
         sys_path.insert(0, str(self.ws_root_path))
 
         workspace_dir_path: Optional[Path] = self.workspace_dir_path
+        resource_files: List[Path] = []
+        if workspace_dir_path is not None:
+            resource_files = get_workspace_resource_files(workspace_dir_path)
+
+        # Resource groups built by a previous command are reused until a resource file,
+        # a local module they import, the .env file or an env var they read changes
+        workspace_cache: Optional[WorkspaceCache] = None
+        cache_entry_name = f"resources-{env}-{infra}-{order}"
+        if workspace_dir_path is not None and workspace_cache_enabled():
+            workspace_cache = WorkspaceCache(ws_root_path=self.ws_root_path, resource_files=resource_files)
+            cached_resources = workspace_cache.load(cache_entry_name)
+            if cached_resources is not None:
+                self._workspace_settings, cached_resource_groups = cached_resources
+                if self.ws_schema is not None and self._workspace_settings is not None:
+                    self._workspace_settings.ws_schema = self.ws_schema
+                logger.debug(f"Removing {self.ws_root_path} from path")
+                sys_path.remove(str(self.ws_root_path))
+                return cached_resource_groups
+
         if workspace_dir_path is not None:
             logger.debug(f"--^^-- Loading workspace from: {workspace_dir_path}")
             # Create a dict of objects in the workspace directory
             workspace_objects = {}
-            resource_files = workspace_dir_path.rglob("*.py")
             for resource_file in resource_files:
-                if resource_file.name == "__init__.py":
-                    continue
-
-                resource_file_parts = resource_file.parts
-                workspace_dir_path_parts = workspace_dir_path.parts
-                resource_file_parts_after_ws = resource_file_parts[len(workspace_dir_path_parts) :]
-                # Check if file in ignored directory
-                if any([ignored_dir in resource_file_parts_after_ws for ignored_dir in ignored_dirs]):
-                    logger.debug(f"Skipping file in ignored directory: {resource_file}")
-                    continue
                 logger.debug(f"Reading file: {resource_file}")
                 try:
-                    python_objects = get_python_objects_from_module(resource_file)
+                    python_objects = get_python_objects_from_module(resource_file, use_cache=True)
                     # logger.debug(f"python_objects: {python_objects}")
                     for obj_name, obj in python_objects.items():
                         _type_name = obj.__class__.__name__
@@ -415,6 +441,9 @@ class WorkspaceConfig(BaseModel):
             for resource_group in env_filtered_resource_groups:
                 logger.debug(f"Setting workspace settings for {resource_group.__class__.__name__}")
                 resource_group.set_workspace_settings(self._workspace_settings)
+
+        if workspace_cache is not None:
+            workspace_cache.save(cache_entry_name, (self._workspace_settings, env_filtered_resource_groups))
         return env_filtered_resource_groups
 
     @staticmethod
@@ -449,6 +478,14 @@ class WorkspaceConfig(BaseModel):
         logger.debug(f"Adding {resource_file_parent_dir} to path")
         sys_path.insert(0, str(resource_file_parent_dir))
 
+        workspace_cache: Optional[WorkspaceCache] = None
+        cache_entry_name = f"{resource_file.stem}-resources-{env}-{infra}-{order}"
+        if workspace_cache_enabled():
+            workspace_cache = WorkspaceCache(ws_root_path=resource_file_parent_dir, resource_files=[resource_file])
+            cached_resource_groups = workspace_cache.load(cache_entry_name)
+            if cached_resource_groups is not None:
+                return cached_resource_groups
+
         logger.debug(f"**--> Loading resources from {resource_file}")
         # Create a dict of objects from the file
         workspace_objects = get_workspace_objects_from_file(resource_file)
@@ -530,4 +567,7 @@ class WorkspaceConfig(BaseModel):
             for resource_group in env_filtered_resource_groups:
                 logger.debug(f"Setting workspace settings for {resource_group.__class__.__name__}")
                 resource_group.set_workspace_settings(temporary_ws_config._workspace_settings)
+
+        if workspace_cache is not None:
+            workspace_cache.save(cache_entry_name, env_filtered_resource_groups)
         return env_filtered_resource_groups
@@ -152,6 +152,10 @@ class WorkspaceSettings(BaseSettings):
     # Set to True if `phi` should continue patching
     # resources after a resource patch has failed
     continue_on_patch_failure: bool = False
+    # Number of independent resources to create/update/delete concurrently
+    apply_workers: int = 8
+    # Number of docker images built concurrently
+    build_workers: int = 2
     #
     # -*- Other Settings
     #
@@ -19,6 +19,8 @@ from src.backend.core.config import settings
 from src.backend.api.v1 import (auth, users, organizations, feedback, 
                                 knowledge_base, assistant, chat, analytics,
                                 project_management, agile_team)
+from src.backend.services.analytics_ingest import get_user_event_buffer
+from src.backend.kr8.llm.ollama.warm_pool import get_ollama_warm_pool
 
 logger.debug(f"DATABASE_URL: {settings.DB_URL}")
 
@@ -39,6 +41,15 @@ app.include_router(project_management.router, prefix="/api/v1/project-management
 @app.on_event("startup")
 async def startup():
     FastAPICache.init(InMemoryBackend())
+    # Create today's event partitions before the first write
+    get_user_event_buffer().maintain_partitions()
+    # Load the local models in the background so the first chat does not wait for them
+    get_ollama_warm_pool().start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    get_user_event_buffer().close()
+    get_ollama_warm_pool().close()
     
 @app.get("/health")
 async def health_check():
@@ -1,6 +1,7 @@
 # src/backend/models/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Float
+from sqlalchemy import (Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Text, JSON, Float,
+                        UniqueConstraint, Index, Sequence)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
@@ -88,14 +89,25 @@ class Vote(Base):
     
     user = relationship("User", back_populates="votes")
 
+user_analytics_id_seq = Sequence("user_analytics_id_seq", metadata=Base.metadata)
+
 class UserAnalytics(Base):
     __tablename__ = "user_analytics"
-
-    id = Column(Integer, primary_key=True, index=True)
+    # Daily range partitions, created ahead and dropped after the retention period by services/analytics_ingest.py
+    __table_args__ = (
+        Index("ix_user_analytics_timestamp", "timestamp"),
+        Index("ix_user_analytics_event_type_timestamp", "event_type", "timestamp"),
+        Index("ix_user_analytics_user_id_timestamp", "user_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+
+    # A sequence rather than an identity column, which partitioned tables only support from Postgres 17
+    id = Column(BigInteger, user_analytics_id_seq, server_default=user_analytics_id_seq.next_value(), primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     event_type = Column(String(50))
     event_data = Column(JSON)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    # Partition key, so part of the primary key
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     duration = Column(Float)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -106,11 +118,13 @@ class UserAnalytics(Base):
 
 class DevOpsProject(Base):
     __tablename__ = "devops_projects"
+    __table_args__ = (UniqueConstraint("organization_id", "project_id", name="uq_devops_projects_org_project"),)
     id = Column(Integer, primary_key=True, index=True)
     organization_id = Column(Integer, ForeignKey("organizations.id"))
     project_id = Column(String, nullable=False)
     name = Column(String, nullable=False)
     description = Column(Text)
+    content_hash = Column(String, nullable=True)
 
     organization = relationship("Organization")
     teams = relationship("DevOpsTeam", back_populates="project")
@@ -119,10 +133,12 @@ class DevOpsProject(Base):
 
 class WorkItemType(Base):
     __tablename__ = "work_item_types"
+    __table_args__ = (UniqueConstraint("project_id", "name", name="uq_work_item_types_project_name"),)
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("devops_projects.id"))
     name = Column(String, nullable=False)
     fields = Column(JSON)
+    content_hash = Column(String, nullable=True)
 
     project = relationship("DevOpsProject")
 
@@ -136,6 +152,38 @@ class DevOpsCache(Base):
 
     organization = relationship("Organization")
     
+class DevOpsSyncCheckpoint(Base):
+    __tablename__ = "devops_sync_checkpoints"
+    organization_id = Column(Integer, ForeignKey("organizations.id"), primary_key=True)
+    status = Column(String, nullable=False)  # 'success' or 'failed'
+    last_synced_at = Column(DateTime(timezone=True))  # Last successful sync
+    last_attempt_at = Column(DateTime(timezone=True))
+    projects_synced = Column(Integer, default=0)
+    rows_upserted = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    organization = relationship("Organization")
+
+class BusinessAnalysisCheckpoint(Base):
+    __tablename__ = "business_analysis_checkpoints"
+    analysis_id = Column(String, primary_key=True)
+    node = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    status = Column(String, nullable=False)  # 'success' or 'failed'
+    input_hash = Column(String, nullable=True)  # Hash of the state fields the node read
+    delta = Column(JSONB, nullable=True)  # State fields the node wrote
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    user = relationship("User")
+
+class KnowledgeBaseVersion(Base):
+    __tablename__ = "knowledge_base_versions"
+    collection = Column(String, primary_key=True)  # Vector db collection, e.g. org_1_user_2_documents
+    version = Column(BigInteger, nullable=False, default=0)  # Bumped by every write to the collection
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class DORAMetric(Base):
     __tablename__ = "dora_metrics"
 
@@ -163,10 +211,12 @@ class DORAMetricSnapshot(Base):
 
 class DevOpsTeam(Base):
     __tablename__ = "devops_teams"
+    __table_args__ = (UniqueConstraint("project_id", "team_id", name="uq_devops_teams_project_team"),)
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("devops_projects.id"))
     team_id = Column(String, nullable=False)
     name = Column(String, nullable=False)
+    content_hash = Column(String, nullable=True)
 
     project = relationship("DevOpsProject", back_populates="teams")
     dora_metrics = relationship("DORAMetric", back_populates="team")
@@ -30,4 +30,7 @@ class DocumentUpdate(BaseModel):
     meta_data: Optional[Dict[str, Any]] = None
 
 class DocumentSearch(BaseModel):
-    query: str
\ No newline at end of file
+    query: str
+    limit: int = 5
+    # Metadata filters applied before the limit, e.g. {"project": "billing", "type": "python_file"}
+    filters: Optional[Dict[str, Any]] = None
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 class UserResponse(BaseModel):
     id: int
@@ -69,4 +69,10 @@ class UserEvent(BaseModel):
     user_id: int    
     event_type: str
     event_data: dict
-    duration: Optional[float] = None        
\ No newline at end of file
+    duration: Optional[float] = None
+
+# Largest batch the event endpoint accepts; UserEventBuffer writes up to this many per INSERT
+MAX_USER_EVENT_BATCH = 1000
+
+class UserEventBatch(BaseModel):
+    events: List[UserEvent] = Field(..., max_length=MAX_USER_EVENT_BATCH)
@@ -0,0 +1,82 @@
+"""User event ingestion benchmark
+
+Writes synthetic events through UserEventBuffer into the database configured by DB_URL, reports the sustained
+insert rate, then times AnalyticsService.get_usage_patterns and reports its p50 and p99.
+
+Usage:
+    python -m src.backend.services.analytics_benchmark --events 100000 --queries 50
+    python -m src.backend.services.analytics_benchmark --events 100000 --cleanup
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete
+
+from src.backend.db.session import SessionLocal
+from src.backend.models.models import User, UserAnalytics
+from src.backend.services.analytics_ingest import UserEventBuffer
+from src.backend.services.analytics_service import AnalyticsService
+
+EVENT_TYPES = ["benchmark_query", "benchmark_feedback", "benchmark_page_view", "benchmark_upload"]
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure user event ingestion and usage pattern queries.")
+    parser.add_argument("--events", type=int, default=100000, help="Events to write")
+    parser.add_argument("--request-size", type=int, default=50, help="Events per enqueue, like one batch request")
+    parser.add_argument("--queries", type=int, default=50, help="get_usage_patterns calls to time")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark events afterwards")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    user_ids = [user_id for (user_id,) in db.query(User.id).limit(100).all()]
+    if not user_ids:
+        parser.error("the database has no users to attribute events to")
+
+    buffer = UserEventBuffer(max_queue_size=max(args.events, 1))
+    buffer.maintain_partitions()
+    started = time.perf_counter()
+    for start in range(0, args.events, args.request_size):
+        buffer.enqueue([
+            {
+                "user_id": random.choice(user_ids),
+                "event_type": random.choice(EVENT_TYPES),
+                "event_data": {"page": f"page-{random.randint(1, 50)}"},
+                "duration": random.random() * 5,
+            }
+            for _ in range(min(args.request_size, args.events - start))
+        ])
+    enqueued = time.perf_counter() - started
+    buffer.close(timeout=600)
+    written = time.perf_counter() - started
+    stats = buffer.stats()
+    print(f"enqueued {args.events} events in {enqueued:.2f} s ({args.events / enqueued:,.0f} events/s)")
+    print(f"wrote {stats['written']} events in {written:.2f} s ({stats['written'] / written:,.0f} events/s), "
+          f"failed {stats['failed']}, dropped {stats['dropped']}")
+
+    service = AnalyticsService()
+    timings = []
+    for _ in range(args.queries):
+        query_started = time.perf_counter()
+        service.get_usage_patterns(db)
+        timings.append((time.perf_counter() - query_started) * 1000)
+    print(f"get_usage_patterns p50 {_percentile(timings, 0.5):.1f} ms, p99 {_percentile(timings, 0.99):.1f} ms")
+
+    if args.cleanup:
+        db.execute(delete(UserAnalytics).where(UserAnalytics.event_type.in_(EVENT_TYPES)))
+        db.commit()
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
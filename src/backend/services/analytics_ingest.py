@@ -0,0 +1,255 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DataError, IntegrityError
+
+from src.backend.core.config import settings
+from src.backend.db.session import SessionLocal
+from src.backend.models.models import UserAnalytics
+
+logger = logging.getLogger(__name__)
+
+EVENT_TABLE = UserAnalytics.__tablename__
+# Daily partitions are created this many days ahead, so inserts never land in the default partition
+PARTITION_DAYS_AHEAD = 7
+MAINTENANCE_INTERVAL = 3600
+
+
+def _partition_name(day: datetime) -> str:
+    return f"{EVENT_TABLE}_p{day:%Y%m%d}"
+
+
+def ensure_event_partitions(db, days_ahead: int = PARTITION_DAYS_AHEAD, start: Optional[datetime] = None) -> int:
+    """Creates the daily partitions of the event table from start (default today, UTC) to days_ahead days
+    after it, and the default partition. Returns the number of partitions created."""
+    day = (start or datetime.now(timezone.utc)).replace(hour=0, minute=0, second=0, microsecond=0)
+    existing = {
+        row[0]
+        for row in db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": EVENT_TABLE},
+        )
+    }
+    created = 0
+    if f"{EVENT_TABLE}_default" not in existing:
+        db.execute(text(f"CREATE TABLE IF NOT EXISTS {EVENT_TABLE}_default PARTITION OF {EVENT_TABLE} DEFAULT"))
+        created += 1
+    for offset in range(days_ahead + 1):
+        lower = day + timedelta(days=offset)
+        name = _partition_name(lower)
+        if name in existing:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {EVENT_TABLE} "
+                        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{(lower + timedelta(days=1)).isoformat()}')"
+                    )
+                )
+            created += 1
+        except Exception as e:
+            # Overlaps an existing partition, or rows for that day already sit in the default partition
+            logger.warning(f"Could not create partition {name}: {str(e)}")
+    db.commit()
+    return created
+
+
+def drop_expired_event_partitions(db, retention_days: Optional[int] = None) -> List[str]:
+    """Drops the partitions whose whole range is older than retention_days. Dropping a partition only
+    removes its files, unlike a DELETE that has to visit and vacuum every expired row."""
+    retention_days = settings.USER_EVENT_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    expired = [
+        row[0]
+        for row in db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) "
+                "AND substring(pg_get_expr(c.relpartbound, c.oid) from 'TO \\(''([^'']+)''\\)')::timestamptz <= :cutoff"
+            ),
+            {"table": EVENT_TABLE, "cutoff": cutoff},
+        )
+    ]
+    for name in expired:
+        db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        logger.info(f"Dropped expired event partition {name}")
+    db.commit()
+    return expired
+
+
+class UserEventBuffer:
+    """In-process write buffer for user events.
+
+    Requests only append to a bounded queue. A background thread writes queued events with one multi-row
+    INSERT per batch, every flush_interval seconds or as soon as batch_size events are waiting, and drops
+    new events when the queue is full. It also creates partitions ahead and drops expired ones every
+    maintenance_interval seconds. Remaining events are written when the process exits.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_queue_size: int = 100000,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        maintenance_interval: float = MAINTENANCE_INTERVAL,
+    ):
+        self.session_factory = session_factory
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.maintenance_interval = maintenance_interval
+
+        self.queue: Deque[Dict[str, Any]] = deque()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.flusher: Optional[threading.Thread] = None
+        self.closed = False
+        self.last_maintenance: float = 0.0
+        # Counters
+        self.num_queued: int = 0
+        self.num_written: int = 0
+        self.num_failed: int = 0
+        self.num_dropped: int = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "queued": self.num_queued,
+                "written": self.num_written,
+                "failed": self.num_failed,
+                "dropped": self.num_dropped,
+                "pending": len(self.queue),
+            }
+
+    def enqueue(self, events: List[Dict[str, Any]]) -> int:
+        """Queues events (user_id, event_type, event_data, duration and optionally timestamp).
+        Returns how many were queued; the rest were dropped because the queue is full."""
+        if self.closed:
+            return 0
+        now = datetime.now(timezone.utc)
+        with self.lock:
+            accepted = max(0, min(len(events), self.max_queue_size - len(self.queue)))
+            for event in events[:accepted]:
+                self.queue.append({
+                    "user_id": event.get("user_id"),
+                    "event_type": event.get("event_type"),
+                    "event_data": event.get("event_data"),
+                    "duration": event.get("duration"),
+                    "timestamp": event.get("timestamp") or now,
+                })
+            self.num_queued += accepted
+            self.num_dropped += len(events) - accepted
+            if self.flusher is None:
+                self.flusher = threading.Thread(target=self._run, name="user-event-buffer", daemon=True)
+                self.flusher.start()
+            if len(self.queue) >= self.batch_size:
+                self.wakeup.set()
+        return accepted
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [self.queue.popleft() for _ in range(min(self.batch_size, len(self.queue)))]
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """Writes batch with one INSERT. If that fails, writes each half separately, down to single events,
+        so only the events the database rejects (e.g. an unknown user_id) are lost."""
+        if not batch:
+            return
+        db = self.session_factory()
+        try:
+            db.execute(insert(UserAnalytics).values(batch))
+            db.commit()
+            with self.lock:
+                self.num_written += len(batch)
+            return
+        except Exception as e:
+            db.rollback()
+            if not isinstance(e, (IntegrityError, DataError)):
+                # Not caused by a row (e.g. the database is down): splitting the batch would not help
+                logger.error(f"Error writing {len(batch)} user events: {str(e)}")
+                with self.lock:
+                    self.num_failed += len(batch)
+                return
+            if len(batch) == 1:
+                logger.error(f"Dropping user event {batch[0].get('event_type')} of user {batch[0].get('user_id')}: {str(e)}")
+                with self.lock:
+                    self.num_failed += 1
+                return
+            logger.warning(f"Error writing {len(batch)} user events, retrying in halves: {str(e)}")
+        finally:
+            db.close()
+        half = len(batch) // 2
+        self._write(batch[:half])
+        self._write(batch[half:])
+
+    def flush(self) -> None:
+        """Writes every queued event, on the calling thread"""
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            self._write(batch)
+
+    def maintain_partitions(self) -> None:
+        db = self.session_factory()
+        try:
+            ensure_event_partitions(db)
+            drop_expired_event_partitions(db)
+        except Exception as e:
+            logger.error(f"Error maintaining event partitions: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+        self.last_maintenance = time.monotonic()
+
+    def _run(self) -> None:
+        while not self.closed:
+            if time.monotonic() - self.last_maintenance >= self.maintenance_interval:
+                self.maintain_partitions()
+            self.wakeup.wait(timeout=self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"User event flush failed: {str(e)}")
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stops the flusher and writes what is left, giving up after timeout seconds"""
+        if self.closed:
+            return
+        self.closed = True
+        self.wakeup.set()
+        if self.flusher is not None:
+            self.flusher.join(timeout=timeout)
+        deadline = time.monotonic() + timeout
+        while self.queue and time.monotonic() < deadline:
+            self._write(self._take_batch())
+        with self.lock:
+            self.num_dropped += len(self.queue)
+            self.queue.clear()
+        logger.info(f"User event buffer closed: {self.stats()}")
+
+
+_user_event_buffer: Optional[UserEventBuffer] = None
+_user_event_buffer_lock = threading.Lock()
+
+
+def get_user_event_buffer() -> UserEventBuffer:
+    """Process-wide user event buffer, flushed at exit"""
+    global _user_event_buffer
+    with _user_event_buffer_lock:
+        if _user_event_buffer is None:
+            _user_event_buffer = UserEventBuffer()
+            atexit.register(_user_event_buffer.close)
+        return _user_event_buffer
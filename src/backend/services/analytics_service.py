@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, extract
 from datetime import datetime, timedelta
 from src.backend.models.models import Vote, UserAnalytics, User
+from src.backend.services.analytics_ingest import get_user_event_buffer
 from collections import Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
@@ -133,8 +134,10 @@ class AnalyticsService:
             logger.error(f"Error in get_quality_metrics: {str(e)}")
             return {'error': str(e)}
 
-    def get_usage_patterns(self, db: Session):
+    def get_usage_patterns(self, db: Session, days: int = 30):
         try:
+            # A bounded window keeps the scan to the most recent partitions, whatever the table size
+            since = datetime.utcnow() - timedelta(days=days)
             popular_topics = db.query(
                 Vote.query.label('topic'),
                 func.count(Vote.id).label('count')
@@ -143,12 +146,12 @@ class AnalyticsService:
             peak_usage = db.query(
                 extract('hour', UserAnalytics.timestamp).label('hour'),
                 func.count(UserAnalytics.id).label('count')
-            ).group_by('hour').order_by('hour').all()
+            ).filter(UserAnalytics.timestamp >= since).group_by('hour').order_by('hour').all()
 
             feature_adoption = db.query(
                 UserAnalytics.event_type,
                 func.count(UserAnalytics.id).label('count')
-            ).group_by(UserAnalytics.event_type).all()
+            ).filter(UserAnalytics.timestamp >= since).group_by(UserAnalytics.event_type).all()
 
             result = {
                 'popular_topics': [{'topic': pt.topic, 'count': pt.count} for pt in popular_topics],
@@ -269,21 +272,20 @@ class AnalyticsService:
             return {'error': str(e)}
 
     def save_user_event(self, db: Session, user_id: int, event_type: str, event_data: dict, duration: float = None):
+        return self.save_user_events(db, [{
+            "user_id": user_id,
+            "event_type": event_type,
+            "event_data": event_data,
+            "duration": duration
+        }]) == 1
+
+    def save_user_events(self, db: Session, events: list) -> int:
+        """Queues events for a batched write and returns how many were accepted"""
         try:
-            new_event = UserAnalytics(
-                user_id=user_id,                
-                event_type=event_type,
-                event_data=event_data,
-                duration=duration,
-                timestamp=datetime.utcnow()
-            )
-            db.add(new_event)
-            db.commit()
-            return True
+            return get_user_event_buffer().enqueue(events)
         except Exception as e:
-            logger.error(f"Error saving user event: {str(e)}")
-            db.rollback()
-            return False
+            logger.error(f"Error saving user events: {str(e)}")
+            return 0
 
     def get_user_events(self, db: Session, user_id: int = None):
         try:
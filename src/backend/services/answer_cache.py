@@ -0,0 +1,226 @@
+import json
+import logging
+import threading
+import time
+from hashlib import sha256
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+from src.backend.core.config import settings
+from src.backend.db.session import SessionLocal
+from src.backend.models.models import KnowledgeBaseVersion
+
+logger = logging.getLogger(__name__)
+
+
+def get_knowledge_base_version(db, collection: str) -> int:
+    row = db.query(KnowledgeBaseVersion.version).filter(KnowledgeBaseVersion.collection == collection).first()
+    return row[0] if row else 0
+
+
+def bump_knowledge_base_version(db, collection: str) -> None:
+    """Marks every answer cached for collection as stale, in every process. Called after each write to it."""
+    stmt = insert(KnowledgeBaseVersion).values(collection=collection, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["collection"],
+        set_={"version": KnowledgeBaseVersion.version + 1, "updated_at": func.now()},
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error bumping knowledge base version of {collection}: {str(e)}")
+        db.rollback()
+    # Drop this process's stale answers right away instead of on their next lookup
+    with _answer_caches_lock:
+        caches = list(_answer_caches.values())
+    for cache in caches:
+        cache.invalidate(collection)
+
+
+def assistant_config_hash(assistant) -> str:
+    """Hash of the settings that shape an assistant's answers, so a changed prompt or model never reuses them"""
+    llm = getattr(assistant, "llm", None)
+    team = getattr(assistant, "team", None) or []
+    config = {
+        "llm": [type(llm).__name__, getattr(llm, "model", None)],
+        "name": getattr(assistant, "name", None),
+        "description": getattr(assistant, "description", None),
+        "instructions": getattr(assistant, "instructions", None),
+        "extra_instructions": getattr(assistant, "extra_instructions", None),
+        "expected_output": getattr(assistant, "expected_output", None),
+        "markdown": getattr(assistant, "markdown", None),
+        "user_nickname": getattr(assistant, "user_nickname", None),
+        "team": [getattr(member, "name", None) for member in team],
+    }
+    return sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _collection_of(assistant) -> Optional[str]:
+    knowledge_base = getattr(assistant, "knowledge_base", None)
+    vector_db = getattr(knowledge_base, "vector_db", None)
+    return getattr(vector_db, "collection", None)
+
+
+class AnswerCacheLookup:
+    """Result of SemanticAnswerCache.lookup; pass it back to store() to cache the answer generated on a miss"""
+
+    def __init__(self, scope: Tuple[str, Optional[str]], version: Optional[int], embedding: Optional[np.ndarray]):
+        self.scope = scope
+        self.version = version
+        self.embedding = embedding
+        self.started = time.perf_counter()
+        self.answer: Optional[str] = None
+        self.similarity: Optional[float] = None
+
+
+class SemanticAnswerCache:
+    """Opt-in cache of an organization's assistant answers, keyed by the embedding of the question.
+
+    A question is answered from the cache when an earlier question's embedding has at least
+    similarity_threshold cosine similarity with it, was asked of an assistant with the same configuration
+    against the same knowledge base collection and version, and is younger than ttl seconds. Only standalone
+    questions should be cached: a follow-up like "and the second one?" depends on the chat history, which is
+    not part of the key, so enable it for assistants that answer the same questions all day (support, call
+    center) and not for long conversations.
+    """
+
+    def __init__(
+        self,
+        org_id: int,
+        embedder,
+        get_version: Optional[Callable[[str], int]] = None,
+        similarity_threshold: float = settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+        ttl: float = settings.ANSWER_CACHE_TTL,
+        max_entries: int = settings.ANSWER_CACHE_MAX_ENTRIES,
+        min_query_chars: int = 12,
+    ):
+        self.org_id = org_id
+        self.embedder = embedder
+        self.get_version = get_version or self._get_version_from_db
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.min_query_chars = min_query_chars
+        # (config hash, collection) -> {"version", "embeddings" (n x d, normalized), "entries"}
+        self.scopes: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        # Counters
+        self.num_lookups: int = 0
+        self.num_hits: int = 0
+        self.seconds_saved: float = 0.0
+        self.lookup_seconds: float = 0.0
+
+    @staticmethod
+    def _get_version_from_db(collection: str) -> int:
+        db = SessionLocal()
+        try:
+            return get_knowledge_base_version(db, collection)
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "lookups": self.num_lookups,
+                "hits": self.num_hits,
+                "hit_rate": self.num_hits / self.num_lookups if self.num_lookups else 0.0,
+                "seconds_saved": round(self.seconds_saved, 2),
+                "avg_lookup_ms": round(1000 * self.lookup_seconds / self.num_lookups, 2) if self.num_lookups else 0.0,
+                "entries": sum(len(scope["entries"]) for scope in self.scopes.values()),
+            }
+
+    def invalidate(self, collection: Optional[str] = None) -> None:
+        """Drops the answers cached for collection, or all of them"""
+        with self.lock:
+            for scope in [scope for scope in self.scopes if collection is None or scope[1] == collection]:
+                del self.scopes[scope]
+
+    def lookup(self, query: str, assistant) -> Optional[AnswerCacheLookup]:
+        """Returns None if query is not cacheable, otherwise a lookup whose answer is set on a hit"""
+        if not query or len(query.strip()) < self.min_query_chars:
+            return None
+        started = time.perf_counter()
+        scope = (assistant_config_hash(assistant), _collection_of(assistant))
+        try:
+            version = self.get_version(scope[1]) if scope[1] else 0
+        except Exception as e:
+            # Without the version a hit could be stale, so neither serve nor store
+            logger.error(f"Error reading knowledge base version of {scope[1]}: {str(e)}")
+            return None
+        embedding = np.asarray(self.embedder.get_embedding(query), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if not norm:
+            return None
+        embedding /= norm
+        result = AnswerCacheLookup(scope, version, embedding)
+        result.started = started
+
+        with self.lock:
+            self.num_lookups += 1
+            cached = self.scopes.get(scope)
+            if cached is not None and cached["version"] != version:
+                # The knowledge base changed since these answers were generated
+                del self.scopes[scope]
+                cached = None
+            if cached is not None and cached["entries"]:
+                similarities = cached["embeddings"] @ embedding
+                best = int(np.argmax(similarities))
+                entry = cached["entries"][best]
+                if similarities[best] >= self.similarity_threshold and time.time() - entry["created_at"] < self.ttl:
+                    result.answer = entry["answer"]
+                    result.similarity = float(similarities[best])
+                    self.num_hits += 1
+                    self.seconds_saved += entry["seconds"]
+            self.lookup_seconds += time.perf_counter() - started
+
+        if result.answer is not None:
+            stats = self.stats()
+            logger.info(
+                f"Answer cache hit for org {self.org_id} (similarity {result.similarity:.3f}), "
+                f"saved {entry['seconds']:.2f}s; hit rate {stats['hit_rate']:.0%} over {stats['lookups']} lookups, "
+                f"{stats['seconds_saved']}s saved"
+            )
+        return result
+
+    def store(self, lookup: AnswerCacheLookup, answer: str) -> None:
+        """Caches the answer generated after a missed lookup, with the time it took to generate"""
+        if lookup.answer is not None or not answer:
+            return
+        entry = {
+            "answer": answer,
+            "created_at": time.time(),
+            "seconds": time.perf_counter() - lookup.started,
+        }
+        with self.lock:
+            cached = self.scopes.get(lookup.scope)
+            if cached is None or cached["version"] != lookup.version:
+                if cached is not None and cached["version"] > lookup.version:
+                    # Generated against a knowledge base that changed meanwhile
+                    return
+                cached = {"version": lookup.version, "embeddings": np.empty((0, len(lookup.embedding)), np.float32),
+                          "entries": []}
+                self.scopes[lookup.scope] = cached
+            embeddings: np.ndarray = cached["embeddings"]
+            entries: List[Dict[str, Any]] = cached["entries"]
+            # Expired entries go first, then the oldest ones
+            now = time.time()
+            keep = [i for i, e in enumerate(entries) if now - e["created_at"] < self.ttl]
+            keep = keep[max(0, len(keep) - self.max_entries + 1):]
+            cached["entries"] = [entries[i] for i in keep] + [entry]
+            cached["embeddings"] = np.vstack([embeddings[keep], lookup.embedding[None, :]])
+
+
+_answer_caches: Dict[int, SemanticAnswerCache] = {}
+_answer_caches_lock = threading.Lock()
+
+
+def get_answer_cache(org_id: int, embedder) -> SemanticAnswerCache:
+    """Process-wide answer cache of an organization, shared by the assistants of its users"""
+    with _answer_caches_lock:
+        if org_id not in _answer_caches:
+            _answer_caches[org_id] = SemanticAnswerCache(org_id=org_id, embedder=embedder)
+        return _answer_caches[org_id]
@@ -0,0 +1,106 @@
+"""SemanticAnswerCache benchmark
+
+Replays a call-center style workload, where a few support questions come back all day in different wordings,
+through SemanticAnswerCache with the local SentenceTransformer embedder. A miss sleeps for a fixed retrieval and
+generation time, like a full assistant run. Reports the hit rate, hits that returned the answer of a different
+question, the latency saved and the cost of a lookup, for each similarity threshold. The knowledge base version
+is held in memory, so no database is needed; --bump-every bumps it every that many questions.
+
+Usage:
+    python -m src.backend.services.answer_cache_benchmark
+    python -m src.backend.services.answer_cache_benchmark --questions 500 --latency 0.5 --thresholds 0.85 0.92
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from src.backend.kr8.embedder.sentence_transformer import SentenceTransformerEmbedder
+from src.backend.services.answer_cache import SemanticAnswerCache
+
+# Each topic is one support question, asked in several wordings
+TOPICS = [
+    ["How do I reset my password?", "I forgot my password, how can I reset it?",
+     "What are the steps to reset a password?", "Can you help me reset my account password?"],
+    ["What are your opening hours?", "When is the support line open?",
+     "What time does customer support open?", "Which hours can I call support?"],
+    ["How do I cancel my subscription?", "I want to cancel my plan, how do I do that?",
+     "What is the process for cancelling a subscription?", "How can I stop my subscription?"],
+    ["How long does a refund take?", "When will I get my refund?",
+     "How many days until a refund is processed?", "What is the refund processing time?"],
+    ["How do I update my billing address?", "Where can I change the billing address on my account?",
+     "I moved, how do I change my billing address?", "How can I edit my billing details?"],
+    ["Is my data stored in Australia?", "Where is my data hosted?",
+     "Which region is customer data stored in?", "Do you keep data onshore in Australia?"],
+    ["How do I add a user to my organization?", "How can I invite a colleague to our account?",
+     "What are the steps to add a new team member?", "How do I give another person access?"],
+    ["Why was my payment declined?", "My card payment failed, why?",
+     "What causes a declined payment?", "Why did my payment not go through?"],
+]
+
+
+class BenchmarkAssistant:
+    """Just the attributes SemanticAnswerCache keys on"""
+
+    def __init__(self):
+        self.llm = None
+        self.name = "llm_os"
+        self.description = "Call center assistant"
+        self.instructions = ["Answer from the knowledge base."]
+        self.knowledge_base = None
+        self.user_nickname = "friend"
+
+
+def workload(num_questions: int, seed: int = 0) -> List[Tuple[int, str]]:
+    """(topic, wording) pairs, with a few popular topics asked much more often than the rest"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(TOPICS))]
+    topics = rng.choices(range(len(TOPICS)), weights=weights, k=num_questions)
+    return [(topic, rng.choice(TOPICS[topic])) for topic in topics]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure SemanticAnswerCache on a repeated-question workload.")
+    parser.add_argument("--questions", type=int, default=300, help="Questions to replay")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds a full retrieval and generation takes")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.8, 0.85, 0.92], help="Similarity thresholds")
+    parser.add_argument("--bump-every", type=int, default=0, help="Bump the knowledge base version every n questions")
+    args = parser.parse_args(argv)
+
+    embedder = SentenceTransformerEmbedder(model="all-MiniLM-L6-v2")
+    questions = workload(args.questions)
+    assistant = BenchmarkAssistant()
+    print(f"{len(questions)} questions over {len(TOPICS)} topics, {args.latency}s per uncached answer")
+
+    for threshold in args.thresholds:
+        version = [0]
+        cache = SemanticAnswerCache(
+            org_id=0, embedder=embedder, get_version=lambda collection: version[0], similarity_threshold=threshold
+        )
+        wrong_hits = 0
+        started = time.perf_counter()
+        for i, (topic, question) in enumerate(questions):
+            if args.bump_every and i and i % args.bump_every == 0:
+                version[0] += 1
+            lookup = cache.lookup(question, assistant)
+            if lookup is not None and lookup.answer is not None:
+                wrong_hits += lookup.answer != f"answer {topic}"
+                continue
+            time.sleep(args.latency)
+            if lookup is not None:
+                cache.store(lookup, f"answer {topic}")
+        seconds = time.perf_counter() - started
+
+        stats = cache.stats()
+        print(
+            f"threshold {threshold:.2f}  hit rate {stats['hit_rate']:6.1%}  wrong hits {wrong_hits:>3}  "
+            f"{seconds:7.2f} s (uncached {len(questions) * args.latency:7.2f} s)  "
+            f"saved {stats['seconds_saved']:7.2f} s  lookup {stats['avg_lookup_ms']:6.2f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
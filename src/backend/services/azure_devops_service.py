@@ -11,14 +11,18 @@ from src.backend.config.azure_devops_config import azure_devops_settings, is_azu
 logger = logging.getLogger(__name__)
 
 class AzureDevOpsService:
-    def __init__(self, organization_id: int):
+    def __init__(self, organization_id: int, organization_url: Optional[str] = None, personal_access_token: Optional[str] = None):
         self.organization_id = organization_id
-        self.organization_url = azure_devops_settings.organization_url 
-        if not is_azure_devops_configured():
-            raise ValueError("Azure DevOps is not configured. Please set the required environment variables.")
-        self.personal_access_token = azure_devops_settings.personal_access_token
-        self.credentials = BasicAuthentication('', azure_devops_settings.personal_access_token)
-        self.connection = Connection(base_url=azure_devops_settings.organization_url, creds=self.credentials)
+        # Per-organization credentials (from AzureDevOpsConfig) take precedence over the global settings
+        if organization_url is None or personal_access_token is None:
+            if not is_azure_devops_configured():
+                raise ValueError("Azure DevOps is not configured. Please set the required environment variables.")
+            organization_url = organization_url or azure_devops_settings.organization_url
+            personal_access_token = personal_access_token or azure_devops_settings.personal_access_token
+        self.organization_url = organization_url
+        self.personal_access_token = personal_access_token
+        self.credentials = BasicAuthentication('', personal_access_token)
+        self.connection = Connection(base_url=organization_url, creds=self.credentials)
 
     def get_projects(self):
         logger.info("Fetching projects from Azure DevOps")
@@ -164,6 +168,11 @@ class AzureDevOpsService:
         core_client = self.connection.clients.get_core_client()
         return core_client.get_teams(project_id)
 
+    def get_work_item_types(self, project_id: str) -> List[Any]:
+        logger.info(f"Fetching work item types for project: {project_id}")
+        wit_client = self.connection.clients.get_work_item_tracking_client()
+        return wit_client.get_work_item_types(project_id)
+
     def project_exists(self, project_id: str) -> bool:
         return self.validate_project(project_id)
 
@@ -15,6 +15,7 @@ from src.backend.kr8.document import Document as Kr8Document
 from src.backend.kr8.document.reader.website import WebsiteReader
 from src.backend.models.models import User
 from src.backend.schemas.knowledge_base import DocumentCreate, DocumentResponse, DocumentUpdate, DocumentSearch
+from src.backend.services.answer_cache import bump_knowledge_base_version
 from sqlalchemy.orm import Session
 from typing import List
 import os
@@ -37,16 +38,23 @@ class KnowledgeBaseService:
         if not self.vector_db.table_exists():
             self.vector_db.create()
 
+    def knowledge_base_changed(self):
+        # Answers cached against the previous contents are no longer served
+        bump_knowledge_base_version(self.db, self.vector_db.collection)
+
     async def add_url(self, url: str) -> bool:
         scraper = WebsiteReader(max_links=2, max_depth=1)
         web_documents = scraper.read(url)
         if web_documents:
             self.vector_db.upsert(web_documents)
+            self.knowledge_base_changed()
             return True
         return False
 
     def clear_knowledge_base(self) -> bool:
-        return self.vector_db.clear()
+        cleared = self.vector_db.clear()
+        self.knowledge_base_changed()
+        return cleared
 
     async def process_file(self, filename: str, file_content: io.BytesIO) -> DocumentResponse:
         if filename.endswith('.pdf'):
@@ -70,6 +78,7 @@ class KnowledgeBaseService:
             raise ValueError(f"Could not read PDF: {filename}")
 
         self.vector_db.upsert(auto_rag_documents)
+        self.knowledge_base_changed()
 
         # Return the first document as a sample
         doc = auto_rag_documents[0]
@@ -108,6 +117,7 @@ class KnowledgeBaseService:
             }
         )
         self.vector_db.upsert([kr8_doc])
+        self.knowledge_base_changed()
         
         return DocumentResponse(
             id=kr8_doc.id,
@@ -140,6 +150,7 @@ class KnowledgeBaseService:
             }
         )
         self.vector_db.upsert([kr8_doc])
+        self.knowledge_base_changed()
         
         return DocumentResponse(
             id=kr8_doc.id,
@@ -161,6 +172,7 @@ class KnowledgeBaseService:
             meta_data={"type": "csv", "shape": df.shape, "analyst_type": analyst_type}
         )
         self.vector_db.upsert([doc])
+        self.knowledge_base_changed()
         
         return f"{filename} processed as {analyst_type} data"
 
@@ -175,6 +187,7 @@ class KnowledgeBaseService:
             meta_data={"type": "excel", "shape": df.shape, "analyst_type": analyst_type}
         )
         self.vector_db.upsert([doc])
+        self.knowledge_base_changed()
         
         return f"{filename} processed as {analyst_type} data"    
 
@@ -189,6 +202,7 @@ class KnowledgeBaseService:
         
         # Add to vector database
         self.vector_db.insert([kr8_doc])
+        self.knowledge_base_changed()
         
         # Create a response
         return DocumentResponse(
@@ -244,7 +258,8 @@ class KnowledgeBaseService:
         return documents
 
     def search_documents(self, search: DocumentSearch) -> List[DocumentResponse]:
-        results = self.vector_db.search(search.query, limit=5)
+        # The vector db is scoped to this user, and search.filters are applied before the limit
+        results = self.vector_db.search(search.query, limit=search.limit, filters=search.filters)
         return [
             DocumentResponse(
                 id=doc.id,
@@ -255,7 +270,7 @@ class KnowledgeBaseService:
                 org_id=self.user.organization_id, 
                 created_at=doc.usage.get('created_at'),
                 updated_at=doc.usage.get('updated_at')
-            ) for doc in results if doc.meta_data.get('user_id') == self.user.id
+            ) for doc in results
         ]
 
     def delete_document(self, document_name: str) -> bool:
@@ -263,6 +278,7 @@ class KnowledgeBaseService:
         deleted = self.vector_db.delete_document(document_name)
         if not deleted:
             raise ValueError(f"Failed to delete document: {document_name}")
+        self.knowledge_base_changed()
         return True
 
     def update_document(self, document_name: str, document_update: DocumentUpdate) -> DocumentResponse:
@@ -275,6 +291,7 @@ class KnowledgeBaseService:
             setattr(document, key, value)
 
         self.vector_db.upsert([document])
+        self.knowledge_base_changed()
 
         return DocumentResponse(
             id=document.id,
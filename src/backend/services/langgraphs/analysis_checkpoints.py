@@ -0,0 +1,90 @@
+import json
+import logging
+import threading
+from hashlib import sha256
+from typing import Any, Dict, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+from src.backend.models.models import BusinessAnalysisCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+def input_hash(inputs: Dict[str, Any]) -> str:
+    return sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class AnalysisCheckpointStore:
+    """Durable per-node checkpoints of one business analysis.
+
+    Each node saves only the state fields it wrote, with a hash of the state it read. A node whose last run
+    succeeded on the same input does not run again, so re-running a failed analysis only runs the failed node
+    and the nodes downstream of it.
+    """
+
+    def __init__(self, db, analysis_id: str, user_id: Optional[int] = None):
+        self.db = db
+        self.analysis_id = analysis_id
+        self.user_id = user_id
+        # node -> {"status", "input_hash", "delta"}
+        self.checkpoints: Dict[str, Dict[str, Any]] = {}
+        # Parallel branches share the request's session
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            rows = (
+                self.db.query(BusinessAnalysisCheckpoint)
+                .filter(
+                    BusinessAnalysisCheckpoint.analysis_id == self.analysis_id,
+                    BusinessAnalysisCheckpoint.user_id == self.user_id,
+                )
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Error loading checkpoints for analysis {self.analysis_id}: {str(e)}")
+            self.db.rollback()
+            return
+        self.checkpoints = {
+            row.node: {"status": row.status, "input_hash": row.input_hash, "delta": row.delta or {}} for row in rows
+        }
+        if self.checkpoints:
+            logger.info(f"Loaded {len(self.checkpoints)} checkpoints for analysis {self.analysis_id}")
+
+    def get_reusable(self, node: str, node_input_hash: str) -> Optional[Dict[str, Any]]:
+        """Returns the state delta of node if it last succeeded on the same input"""
+        checkpoint = self.checkpoints.get(node)
+        if checkpoint and checkpoint["status"] == "success" and checkpoint["input_hash"] == node_input_hash:
+            return checkpoint["delta"]
+        return None
+
+    def save(
+        self, node: str, node_input_hash: str, delta: Optional[Dict[str, Any]] = None, error: Optional[str] = None
+    ) -> None:
+        values = {
+            "user_id": self.user_id,
+            "status": "failed" if error is not None else "success",
+            "input_hash": node_input_hash,
+            "delta": delta if error is None else None,
+            "error": error,
+        }
+        stmt = insert(BusinessAnalysisCheckpoint).values(analysis_id=self.analysis_id, node=node, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["analysis_id", "node"],
+            set_={**values, "updated_at": func.now()},
+            # Never overwrite the checkpoints of another user's analysis
+            where=BusinessAnalysisCheckpoint.user_id == self.user_id,
+        )
+        with self.lock:
+            try:
+                self.db.execute(stmt)
+                self.db.commit()
+            except Exception as e:
+                # A lost checkpoint only means the node runs again on resume
+                logger.error(f"Error saving checkpoint {node} for analysis {self.analysis_id}: {str(e)}")
+                self.db.rollback()
+                return
+            self.checkpoints[node] = {"status": values["status"], "input_hash": node_input_hash, "delta": delta or {}}
@@ -1,17 +1,38 @@
 import logging
 import uuid
-from typing import Any, AsyncGenerator, Dict, List
+from typing import Any, AsyncGenerator, Callable, Dict, List, Tuple
 from langchain.chat_models import ChatOpenAI
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from src.backend.schemas.agile_entity_schemas import BusinessAnalysisState
 from src.backend.services.confluence_service import ConfluenceService
 from src.backend.kr8.assistant.team.business_analyst import EnhancedBusinessAnalyst
 from src.backend.kr8.vectordb.pgvector.pgvector2 import PgVector2
 from src.backend.kr8.document.base import Document 
 from src.backend.kr8.knowledge.base import AssistantKnowledge
+from src.backend.kr8.llm.message import Message
+from src.backend.services.langgraphs.analysis_checkpoints import AnalysisCheckpointStore, input_hash
+from src.backend.services.langgraphs.document_map_reduce import DocumentMapReduce, VectorDbSummaryStore, content_hash
 
 logger = logging.getLogger(__name__)
 
+# Analysis node -> (state fields it reads, state field it writes). Edges are derived from these, so nodes that
+# do not read each other's output run as parallel branches.
+ANALYSIS_NODES: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    "AnalyzeBusinessDocuments": ((), "business_analysis"),
+    "ExtractKeyRequirements": (("business_analysis",), "key_requirements"),
+    "GenerateUserStories": (("key_requirements",), "user_stories"),
+    "CreateAcceptanceCriteria": (("user_stories",), "acceptance_criteria"),
+    "GenerateTestCases": (("user_stories", "acceptance_criteria"), "test_cases"),
+}
+# Side branch that indexes the output of an analysis node in the knowledge base
+STORE_NODES: Dict[str, str] = {
+    "AnalyzeBusinessDocuments": "StoreAnalysis",
+    "ExtractKeyRequirements": "StoreRequirements",
+    "GenerateUserStories": "StoreUserStories",
+    "CreateAcceptanceCriteria": "StoreAcceptanceCriteria",
+    "GenerateTestCases": "StoreTestCases",
+}
+
 class BusinessAnalysisGraph:
     def __init__(self, db, user, assistant, analysis_id=None):
         self.db = db
@@ -25,6 +46,15 @@ class BusinessAnalysisGraph:
         )
         self.knowledge_base = AssistantKnowledge(vector_db=self.vector_db)
         self.confluence_service = ConfluenceService(db, user)
+        # Page summaries live in their own collection so they are not read back as confluence pages
+        self.summary_store = VectorDbSummaryStore(
+            PgVector2(
+                collection="confluence_page_summaries",
+                db_url=db.bind.url,
+                user_id=user.id,
+                org_id=user.organization_id
+            )
+        )
         self.analysis_id = analysis_id or str(uuid.uuid4())
         self.current_state = BusinessAnalysisState(
             db=self.db,
@@ -32,138 +62,172 @@ class BusinessAnalysisGraph:
             assistant=self.assistant,
             analysis_id=self.analysis_id
         )
+        # Passing the analysis_id of a failed analysis resumes it from its last good nodes
+        self.checkpoints = AnalysisCheckpointStore(db, self.analysis_id, user_id=user.id)
+        # Nodes whose output was taken from a checkpoint in this run
+        self.reused_nodes = set()
+        self.documents = None
 
     def update_state(self, key: str, value: str):
         setattr(self.current_state, key, value)
         logger.info(f"Updated state: {key} = {value[:100]}...")
 
-    def analyze_business_documents(self, state: BusinessAnalysisState) -> BusinessAnalysisState:
+    def complete(self, prompt: str) -> str:
+        # Map and reduce prompts run concurrently, so they go to a tool-less copy of the assistant's llm
+        # instead of assistant.run, which would search the knowledge base and write memory for every chunk
+        llm = self.assistant.llm.model_copy(
+            update={"tools": None, "functions": None, "tool_choice": None, "function_call_stack": None, "metrics": {}}
+        )
+        return llm.response(messages=[Message(role="user", content=prompt)])
+
+    def get_documents(self) -> List[Any]:
+        if self.documents is None:
+            self.documents = self.confluence_service.get_documents()
+            logger.info(f"Retrieved {len(self.documents)} documents")
+        return self.documents
+
+    def get_node_input(self, node: str, state: BusinessAnalysisState) -> Dict[str, Any]:
+        inputs, _ = ANALYSIS_NODES[node]
+        if node == "AnalyzeBusinessDocuments":
+            # The documents are the input, a checkpoint is reused until a page changes
+            return {"pages": [[doc.name, content_hash(doc.content or "")] for doc in self.get_documents()]}
+        return {field: getattr(state, field) for field in inputs}
+
+    def checkpointed(self, node: str, run: Callable[[BusinessAnalysisState], str]):
+        """Wraps an analysis node so it returns only the field it writes and saves that delta as a checkpoint"""
+        _, output = ANALYSIS_NODES[node]
+
+        def run_node(state: BusinessAnalysisState) -> Dict[str, Any]:
+            node_input_hash = None
+            try:
+                node_input_hash = input_hash(self.get_node_input(node, state))
+                delta = self.checkpoints.get_reusable(node, node_input_hash)
+                if delta is not None and delta.get(output):
+                    logger.info(f"Reusing checkpoint of {node}")
+                    self.reused_nodes.add(node)
+                else:
+                    result = run(state)
+                    if not result.strip():
+                        raise ValueError("Received empty response from assistant")
+                    delta = {output: result}
+                    self.checkpoints.save(node, node_input_hash, delta=delta)
+            except Exception as e:
+                logger.error(f"Error in {node}: {str(e)}")
+                self.update_state(output, f"Error in {node}: {str(e)}")
+                self.checkpoints.save(node, node_input_hash, error=str(e))
+                # Downstream nodes must not run on the error; resuming the analysis picks up from here
+                raise
+            for key, value in delta.items():
+                self.update_state(key, value)
+            return delta
+
+        return run_node
+
+    def analyze_business_documents(self, state: BusinessAnalysisState) -> str:
         logger.info("Starting analyze_business_documents")
-        documents = self.confluence_service.get_documents()
-        logger.info(f"Retrieved {len(documents)} documents")
-        combined_content = "\n\n".join([doc.content for doc in documents])
-        self.update_state("business_analysis", combined_content)
-        return self.current_state
+        documents = self.get_documents()
+        map_reduce = DocumentMapReduce(complete=self.complete, summary_store=self.summary_store)
+        analysis = map_reduce.run([(doc.name, doc.content or "") for doc in documents])
+        logger.info(
+            f"Analyzed documents with {map_reduce.num_calls} llm calls, "
+            f"largest prompt {map_reduce.max_prompt_chars} chars"
+        )
+        return analysis
 
-    def extract_key_requirements(self, state: BusinessAnalysisState) -> BusinessAnalysisState:
+    def extract_key_requirements(self, state: BusinessAnalysisState) -> str:
         logger.info("Starting extract_key_requirements")
-        try:
-            result = self.assistant.run(f"Based on the following business analysis, extract the key requirements:\n\n{self.current_state.business_analysis}")
-            if not result.strip():
-                raise ValueError("Received empty response from assistant")
-            self.update_state("key_requirements", result)
-        except Exception as e:
-            logger.error(f"Error in extract_key_requirements: {str(e)}")
-            self.update_state("key_requirements", f"Error extracting key requirements: {str(e)}")
-        return self.current_state
+        return self.assistant.run(f"Based on the following business analysis, extract the key requirements:\n\n{state.business_analysis}")
 
-    def generate_user_stories(self, state: BusinessAnalysisState) -> BusinessAnalysisState:
+    def generate_user_stories(self, state: BusinessAnalysisState) -> str:
         logger.info("Starting generate_user_stories")
-        try:
-            result = self.assistant.run(f"Create user stories based on these key requirements:\n\n{self.current_state.key_requirements}")
-            if not result.strip():
-                raise ValueError("Received empty response from assistant")
-            self.update_state("user_stories", result)
-        except Exception as e:
-            logger.error(f"Error in generate_user_stories: {str(e)}")
-            self.update_state("user_stories", f"Error generating user stories: {str(e)}")
-        return self.current_state
+        return self.assistant.run(f"Create user stories based on these key requirements:\n\n{state.key_requirements}")
 
-    def create_acceptance_criteria(self, state: BusinessAnalysisState) -> BusinessAnalysisState:
+    def create_acceptance_criteria(self, state: BusinessAnalysisState) -> str:
         logger.info("Starting create_acceptance_criteria")
-        try:
-            result = self.assistant.run(f"Create acceptance criteria for each of these user stories:\n\n{self.current_state.user_stories}")
-            if not result.strip():
-                raise ValueError("Received empty response from assistant")
-            self.update_state("acceptance_criteria", result)
-        except Exception as e:
-            logger.error(f"Error in create_acceptance_criteria: {str(e)}")
-            self.update_state("acceptance_criteria", f"Error creating acceptance criteria: {str(e)}")
-        return self.current_state
+        return self.assistant.run(f"Create acceptance criteria for each of these user stories:\n\n{state.user_stories}")
 
-    def generate_test_cases(self, state: BusinessAnalysisState) -> BusinessAnalysisState:
+    def generate_test_cases(self, state: BusinessAnalysisState) -> str:
         logger.info("Starting generate_test_cases")
-        try:
-            result = self.assistant.run(f"Generate test cases based on these user stories and acceptance criteria:\n\nUser Stories:\n{self.current_state.user_stories}\n\nAcceptance Criteria:\n{self.current_state.acceptance_criteria}")
-            if not result.strip():
-                raise ValueError("Received empty response from assistant")
-            self.update_state("test_cases", result)
-        except Exception as e:
-            logger.error(f"Error in generate_test_cases: {str(e)}")
-            self.update_state("test_cases", f"Error generating test cases: {str(e)}")
-        return self.current_state
-
-    def store_interim_results(self, state: BusinessAnalysisState) -> BusinessAnalysisState:
-        logger.info("Storing interim results in pgvector")
-        for key, value in self.current_state.dict().items():
-            if key not in ['db', 'user', 'assistant'] and value:
-                unique_id = f"ba_result_{key}_{self.analysis_id}"
-                try:
-                    document = Document(
-                        id=unique_id,
-                        name=f"Business Analysis Result: {key.replace('_', ' ').title()}",
-                        content=str(value),
-                        meta_data={
-                            "type": "business_analysis_result",
-                            "step": key,
-                            "analysis_id": self.analysis_id,
-                            "user_id": self.user.id,
-                            "org_id": self.user.organization_id,
-                            "url": f"/business-analysis/{self.analysis_id}/{key}"
-                        }
-                    )
-                    self.knowledge_base.load_document(document)
-                    logger.info(f"Stored document for {key}")
-                except Exception as e:
-                    logger.error(f"Error storing document for {key}: {str(e)}", exc_info=True)
-        logger.info("Interim results storage completed")
-        return self.current_state
+        return self.assistant.run(f"Generate test cases based on these user stories and acceptance criteria:\n\nUser Stories:\n{state.user_stories}\n\nAcceptance Criteria:\n{state.acceptance_criteria}")
+
+    def store_interim_results(self, node: str):
+        """Node that indexes the output of node in the knowledge base, once per new output"""
+        _, key = ANALYSIS_NODES[node]
+
+        def store(state: BusinessAnalysisState) -> Dict[str, Any]:
+            value = getattr(state, key)
+            if node in self.reused_nodes or not value:
+                # Indexed by the run that produced it
+                return {}
+            logger.info(f"Storing {key} in pgvector")
+            unique_id = f"ba_result_{key}_{self.analysis_id}"
+            try:
+                document = Document(
+                    id=unique_id,
+                    name=f"Business Analysis Result: {key.replace('_', ' ').title()}",
+                    content=str(value),
+                    meta_data={
+                        "type": "business_analysis_result",
+                        "step": key,
+                        "analysis_id": self.analysis_id,
+                        "user_id": self.user.id,
+                        "org_id": self.user.organization_id,
+                        "url": f"/business-analysis/{self.analysis_id}/{key}"
+                    }
+                )
+                self.knowledge_base.load_document(document)
+                logger.info(f"Stored document for {key}")
+            except Exception as e:
+                logger.error(f"Error storing document for {key}: {str(e)}", exc_info=True)
+            return {}
+
+        return store
 
     def create_graph(self):
         workflow = StateGraph(state_schema=BusinessAnalysisState)
 
-        workflow.add_node("AnalyzeBusinessDocuments", self.analyze_business_documents)
-        workflow.add_node("StoreAnalysis", self.store_interim_results)
-        workflow.add_node("ExtractKeyRequirements", self.extract_key_requirements)
-        workflow.add_node("StoreRequirements", self.store_interim_results)
-        workflow.add_node("GenerateUserStories", self.generate_user_stories)
-        workflow.add_node("StoreUserStories", self.store_interim_results)
-        workflow.add_node("CreateAcceptanceCriteria", self.create_acceptance_criteria)
-        workflow.add_node("StoreAcceptanceCriteria", self.store_interim_results)
-        workflow.add_node("GenerateTestCases", self.generate_test_cases)
-        workflow.add_node("StoreTestCases", self.store_interim_results)
-
-        workflow.add_edge("AnalyzeBusinessDocuments", "StoreAnalysis")
-        workflow.add_edge("StoreAnalysis", "ExtractKeyRequirements")
-        workflow.add_edge("ExtractKeyRequirements", "StoreRequirements")
-        workflow.add_edge("StoreRequirements", "GenerateUserStories")
-        workflow.add_edge("GenerateUserStories", "StoreUserStories")
-        workflow.add_edge("StoreUserStories", "CreateAcceptanceCriteria")
-        workflow.add_edge("CreateAcceptanceCriteria", "StoreAcceptanceCriteria")
-        workflow.add_edge("StoreAcceptanceCriteria", "GenerateTestCases")
-        workflow.add_edge("GenerateTestCases", "StoreTestCases")
-        workflow.add_edge("StoreTestCases", END)
-
-        workflow.set_entry_point("AnalyzeBusinessDocuments")
+        runs = {
+            "AnalyzeBusinessDocuments": self.analyze_business_documents,
+            "ExtractKeyRequirements": self.extract_key_requirements,
+            "GenerateUserStories": self.generate_user_stories,
+            "CreateAcceptanceCriteria": self.create_acceptance_criteria,
+            "GenerateTestCases": self.generate_test_cases,
+        }
+        producers = {output: node for node, (_, output) in ANALYSIS_NODES.items()}
+        downstream = {producers[field] for inputs, _ in ANALYSIS_NODES.values() for field in inputs}
+
+        for node, (inputs, _) in ANALYSIS_NODES.items():
+            workflow.add_node(node, self.checkpointed(node, runs[node]))
+            upstream = sorted({producers[field] for field in inputs})
+            if not upstream:
+                workflow.add_edge(START, node)
+            elif len(upstream) == 1:
+                workflow.add_edge(upstream[0], node)
+            else:
+                # Runs once every node it reads from has finished
+                workflow.add_edge(upstream, node)
+            if node not in downstream:
+                workflow.add_edge(node, END)
+
+            # Indexing runs alongside the next analysis node instead of blocking it
+            workflow.add_node(STORE_NODES[node], self.store_interim_results(node))
+            workflow.add_edge(node, STORE_NODES[node])
+            workflow.add_edge(STORE_NODES[node], END)
 
         return workflow.compile()
 
     async def run_business_analysis_graph(self) -> AsyncGenerator[Dict[str, Any], None]:
         graph = self.create_graph()
         
-        node_to_attr = {
-            "AnalyzeBusinessDocuments": "business_analysis",
-            "ExtractKeyRequirements": "key_requirements",
-            "GenerateUserStories": "user_stories",
-            "CreateAcceptanceCriteria": "acceptance_criteria",
-            "GenerateTestCases": "test_cases"
-        }
+        node_to_attr = {node: output for node, (_, output) in ANALYSIS_NODES.items()}
         
         try:
             async for event in graph.astream(self.current_state):
                 if isinstance(event, dict):
                     for node, state in event.items():
-                        if isinstance(state, BusinessAnalysisState):
+                        if node in STORE_NODES.values():
+                            logger.info(f"Interim results stored for {node}")
+                        elif isinstance(state, BusinessAnalysisState):
                             logger.info(f"Node {node} completed. State keys: {state.dict().keys()}")
                             
                             attr_name = node_to_attr.get(node)
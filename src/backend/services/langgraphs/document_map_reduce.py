@@ -0,0 +1,225 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.backend.kr8.document.base import Document
+
+logger = logging.getLogger(__name__)
+
+MAP_PROMPT = (
+    "Summarize the following part of the business document \"{name}\". Keep every business requirement, "
+    "objective, constraint, stakeholder, metric and open question; drop boilerplate.\n\n{content}"
+)
+COMBINE_PROMPT = (
+    "Combine these summaries of business documents into one summary. Keep every distinct requirement, "
+    "objective, constraint and open question, merge duplicates and note which documents they come from.\n\n"
+    "{content}"
+)
+REDUCE_PROMPT = (
+    "Based on these summaries of the business documents, write a business analysis covering the business "
+    "goals, key requirements, stakeholders, constraints, risks and open questions.\n\n{content}"
+)
+
+
+def content_hash(content: str) -> str:
+    return sha256(content.encode()).hexdigest()
+
+
+class SummaryStore:
+    """Page summaries keyed by the hash of the page content. Kept in memory only."""
+
+    def __init__(self):
+        self.summaries: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, str]:
+        with self.lock:
+            return {h: self.summaries[h] for h in hashes if h in self.summaries}
+
+    def put_many(self, summaries: Dict[str, Tuple[str, str]]) -> None:
+        """summaries: content hash -> (page name, summary)"""
+        with self.lock:
+            for h, (_, summary) in summaries.items():
+                self.summaries[h] = summary
+
+
+class VectorDbSummaryStore(SummaryStore):
+    """Page summaries stored as documents in a vector db collection, so they survive between analyses.
+
+    Summaries are also searchable from the knowledge base of that collection. Use a collection of its own:
+    storing them next to the pages would make them pages to analyze.
+    """
+
+    def __init__(self, vector_db):
+        super().__init__()
+        self.vector_db = vector_db
+        self.loaded = False
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, str]:
+        if not self.loaded:
+            try:
+                # One exact lookup served by the GIN index on meta_data
+                for document in self.vector_db.get_documents_by_metadata({"type": "page_summary"}):
+                    summary_hash = document.meta_data.get("content_hash")
+                    if summary_hash:
+                        self.summaries[summary_hash] = document.content
+            except Exception as e:
+                logger.warning(f"Could not load page summaries: {str(e)}")
+            self.loaded = True
+        return super().get_many(hashes)
+
+    def put_many(self, summaries: Dict[str, Tuple[str, str]]) -> None:
+        super().put_many(summaries)
+        if not summaries:
+            return
+        documents = [
+            Document(
+                id=f"page_summary_{h}",
+                name=f"Summary: {name}",
+                content=summary,
+                meta_data={"type": "page_summary", "content_hash": h, "source": name},
+            )
+            for h, (name, summary) in summaries.items()
+        ]
+        try:
+            self.vector_db.bulk_upsert(documents)
+        except Exception as e:
+            logger.warning(f"Could not store page summaries: {str(e)}")
+
+
+class DocumentMapReduce:
+    """Analyzes a document corpus with bounded prompts.
+
+    Map: every page is split into chunks of at most chunk_chars on paragraph boundaries and the chunks of all
+    pages are summarized concurrently. A page summary is cached by the hash of the page content, so pages that
+    did not change since the last analysis are not summarized again.
+    Reduce: summaries are combined in groups of at most reduce_chars, concurrently, until together they fit
+    reduce_chars, and the final prompt runs over them. No prompt holds more than reduce_chars of summaries.
+    """
+
+    def __init__(
+        self,
+        complete: Callable[[str], str],
+        summary_store: Optional[SummaryStore] = None,
+        chunk_chars: int = 8000,
+        reduce_chars: int = 16000,
+        max_workers: int = 8,
+    ):
+        self.complete = complete
+        self.summary_store = summary_store or SummaryStore()
+        self.chunk_chars = chunk_chars
+        self.reduce_chars = reduce_chars
+        self.max_workers = max_workers
+        # Counters for the last run
+        self.num_pages_summarized: int = 0
+        self.num_pages_cached: int = 0
+        self.num_calls: int = 0
+        self.max_prompt_chars: int = 0
+        self.calls_lock = threading.Lock()
+
+    def _call(self, prompt: str) -> str:
+        with self.calls_lock:
+            self.num_calls += 1
+            self.max_prompt_chars = max(self.max_prompt_chars, len(prompt))
+        return self.complete(prompt).strip()
+
+    def chunk(self, content: str, chunk_chars: Optional[int] = None) -> List[str]:
+        """Splits content into chunks of at most chunk_chars, on paragraph boundaries where possible"""
+        chunk_chars = chunk_chars or self.chunk_chars
+        chunks: List[str] = []
+        current = ""
+        for paragraph in content.split("\n\n"):
+            # A single paragraph longer than a chunk is cut on a hard boundary
+            while len(paragraph) > chunk_chars:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(paragraph[:chunk_chars])
+                paragraph = paragraph[chunk_chars:]
+            if current and len(current) + len(paragraph) + 2 > chunk_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current.strip():
+            chunks.append(current)
+        return chunks
+
+    def _group(self, texts: List[str]) -> List[List[str]]:
+        """Groups texts of at most reduce_chars each so every group joined fits reduce_chars"""
+        groups: List[List[str]] = [[]]
+        size = 0
+        for text in texts:
+            if groups[-1] and size + 2 + len(text) > self.reduce_chars:
+                groups.append([])
+                size = 0
+            size += len(text) + (2 if groups[-1] else 0)
+            groups[-1].append(text)
+        return groups
+
+    def summarize_pages(self, pages: List[Tuple[str, str]]) -> List[str]:
+        """Returns a summary for each (name, content) page, in order"""
+        hashes = [content_hash(content) for _, content in pages]
+        cached = self.summary_store.get_many(hashes)
+
+        # Map every chunk of every page that is not cached, all at once
+        to_summarize: Dict[str, Tuple[str, List[str]]] = {}
+        for (name, content), h in zip(pages, hashes):
+            if h not in cached and h not in to_summarize and content.strip():
+                to_summarize[h] = (name, self.chunk(content))
+        jobs = [(h, name, chunk) for h, (name, chunks) in to_summarize.items() for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            chunk_summaries = list(
+                executor.map(lambda job: self._call(MAP_PROMPT.format(name=job[1], content=job[2])), jobs)
+            )
+
+        new_summaries: Dict[str, Tuple[str, str]] = {}
+        for (h, name, _), summary in zip(jobs, chunk_summaries):
+            previous = new_summaries.get(h, (name, ""))[1]
+            new_summaries[h] = (name, f"{previous}\n{summary}".strip())
+        self.summary_store.put_many(new_summaries)
+
+        self.num_pages_cached = len(set(hashes) & set(cached))
+        self.num_pages_summarized = len(new_summaries)
+        summaries = {**cached, **{h: summary for h, (_, summary) in new_summaries.items()}}
+        return [
+            f"## {name}\n{summaries[h]}" for (name, _), h in zip(pages, hashes) if summaries.get(h)
+        ]
+
+    def reduce(self, summaries: List[str]) -> str:
+        if not summaries:
+            return ""
+        texts = summaries
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            while len("\n\n".join(texts)) > self.reduce_chars:
+                # A summary longer than a prompt is split first. Summaries longer than half of one end up in a
+                # group of their own, which combining still shortens.
+                pieces = [
+                    piece
+                    for text in texts
+                    for piece in (self.chunk(text, self.reduce_chars) if len(text) > self.reduce_chars else [text])
+                ]
+                combined = list(
+                    executor.map(
+                        lambda group: self._call(COMBINE_PROMPT.format(content="\n\n".join(group))),
+                        self._group(pieces),
+                    )
+                )
+                if len("\n\n".join(combined)) >= len("\n\n".join(texts)):
+                    logger.warning("Combining did not shorten the summaries, cutting them to fit the prompt")
+                    combined = ["\n\n".join(combined)[: self.reduce_chars]]
+                texts = combined
+        content = "\n\n".join(texts)
+        assert len(content) <= self.reduce_chars
+        return self._call(REDUCE_PROMPT.format(content=content))
+
+    def run(self, pages: List[Tuple[str, str]]) -> str:
+        """Returns the analysis of the (name, content) pages"""
+        self.num_calls = 0
+        self.max_prompt_chars = 0
+        summaries = self.summarize_pages(pages)
+        logger.info(
+            f"Summarized {self.num_pages_summarized} pages, reused {self.num_pages_cached} cached summaries"
+        )
+        return self.reduce(summaries)
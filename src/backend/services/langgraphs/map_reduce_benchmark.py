@@ -0,0 +1,98 @@
+"""DocumentMapReduce benchmark
+
+Analyzes a corpus of synthetic confluence pages with a fake llm that sleeps for a fixed time plus a time per
+prompt character, and reports wall time, llm calls and the largest prompt for a cold run (nothing cached), a
+warm run (nothing changed) and a run after a few pages changed, next to the single-prompt baseline.
+
+Usage:
+    python -m src.backend.services.langgraphs.map_reduce_benchmark
+    python -m src.backend.services.langgraphs.map_reduce_benchmark --pages 200 --changed 10 --latency 0.2
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from src.backend.services.langgraphs.document_map_reduce import DocumentMapReduce, SummaryStore
+
+_WORDS = (
+    "customer onboarding invoice approval workflow report dashboard integration compliance audit payment "
+    "notification access role region quarterly forecast migration latency retention escalation partner"
+).split()
+
+
+class FakeLLM:
+    """Returns a short summary after sleeping latency + prompt length * seconds_per_char"""
+
+    def __init__(self, latency: float = 0.2, seconds_per_char: float = 0.00001, summary_chars: int = 400):
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.summary_chars = summary_chars
+        self.num_calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self.lock:
+            self.num_calls += 1
+        time.sleep(self.latency + len(prompt) * self.seconds_per_char)
+        return prompt[-self.summary_chars :]
+
+
+def synthetic_pages(num_pages: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """Pages of 2 to 30 paragraphs, so some of them span several chunks"""
+    rng = random.Random(seed)
+    pages = []
+    for i in range(num_pages):
+        paragraphs = [
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randint(40, 120))) for _ in range(rng.randint(2, 30))
+        ]
+        pages.append((f"Page {i}", "\n\n".join(paragraphs)))
+    return pages
+
+
+def _report(label: str, map_reduce: DocumentMapReduce, seconds: float) -> None:
+    print(
+        f"{label:<16} {seconds:8.2f} s  {map_reduce.num_calls:>5} calls  "
+        f"summarized {map_reduce.num_pages_summarized:>4}  cached {map_reduce.num_pages_cached:>4}  "
+        f"largest prompt {map_reduce.max_prompt_chars:>8} chars"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure DocumentMapReduce against a fake llm.")
+    parser.add_argument("--pages", type=int, default=200, help="Synthetic pages in the corpus")
+    parser.add_argument("--changed", type=int, default=10, help="Pages edited before the last run")
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake llm seconds per call")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent llm calls")
+    args = parser.parse_args(argv)
+
+    pages = synthetic_pages(args.pages)
+    llm = FakeLLM(latency=args.latency)
+
+    # Baseline: every page joined into one prompt and a single call
+    single_prompt = "\n\n".join(content for _, content in pages)
+    started = time.perf_counter()
+    llm(single_prompt)
+    print(f"{'single prompt':<16} {time.perf_counter() - started:8.2f} s  {1:>5} calls  "
+          f"{'':>30}largest prompt {len(single_prompt):>8} chars")
+
+    map_reduce = DocumentMapReduce(complete=llm, summary_store=SummaryStore(), max_workers=args.workers)
+    for label in ("cold", "warm"):
+        started = time.perf_counter()
+        map_reduce.run(pages)
+        _report(label, map_reduce, time.perf_counter() - started)
+
+    for i in range(min(args.changed, len(pages))):
+        name, content = pages[i]
+        pages[i] = (name, f"{content}\n\nEdited.")
+    started = time.perf_counter()
+    map_reduce.run(pages)
+    _report(f"{args.changed} changed", map_reduce, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+# dependency_resolver.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "kr8", "dependency_metadata")
+DEFAULT_MAX_WORKERS = 16
+# Version lists change as packages are published; metadata of a released version never does
+VERSION_LIST_TTL_SECONDS = 24 * 60 * 60
+
+
+class ArtifactCache:
+    """Persistent on-disk metadata cache keyed by ecosystem, coordinates and version.
+
+    Each entry is a small JSON file written atomically, so the cache can be shared by concurrent
+    workers and processes. Entries without a TTL (released-version metadata) never expire.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.getenv("DEPENDENCY_CACHE_DIR", DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            if ttl is not None and time.time() - os.path.getmtime(path) > ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "value": value}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write dependency cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class MavenSource:
+    """A Maven repository the resolver can fetch POMs from."""
+
+    def fetch_pom(self, group_id: str, artifact_id: str, version: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @staticmethod
+    def pom_path(group_id: str, artifact_id: str, version: str) -> str:
+        return f"{group_id.replace('.', '/')}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
+
+
+class MavenHttpSource(MavenSource):
+    def __init__(self, base_url: str = "https://repo1.maven.org/maven2", timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def fetch_pom(self, group_id: str, artifact_id: str, version: str) -> Optional[str]:
+        pom_url = f"{self.base_url}/{self.pom_path(group_id, artifact_id, version)}"
+        try:
+            response = self.session.get(pom_url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.text
+        except requests.RequestException as e:
+            logger.error(f"Error fetching POM for {group_id}:{artifact_id}:{version}: {e}")
+            return None
+
+
+class MavenMirrorSource(MavenSource):
+    """Reads POMs from a local directory laid out like a Maven repository (e.g. ~/.m2/repository)."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def fetch_pom(self, group_id: str, artifact_id: str, version: str) -> Optional[str]:
+        path = os.path.join(self.root_dir, self.pom_path(group_id, artifact_id, version))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            logger.debug(f"POM not found in mirror: {path}")
+            return None
+
+
+class NpmSource:
+    """An npm registry the resolver can fetch package metadata from.
+
+    `fetch_package` returns an abbreviated packument: {"versions": {version: {"dependencies": {...}}}}.
+    """
+
+    def fetch_package(self, name: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class NpmHttpSource(NpmSource):
+    def __init__(self, registry_url: str = "https://registry.npmjs.org", timeout: float = 10.0):
+        self.registry_url = registry_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def fetch_package(self, name: str) -> Optional[Dict[str, Any]]:
+        url = f"{self.registry_url}/{quote(name, safe='@')}"
+        try:
+            # The abbreviated ("corgi") document carries every version's dependencies in one small response
+            response = self.session.get(url, headers={"Accept": "application/vnd.npm.install-v1+json"}, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error fetching npm metadata for {name}: {e}")
+            return None
+
+
+class NpmMirrorSource(NpmSource):
+    """Reads packuments from a local directory containing `<name>.json` files (scoped names nest, e.g. `@scope/pkg.json`)."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def fetch_package(self, name: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.root_dir, f"{name}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.debug(f"Package not found in mirror: {path}")
+            return None
+
+
+def default_maven_sources() -> List[MavenSource]:
+    sources: List[MavenSource] = []
+    if os.getenv("MAVEN_MIRROR_DIR"):
+        sources.append(MavenMirrorSource(os.environ["MAVEN_MIRROR_DIR"]))
+    if os.getenv("DEPENDENCY_OFFLINE", "").lower() not in ("1", "true", "yes"):
+        sources.append(MavenHttpSource(os.getenv("MAVEN_REPOSITORY_URL", "https://repo1.maven.org/maven2")))
+    return sources
+
+
+def default_npm_sources() -> List[NpmSource]:
+    sources: List[NpmSource] = []
+    if os.getenv("NPM_MIRROR_DIR"):
+        sources.append(NpmMirrorSource(os.environ["NPM_MIRROR_DIR"]))
+    if os.getenv("DEPENDENCY_OFFLINE", "").lower() not in ("1", "true", "yes"):
+        sources.append(NpmHttpSource(os.getenv("NPM_REGISTRY_URL", "https://registry.npmjs.org")))
+    return sources
+
+
+# Per-process memo of resolved nodes (key -> (loaded_at, value)), shared by every resolver and so across projects
+_node_memo: Dict[str, Tuple[float, Any]] = {}
+_node_memo_lock = threading.Lock()
+
+
+class DependencyResolver:
+    """Resolves Maven and npm dependency metadata with caching and bounded concurrency.
+
+    Lookups go through three layers: the per-process node memo, the persistent `ArtifactCache`,
+    and finally the configured sources in order (e.g. a local mirror before the public registry).
+    Only artifacts missing from both caches are fetched, so regenerating a graph after a few
+    dependencies change costs a handful of requests.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ArtifactCache] = None,
+        maven_sources: Optional[List[MavenSource]] = None,
+        npm_sources: Optional[List[NpmSource]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.cache = cache or ArtifactCache()
+        self.maven_sources = maven_sources if maven_sources is not None else default_maven_sources()
+        self.npm_sources = npm_sources if npm_sources is not None else default_npm_sources()
+        self.max_workers = max_workers
+
+    def _lookup(self, key: str, load: Callable[[], Optional[Any]], ttl: Optional[float] = None) -> Optional[Any]:
+        with _node_memo_lock:
+            memoized = _node_memo.get(key)
+        if memoized is not None and (ttl is None or time.time() - memoized[0] <= ttl):
+            return memoized[1]
+        value = self.cache.get(key, ttl=ttl)
+        if value is None:
+            value = load()
+            if value is None:
+                return None
+            self.cache.set(key, value)
+        with _node_memo_lock:
+            _node_memo[key] = (time.time(), value)
+        return value
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(fn, items))
+
+    # Maven
+
+    def maven_dependencies(self, coordinate: str, version: str) -> Optional[Dict[str, str]]:
+        """Direct (non-test) dependencies of `group:artifact` at `version`, or None if no POM was found."""
+        from src.backend.utils.java_utils import parse_pom_xml
+
+        group_id, artifact_id = coordinate.split(":", 1)
+
+        def load() -> Optional[Dict[str, str]]:
+            for source in self.maven_sources:
+                pom_content = source.fetch_pom(group_id, artifact_id, version)
+                if pom_content is not None:
+                    return parse_pom_xml(pom_content, include_test=False)
+            return None
+
+        return self._lookup(f"maven:{coordinate}@{version}", load)
+
+    def resolve_maven(self, roots: Dict[str, str], max_depth: int = 5) -> Dict[str, Any]:
+        """Breadth-first transitive resolution; every level is fetched concurrently.
+
+        Resolved nodes map to {"version", "dependencies"}; nodes whose POM was not found or that lie
+        beyond `max_depth` keep their version string.
+        """
+        resolved: Dict[str, Any] = dict(roots)
+        frontier: List[Tuple[str, str]] = [(dep, version) for dep, version in roots.items() if version]
+        depth = 0
+        while frontier and depth <= max_depth:
+            results = self.map(lambda item: self.maven_dependencies(*item), frontier)
+            next_frontier = []
+            for (dep, version), dependencies in zip(frontier, results):
+                if dependencies is None:
+                    continue
+                resolved[dep] = {"version": version, "dependencies": list(dependencies.keys())}
+                for child, child_version in dependencies.items():
+                    if child not in resolved:
+                        resolved[child] = child_version
+                        next_frontier.append((child, child_version))
+            frontier = next_frontier
+            depth += 1
+        return resolved
+
+    # npm
+
+    def npm_package(self, name: str) -> Optional[Dict[str, Any]]:
+        """Version list and per-version dependencies for an npm package."""
+
+        def load() -> Optional[Dict[str, Any]]:
+            for source in self.npm_sources:
+                packument = source.fetch_package(name)
+                if packument is not None:
+                    return {
+                        "versions": {
+                            version: manifest.get("dependencies", {}) or {}
+                            for version, manifest in (packument.get("versions") or {}).items()
+                        },
+                        "dist_tags": packument.get("dist-tags", {}),
+                    }
+            return None
+
+        return self._lookup(f"npm:{name}", load, ttl=VERSION_LIST_TTL_SECONDS)
+
+    def npm_dependencies(self, name: str, version_range: str) -> Optional[Tuple[str, Dict[str, str]]]:
+        """Resolve `version_range` to the highest satisfying version and return (version, dependencies)."""
+        package = self.npm_package(name)
+        if package is None:
+            return None
+        if version_range in package["dist_tags"]:
+            version = package["dist_tags"][version_range]
+        else:
+            version = max_satisfying(list(package["versions"]), version_range)
+        if version is None:
+            logger.warning(f"No version of {name} satisfies {version_range}")
+            return None
+        return version, package["versions"].get(version, {})
+
+
+_SEMVER = re.compile(r"^v?(\d+)(?:\.(\d+|x|\*))?(?:\.(\d+|x|\*))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$")
+
+
+def _parse_version(version: str) -> Optional[Tuple[int, int, int, Optional[str]]]:
+    match = _SEMVER.match(version.strip())
+    if not match or not all(part is None or part.isdigit() for part in match.groups()[:3]):
+        return None
+    major, minor, patch, prerelease = match.groups()
+    return int(major), int(minor or 0), int(patch or 0), prerelease
+
+
+def _version_key(version: Tuple[int, int, int, Optional[str]]) -> Tuple[int, int, int, int, str]:
+    major, minor, patch, prerelease = version
+    # Releases sort after their prereleases
+    return major, minor, patch, 0 if prerelease else 1, prerelease or ""
+
+
+def _comparator_bounds(token: str) -> List[Tuple[str, Tuple[int, int, int, int, str]]]:
+    """Translate one npm range token (^1.2.3, ~1.2, 1.x, >=1.0.0, 1.2.3) into (operator, version) bounds."""
+    operator_match = re.match(r"^(>=|<=|>|<|=|\^|~)?\s*(.+)$", token)
+    operator, version = operator_match.group(1) or "", operator_match.group(2)
+    match = _SEMVER.match(version)
+    if not match:
+        return []
+    major, minor, patch, prerelease = match.groups()
+    wildcard = lambda part: part is None or part in ("x", "*")
+    major_i = int(major)
+    minor_i = 0 if wildcard(minor) else int(minor)
+    patch_i = 0 if wildcard(patch) else int(patch)
+    low = (major_i, minor_i, patch_i, 0 if prerelease else 1, prerelease or "")
+    floor = (major_i, minor_i, patch_i, 0, "")
+
+    if operator in (">", ">=", "<", "<="):
+        return [(operator, low)]
+    if operator == "^":
+        if major_i > 0 or wildcard(minor):
+            upper = (major_i + 1, 0, 0, 0, "")
+        elif minor_i > 0 or wildcard(patch):
+            upper = (0, minor_i + 1, 0, 0, "")
+        else:
+            upper = (0, 0, patch_i + 1, 0, "")
+        return [(">=", low), ("<", upper)]
+    if operator == "~" or wildcard(minor) or wildcard(patch):
+        if wildcard(minor):
+            upper = (major_i + 1, 0, 0, 0, "")
+        else:
+            upper = (major_i, minor_i + 1, 0, 0, "")
+        return [(">=", floor if operator != "~" else low), ("<", upper)]
+    return [("=", low)]
+
+
+def _hyphen_bounds(low: str, high: str) -> List[Tuple[str, Tuple[int, int, int, int, str]]]:
+    """Bounds of an npm hyphen range "low - high". A partial high side is exclusive: 1.2 - 2.3 means <2.4.0."""
+    low_match, high_match = _SEMVER.match(low.strip()), _SEMVER.match(high.strip())
+    if not low_match or not high_match:
+        return []
+    wildcard = lambda part: part is None or part in ("x", "*")
+    bounds = _comparator_bounds(f">={low.strip()}")
+    major, minor, patch, _ = high_match.groups()
+    if wildcard(minor):
+        bounds.append(("<", (int(major) + 1, 0, 0, 0, "")))
+    elif wildcard(patch):
+        bounds.append(("<", (int(major), int(minor) + 1, 0, 0, "")))
+    else:
+        bounds.extend(_comparator_bounds(f"<={high.strip()}"))
+    return bounds
+
+
+def _satisfies(version: Tuple[int, int, int, int, str], bounds: List[Tuple[str, Tuple[int, int, int, int, str]]]) -> bool:
+    checks = {
+        ">": lambda a, b: a > b,
+        ">=": lambda a, b: a >= b,
+        "<": lambda a, b: a < b,
+        "<=": lambda a, b: a <= b,
+        "=": lambda a, b: a == b,
+    }
+    return all(checks[operator](version, bound) for operator, bound in bounds)
+
+
+def max_satisfying(versions: List[str], version_range: str) -> Optional[str]:
+    """Highest version in `versions` matching an npm-style range; prereleases only match exact pins."""
+    version_range = (version_range or "*").strip()
+    parsed = [(version, _parse_version(version)) for version in versions]
+    parsed = [(version, key) for version, key in parsed if key is not None]
+    if not parsed:
+        return None
+
+    candidates = []
+    for alternative in version_range.split("||"):
+        alternative = alternative.strip()
+        if alternative in ("", "*", "x", "latest"):
+            bounds = []
+        elif " - " in alternative:
+            bounds = _hyphen_bounds(*alternative.split(" - ", 1))
+            if not bounds:
+                continue
+        else:
+            tokens = re.sub(r"(>=|<=|>|<|=)\s+", r"\1", alternative).split()
+            bounds = [bound for token in tokens for bound in _comparator_bounds(token)]
+            if tokens and not bounds:
+                # Not a semver range (git url, file path, dist-tag); nothing to match
+                continue
+        for version, key in parsed:
+            if key[3] and not any(operator == "=" for operator, _ in bounds):
+                continue
+            if _satisfies(_version_key(key), bounds):
+                candidates.append((_version_key(key), version))
+
+    return max(candidates)[1] if candidates else None
+
+
+_default_resolver: Optional[DependencyResolver] = None
+_default_resolver_lock = threading.Lock()
+
+
+def get_dependency_resolver() -> DependencyResolver:
+    """Process-wide resolver configured from the environment."""
+    global _default_resolver
+    with _default_resolver_lock:
+        if _default_resolver is None:
+            _default_resolver = DependencyResolver()
+        return _default_resolver
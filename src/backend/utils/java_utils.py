@@ -3,21 +3,44 @@
 import xml.etree.ElementTree as ET
 import re
 import logging
-import requests
-from urllib.parse import urlparse
 import javalang
 
+from src.backend.utils.dependency_resolver import get_dependency_resolver
+
 logger = logging.getLogger(__name__)
 
-def parse_pom_xml(pom_content):
+def parse_pom_xml(pom_content, include_test=True):
     try:
         root = ET.fromstring(pom_content)
-        dependencies = root.findall(".//dependency")
-        return {f"{dep.find('groupId').text}:{dep.find('artifactId').text}": dep.find('version').text for dep in dependencies}
     except ET.ParseError as e:
         logger.error(f"Error parsing pom.xml: {e}")
         return {}
 
+    # Published POMs declare the Maven namespace; match on local tag names
+    for element in root.iter():
+        if isinstance(element.tag, str) and '}' in element.tag:
+            element.tag = element.tag.split('}', 1)[1]
+
+    properties = {child.tag: (child.text or '').strip() for child in root.findall('./properties/*')}
+    version_element = root.find('./version')
+    if version_element is None:
+        version_element = root.find('./parent/version')
+    if version_element is not None and version_element.text:
+        properties.setdefault('project.version', version_element.text.strip())
+
+    dependencies = {}
+    for dep in root.findall('./dependencies/dependency'):
+        group_id, artifact_id, version = dep.findtext('groupId'), dep.findtext('artifactId'), dep.findtext('version')
+        if not group_id or not artifact_id or not version:
+            continue
+        if not include_test and (dep.findtext('scope') or '').strip() == 'test':
+            continue
+        version = re.sub(r'\$\{([^}]+)\}', lambda m: properties.get(m.group(1), m.group(0)), version.strip())
+        if '${' in version:
+            continue
+        dependencies[f"{group_id.strip()}:{artifact_id.strip()}"] = version
+    return dependencies
+
 def parse_build_gradle(gradle_content):
     dependencies = {}
     dependency_pattern = re.compile(r'(\w+)\s*[\'\"](.+?):(.+?):(.+?)[\'\"]')
@@ -31,46 +54,21 @@ def parse_build_gradle(gradle_content):
     return dependencies
 
 def fetch_pom(group_id, artifact_id, version):
-    base_url = "https://repo1.maven.org/maven2"
-    group_path = group_id.replace('.', '/')
-    pom_url = f"{base_url}/{group_path}/{artifact_id}/{version}/{artifact_id}-{version}.pom"
-    
-    try:
-        response = requests.get(pom_url)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        logger.error(f"Error fetching POM for {group_id}:{artifact_id}:{version}: {e}")
-        return None
+    for source in get_dependency_resolver().maven_sources:
+        pom_content = source.fetch_pom(group_id, artifact_id, version)
+        if pom_content is not None:
+            return pom_content
+    return None
 
 def resolve_transitive_dependencies(dependency, resolved=None, depth=0, max_depth=5):
     if resolved is None:
         resolved = {}
-    
-    if depth > max_depth:
-        return resolved
 
-    group_id, artifact_id = dependency.split(':')
     version = resolved.get(dependency)
-    
-    if version is None:
+    if not isinstance(version, str):
         return resolved
 
-    pom_content = fetch_pom(group_id, artifact_id, version)
-    if pom_content is None:
-        return resolved
-
-    dependencies = parse_pom_xml(pom_content)
-    resolved[dependency] = {
-        "version": version,
-        "dependencies": list(dependencies.keys())
-    }
-
-    for dep, ver in dependencies.items():
-        if dep not in resolved:
-            resolved[dep] = ver
-            resolve_transitive_dependencies(dep, resolved, depth + 1, max_depth)
-
+    resolved.update(get_dependency_resolver().resolve_maven({dependency: version}, max_depth=max_depth - depth))
     return resolved
 
 def generate_java_dependency_graph(pom_xml=None, build_gradle=None):
@@ -82,12 +80,7 @@ def generate_java_dependency_graph(pom_xml=None, build_gradle=None):
     if build_gradle:
         dependencies.update(parse_build_gradle(build_gradle))
     
-    resolved_dependencies = {}
-    for dep, version in dependencies.items():
-        resolved_dependencies[dep] = version
-        resolve_transitive_dependencies(dep, resolved_dependencies)
-
-    return resolved_dependencies
+    return get_dependency_resolver().resolve_maven(dependencies)
 
 def analyze_java_file(file_content):
     try:
@@ -162,4 +155,67 @@ def analyze_java_project(project_files):
             print(f"Warning: Could not analyze file {file_path}")
             project_info["files"].append({"path": file_path, "error": "Could not analyze file"})
     
-    return project_info
\ No newline at end of file
+    return project_info
+
+_JAVA_PREAMBLE_PREFIXES = ("@", "/*", "*", "//")
+
+
+def _declaration_start_line(lines, line_number):
+    """Move a declaration's start line up over any annotations and Javadoc directly above it."""
+    start = line_number
+    while start > 1 and lines[start - 2].strip().startswith(_JAVA_PREAMBLE_PREFIXES):
+        start -= 1
+    return start
+
+
+def chunk_java_file(file_content, max_chunk_chars=3000):
+    """Split a Java source file at type, constructor and method boundaries.
+
+    Returns a list of dicts with `content`, `start_line`, `end_line` and `symbol`. Adjacent small
+    declarations are merged up to `max_chunk_chars`; a single oversized declaration is returned as
+    one chunk for the caller to split further. Returns None if the file cannot be parsed.
+    """
+    try:
+        tree = javalang.parse.parse(file_content)
+    except (javalang.parser.JavaSyntaxError, javalang.tokenizer.LexerError) as e:
+        logger.debug(f"Could not parse Java file for chunking: {e}")
+        return None
+
+    lines = file_content.split('\n')
+    boundaries = {}
+    declaration_types = (
+        javalang.tree.TypeDeclaration,
+        javalang.tree.MethodDeclaration,
+        javalang.tree.ConstructorDeclaration,
+    )
+    for path, node in tree:
+        if isinstance(node, declaration_types) and node.position:
+            # Only split at members of top-level or nested types, not at local/anonymous classes in method bodies
+            if any(isinstance(parent, (javalang.tree.MethodDeclaration, javalang.tree.ConstructorDeclaration)) for parent in path):
+                continue
+            start = _declaration_start_line(lines, node.position.line)
+            boundaries.setdefault(start, node.name)
+
+    starts = sorted(start for start in boundaries if start > 1)
+    segments = []
+    previous = 1
+    for start in starts + [len(lines) + 1]:
+        if start > previous:
+            segments.append({
+                "start_line": previous,
+                "end_line": start - 1,
+                "symbol": boundaries.get(previous),
+                "content": '\n'.join(lines[previous - 1:start - 1]),
+            })
+        previous = start
+
+    chunks = []
+    for segment in segments:
+        if chunks and len(chunks[-1]["content"]) + len(segment["content"]) + 1 <= max_chunk_chars:
+            last = chunks[-1]
+            last["content"] = f"{last['content']}\n{segment['content']}"
+            last["end_line"] = segment["end_line"]
+            last["symbol"] = last["symbol"] or segment["symbol"]
+        else:
+            chunks.append(dict(segment))
+    return chunks
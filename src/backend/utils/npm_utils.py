@@ -1,7 +1,8 @@
 # npm_utils.py
 
 import subprocess
-import json
+
+from src.backend.utils.dependency_resolver import get_dependency_resolver
 
 def run_npm_command(command, cwd=None):
     try:
@@ -11,26 +12,29 @@ def run_npm_command(command, cwd=None):
         print(f"Error running npm command: {e}")
         return None
 
-def get_dependency_versions(package_json):
+def _all_dependencies(package_json):
     dependencies = package_json.get("dependencies", {})
     dev_dependencies = package_json.get("devDependencies", {})
-    all_dependencies = {**dependencies, **dev_dependencies}
-    
+    return {**dependencies, **dev_dependencies}
+
+def get_dependency_versions(package_json):
+    resolver = get_dependency_resolver()
+    resolved = resolver.map(lambda item: resolver.npm_dependencies(*item), _all_dependencies(package_json).items())
+
     versions = {}
-    for package, version_range in all_dependencies.items():
-        available_versions = run_npm_command(f"view {package} versions --json")
-        if available_versions:
-            available_versions = json.loads(available_versions)
-            max_version = max_satisfying(available_versions, version_range)
-            versions[package] = max_version
-    
+    for package, result in zip(_all_dependencies(package_json), resolved):
+        if result:
+            versions[package] = result[0]
     return versions
 
 def generate_dependency_graph(package_json):
-    versions = get_dependency_versions(package_json)
+    resolver = get_dependency_resolver()
+    all_dependencies = _all_dependencies(package_json)
+    # One cached registry lookup per package yields both the version list and each version's dependencies
+    resolved = resolver.map(lambda item: resolver.npm_dependencies(*item), all_dependencies.items())
+
     graph = {}
-    for package, version in versions.items():
-        dependencies = run_npm_command(f"view {package}@{version} dependencies --json")
-        if dependencies:
-            graph[package] = json.loads(dependencies)
-    return graph
\ No newline at end of file
+    for package, result in zip(all_dependencies, resolved):
+        if result:
+            graph[package] = result[1]
+    return graph
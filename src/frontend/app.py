@@ -9,7 +9,7 @@ from views.analytics_page import render_analytics_page
 from views.settings_page import render_settings_page
 from components.sidebar_manager import render_sidebar
 from utils.helpers import setup_logging, get_client_name
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_STATIC, get_backend_client
 import datetime
 import requests
 
@@ -24,7 +24,7 @@ def load_org_config():
     """
     client_name = get_client_name()
     try:
-        response = requests.get(f"{BACKEND_URL}/api/v1/organizations/public-config/{client_name}")
+        response = get_backend_client().get(f"/api/v1/organizations/public-config/{client_name}", ttl=TTL_STATIC, auth=False)
         response.raise_for_status()
         # Parse the TOML content
         config = toml.loads(response.text)
@@ -1,7 +1,6 @@
 import streamlit as st
-import requests
 import pandas as pd
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_FAST, get_backend_client
 from utils.helpers import handle_response
 from utils.file_processor import process_file
 from utils.helpers import send_event
@@ -77,10 +76,10 @@ def search_documents():
     search_query = st.text_input("Enter search query", key="kb_search_query")
     if st.button("Search", key="kb_search_button"):
         with st.spinner("Searching..."):
-            response = requests.post(
-                f"{BACKEND_URL}/api/v1/knowledge-base/search",
+            response = get_backend_client().post(
+                "/api/v1/knowledge-base/search",
                 json={"query": search_query},
-                headers={"Authorization": f"Bearer {st.session_state.token}"}
+                invalidate=False
             )
             if handle_response(response):
                 results = response.json()
@@ -137,10 +136,9 @@ def manage_documents():
 def upload_file(uploaded_file):
     with st.spinner(f"Uploading file: {uploaded_file.name}..."):
         files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/knowledge-base/upload-file",
-            files=files,
-            headers={"Authorization": f"Bearer {st.session_state.token}"}
+        response = get_backend_client().post(
+            "/api/v1/knowledge-base/upload-file",
+            files=files
         )
         handle_response(response, success_message=f"File {uploaded_file.name} uploaded successfully!")
         if response.status_code == 200:
@@ -149,10 +147,9 @@ def upload_file(uploaded_file):
 def add_url(input_url):
     if input_url:
         with st.spinner("Processing URL..."):
-            response = requests.post(
-                f"{BACKEND_URL}/api/v1/knowledge-base/add-url",
-                params={"url": input_url},
-                headers={"Authorization": f"Bearer {st.session_state.token}"}
+            response = get_backend_client().post(
+                "/api/v1/knowledge-base/add-url",
+                params={"url": input_url}
             )
             if handle_response(response, success_message=f"Successfully added URL: {input_url}"):
                 if "processed_files" not in st.session_state:
@@ -161,10 +158,9 @@ def add_url(input_url):
                 st.session_state.documents = fetch_documents()
 
 def clear_knowledge_base(assistant_id):
-    response = requests.post(
-        f"{BACKEND_URL}/api/v1/knowledge-base/clear-knowledge-base",
-        json={"assistant_id": assistant_id},
-        headers={"Authorization": f"Bearer {st.session_state.token}"}
+    response = get_backend_client().post(
+        "/api/v1/knowledge-base/clear-knowledge-base",
+        json={"assistant_id": assistant_id}
     )
     if response.status_code == 200:
         st.session_state["processed_files"] = []
@@ -174,18 +170,17 @@ def clear_knowledge_base(assistant_id):
         st.error(f"Failed to clear knowledge base: {response.text}")
 
 def fetch_documents():
-    response = requests.get(
-        f"{BACKEND_URL}/api/v1/knowledge-base/documents",
-        headers={"Authorization": f"Bearer {st.session_state.token}"}
+    response = get_backend_client().get(
+        "/api/v1/knowledge-base/documents",
+        ttl=TTL_FAST
     )
     if handle_response(response):
         return response.json()
     return []
 
 def delete_document(document_name):
-    response = requests.delete(
-        f"{BACKEND_URL}/api/v1/knowledge-base/documents/{document_name}",
-        headers={"Authorization": f"Bearer {st.session_state.token}"}
+    response = get_backend_client().delete(
+        f"/api/v1/knowledge-base/documents/{document_name}"
     )
     return handle_response(response)
 
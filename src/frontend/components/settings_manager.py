@@ -1,20 +1,18 @@
 import streamlit as st
 import pandas as pd
-import requests
 import json
 from datetime import datetime, timedelta
 from io import BytesIO
 from PIL import Image
 from src.frontend.utils.api_helpers import update_azure_devops_schema
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_FAST, TTL_STATIC, get_backend_client
 from utils.helpers import handle_response
 from src.frontend.utils.helpers import restart_assistant
 from utils.helpers import send_event
 
 def render_org_management():
     st.header("Organization Management")
-    response = requests.get(f"{BACKEND_URL}/api/v1/organizations", 
-                            headers={"Authorization": f"Bearer {st.session_state.token}"})
+    response = get_backend_client().get("/api/v1/organizations", ttl=TTL_FAST)
     if response.status_code == 200:
         organizations = response.json()
 
@@ -130,8 +128,7 @@ def create_or_edit_organization(org=None):
         st.rerun()
 
 def display_current_asset(org_id, asset_type, display_name):
-    response = requests.get(f"{BACKEND_URL}/api/v1/organizations/asset/{org_id}/{asset_type}", 
-                            headers={"Authorization": f"Bearer {st.session_state.token}"})
+    response = get_backend_client().get(f"/api/v1/organizations/asset/{org_id}/{asset_type}", ttl=TTL_STATIC)
     if response.status_code == 200:
         if asset_type in ["chat_system_icon", "chat_user_icon", "main_image"]:
             image = Image.open(BytesIO(response.content))
@@ -190,20 +187,18 @@ def update_or_create_organization(is_editing, org_id, name, json_data, new_files
 
     with st.spinner("Processing..."):
         if is_editing:
-            response = requests.put(
-                f"{BACKEND_URL}/api/v1/organizations/{org_id}",
+            response = get_backend_client().put(
+                f"/api/v1/organizations/{org_id}",
                 data=data,
-                files=new_files,
-                headers={"Authorization": f"Bearer {st.session_state.token}"}
+                files=new_files
             )
             success_message = "Organization updated successfully"
             error_message = "Failed to update organization"
         else:
-            response = requests.post(
-                f"{BACKEND_URL}/api/v1/organizations",
+            response = get_backend_client().post(
+                "/api/v1/organizations",
                 data=data,
-                files=new_files,
-                headers={"Authorization": f"Bearer {st.session_state.token}"}
+                files=new_files
             )
             success_message = "New organization created successfully"
             error_message = "Failed to create new organization"
@@ -217,8 +212,7 @@ def update_or_create_organization(is_editing, org_id, name, json_data, new_files
         st.error(f"{error_message}: {response.text}")
 
 def get_azure_devops_config(org_id):
-    response = requests.get(f"{BACKEND_URL}/api/v1/organizations/azure-devops-config/{org_id}", 
-                            headers={"Authorization": f"Bearer {st.session_state.token}"})
+    response = get_backend_client().get(f"/api/v1/organizations/azure-devops-config/{org_id}", ttl=TTL_FAST)
     
     if response.status_code == 200:
         return response.json()
@@ -231,9 +225,8 @@ def get_azure_devops_config(org_id):
 
 def delete_organization(org_id):
     if st.button(f"Confirm deletion of Organization (ID: {org_id})"):
-        delete_response = requests.delete(
-            f"{BACKEND_URL}/api/v1/organizations/{org_id}",
-            headers={"Authorization": f"Bearer {st.session_state.token}"}
+        delete_response = get_backend_client().delete(
+            f"/api/v1/organizations/{org_id}"
         )
         if delete_response.status_code == 200:
             st.success(f"Organization (ID: {org_id}) deleted successfully")
@@ -242,8 +235,7 @@ def delete_organization(org_id):
 
 def render_user_management():
     st.header("User Management")
-    response = requests.get(f"{BACKEND_URL}/api/v1/users", 
-                            headers={"Authorization": f"Bearer {st.session_state.token}"})
+    response = get_backend_client().get("/api/v1/users", ttl=TTL_FAST)
     if response.status_code == 200:
         users = response.json()
         user_data = [
@@ -309,10 +301,9 @@ def render_user_management():
         st.error("Failed to fetch users")
 
 def update_user_role(user_id, new_role):
-    update_response = requests.put(
-        f"{BACKEND_URL}/api/v1/users/{user_id}/role",
-        json={"role": new_role},
-        headers={"Authorization": f"Bearer {st.session_state.token}"}
+    update_response = get_backend_client().put(
+        f"/api/v1/users/{user_id}/role",
+        json={"role": new_role}
     )
     if update_response.status_code == 200:
         st.success(f"Role updated to {new_role}")
@@ -320,10 +311,9 @@ def update_user_role(user_id, new_role):
         st.error(f"Failed to update role")
 
 def extend_user_trial(user_id, days):
-    extend_response = requests.post(
-        f"{BACKEND_URL}/api/v1/users/{user_id}/extend-trial",
-        json={"days": days},
-        headers={"Authorization": f"Bearer {st.session_state.token}"}
+    extend_response = get_backend_client().post(
+        f"/api/v1/users/{user_id}/extend-trial",
+        json={"days": days}
     )
     if extend_response.status_code == 200:
         st.success(f"Trial extended by {days} days")
@@ -331,9 +321,8 @@ def extend_user_trial(user_id, days):
         st.error(f"Failed to extend trial")
 
 def delete_user(user_id):
-    delete_response = requests.delete(
-        f"{BACKEND_URL}/api/v1/users/{user_id}",
-        headers={"Authorization": f"Bearer {st.session_state.token}"}
+    delete_response = get_backend_client().delete(
+        f"/api/v1/users/{user_id}"
     )
     if delete_response.status_code == 200:
         st.success(f"User deleted successfully")
@@ -352,10 +341,9 @@ def create_new_user(email, password, first_name, last_name, nickname, role, org)
             "organization": org,
             "trial_end": (datetime.now() + timedelta(days=7)).isoformat() if role == 'trial' else None
         }
-        create_response = requests.post(
-            f"{BACKEND_URL}/api/v1/users", 
-            json=create_data,
-            headers={"Authorization": f"Bearer {st.session_state.token}"}
+        create_response = get_backend_client().post(
+            "/api/v1/users",
+            json=create_data
         )
         if create_response.status_code == 200:
             st.success("New user created successfully")
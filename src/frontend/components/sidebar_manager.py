@@ -1,9 +1,8 @@
 import streamlit as st
-import requests
 import json
 import asyncio
 from sseclient import SSEClient
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_SLOW, get_backend_client
 from utils.helpers import restart_assistant
 from utils.helpers import send_event
 from config.settings import ENABLED_ASSISTANTS
@@ -47,11 +46,12 @@ def initialize_session_state(user_role):
         }
         
         if 'assistant_id' not in st.session_state:
-            response = requests.get(f"{BACKEND_URL}/api/v1/assistant/get-assistant", 
-                                    params={"user_id": st.session_state.user_id,
-                                            "org_id": st.session_state.org_id,
-                                            "user_role": user_role,
-                                            "user_nickname": st.session_state.nickname})
+            response = get_backend_client().get("/api/v1/assistant/get-assistant",
+                                                ttl=TTL_SLOW,
+                                                params={"user_id": st.session_state.user_id,
+                                                        "org_id": st.session_state.org_id,
+                                                        "user_role": user_role,
+                                                        "user_nickname": st.session_state.nickname})
             if response.status_code == 200:
                 st.session_state.assistant_id = response.json()["assistant_id"]
                 st.sidebar.write(f"Debug: New Assistant ID = {st.session_state.assistant_id}")  # Debug line
@@ -134,8 +134,8 @@ def process_project(project_type, project_name, project_files):
             return
 
         with st.spinner('Processing project...'):
-            response = requests.post(
-                f"{BACKEND_URL}/api/v1/assistant/load-project-stream",
+            response = get_backend_client().post(
+                "/api/v1/assistant/load-project-stream",
                 json={
                     "assistant_id": assistant_id,
                     "project_name": project_name,
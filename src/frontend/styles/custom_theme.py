@@ -1,7 +1,7 @@
 import streamlit as st
 import requests
 import toml
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_STATIC, get_backend_client
 from utils.helpers import get_client_name
 
 def load_theme_config():
@@ -11,7 +11,7 @@ def load_theme_config():
     """
     client_name = get_client_name()
     try:
-        response = requests.get(f"{BACKEND_URL}/api/v1/organizations/public-config/{client_name}")
+        response = get_backend_client().get(f"/api/v1/organizations/public-config/{client_name}", ttl=TTL_STATIC, auth=False)
         response.raise_for_status()
         config_content = response.text
         theme_config = toml.loads(config_content)
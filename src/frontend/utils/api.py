@@ -1,45 +1,40 @@
-import os
 import requests
 import streamlit as st
-from dotenv import load_dotenv
+from utils.backend_client import BACKEND_URL, TTL_FAST, TTL_SLOW, get_backend_client
 
-# Load environment variables
-load_dotenv()
-
-# Backend URL
-BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
-
-def fetch_data(endpoint):
+def fetch_data(endpoint, ttl=TTL_FAST):
     """
     Fetch data from the specified API endpoint.
 
     Args:
     endpoint (str): The API endpoint to fetch data from.
+    ttl (float): Seconds the response may be served from the session cache, 0 to always fetch.
 
     Returns:
     dict or None: The JSON response from the API if successful, None otherwise.
     """
     try:
-        response = requests.get(f"{BACKEND_URL}{endpoint}", headers=get_auth_header())
+        response = get_backend_client().get(endpoint, ttl=ttl, headers=get_auth_header())
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
         st.error(f"Failed to fetch data from {endpoint}: {str(e)}")
         return None
 
-def post_data(endpoint, data):
+def post_data(endpoint, data, invalidate=True):
     """
     Post data to the specified API endpoint.
 
     Args:
     endpoint (str): The API endpoint to post data to.
     data (dict): The data to be posted.
+    invalidate (bool): Whether the post changes data, dropping the cached reads of its resource.
 
     Returns:
     dict or None: The JSON response from the API if successful, None otherwise.
     """
     try:
-        response = requests.post(f"{BACKEND_URL}{endpoint}", json=data, headers=get_auth_header())
+        response = get_backend_client().post(endpoint, json=data, headers=get_auth_header(), invalidate=invalidate)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -58,7 +53,7 @@ def put_data(endpoint, data):
     dict or None: The JSON response from the API if successful, None otherwise.
     """
     try:
-        response = requests.put(f"{BACKEND_URL}{endpoint}", json=data, headers=get_auth_header())
+        response = get_backend_client().put(endpoint, json=data, headers=get_auth_header())
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -76,7 +71,7 @@ def delete_data(endpoint):
     bool: True if deletion was successful, False otherwise.
     """
     try:
-        response = requests.delete(f"{BACKEND_URL}{endpoint}", headers=get_auth_header())
+        response = get_backend_client().delete(endpoint, headers=get_auth_header())
         response.raise_for_status()
         return True
     except requests.RequestException as e:
@@ -106,7 +101,7 @@ def fetch_organization_config(org_id):
     Returns:
     dict or None: The organization configuration if successful, None otherwise.
     """
-    return fetch_data(f"/api/v1/organizations/{org_id}/config")
+    return fetch_data(f"/api/v1/organizations/{org_id}/config", ttl=TTL_SLOW)
 
 def fetch_user_info(user_id):
     """
@@ -118,7 +113,7 @@ def fetch_user_info(user_id):
     Returns:
     dict or None: The user information if successful, None otherwise.
     """
-    return fetch_data(f"/api/v1/users/{user_id}")
+    return fetch_data(f"/api/v1/users/{user_id}", ttl=TTL_SLOW)
 
 def update_user_info(user_id, user_data):
     """
@@ -134,7 +129,7 @@ def update_user_info(user_id, user_data):
     return put_data(f"/api/v1/users/{user_id}", user_data)
 
 def fetch_all_analytics():
-    return fetch_data("/api/v1/analytics/all-analytics")
+    return fetch_data("/api/v1/analytics/all-analytics", ttl=TTL_SLOW)
 
 def fetch_analytics_data(start_date, end_date):
     """
@@ -147,7 +142,7 @@ def fetch_analytics_data(start_date, end_date):
     Returns:
     dict or None: The analytics data if successful, None otherwise.
     """
-    return fetch_data(f"/api/v1/analytics?start_date={start_date}&end_date={end_date}")
+    return fetch_data(f"/api/v1/analytics?start_date={start_date}&end_date={end_date}", ttl=TTL_SLOW)
 
 def send_chat_message(assistant_id, message):
     """
@@ -174,8 +169,8 @@ def upload_document(file):
     """
     try:
         files = {"file": (file.name, file.getvalue(), file.type)}
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/knowledge-base/upload-file",
+        response = get_backend_client().post(
+            "/api/v1/knowledge-base/upload-file",
             files=files,
             headers=get_auth_header()
         )
@@ -195,7 +190,7 @@ def search_knowledge_base(query):
     Returns:
     list or None: The search results if successful, None otherwise.
     """
-    return post_data("/api/v1/knowledge-base/search", {"query": query})
+    return post_data("/api/v1/knowledge-base/search", {"query": query}, invalidate=False)
 
 def fetch_model_performance(model_id):
     """
@@ -1,53 +1,22 @@
 # src/frontend/utils/api_helpers.py
 import logging
 import json
-from fastapi import logger
 import streamlit as st
 import requests
 from typing import Any, Dict, Iterator, List
-from utils.api import BACKEND_URL, get_auth_header
+from utils.api import get_auth_header
+from utils.backend_client import TTL_FAST, TTL_SLOW, get_backend_client
 import sys
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', stream=sys.stdout)
 logger = logging.getLogger(__name__)
 
 
-def send_business_analysis_query(message: str, analysis_results: Dict[str, Any], org_id: int) -> Iterator[str]:
-    try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/agile-team/business-analysis/chat",
-            json={
-                "query": message,
-                "context": analysis_results,
-                "org_id": org_id
-            },
-            headers=get_auth_header(),
-            stream=True
-        )
-        response.raise_for_status()
-        return handle_streaming_response(response)
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error in business analysis query: {str(e)}")
-        yield f"An error occurred: {str(e)}"
-
-def handle_streaming_response(response: requests.Response) -> Iterator[str]:
-    for line in response.iter_lines():
-        if line:
-            try:
-                json_response = json.loads(line)
-                if "response" in json_response:
-                    yield json_response["response"]
-                elif "error" in json_response:
-                    logger.error(f"Error in response: {json_response['error']}")
-                    yield f"Error: {json_response['error']}"
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse JSON, yielding raw line: {line.decode('utf-8')}")
-                yield line.decode('utf-8')
-                
 def get_user_info(user_id: int) -> dict:
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/users/{user_id}",
+        response = get_backend_client().get(
+            f"/api/v1/users/{user_id}",
+            ttl=TTL_SLOW,
             headers=get_auth_header()
         )
         response.raise_for_status()
@@ -58,10 +27,10 @@ def get_user_info(user_id: int) -> dict:
 
 def get_user_projects(org_id):
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/project-management/projects",
-            params={"org_id": org_id},
-            headers={"Authorization": f"Bearer {st.session_state.get('token')}"}
+        response = get_backend_client().get(
+            "/api/v1/project-management/projects",
+            ttl=TTL_SLOW,
+            params={"org_id": org_id}
         )
         response.raise_for_status()
         return response.json()
@@ -72,10 +41,10 @@ def get_user_projects(org_id):
 
 def get_project_teams(org_id, project_id):
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/project-management/teams",
-            params={"org_id": org_id, "project_id": project_id},
-            headers={"Authorization": f"Bearer {st.session_state.get('token')}"}
+        response = get_backend_client().get(
+            "/api/v1/project-management/teams",
+            ttl=TTL_SLOW,
+            params={"org_id": org_id, "project_id": project_id}
         )
         response.raise_for_status()
         return response.json()
@@ -87,28 +56,12 @@ def get_project_teams(org_id, project_id):
 def send_chat_message(message: str, assistant_id: int) -> Iterator[str]:
     logger.info(f"Sending chat message: message={message}, assistant_id={assistant_id}")
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/chat",
+        yield from get_backend_client().stream_responses(
+            "POST",
+            "/api/v1/chat",
             json={"message": message, "assistant_id": assistant_id},
-            headers=get_auth_header(),
-            stream=True
+            headers=get_auth_header()
         )
-        response.raise_for_status()
-        logger.info("Chat message sent successfully")
-        
-        for line in response.iter_lines():
-            if line:
-                try:
-                    json_response = json.loads(line)
-                    if "response" in json_response:
-                        yield json_response["response"]
-                    elif "error" in json_response:
-                        logger.error(f"Error in response: {json_response['error']}")
-                        yield f"Error: {json_response['error']}"
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON, yielding raw line: {line.decode('utf-8')}")
-                    yield line.decode('utf-8')
-        
         logger.info("Chat response completed")
     except requests.exceptions.RequestException as e:
         logger.error(f"Error in chat message: {str(e)}", exc_info=True)
@@ -116,8 +69,8 @@ def send_chat_message(message: str, assistant_id: int) -> Iterator[str]:
 
 def query_knowledge_base(query: str) -> List[Dict[str, Any]]:
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/confluence/query",
+        response = get_backend_client().get(
+            "/api/v1/confluence/query",
             params={"query": query},
             headers=get_auth_header()
         )
@@ -130,28 +83,13 @@ def query_knowledge_base(query: str) -> List[Dict[str, Any]]:
 def send_project_management_query(prompt: str, project_id: str, team_id: str, org_id: int) -> Iterator[str]:
     logger.info(f"Sending project management query: prompt={prompt}, project_id={project_id}, team_id={team_id}, org_id={org_id}")
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/project-management/chat",
+        yield from get_backend_client().stream_responses(
+            "POST",
+            "/api/v1/project-management/chat",
             json={"message": prompt, "project": project_id, "team": team_id, "org_id": org_id},
             headers=get_auth_header(),
-            stream=True
+            invalidate=False
         )
-        response.raise_for_status()
-        logger.info("Project management query sent successfully")
-        
-        for line in response.iter_lines():
-            if line:
-                try:
-                    json_response = json.loads(line)
-                    if "response" in json_response:
-                        yield json_response["response"]
-                    elif "error" in json_response:
-                        logger.error(f"Error in response: {json_response['error']}")
-                        yield f"Error: {json_response['error']}"
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON, yielding raw line: {line.decode('utf-8')}")
-                    yield line.decode('utf-8')
-        
         logger.info("Project management response completed")
     except requests.exceptions.RequestException as e:
         logger.error(f"Error in project management query: {str(e)}", exc_info=True)
@@ -159,8 +97,10 @@ def send_project_management_query(prompt: str, project_id: str, team_id: str, or
                 
 def get_chat_history(assistant_id: int) -> list:
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/chat/chat_history",
+        # Cached until the next chat message, which drops every cached /api/v1/chat read
+        response = get_backend_client().get(
+            "/api/v1/chat/chat_history",
+            ttl=TTL_FAST,
             params={"assistant_id": assistant_id},
             headers=get_auth_header()
         )
@@ -175,8 +115,8 @@ def get_chat_history(assistant_id: int) -> list:
 
 def submit_feedback(feedback_data: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/feedback/submit-feedback",
+        response = get_backend_client().post(
+            "/api/v1/feedback/submit-feedback",
             json=feedback_data,
             headers=get_auth_header()
         )
@@ -188,8 +128,8 @@ def submit_feedback(feedback_data: Dict[str, Any]) -> Dict[str, Any]:
         
 def update_azure_devops_schema():
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/project-management/update-azure-devops-schema",
+        response = get_backend_client().post(
+            "/api/v1/project-management/update-azure-devops-schema",
             headers=get_auth_header()
         )
         response.raise_for_status()
@@ -199,15 +139,15 @@ def update_azure_devops_schema():
         raise        
     
 def get_assistant_id(user_id, org_id, user_role, user_nickname):
-    response = requests.get(
-        f"{BACKEND_URL}/api/v1/assistant/get-assistant",
+    response = get_backend_client().get(
+        "/api/v1/assistant/get-assistant",
+        ttl=TTL_SLOW,
         params={
             "user_id": user_id,
             "org_id": org_id,
             "user_role": user_role,
             "user_nickname": user_nickname
-        },
-        headers={"Authorization": f"Bearer {st.session_state.get('token')}"}
+        }
     )
     if response.status_code == 200:
         return response.json()["assistant_id"]
@@ -216,8 +156,9 @@ def get_assistant_id(user_id, org_id, user_role, user_nickname):
     
 def get_confluence_spaces(org_id: int) -> List[Dict[str, Any]]:
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/agile-team/confluence/spaces",
+        response = get_backend_client().get(
+            "/api/v1/agile-team/confluence/spaces",
+            ttl=TTL_SLOW,
             params={"org_id": org_id},
             headers=get_auth_header()
         )
@@ -229,8 +170,8 @@ def get_confluence_spaces(org_id: int) -> List[Dict[str, Any]]:
 
 def sync_confluence_pages(org_id: int, space_key: str, page_ids: List[str]) -> Dict[str, Any]:
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/agile-team/confluence/sync",
+        response = get_backend_client().post(
+            "/api/v1/agile-team/confluence/sync",
             json={"space_key": space_key, "page_ids": page_ids},
             params={"org_id": org_id},
             headers=get_auth_header()
@@ -243,8 +184,8 @@ def sync_confluence_pages(org_id: int, space_key: str, page_ids: List[str]) -> D
     
 def sync_confluence_space(org_id: int, space_key: str) -> Dict[str, Any]:
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/agile-team/confluence/sync",
+        response = get_backend_client().post(
+            "/api/v1/agile-team/confluence/sync",
             json={"space_key": space_key, "page_ids": []},  # Add empty page_ids list
             params={"org_id": org_id},  # Move org_id to query parameters
             headers=get_auth_header()
@@ -257,8 +198,9 @@ def sync_confluence_space(org_id: int, space_key: str) -> Dict[str, Any]:
 
 def get_confluence_pages(org_id: int, space_key: str) -> List[Dict[str, Any]]:
     try:
-        response = requests.get(
-            f"{BACKEND_URL}/api/v1/agile-team/confluence/pages/{space_key}",
+        response = get_backend_client().get(
+            f"/api/v1/agile-team/confluence/pages/{space_key}",
+            ttl=TTL_SLOW,
             params={"org_id": org_id},
             headers=get_auth_header()
         )
@@ -271,24 +213,18 @@ def get_confluence_pages(org_id: int, space_key: str) -> List[Dict[str, Any]]:
 def generate_development_artifacts(org_id: int) -> Iterator[str]:
     logger.info(f"Generating development artifacts for org_id: {org_id}")
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/agile-team/confluence/generate_business_analysis",
+        lines = get_backend_client().stream_lines(
+            "POST",
+            "/api/v1/agile-team/confluence/generate_business_analysis",
             json={"org_id": org_id, "task": "Perform business analysis"},
-            headers=get_auth_header(),
-            stream=True
+            headers=get_auth_header()
         )
-        response.raise_for_status()
-        logger.info("Development artifacts generation request sent successfully")
-        
-        for line in response.iter_lines():
-            if line:
-                logger.info(f"Received line from backend: {line}")
-                try:
-                    yield line.decode('utf-8')
-                except UnicodeDecodeError:
-                    logger.error(f"Failed to decode line: {line}")
-            else:
-                logger.warning("Received empty line from backend")
+        for line in lines:
+            logger.info(f"Received line from backend: {line}")
+            try:
+                yield line.decode('utf-8')
+            except UnicodeDecodeError:
+                logger.error(f"Failed to decode line: {line}")
         
         logger.info("Finished processing backend response")
     except requests.exceptions.RequestException as e:
@@ -297,29 +233,17 @@ def generate_development_artifacts(org_id: int) -> Iterator[str]:
             
 def send_business_analysis_query(message: str, context: Dict[str, Any], org_id: int) -> Iterator[str]:
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/agile-team/business-analysis/chat",
+        yield from get_backend_client().stream_responses(
+            "POST",
+            "/api/v1/agile-team/business-analysis/chat",
             json={
                 "query": message,
                 "context": context,
                 "org_id": org_id
             },
             headers=get_auth_header(),
-            stream=True
+            invalidate=False
         )
-        response.raise_for_status()
-        for line in response.iter_lines():
-            if line:
-                try:
-                    json_response = json.loads(line)
-                    if "response" in json_response:
-                        yield json_response["response"]
-                    elif "error" in json_response:
-                        logger.error(f"Error in response: {json_response['error']}")
-                        yield f"Error: {json_response['error']}"
-                except json.JSONDecodeError:
-                    logger.warning(f"Failed to parse JSON, yielding raw line: {line.decode('utf-8')}")
-                    yield line.decode('utf-8')
     except requests.exceptions.RequestException as e:
         logger.error(f"Error in business analysis query: {str(e)}")
         yield f"An error occurred: {str(e)}"
\ No newline at end of file
@@ -6,7 +6,8 @@ from PIL import Image
 from io import BytesIO
 
 import toml
-from utils.api import BACKEND_URL, get_auth_header
+from utils.api import get_auth_header
+from utils.backend_client import TTL_SLOW, TTL_STATIC, get_backend_client
 from utils.helpers import get_client_name, validate_email, validate_password
 from utils.api_helpers import get_user_info
 
@@ -14,7 +15,7 @@ client_name = get_client_name()
 
 def get_org_public_config(org_name):
     try:
-        response = requests.get(f"{BACKEND_URL}/api/v1/organizations/public-config/{org_name}")
+        response = get_backend_client().get(f"/api/v1/organizations/public-config/{org_name}", ttl=TTL_STATIC, auth=False)
         if response.status_code == 200:
             content = response.text
             try:
@@ -43,7 +44,9 @@ def get_user_role():
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_main_image(org_name):
     try:
-        response = requests.get(f"{BACKEND_URL}/api/v1/organizations/asset/{org_name}/login-form/main_image")
+        response = get_backend_client().get(
+            f"/api/v1/organizations/asset/{org_name}/login-form/main_image", ttl=TTL_STATIC, auth=False
+        )
         if response.status_code == 200:
             return Image.open(BytesIO(response.content))
         else:
@@ -80,8 +83,9 @@ def register_form(org_config):
             st.error("Please enter a valid email and a strong password.")
 
 def register(email, password, first_name, last_name, nickname, role):
-    response = requests.post(
-        f"{BACKEND_URL}/api/v1/auth/register",
+    response = get_backend_client().post(
+        "/api/v1/auth/register",
+        auth=False,
         json={
             "email": email,
             "password": password,
@@ -106,15 +110,16 @@ def reset_password_form():
             st.error("Please enter a valid email address.")
 
 def reset_password(email):
-    response = requests.post(f"{BACKEND_URL}/api/request-password-reset", json={"email": email})
+    response = get_backend_client().post("/api/request-password-reset", json={"email": email}, auth=False)
     if response.status_code == 200:
         st.success("If a user with that email exists, a password reset link has been sent.")
     else:
         st.error("Failed to send reset link. Please try again.")
 
 def initialize_assistant():
-    assistant_response = requests.get(
-        f"{BACKEND_URL}/api/v1/assistant/get-assistant",
+    assistant_response = get_backend_client().get(
+        "/api/v1/assistant/get-assistant",
+        ttl=TTL_SLOW,
         params={
             "user_id": st.session_state.user_id,
             "org_id": st.session_state.org_id,
@@ -129,7 +134,7 @@ def initialize_assistant():
         st.warning("Failed to initialize assistant. Some features may be limited.")
 
 def verify_email(token):
-    response = requests.get(f"{BACKEND_URL}/api/verify-email/{token}")
+    response = get_backend_client().get(f"/api/verify-email/{token}", auth=False)
     if response.status_code == 200:
         st.success("Email verified successfully")
         st.info("You can now log in to your account")
@@ -140,7 +145,7 @@ def is_authenticated():
     if 'auth_status' not in st.session_state or (time.time() - st.session_state.get('auth_check_time', 0) > 300):  # Check every 5 minutes
         if 'token' in st.session_state:
             try:
-                response = requests.get(f"{BACKEND_URL}/api/v1/auth/is_authenticated", headers=get_auth_header())
+                response = get_backend_client().get("/api/v1/auth/is_authenticated", headers=get_auth_header())
                 st.session_state.auth_status = response.status_code == 200 and response.json().get('authenticated', False)
                 st.session_state.auth_check_time = time.time()
             except requests.RequestException as e:
@@ -152,8 +157,9 @@ def is_authenticated():
 
 def login(email, password):
     try:
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/auth/login", 
+        response = get_backend_client().post(
+            "/api/v1/auth/login",
+            auth=False,
             data={"username": email, "password": password}
         )
         if response.status_code == 200:
@@ -180,7 +186,7 @@ def login(email, password):
 def logout():
     try:
         if 'token' in st.session_state:
-            requests.post(f"{BACKEND_URL}/api/v1/auth/logout", headers=get_auth_header())
+            get_backend_client().post("/api/v1/auth/logout", headers=get_auth_header())
     except requests.RequestException as e:
         st.warning(f"An error occurred during logout: {str(e)}")
     finally:
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import requests
+import streamlit as st
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+
+# Seconds idempotent reads stay cached, by how often the data changes
+TTL_STATIC = 3600  # Org public config and assets
+TTL_SLOW = 300  # Assistant ids, user info, projects, analytics
+TTL_FAST = 60  # Document lists, chat history, admin lists
+
+
+class BackendClient:
+    """Data access to the backend for one Streamlit user session.
+
+    All calls go through one requests.Session, so connections are kept alive and pooled instead of opening a
+    new one per call on every rerun. GETs made with a ttl are cached per token for that many seconds. A write
+    (POST, PUT, DELETE) drops the cached reads of the resource it targets, e.g. an upload to
+    /api/v1/knowledge-base/... drops the cached /api/v1/knowledge-base/documents, unless the caller passes
+    invalidate=False for writes that are really reads (search, chat) or do not change what is cached (events).
+    """
+
+    def __init__(self, base_url: str = BACKEND_URL, pool_size: int = 10, timeout: float = 60):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Retries only idempotent requests that failed to connect or hit a restarting backend
+        retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # (path, params, token) -> (expires_at, response)
+        self.cache: Dict[Tuple[str, str, Optional[str]], Tuple[float, requests.Response]] = {}
+        self.lock = threading.Lock()
+        # Backend calls made, and reads served from the cache
+        self.calls: Counter = Counter()
+        self.num_cached: int = 0
+
+    @staticmethod
+    def resource(path: str) -> str:
+        """/api/v1/<resource>, the scope a write invalidates"""
+        return "/".join(path.split("?")[0].split("/")[:4])
+
+    def _token(self) -> Optional[str]:
+        try:
+            return st.session_state.get("token")
+        except Exception:
+            return None
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drops the cached reads of the resource of path, or every cached read"""
+        with self.lock:
+            if path is None:
+                self.cache.clear()
+                return
+            prefix = self.resource(path)
+            for key in [key for key in self.cache if key[0].startswith(prefix)]:
+                del self.cache[key]
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        ttl: float = 0,
+        invalidate: bool = True,
+        auth: bool = True,
+        **kwargs,
+    ) -> requests.Response:
+        """Sends a request to the backend and returns the response, which may come from the cache for GETs"""
+        method = method.upper()
+        token = self._token() if auth else None
+        headers = dict(kwargs.pop("headers", None) or {})
+        if token:
+            headers.setdefault("Authorization", f"Bearer {token}")
+        kwargs.setdefault("timeout", None if kwargs.get("stream") else self.timeout)
+
+        key = None
+        if method == "GET" and ttl > 0 and not kwargs.get("stream"):
+            key = (path, json.dumps(kwargs.get("params"), sort_keys=True, default=str), token)
+            with self.lock:
+                cached = self.cache.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    self.num_cached += 1
+                    return cached[1]
+
+        with self.lock:
+            self.calls[f"{method} {path}"] += 1
+        response = self.session.request(method, f"{self.base_url}{path}", headers=headers, **kwargs)
+
+        if key is not None and response.status_code == 200:
+            with self.lock:
+                self.cache[key] = (time.monotonic() + ttl, response)
+        elif method != "GET" and invalidate and response.status_code < 400:
+            self.invalidate(path)
+        return response
+
+    def get(self, path: str, ttl: float = 0, **kwargs) -> requests.Response:
+        return self.request("GET", path, ttl=ttl, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def stream_lines(self, method: str, path: str, invalidate: bool = True, **kwargs) -> Iterator[bytes]:
+        """Yields each non-empty line of a streamed response as soon as it arrives"""
+        with self.request(method, path, stream=True, invalidate=False, **kwargs) as response:
+            response.raise_for_status()
+            # chunk_size=None hands over data as it is received instead of waiting for 512 byte chunks
+            for line in response.iter_lines(chunk_size=None):
+                if line:
+                    yield line
+        # The backend writes while it streams, so reads cached meanwhile are stale too
+        if invalidate and method.upper() != "GET":
+            self.invalidate(path)
+
+    def stream_responses(self, method: str, path: str, **kwargs) -> Iterator[str]:
+        """Yields the "response" of each JSON line of a streamed chat response, as soon as it arrives"""
+        for line in self.stream_lines(method, path, **kwargs):
+            try:
+                json_response = json.loads(line)
+                if "response" in json_response:
+                    yield json_response["response"]
+                elif "error" in json_response:
+                    logger.error(f"Error in response: {json_response['error']}")
+                    yield f"Error: {json_response['error']}"
+            except json.JSONDecodeError:
+                logger.warning(f"Failed to parse JSON, yielding raw line: {line.decode('utf-8')}")
+                yield line.decode('utf-8')
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"calls": sum(self.calls.values()), "cached": self.num_cached, "by_endpoint": dict(self.calls)}
+
+
+_fallback_client: Optional[BackendClient] = None
+
+
+def get_backend_client() -> BackendClient:
+    """The client of the current user session; logging out clears the session state and with it the cache"""
+    global _fallback_client
+    try:
+        if "backend_client" not in st.session_state:
+            st.session_state["backend_client"] = BackendClient()
+        return st.session_state["backend_client"]
+    except Exception:
+        # Outside a script run, e.g. in a background thread
+        if _fallback_client is None:
+            _fallback_client = BackendClient()
+        return _fallback_client
+
@@ -7,7 +7,6 @@ from src.backend.kr8.document import Document
 from src.backend.kr8.document.reader.pdf import PDFReader
 from src.backend.kr8.utils.log import logger
 import sqlalchemy
-from sqlite3 import IntegrityError
 
 def process_pdf(file, llm_os):
     reader = PDFReader()
@@ -111,23 +110,6 @@ def process_file_for_analyst(llm_os, file, file_content, analyst):
     try:
         if file.name.endswith('.csv'):
             df_name = pandas_tools.load_csv(file.name, file_content)
-            df = pandas_tools.dataframes[df_name]
-
-            doc = Document(
-                name=file.name,
-                content=df.to_csv(index=False),
-                meta_data={"type": "csv", "shape": df.shape}
-            )
-            try:
-                llm_os.knowledge_base.vector_db.upsert([doc])
-                logger.info(f"Upserted CSV file {file.name} to vector database")
-            except AttributeError:
-                try:
-                    llm_os.knowledge_base.vector_db.insert([doc])
-                    logger.info(f"Inserted CSV file {file.name} to vector database")
-                except IntegrityError:
-                    logger.warning(f"Document {file.name} already exists in the database. Skipping insertion.")
-
         elif file.name.endswith(('.xlsx', '.xls')):
             df_name = pandas_tools.load_excel(file.name, file_content)
         else:
@@ -2,7 +2,6 @@ import os
 import streamlit as st
 import re
 import json
-import requests
 import pandas as pd
 import base64
 from io import BytesIO
@@ -14,7 +13,7 @@ from pygments import highlight
 from pygments.lexers import get_lexer_by_name
 from pygments.formatters import HtmlFormatter
 import logging
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_FAST, get_backend_client
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -75,7 +74,7 @@ def render_chart(chart_data):
 
 def is_authenticated():
     if 'token' in st.session_state:
-        response = requests.get(f"{BACKEND_URL}/api/v1/auth/is_authenticated", headers={"Authorization": f"Bearer {st.session_state['token']}"})
+        response = get_backend_client().get("/api/v1/auth/is_authenticated", ttl=TTL_FAST)
         return response.status_code == 200 and response.json().get('authenticated', False)
     return False
 
@@ -118,10 +117,11 @@ def send_event(event_type, event_data, duration=None):
             "event_data": event_data,
             "duration": duration
         }
-        response = requests.post(
-            f"{BACKEND_URL}/api/v1/analytics/user-events",
+        # Events do not change anything the session has cached
+        response = get_backend_client().post(
+            "/api/v1/analytics/user-events",
             json=payload,
-            headers={"Authorization": f"Bearer {st.session_state.get('token')}"}
+            invalidate=False
         )
         if response.status_code != 200:
             logger.error(f"Failed to send event: {response.text}")
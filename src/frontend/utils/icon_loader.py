@@ -1,13 +1,12 @@
 import streamlit as st
-import requests
 from PIL import Image
 from io import BytesIO
 import logging
-from utils.api import BACKEND_URL
+from utils.backend_client import TTL_STATIC, get_backend_client
 
 logger = logging.getLogger(__name__)
 
-@st.cache_data(ttl=3600)
+# Not st.cache_data: that cache is shared by every session, whatever their org
 def load_org_icons():
     org_id = st.session_state.get('org_id')
     if not org_id:
@@ -16,16 +15,14 @@ def load_org_icons():
 
     system_chat_icon = user_chat_icon = None
     try:
-        system_icon_response = requests.get(
-            f"{BACKEND_URL}/api/v1/organizations/asset/{org_id}/chat_system_icon",
-            headers={"Authorization": f"Bearer {st.session_state.get('token')}"}
+        system_icon_response = get_backend_client().get(
+            f"/api/v1/organizations/asset/{org_id}/chat_system_icon", ttl=TTL_STATIC
         )
         if system_icon_response.status_code == 200:
             system_chat_icon = Image.open(BytesIO(system_icon_response.content))
 
-        user_icon_response = requests.get(
-            f"{BACKEND_URL}/api/v1/organizations/asset/{org_id}/chat_user_icon",
-            headers={"Authorization": f"Bearer {st.session_state.get('token')}"}
+        user_icon_response = get_backend_client().get(
+            f"/api/v1/organizations/asset/{org_id}/chat_user_icon", ttl=TTL_STATIC
         )
         if user_icon_response.status_code == 200:
             user_chat_icon = Image.open(BytesIO(user_icon_response.content))
@@ -0,0 +1,125 @@
+"""Backend calls per page render
+
+Starts a stub backend that counts the requests it gets and answers with canned json, renders app.py for a
+logged-in user with Streamlit's AppTest, then reruns it the way a widget interaction does, and reports how many
+backend calls each render made and to which endpoints. The first render fills the session's BackendClient cache,
+so later renders should only make the calls that are not cached.
+
+Usage (from src/frontend, with the repository root on the path for the backend imports of the sidebar):
+    PYTHONPATH=../.. python -m utils.render_harness
+    PYTHONPATH=../.. python -m utils.render_harness --reruns 5 --role admin
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+from urllib.parse import urlparse
+
+# Canned answers by path prefix; anything else gets an empty json object
+CANNED_RESPONSES = {
+    "/api/v1/auth/is_authenticated": {"authenticated": True},
+    "/api/v1/assistant/get-assistant": {"assistant_id": 1},
+    "/api/v1/knowledge-base/documents": [],
+    "/api/v1/analytics/all-analytics": {},
+    "/api/v1/organizations/public-config/": "",
+    "/api/v1/organizations": [],
+    "/api/v1/users": [],
+}
+
+
+class StubBackend:
+    """Backend on localhost that counts requests by "METHOD path" """
+
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                path = urlparse(self.path).path
+                with stub.lock:
+                    stub.calls[f"{self.command} {path}"] += 1
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                body = next((value for prefix, value in CANNED_RESPONSES.items() if path.startswith(prefix)), {})
+                data = body.encode() if isinstance(body, str) else json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain" if isinstance(body, str) else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self) -> "StubBackend":
+        self.thread.start()
+        return self
+
+    def take_calls(self) -> Counter:
+        with self.lock:
+            calls, self.calls = self.calls, Counter()
+        return calls
+
+    def stop(self) -> None:
+        self.server.shutdown()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Count backend calls per render of the Streamlit app.")
+    parser.add_argument("--reruns", type=int, default=3, help="Renders after the first one")
+    parser.add_argument("--role", default="user", choices=["trial", "user", "admin", "super_admin"])
+    parser.add_argument("--app", default="app.py", help="Streamlit script to render")
+    args = parser.parse_args(argv)
+
+    backend = StubBackend().start()
+    # Read by utils.backend_client at import, which happens inside the first render
+    os.environ["BACKEND_URL"] = backend.url
+
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(args.app, default_timeout=60)
+    app.session_state["token"] = "render-harness"
+    app.session_state["user_id"] = 1
+    app.session_state["org_id"] = 1
+    app.session_state["nickname"] = "harness"
+    app.session_state["role"] = args.role
+    app.session_state["is_admin"] = args.role in ("admin", "super_admin")
+    app.session_state["is_super_admin"] = args.role == "super_admin"
+
+    totals = []
+    for render in range(args.reruns + 1):
+        app.run()
+        calls = backend.take_calls()
+        totals.append(sum(calls.values()))
+        label = "first render" if render == 0 else f"rerun {render}"
+        print(f"{label:<14} {totals[-1]:>4} backend calls")
+        for endpoint, count in calls.most_common():
+            print(f"    {count:>4}  {endpoint}")
+        for exception in app.exception:
+            print(f"    exception: {exception.message}")
+
+    if args.reruns:
+        print(f"average per rerun: {sum(totals[1:]) / args.reruns:.1f} backend calls")
+    backend.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())